@@ -0,0 +1,119 @@
+"""
+Benchmark del modelo Artefacto
+
+Compara la clase Artefacto (con __slots__ y valores derivados guardados)
+contra una copia de la versión anterior, basada en __dict__ y que recalcula
+en cada llamada:
+- Memoria por millón de instancias (medida con tracemalloc)
+- Tiempo del camino caliente: consumo_mensual() y nivel_consumo() repetidos
+  sobre el mismo inventario, como hacen los analizadores
+
+Uso:
+    python benchmarks/bench_artefacto.py [instancias]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from models.artefacto import Artefacto
+
+
+class ArtefactoAnterior:
+    """Versión anterior de Artefacto: atributos en __dict__, sin caché"""
+
+    def __init__(self, nombre, watts, horas_dia, ubicacion, tipo):
+        self.nombre = nombre
+        self.watts = watts
+        self.horas_dia = horas_dia
+        self.ubicacion = ubicacion
+        self.tipo = tipo
+
+    def consumo_diario(self):
+        return self.watts * self.horas_dia
+
+    def consumo_mensual(self):
+        return (self.consumo_diario() * 30) / 1000
+
+    def nivel_consumo(self):
+        if self.watts > 1000:
+            return "ALTO"
+        elif self.watts >= 200:
+            return "MEDIO"
+        else:
+            return "BAJO"
+
+
+def crear(clase, cantidad: int) -> list:
+    """Crea instancias que comparten los mismos strings de ubicación y tipo"""
+    return [
+        clase(f"Artefacto {i}", float(i % 2500 + 5), float(i % 24), "Cocina", "Electrónica")
+        for i in range(cantidad)
+    ]
+
+
+def memoria_por_millon(clase, cantidad: int, derivar: bool) -> float:
+    """
+    MB asignados por 1M instancias, sin contar los nombres
+
+    Con derivar=True se mide después de consultar los valores derivados,
+    que la clase con caché guarda en cada instancia.
+    """
+    nombres = [f"Artefacto {i}" for i in range(cantidad)]
+    gc.collect()
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    instancias = [
+        clase(nombre, float(i % 2500 + 5), float(i % 24), "Cocina", "Electrónica")
+        for i, nombre in enumerate(nombres)
+    ]
+    if derivar:
+        for instancia in instancias:
+            instancia.consumo_mensual()
+            instancia.nivel_consumo()
+    fin, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Los floats de watts/horas y la lista se cuentan igual en ambas clases
+    return (fin - inicio) / cantidad * 1_000_000 / 2**20
+
+
+def camino_caliente(instancias: list, pasadas: int = 5) -> float:
+    """Tiempo de varias pasadas de consumo_mensual y nivel_consumo"""
+    inicio = time.perf_counter()
+    for _ in range(pasadas):
+        total = 0.0
+        for instancia in instancias:
+            total += instancia.consumo_mensual()
+            instancia.nivel_consumo()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Instancias: {cantidad:,}\n")
+    print(f"{'':<20}{'MB por millón':>30}")
+    print(f"{'Clase':<20}{'recién creadas':>16}{'con derivados':>16}{'camino caliente':>18}")
+    for clase in (ArtefactoAnterior, Artefacto):
+        memoria = memoria_por_millon(clase, cantidad, derivar=False)
+        memoria_derivados = memoria_por_millon(clase, cantidad, derivar=True)
+        instancias = crear(clase, cantidad)
+        tiempo = camino_caliente(instancias)
+        print(
+            f"{clase.__name__:<20}{memoria:>16.1f}{memoria_derivados:>16.1f}"
+            f"{tiempo:>16.3f} s"
+        )
+        del instancias
+
+
+if __name__ == "__main__":
+    main()
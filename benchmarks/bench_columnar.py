@@ -0,0 +1,84 @@
+"""
+Benchmark del almacén columnar
+
+Mide consumo_total_mensual, consumo_por_ubicacion y consumo_por_tipo sobre
+columnas NumPy, y los compara con AnalizadorConteo sobre objetos Artefacto.
+El analizador se mide con menos artefactos y se informa su costo por fila.
+
+Uso:
+    python benchmarks/bench_columnar.py [filas]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from services.columnar import AlmacenColumnar
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.generador import GeneradorInventario
+
+SEMILLA = 42
+OPERACIONES = ["consumo_total_mensual", "consumo_por_ubicacion", "consumo_por_tipo"]
+
+
+def medir(funcion, repeticiones: int = 5) -> float:
+    """Mejor tiempo de varias ejecuciones, en segundos"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def crear_almacen(filas: int) -> AlmacenColumnar:
+    """Almacén con columnas sintéticas reproducibles"""
+    generador = GeneradorInventario(SEMILLA)
+    columnas = generador.columnas(filas)
+    return AlmacenColumnar.desde_columnas(
+        columnas["nombres"],
+        columnas["watts"],
+        columnas["horas_dia"],
+        columnas["ubicaciones"],
+        columnas["tipos"],
+        generador.ubicaciones,
+        generador.tipos,
+    )
+
+
+def crear_analizador(filas: int) -> AnalizadorConteo:
+    """Analizador sobre un gestor con artefactos sintéticos"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(GeneradorInventario(SEMILLA).artefactos(filas))
+    return AnalizadorConteo(gestor)
+
+
+def main() -> None:
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    filas_objetos = min(filas, 100_000)
+
+    almacen = crear_almacen(filas)
+    analizador = crear_analizador(filas_objetos)
+
+    print(f"Columnar: {filas:,} filas | Objetos: {filas_objetos:,} artefactos\n")
+    print(f"{'Operación':<24}{'columnar':>12}{'objetos/fila':>16}{'columnar/fila':>16}")
+    for operacion in OPERACIONES:
+        t_columnar = medir(getattr(almacen, operacion))
+        t_objetos = medir(getattr(analizador, operacion), repeticiones=1)
+        print(
+            f"{operacion:<24}{t_columnar * 1e3:>10.1f}ms"
+            f"{t_objetos / filas_objetos * 1e9:>14.0f}ns"
+            f"{t_columnar / filas * 1e9:>14.1f}ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
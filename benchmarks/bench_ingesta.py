@@ -0,0 +1,115 @@
+"""
+Benchmark de carga de artefactos
+
+Compara agregar_artefacto llamado en un bucle contra la carga masiva
+agregar_artefactos. El bucle se mide con la salida estándar dirigida a una
+pseudo-terminal (como en el menú interactivo, con buffer por línea) y a
+/dev/null. Una terminal real, que además dibuja cada línea, es más lenta que
+la pseudo-terminal, así que la aceleración informada es una cota inferior.
+
+La carga masiva debe ser al menos 10x más rápida que el bucle sobre la
+pseudo-terminal (o sobre /dev/null si no hay pseudo-terminal). El benchmark
+informa en qué se va el tiempo y falla si no alcanza el objetivo.
+
+Uso:
+    python benchmarks/bench_ingesta.py [cantidad]
+"""
+
+import contextlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from services.conjuntos import GestorConjuntos
+from services.generador import GeneradorInventario
+
+SEMILLA = 42
+# Aceleración pedida para agregar_artefactos frente al bucle
+OBJETIVO = 10
+
+
+def medir_bucle(artefactos, salida) -> float:
+    """Tiempo de agregar_artefacto en un bucle, escribiendo en salida"""
+    gestor = GestorConjuntos()
+    with contextlib.redirect_stdout(salida):
+        inicio = time.perf_counter()
+        for artefacto in artefactos:
+            gestor.agregar_artefacto(artefacto)
+        return time.perf_counter() - inicio
+
+
+def medir_bucle_terminal(artefactos):
+    """Mide el bucle sobre una pseudo-terminal, o None si no hay soporte"""
+    try:
+        import pty
+    except ImportError:
+        return None
+
+    maestro, esclavo = pty.openpty()
+
+    def vaciar() -> None:
+        while True:
+            try:
+                if not os.read(maestro, 65536):
+                    break
+            except OSError:
+                break
+
+    threading.Thread(target=vaciar, daemon=True).start()
+    with open(esclavo, "w", buffering=1) as terminal:
+        tiempo = medir_bucle(artefactos, terminal)
+    os.close(maestro)
+    return tiempo
+
+
+def medir_masiva(artefactos) -> float:
+    """Tiempo de agregar_artefactos sobre la misma lista"""
+    gestor = GestorConjuntos()
+    inicio = time.perf_counter()
+    gestor.agregar_artefactos(artefactos)
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    artefactos = list(GeneradorInventario(SEMILLA).artefactos(cantidad))
+
+    t_terminal = medir_bucle_terminal(artefactos)
+    with open(os.devnull, "w") as nulo:
+        t_nulo = medir_bucle(artefactos, nulo)
+    t_masiva = medir_masiva(artefactos)
+
+    print(f"Artefactos:                         {cantidad:,}")
+    if t_terminal is not None:
+        print(
+            f"agregar_artefacto (terminal):      {t_terminal:.3f} s"
+            f"  ({t_terminal / t_masiva:.1f}x)"
+        )
+    print(
+        f"agregar_artefacto (/dev/null):     {t_nulo:.3f} s"
+        f"  ({t_nulo / t_masiva:.1f}x)"
+    )
+    print(f"agregar_artefactos:                {t_masiva:.3f} s")
+
+    referencia = t_terminal if t_terminal is not None else t_nulo
+    print(f"\nObjetivo: {OBJETIVO}x; logrado: {referencia / t_masiva:.1f}x")
+    if t_terminal is not None:
+        print(f"  Impresión en el bucle:           {t_terminal - t_nulo:.3f} s (eliminada)")
+    print(f"  Costo por llamada del bucle:     {t_nulo - t_masiva:.3f} s (eliminado)")
+    print(f"  Indexar cada artefacto:          {t_masiva:.3f} s (compartido)")
+    assert referencia / t_masiva >= OBJETIVO, (
+        f"Error: la carga masiva logra {referencia / t_masiva:.1f}x, el objetivo es "
+        f"{OBJETIVO}x (debería tardar como máximo {referencia / OBJETIVO:.3f} s)"
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark de evaluación en lote de hogares
+
+Escribe un archivo JSONL temporal con hogares sintéticos y mide el
+rendimiento (hogares por segundo) de lotes.evaluar_origen con 1, 2, 4, ...
+procesos hasta la cantidad de núcleos. Informa la aceleración y la
+eficiencia respecto de un solo proceso (1.0 = escala lineal).
+
+Uso:
+    python benchmarks/bench_lotes.py [hogares] [tamano_bloque]
+"""
+
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from services import lotes
+from services.generador import GeneradorInventario
+
+SEMILLA = 42
+
+
+def generar_hogares(cantidad: int, artefactos: int = 25):
+    """Hogares sintéticos reproducibles: artefactos consecutivos del generador"""
+    registros = GeneradorInventario(SEMILLA).registros(cantidad * artefactos)
+    for h in range(cantidad):
+        yield f"hogar {h}", list(itertools.islice(registros, artefactos))
+
+
+def medir(ruta: str, cantidad: int, trabajadores: int, tamano_bloque: int) -> float:
+    """Segundos para evaluar el archivo con trabajadores procesos"""
+    inicio = time.perf_counter()
+    evaluados = sum(1 for _ in lotes.evaluar_origen(ruta, trabajadores, tamano_bloque))
+    assert evaluados == cantidad
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    tamano_bloque = int(sys.argv[2]) if len(sys.argv) > 2 else lotes.TAMANO_BLOQUE
+    nucleos = os.cpu_count() or 1
+
+    niveles = [1]
+    while niveles[-1] * 2 <= nucleos:
+        niveles.append(niveles[-1] * 2)
+    if niveles[-1] != nucleos:
+        niveles.append(nucleos)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as archivo:
+        for hogar, artefactos in generar_hogares(cantidad):
+            archivo.write(json.dumps({"hogar": hogar, "artefactos": artefactos}) + "\n")
+
+    print(f"Hogares: {cantidad:,} | bloque: {tamano_bloque} | núcleos: {nucleos}\n")
+    print(f"{'procesos':>8}{'tiempo':>10}{'hogares/s':>12}{'acel.':>8}{'efic.':>8}")
+    try:
+        medir_niveles(archivo.name, cantidad, niveles, tamano_bloque)
+    finally:
+        os.remove(archivo.name)
+
+
+def medir_niveles(ruta: str, cantidad: int, niveles, tamano_bloque: int) -> None:
+    """Imprime una fila por cantidad de procesos"""
+    base = None
+    for trabajadores in niveles:
+        tiempo = medir(ruta, cantidad, trabajadores, tamano_bloque)
+        base = base or tiempo
+        aceleracion = base / tiempo
+        print(
+            f"{trabajadores:>8}{tiempo:>9.2f}s{cantidad / tiempo:>12,.0f}"
+            f"{aceleracion:>7.2f}x{aceleracion / trabajadores:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
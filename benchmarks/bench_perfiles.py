@@ -0,0 +1,76 @@
+"""
+Benchmark del motor de perfiles de uso
+
+Mide el armado de la matriz de carga (artefactos × 96 cuartos de hora) y
+las consultas de curva, picos por ubicación y simultaneidad sobre ella.
+
+Uso:
+    python benchmarks/bench_perfiles.py [artefactos]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+import numpy as np
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.generador import GeneradorInventario
+from services.perfiles import RANURAS, MotorPerfiles
+
+SEMILLA = 42
+
+
+def crear_gestor(artefactos: int) -> GestorConjuntos:
+    """
+    Gestor con artefactos del generador y perfiles aleatorios reproducibles
+    (uno de cada diez sin perfil); las horas de uso salen del perfil
+    """
+    rng = np.random.default_rng(SEMILLA)
+    encendido = rng.random((artefactos, RANURAS)) < 0.2
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        Artefacto(
+            registro["nombre"],
+            registro["watts"],
+            float(encendido[i].sum()) / 4,
+            registro["ubicacion"],
+            registro["tipo"],
+            None if i % 10 == 0 else encendido[i].astype(np.float64),
+        )
+        for i, registro in enumerate(GeneradorInventario(SEMILLA).registros(artefactos))
+    )
+    return gestor
+
+
+def main() -> None:
+    artefactos = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    gestor = crear_gestor(artefactos)
+    motor = MotorPerfiles.de(gestor)
+
+    inicio = time.perf_counter()
+    motor.curva_carga()
+    armado = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    pico = motor.pico()
+    motor.picos_por_ubicacion()
+    motor.maximo_simultaneo_alto()
+    consultas = time.perf_counter() - inicio
+
+    print(f"Artefactos: {artefactos:,} × {RANURAS} cuartos de hora")
+    print(f"  Armado de la matriz y curvas: {armado * 1000:8.1f} ms")
+    print(f"  Pico, picos y simultaneidad:  {consultas * 1000:8.3f} ms")
+    print(f"  Pico del hogar: {pico[0]:,.1f} kW a las {pico[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark de reglas lógicas sobre muchos hogares
+
+Compara la evaluación vectorizada (services.reglas) de alerta y
+recomendaciones para todos los hogares contra SistemaLogico, que necesita un
+gestor por hogar. SistemaLogico se mide sobre una muestra de hogares y se
+informa su costo por hogar (sin contar la carga de los artefactos).
+
+Uso:
+    python benchmarks/bench_reglas.py [hogares]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+import numpy as np
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.generador import GeneradorInventario
+from services.logica import SistemaLogico
+from services import reglas
+
+ARTEFACTOS_POR_HOGAR = 8
+GENERADOR = GeneradorInventario(42)
+
+
+def crear_columnas(hogares: int):
+    """Columnas sintéticas reproducibles, ARTEFACTOS_POR_HOGAR por hogar"""
+    columnas = GENERADOR.columnas(hogares * ARTEFACTOS_POR_HOGAR)
+    return (
+        np.repeat(np.arange(hogares), ARTEFACTOS_POR_HOGAR),
+        columnas["watts"],
+        columnas["horas_dia"],
+        columnas["ubicaciones"],
+    )
+
+
+def medir_vectorizado(columnas, hogares: int) -> float:
+    """Tiempo de proposiciones + alerta + recomendaciones para todos"""
+    inicio = time.perf_counter()
+    proposiciones = reglas.proposiciones_por_hogar(*columnas, cantidad_hogares=hogares)
+    reglas.niveles_alerta(proposiciones)
+    reglas.recomendaciones(proposiciones)
+    return time.perf_counter() - inicio
+
+
+def medir_por_hogar(columnas, muestra: int) -> float:
+    """Tiempo total de SistemaLogico sobre los primeros hogares de la muestra"""
+    hogares, watts, horas, ubicaciones = columnas
+    sistemas = []
+    for hogar in range(muestra):
+        gestor = GestorConjuntos()
+        filas = range(hogar * ARTEFACTOS_POR_HOGAR, (hogar + 1) * ARTEFACTOS_POR_HOGAR)
+        gestor.agregar_artefactos(
+            Artefacto(
+                f"artefacto {fila}",
+                float(watts[fila]),
+                float(horas[fila]),
+                GENERADOR.ubicaciones[ubicaciones[fila]],
+                "Electrodoméstico",
+            )
+            for fila in filas
+        )
+        sistemas.append(SistemaLogico(gestor, AnalizadorConteo(gestor)))
+
+    inicio = time.perf_counter()
+    for sistema in sistemas:
+        sistema.generar_recomendaciones()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    hogares = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    muestra = min(hogares, 10_000)
+    columnas = crear_columnas(hogares)
+
+    t_vectorizado = medir_vectorizado(columnas, hogares)
+    t_muestra = medir_por_hogar(columnas, muestra)
+    por_hogar = t_muestra / muestra
+
+    print(f"Hogares: {hogares:,} ({ARTEFACTOS_POR_HOGAR} artefactos c/u)")
+    print(f"Vectorizado:          {t_vectorizado:.3f} s")
+    print(
+        f"SistemaLogico:        {por_hogar * 1e6:.1f} µs/hogar"
+        f" → {por_hogar * hogares:.1f} s estimados"
+        f" ({por_hogar * hogares / t_vectorizado:.0f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
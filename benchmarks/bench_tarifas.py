@@ -0,0 +1,68 @@
+"""
+Benchmark del motor de tarifas
+
+Mide el costo de muchos planes contra muchos hogares en una sola llamada
+(costos_por_plan), con y sin reparto horario del consumo.
+
+Uso:
+    python benchmarks/bench_tarifas.py [planes] [hogares]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+import numpy as np
+
+from services.perfiles import RANURAS
+from services.tarifas import Tarifa, costos_por_plan
+
+
+def crear_planes(cantidad: int) -> list:
+    """Planes aleatorios reproducibles de 1 a 6 escalones, la mitad con franja"""
+    rng = np.random.default_rng(42)
+    planes = []
+    for i in range(cantidad):
+        escalones = int(rng.integers(1, 7))
+        limites = np.cumsum(rng.uniform(50, 250, escalones - 1)).tolist()
+        franjas = {"18:00-23:00": float(rng.uniform(5, 30))} if i % 2 else None
+        precios = rng.uniform(20, 120, escalones).tolist()
+        cargo_fijo = float(rng.uniform(0, 3000))
+        planes.append(Tarifa(f"Plan {i}", precios, limites, cargo_fijo, franjas))
+    return planes
+
+
+def main() -> None:
+    cantidad_planes = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    hogares = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    planes = crear_planes(cantidad_planes)
+    rng = np.random.default_rng(7)
+    consumos = rng.gamma(2.0, 150.0, hogares)
+    repartos = rng.random((hogares, RANURAS))
+    repartos /= repartos.sum(axis=1, keepdims=True)
+
+    inicio = time.perf_counter()
+    costos = costos_por_plan(planes, consumos)
+    parejo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    costos_por_plan(planes, consumos, repartos)
+    con_reparto = time.perf_counter() - inicio
+
+    celdas = cantidad_planes * hogares
+    print(f"Planes × hogares: {cantidad_planes:,} × {hogares:,} = {celdas:,}")
+    print(f"  Consumo parejo:      {parejo * 1000:8.1f} ms ({parejo / celdas * 1e9:.1f} ns/celda)")
+    print(f"  Con reparto horario: {con_reparto * 1000:8.1f} ms")
+    mejor = np.argmin(costos, axis=0)
+    print(f"  Plan más barato más frecuente: {planes[np.bincount(mejor).argmax()].nombre}")
+
+
+if __name__ == "__main__":
+    main()
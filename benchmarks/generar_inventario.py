@@ -0,0 +1,74 @@
+"""
+Genera un inventario sintético reproducible para pruebas de carga
+
+El formato sale de la extensión del archivo (.csv, .jsonl o .snap); con
+"-" se escribe en la salida estándar (CSV o JSONL, según --formato). La
+misma semilla y los mismos parámetros dan siempre el mismo archivo.
+
+Uso:
+    python benchmarks/generar_inventario.py cantidad destino [--semilla N]
+        [--formato csv|jsonl|snapshot] [--ubicaciones N] [--tipos N]
+        [--zipf S] [--alto F --medio F --bajo F]
+
+Ejemplo:
+    python benchmarks/generar_inventario.py 1e6 inventario.jsonl --semilla 7
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from services.generador import (
+    EXPONENTE_ZIPF,
+    PROPORCIONES,
+    TIPOS,
+    UBICACIONES,
+    GeneradorInventario,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Genera un inventario sintético")
+    parser.add_argument("cantidad", type=lambda texto: int(float(texto)), help="artefactos")
+    parser.add_argument("destino", help="archivo .csv, .jsonl o .snap, o - (salida estándar)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--formato", choices=("csv", "jsonl", "snapshot"))
+    parser.add_argument("--ubicaciones", type=int, default=len(UBICACIONES))
+    parser.add_argument("--tipos", type=int, default=len(TIPOS))
+    parser.add_argument("--zipf", type=float, default=EXPONENTE_ZIPF, help="exponente s")
+    for nivel, fraccion in PROPORCIONES.items():
+        parser.add_argument(f"--{nivel.lower()}", type=float, default=fraccion, dest=nivel)
+    args = parser.parse_args(argv)
+
+    try:
+        generador = GeneradorInventario(
+            args.semilla,
+            ubicaciones=args.ubicaciones,
+            tipos=args.tipos,
+            exponente_zipf=args.zipf,
+            proporciones={nivel: getattr(args, nivel) for nivel in PROPORCIONES},
+        )
+        inicio = time.perf_counter()
+        escritos = generador.escribir(args.destino, args.cantidad, args.formato)
+    except ValueError as e:
+        parser.error(str(e))
+    segundos = time.perf_counter() - inicio
+    if args.destino != "-":
+        print(
+            f"✅ {escritos:,} artefactos en {args.destino} "
+            f"({segundos:.2f} s, {escritos / max(segundos, 1e-9):,.0f} por segundo)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+"""
+Suite de benchmarks de escala
+
+Genera inventarios de 10³ a 10⁷ artefactos y mide los caminos calientes del
+gestor, el conteo y la lógica:
+- Carga: agregar_artefacto en un bucle y agregar_artefactos
+- Consultas: cada obtener_por_* y las operaciones de conjuntos
+- Conteo: cada método de AnalizadorConteo (con una tarifa, también los
+  costos)
+- Lógica: identificar_ubicaciones_criticas
+- Reportes: generar_reporte_estadistico y generar_reporte_logico
+
+Las lecturas se miden en frío: el analizador y el sistema lógico se crean
+de nuevo en cada repetición, así no se mide la memoización de SistemaLogico.
+Las operaciones rápidas se repiten hasta sumar al menos MINIMO_MEDICION
+segundos y se informa el tiempo por llamada. Para cada operación se guarda
+el mejor tiempo y la mediana de las repeticiones, y la pendiente de la
+curva de escala (log tiempo / log tamaño: 1 es lineal, 0 es constante).
+
+Los resultados se guardan en JSON y el modo comparar marca las
+regresiones entre dos corridas. Termina con código 1 si hay alguna, para
+usarlo en integración continua.
+
+Uso:
+    python benchmarks/suite.py correr [--tamanos 1e3 1e4 1e5] [--salida r.json]
+    python benchmarks/suite.py comparar base.json nuevo.json [--tolerancia 0.25]
+
+Por defecto se mide de 10³ a 10⁷. 10⁷ artefactos necesita varios GB de
+memoria; con --tamanos se elige una escala menor para corridas rápidas.
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# ruff: noqa: E402
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.generador import GeneradorInventario
+from services.logica import SistemaLogico
+from services.tarifas import Tarifa
+
+FORMATO = 2
+TAMANOS_POR_DEFECTO = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+REPETICIONES = 5
+# Tiempo mínimo de cada medición; las operaciones rápidas se repiten
+MINIMO_MEDICION = 0.02
+# Comparación: se marca una regresión si el tiempo crece más que la
+# tolerancia y, además, más que el mínimo absoluto (evita el ruido de las
+# operaciones de microsegundos)
+TOLERANCIA = 0.25
+MINIMO_ABSOLUTO = 50e-6
+
+# Inventarios de services.generador; cambiar la semilla cambia los datos,
+# así que se guarda en los resultados y comparar exige la misma
+SEMILLA = 42
+GENERADOR = GeneradorInventario(SEMILLA)
+TARIFA = Tarifa(
+    "Residencial", [50, 65, 80], [150, 300], cargo_fijo=1500, franjas={"18:00-23:00": 20}
+)
+
+Operacion = Callable[[], Any]
+
+
+def generar_artefactos(cantidad: int) -> Iterator[Artefacto]:
+    """Artefactos sintéticos reproducibles (las primeras filas de GENERADOR)"""
+    return GENERADOR.artefactos(cantidad)
+
+
+# ==================== MEDICIÓN ====================
+
+
+@contextlib.contextmanager
+def sin_recolector() -> Iterator[None]:
+    """Suspende el recolector de ciclos durante una medición (como timeit)"""
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+def medir(operacion: Operacion, repeticiones: int = REPETICIONES) -> Dict[str, float]:
+    """
+    Mide una operación que no modifica el inventario
+
+    Returns:
+        dict: mejor y mediana (segundos por llamada) y llamadas por medición
+    """
+    inicio = time.perf_counter()
+    operacion()
+    primera = time.perf_counter() - inicio
+    llamadas = max(1, math.ceil(MINIMO_MEDICION / primera)) if primera > 0 else 1000
+
+    tiempos = []
+    with sin_recolector():
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            for _ in range(llamadas):
+                operacion()
+            tiempos.append((time.perf_counter() - inicio) / llamadas)
+    return _resumen(tiempos, llamadas)
+
+
+def _resumen(tiempos: List[float], llamadas: int) -> Dict[str, float]:
+    return {"mejor": min(tiempos), "mediana": statistics.median(tiempos), "llamadas": llamadas}
+
+
+def medir_carga(artefactos: List[Artefacto], repeticiones: int) -> Dict[str, Dict[str, float]]:
+    """Mide la carga uno a uno (con la salida descartada) y la carga masiva"""
+    bucle, masiva = [], []
+    for _ in range(repeticiones):
+        gestor = GestorConjuntos()
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo), sin_recolector():
+            inicio = time.perf_counter()
+            for artefacto in artefactos:
+                gestor.agregar_artefacto(artefacto)
+            bucle.append(time.perf_counter() - inicio)
+        del gestor
+
+        gestor = GestorConjuntos()
+        with sin_recolector():
+            inicio = time.perf_counter()
+            gestor.agregar_artefactos(artefactos)
+            masiva.append(time.perf_counter() - inicio)
+        del gestor
+    return {"agregar_artefacto": _resumen(bucle, 1), "agregar_artefactos": _resumen(masiva, 1)}
+
+
+def operaciones(gestor: GestorConjuntos) -> Dict[str, Operacion]:
+    """Operaciones de lectura a medir sobre un inventario ya cargado"""
+    alto = gestor.obtener_por_nivel_consumo("ALTO")
+    cocina = gestor.obtener_por_ubicacion("Cocina")
+    climatizacion = gestor.obtener_por_tipo("Climatización")
+
+    def obtener_por(metodo: Callable[[str], Any], valores: Sequence[str]) -> Operacion:
+        return lambda: [metodo(valor) for valor in valores]
+
+    def conteo(metodo: str, *args: Any, tarifa: Optional[Tarifa] = None) -> Operacion:
+        # Analizador nuevo en cada llamada: sin resultados de llamadas previas
+        return lambda: getattr(AnalizadorConteo(gestor, tarifa), metodo)(*args)
+
+    def logica(metodo: str) -> Operacion:
+        return lambda: getattr(SistemaLogico(gestor, AnalizadorConteo(gestor)), metodo)()
+
+    return {
+        "obtener_por_ubicacion": obtener_por(gestor.obtener_por_ubicacion, GENERADOR.ubicaciones),
+        "obtener_por_tipo": obtener_por(gestor.obtener_por_tipo, GENERADOR.tipos),
+        "obtener_por_nivel_consumo": obtener_por(
+            gestor.obtener_por_nivel_consumo, ["ALTO", "MEDIO", "BAJO"]
+        ),
+        "union": lambda: gestor.union(cocina, alto),
+        "interseccion": lambda: gestor.interseccion(cocina, alto),
+        "diferencia": lambda: gestor.diferencia(climatizacion, alto),
+        "complemento": lambda: gestor.complemento(alto),
+        "agrupar_ubicacion_nivel": conteo("agrupar", "ubicacion", "nivel"),
+        "contar_por_ubicacion": conteo("contar_por_ubicacion"),
+        "contar_por_tipo": conteo("contar_por_tipo"),
+        "contar_por_nivel_consumo": conteo("contar_por_nivel_consumo"),
+        "calcular_porcentajes_consumo": conteo("calcular_porcentajes_consumo"),
+        "consumo_total_mensual": conteo("consumo_total_mensual"),
+        "consumo_por_ubicacion": conteo("consumo_por_ubicacion"),
+        "consumo_por_tipo": conteo("consumo_por_tipo"),
+        "mayores_consumidores": conteo("mayores_consumidores", 5),
+        "menores_consumidores": conteo("menores_consumidores", 5),
+        "ranking": conteo("ranking", len(gestor.universo) // 2, 10),
+        "costos": conteo("costos", tarifa=TARIFA),
+        "identificar_ubicaciones_criticas": logica("identificar_ubicaciones_criticas"),
+        "generar_reporte_estadistico": conteo("generar_reporte_estadistico"),
+        "generar_reporte_estadistico_con_tarifa": conteo(
+            "generar_reporte_estadistico", tarifa=TARIFA
+        ),
+        "generar_reporte_logico": logica("generar_reporte_logico"),
+    }
+
+
+def calibrar(repeticiones: int = REPETICIONES) -> float:
+    """
+    Tiempo de una carga fija de Python puro (diccionarios, conjuntos y
+    aritmética), para comparar corridas hechas en máquinas o momentos con
+    distinta velocidad
+    """
+
+    def carga() -> None:
+        datos = {f"clave {i}": i * 0.5 for i in range(20_000)}
+        pares = {clave for clave, valor in datos.items() if int(valor) % 2 == 0}
+        sum(valor for clave, valor in datos.items() if clave in pares)
+
+    return medir(carga, repeticiones)["mejor"]
+
+
+def pendiente(tamanos: Sequence[int], tiempos: Sequence[float]) -> Optional[float]:
+    """Pendiente de la recta de mínimos cuadrados en escala log-log"""
+    puntos = [(math.log(n), math.log(t)) for n, t in zip(tamanos, tiempos) if t > 0]
+    if len(puntos) < 2:
+        return None
+    media_x = statistics.fmean(x for x, _ in puntos)
+    media_y = statistics.fmean(y for _, y in puntos)
+    varianza = sum((x - media_x) ** 2 for x, _ in puntos)
+    covarianza = sum((x - media_x) * (y - media_y) for x, y in puntos)
+    return covarianza / varianza
+
+
+def correr(tamanos: Sequence[int], repeticiones: int = REPETICIONES) -> Dict[str, Any]:
+    """
+    Corre la suite para cada tamaño de inventario
+
+    Returns:
+        dict: Resultados en el formato del archivo JSON
+    """
+    resultados: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for tamano in tamanos:
+        print(f"\n📏 {tamano:,} artefactos", flush=True)
+        artefactos = list(generar_artefactos(tamano))
+        medidos = medir_carga(artefactos, repeticiones)
+
+        gestor = GestorConjuntos()
+        gestor.agregar_artefactos(artefactos)
+        for nombre, operacion in operaciones(gestor).items():
+            medidos[nombre] = medir(operacion, repeticiones)
+        for nombre, medicion in medidos.items():
+            print(f"   {nombre:<40} {formatear_tiempo(medicion['mejor'])}", flush=True)
+        resultados[str(tamano)] = medidos
+        del artefactos, gestor
+
+    escala = {
+        nombre: pendiente(tamanos, [resultados[str(n)][nombre]["mejor"] for n in tamanos])
+        for nombre in (resultados[str(tamanos[0])] if tamanos else ())
+    }
+    return {
+        "formato": FORMATO,
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "semilla": SEMILLA,
+        "repeticiones": repeticiones,
+        "calibracion": calibrar(repeticiones),
+        "resultados": resultados,
+        "escala": escala,
+    }
+
+
+# ==================== COMPARACIÓN ====================
+
+
+def comparar(
+    base: Dict[str, Any],
+    nuevo: Dict[str, Any],
+    tolerancia: float = TOLERANCIA,
+    minimo_absoluto: float = MINIMO_ABSOLUTO,
+) -> List[Dict[str, Any]]:
+    """
+    Compara dos corridas operación por operación (mejor tiempo)
+
+    Si las dos corridas tienen calibración, los tiempos de la base se
+    escalan por la razón entre calibraciones: así una máquina más lenta (o
+    más cargada) en la corrida nueva no se confunde con una regresión.
+
+    Args:
+        base (dict): Corrida de referencia
+        nuevo (dict): Corrida a evaluar
+        tolerancia (float): Aumento relativo admitido (0.25 = 25 %)
+        minimo_absoluto (float): Aumento en segundos por debajo del cual no
+            se marca regresión
+
+    Returns:
+        list: Una fila por (tamaño, operación) presente en las dos corridas,
+        con base, nuevo, razón (nuevo / base) y regresion (bool)
+    """
+    factor = velocidad_relativa(base, nuevo)
+    filas = []
+    for tamano, operaciones_base in base["resultados"].items():
+        operaciones_nuevas = nuevo["resultados"].get(tamano, {})
+        for nombre, medicion in operaciones_base.items():
+            if nombre not in operaciones_nuevas:
+                continue
+            antes = medicion["mejor"] * factor
+            despues = operaciones_nuevas[nombre]["mejor"]
+            razon = despues / antes if antes > 0 else math.inf
+            filas.append(
+                {
+                    "tamano": int(tamano),
+                    "operacion": nombre,
+                    "base": antes,
+                    "nuevo": despues,
+                    "razon": razon,
+                    "regresion": razon > 1 + tolerancia and despues - antes > minimo_absoluto,
+                }
+            )
+    return filas
+
+
+def velocidad_relativa(base: Dict[str, Any], nuevo: Dict[str, Any]) -> float:
+    """Razón entre las calibraciones de dos corridas (1 si falta alguna)"""
+    if base.get("calibracion") and nuevo.get("calibracion"):
+        return nuevo["calibracion"] / base["calibracion"]
+    return 1.0
+
+
+def formatear_tiempo(segundos: float) -> str:
+    """Tiempo con la unidad más legible (s, ms o µs)"""
+    if segundos >= 1:
+        return f"{segundos:8.3f} s "
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:8.3f} ms"
+    return f"{segundos * 1e6:8.3f} µs"
+
+
+def _leer(ruta: str) -> Dict[str, Any]:
+    with open(ruta, encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    if datos.get("formato") != FORMATO:
+        raise SystemExit(f"❌ {ruta}: formato de resultados no reconocido")
+    return datos
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de escala")
+    modos = parser.add_subparsers(dest="modo", required=True)
+
+    modo_correr = modos.add_parser("correr", help="mide y guarda los resultados en JSON")
+    modo_correr.add_argument(
+        "--tamanos",
+        nargs="+",
+        type=lambda texto: int(float(texto)),
+        default=list(TAMANOS_POR_DEFECTO),
+        help="cantidades de artefactos (se acepta notación 1e6)",
+    )
+    modo_correr.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    modo_correr.add_argument("--salida", default="resultados_benchmark.json")
+
+    modo_comparar = modos.add_parser("comparar", help="marca regresiones entre dos corridas")
+    modo_comparar.add_argument("base")
+    modo_comparar.add_argument("nuevo")
+    modo_comparar.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+
+    args = parser.parse_args(argv)
+
+    if args.modo == "correr":
+        datos = correr(sorted(set(args.tamanos)), args.repeticiones)
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, indent=2, ensure_ascii=False)
+        print("\n📈 Pendiente de escala (1 = lineal):")
+        for nombre, valor in datos["escala"].items():
+            if valor is not None:
+                print(f"   {nombre:<40} {valor:5.2f}")
+        print(f"\n💾 Resultados guardados en {args.salida}")
+        return 0
+
+    base, nuevo = _leer(args.base), _leer(args.nuevo)
+    if base.get("semilla") != nuevo.get("semilla"):
+        raise SystemExit("❌ Las corridas usan inventarios distintos (otra semilla)")
+    factor = velocidad_relativa(base, nuevo)
+    if factor != 1.0:
+        print(f"⚖️  Velocidad de la máquina: {factor:.2f}x la de la base (base escalada)\n")
+    filas = comparar(base, nuevo, args.tolerancia)
+    regresiones = [fila for fila in filas if fila["regresion"]]
+    for fila in filas:
+        marca = "❌" if fila["regresion"] else "  "
+        print(
+            f"{marca} {fila['tamano']:>10,} {fila['operacion']:<40} "
+            f"{formatear_tiempo(fila['base'])} → {formatear_tiempo(fila['nuevo'])} "
+            f"({fila['razon']:.2f}x)"
+        )
+    print(f"\n{len(regresiones)} regresión(es) en {len(filas)} mediciones")
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,7 +13,7 @@ setup(
     package_dir={"": "src"},
     python_requires=">=3.8",
     install_requires=[
-        # Aquí irían las dependencias externas si las hubiera
+        "numpy>=1.20",
     ],
     classifiers=[
         "Programming Language :: Python :: 3",
@@ -8,10 +8,11 @@ Autor:
 - Fernando Agustín Moyano
 """
 
-import os
+import argparse
+import json
 import sys
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, TextIO
 
 # Configurar path del proyecto ANTES de importar los módulos
 src_path = Path(__file__).resolve().parent
@@ -23,13 +24,22 @@ if str(src_path) not in sys.path:
 
 from models.artefacto import Artefacto
 from services.conjuntos import GestorConjuntos
+from services.almacen_sqlite import GestorSQLite
 from services.conteo import AnalizadorConteo
 from services.logica import SistemaLogico
+from services.expresiones import Nivel, Ubicacion
+from services.agenda import MotorAgenda
+from services.perfiles import MotorPerfiles
+from services.tarifas import cargar_tarifa
+from services.perfilado import Perfilador
+from services.metricas import PUERTO, MonitorMetricas
+from services import consultas, importador
 
 
 def limpiar_pantalla() -> None:
-    """Limpia la consola"""
-    os.system("cls" if os.name == "nt" else "clear")
+    """Limpia la consola con una secuencia ANSI, solo si es una terminal"""
+    if sys.stdout.isatty():
+        print("\033[2J\033[H", end="", flush=True)
 
 
 def pausa() -> None:
@@ -63,6 +73,7 @@ def mostrar_menu_principal() -> None:
     print("  5️⃣  Sistema de recomendaciones (Lógica)")
     print("  6️⃣  Reporte completo")
     print("  7️⃣  Cargar datos de ejemplo")
+    print("  8️⃣  Importar inventario (CSV/JSONL)")
     print("  0️⃣  Salir")
     print()
     print("=" * 60)
@@ -126,15 +137,14 @@ def menu_ver_artefactos(gestor: GestorConjuntos) -> None:
     print("           ARTEFACTOS REGISTRADOS")
     print("=" * 60 + "\n")
 
-    if not gestor.universo:
+    if not gestor.total_artefactos():
         print("⚠️  No hay artefactos registrados todavía.\n")
         pausa()
         return
 
-    print(f"Total de artefactos: {len(gestor.universo)}\n")
+    print(f"Total de artefactos: {gestor.total_artefactos()}\n")
 
-    for nombre in sorted(gestor.universo):
-        art = gestor.obtener_artefacto(nombre)
+    for art in sorted(gestor.iterar_artefactos(), key=lambda a: a.nombre.lower().strip()):
         print(f"  • {art.nombre}")
         print(
             f"    └─ {art.watts}W | {art.horas_dia}h/día | {art.ubicacion} | {art.tipo}"
@@ -154,7 +164,7 @@ def menu_consultas_conjuntos(gestor: GestorConjuntos) -> None:
         print("           CONSULTAS POR CONJUNTOS")
         print("=" * 60 + "\n")
 
-        if not gestor.universo:
+        if not gestor.total_artefactos():
             print("⚠️  No hay artefactos registrados todavía.\n")
             pausa()
             return
@@ -166,6 +176,7 @@ def menu_consultas_conjuntos(gestor: GestorConjuntos) -> None:
         print("  5. Operación: Intersección (A ∩ B)")
         print("  6. Operación: Diferencia (A - B)")
         print("  7. Operación: Complemento (U - A)")
+        print("  8. Consulta libre (ej: ubicacion:Cocina ∪ nivel:ALTO)")
         print("  0. Volver al menú principal")
         print()
 
@@ -187,6 +198,8 @@ def menu_consultas_conjuntos(gestor: GestorConjuntos) -> None:
             operacion_diferencia(gestor)
         elif opcion == "7":
             operacion_complemento(gestor)
+        elif opcion == "8":
+            consulta_libre(gestor)
         else:
             print("❌ Opción no válida")
             pausa()
@@ -253,11 +266,13 @@ def operacion_union(gestor: GestorConjuntos) -> None:
     gestor.mostrar_conjunto(cocina, "A: Artefactos en Cocina")
     gestor.mostrar_conjunto(alto, "B: Artefactos de Alto Consumo")
 
-    union = gestor.union(cocina, alto)
+    union = gestor.consultar(Ubicacion("Cocina") | Nivel("ALTO"))
     gestor.mostrar_conjunto(union, "A ∪ B: Unión")
 
+    # |A ∩ B| se cuenta sin construir la intersección
+    comunes = gestor.cardinalidad(Ubicacion("Cocina") & Nivel("ALTO"))
     print("\n📊 Verificación: |A ∪ B| = |A| + |B| - |A ∩ B|")
-    print(f"   {len(union)} = {len(cocina)} + {len(alto)} - {len(cocina & alto)}")
+    print(f"   {len(union)} = {len(cocina)} + {len(alto)} - {comunes}")
 
     pausa()
 
@@ -275,7 +290,7 @@ def operacion_interseccion(gestor: GestorConjuntos) -> None:
     gestor.mostrar_conjunto(cocina, "A: Artefactos en Cocina")
     gestor.mostrar_conjunto(alto, "B: Artefactos de Alto Consumo")
 
-    interseccion = gestor.interseccion(cocina, alto)
+    interseccion = gestor.consultar(Ubicacion("Cocina") & Nivel("ALTO"))
     gestor.mostrar_conjunto(interseccion, "A ∩ B: Intersección")
 
     print("\n💡 Interpretación: Artefactos críticos en la cocina")
@@ -324,6 +339,24 @@ def operacion_complemento(gestor: GestorConjuntos) -> None:
     pausa()
 
 
+def consulta_libre(gestor: GestorConjuntos) -> None:
+    """Ejecuta una consulta de conjuntos escrita por el usuario"""
+    limpiar_pantalla()
+    print("\n🔎 CONSULTA LIBRE\n")
+    print("Términos: ubicacion:VALOR, tipo:VALOR, nivel:ALTO|MEDIO|BAJO, U")
+    print("Operadores: ∪ (|), ∩ (&), - , ¬ (~) y paréntesis")
+    print('Ejemplo: (ubicacion:Cocina ∪ nivel:ALTO) ∩ ¬tipo:"Iluminación"\n')
+
+    texto = input("Consulta: ").strip()
+    try:
+        conjunto = consultas.consultar(gestor, texto)
+    except ValueError as e:
+        print(f"\n❌ Consulta no válida: {e}")
+    else:
+        gestor.mostrar_conjunto(conjunto, texto)
+    pausa()
+
+
 def menu_analisis_estadistico(conteo: AnalizadorConteo) -> None:
     """Menú de análisis estadístico"""
     limpiar_pantalla()
@@ -341,42 +374,66 @@ def menu_sistema_logico(sistema_logico: SistemaLogico) -> None:
 def generar_reporte_completo(
     gestor: GestorConjuntos, conteo: AnalizadorConteo, logica: SistemaLogico
 ) -> None:
-    """Genera un reporte completo del sistema"""
+    """Muestra el reporte completo del sistema"""
     limpiar_pantalla()
+    print(reporte_completo(gestor, conteo, logica))
+    pausa()
+
 
-    print("\n" + "╔" + "=" * 58 + "╗")
-    print("║" + " " * 14 + "REPORTE COMPLETO DEL SISTEMA" + " " * 16 + "║")
-    print("╚" + "=" * 58 + "╝")
+def reporte_completo(
+    gestor: GestorConjuntos, conteo: AnalizadorConteo, logica: SistemaLogico
+) -> str:
+    """
+    Genera un reporte completo del sistema
+
+    Returns:
+        str: Estadísticas, análisis lógico, demanda y horarios (si hay
+        artefactos con perfil u horarios) y detalle por conjuntos
+    """
+    secciones = [
+        "\n" + "╔" + "=" * 58 + "╗",
+        "║" + " " * 14 + "REPORTE COMPLETO DEL SISTEMA" + " " * 16 + "║",
+        "╚" + "=" * 58 + "╝",
+    ]
 
     # Sección 1: Estadísticas
-    print(conteo.generar_reporte_estadistico())
+    secciones.append(conteo.generar_reporte_estadistico())
 
     # Sección 2: Análisis Lógico
-    print(logica.generar_reporte_logico())
+    secciones.append(logica.generar_reporte_logico())
+
+    # Demanda diaria, si hay artefactos con perfil de uso
+    motor = MotorPerfiles.de(gestor)
+    if motor.artefactos_con_perfil():
+        secciones.append(motor.generar_reporte_demanda())
+
+    # Concurrencia, si hay artefactos con horarios de encendido
+    agenda = MotorAgenda.de(gestor)
+    if agenda.artefactos_con_horarios():
+        secciones.append(agenda.generar_reporte_horarios())
 
     # Sección 3: Detalles por conjunto
-    print("\n" + "=" * 60)
-    print("   ANÁLISIS DETALLADO POR CONJUNTOS")
-    print("=" * 60 + "\n")
+    secciones.append("\n" + "=" * 60)
+    secciones.append("   ANÁLISIS DETALLADO POR CONJUNTOS")
+    secciones.append("=" * 60 + "\n")
 
-    print("📍 POR UBICACIÓN:")
+    secciones.append("📍 POR UBICACIÓN:")
     for ubicacion in sorted(gestor.obtener_todas_ubicaciones()):
-        conjunto = gestor.obtener_por_ubicacion(ubicacion)
-        print(f"   {ubicacion}: {len(conjunto)} artefacto(s)")
+        cantidad = gestor.tamano_indice("ubicacion", ubicacion)
+        secciones.append(f"   {ubicacion}: {cantidad} artefacto(s)")
 
-    print("\n🔧 POR TIPO:")
+    secciones.append("\n🔧 POR TIPO:")
     for tipo in sorted(gestor.obtener_todos_tipos()):
-        conjunto = gestor.obtener_por_tipo(tipo)
-        print(f"   {tipo}: {len(conjunto)} artefacto(s)")
+        cantidad = gestor.tamano_indice("tipo", tipo)
+        secciones.append(f"   {tipo}: {cantidad} artefacto(s)")
 
-    print("\n⚡ POR NIVEL DE CONSUMO:")
+    secciones.append("\n⚡ POR NIVEL DE CONSUMO:")
     for nivel in ["ALTO", "MEDIO", "BAJO"]:
-        conjunto = gestor.obtener_por_nivel_consumo(nivel)
-        print(f"   {nivel}: {len(conjunto)} artefacto(s)")
+        cantidad = gestor.tamano_indice("nivel", nivel)
+        secciones.append(f"   {nivel}: {cantidad} artefacto(s)")
 
-    print("\n" + "=" * 60 + "\n")
-
-    pausa()
+    secciones.append("\n" + "=" * 60 + "\n")
+    return "\n".join(secciones)
 
 
 def cargar_datos_ejemplo(gestor: GestorConjuntos) -> None:
@@ -404,13 +461,140 @@ def cargar_datos_ejemplo(gestor: GestorConjuntos) -> None:
     pausa()
 
 
-def main() -> None:
-    """Función principal del programa"""
-    # Inicializar componentes
-    gestor = GestorConjuntos()
-    conteo = AnalizadorConteo(gestor)
-    logica = SistemaLogico(gestor, conteo)
+def menu_importar(gestor: GestorConjuntos) -> None:
+    """Importa artefactos desde un archivo CSV o JSONL"""
+    limpiar_pantalla()
+    print("\n" + "=" * 60)
+    print("           IMPORTAR INVENTARIO")
+    print("=" * 60 + "\n")
+    print("Columnas: nombre, watts, horas_dia, ubicacion, tipo\n")
+
+    ruta = input("📂 Archivo (.csv o .jsonl): ").strip()
+    if not ruta:
+        print("❌ La ruta no puede estar vacía")
+        pausa()
+        return
+    reporte = ruta + ".errores.csv"
 
+    try:
+        resultado = importador.importar(gestor, ruta, reporte=reporte)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Error: {e}")
+        pausa()
+        return
+
+    print(f"\n✅ Filas leídas: {resultado['leidos']}")
+    print(f"   Insertados:   {resultado['insertados']}")
+    print(f"   Reemplazados: {resultado['reemplazados']}")
+    print(f"   Rechazados:   {resultado['rechazados']}")
+    for linea, motivo in resultado["errores"][:5]:
+        print(f"   ❌ Línea {linea}: {motivo}")
+    if resultado["rechazados"]:
+        print(f"\n📄 Detalle de los rechazos en: {reporte}")
+    pausa()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Función principal del programa
+
+    Sin comando abre el menú interactivo; con un comando (import, report,
+    query o top) procesa los inventarios y termina, sin esperar teclas.
+
+    Returns:
+        int: Código de salida (1 si algún inventario no se pudo procesar)
+    """
+    parser = argparse.ArgumentParser(
+        description="Sistema de Monitoreo Inteligente de Consumo Hogareño",
+        epilog="Sin COMANDO se abre el menú interactivo.",
+    )
+    parser.add_argument(
+        "--db", metavar="ARCHIVO", help="base SQLite donde se guarda el inventario"
+    )
+    parser.add_argument(
+        "--tarifa",
+        metavar="ARCHIVO",
+        help="tarifa en JSON para agregar el costo mensual a los reportes",
+    )
+    parser.add_argument(
+        "--perfil",
+        metavar="ARCHIVO",
+        nargs="?",
+        const="-",
+        help="mide cada método y al salir guarda el perfil (.json o tabla; "
+        "sin ARCHIVO, en la salida de errores)",
+    )
+    parser.add_argument(
+        "--metricas",
+        metavar="PUERTO",
+        nargs="?",
+        const=PUERTO,
+        type=int,
+        help=f"publica métricas OpenMetrics en http://127.0.0.1:PUERTO/metrics "
+        f"(por defecto, {PUERTO})",
+    )
+    agregar_comandos(parser)
+    args, resto = parser.parse_known_args(
+        _separar_opcionales(sys.argv[1:] if argv is None else argv)
+    )
+    # argparse no junta los ARCHIVO separados por opciones ("report full --json a b")
+    if resto and (args.comando is None or any(r.startswith("-") and r != "-" for r in resto)):
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    if resto:
+        args.archivos += resto
+
+    if args.comando is not None:
+        if args.metricas is not None:
+            parser.error("--metricas solo se usa con el menú interactivo")
+        if args.db and args.comando != "import" and args.archivos:
+            parser.error(f"{args.comando}: con --db el inventario es la base, sin ARCHIVO")
+        if args.comando == "query":
+            try:
+                consultas.compilar(args.expresion)
+            except ValueError as e:
+                parser.error(f"consulta no válida: {e}")
+
+    tarifa = None
+    if args.tarifa:
+        try:
+            tarifa = cargar_tarifa(args.tarifa)
+        except (OSError, ValueError) as e:
+            parser.error(f"no se pudo leer la tarifa: {e}")
+
+    perfilador = Perfilador().activar() if args.perfil else None
+    try:
+        if args.comando is not None:
+            return ejecutar_comando(args, tarifa)
+
+        # Inicializar componentes: con --db el inventario persiste entre sesiones
+        gestor = GestorSQLite(args.db) if args.db else GestorConjuntos()
+        conteo = AnalizadorConteo(gestor, tarifa)
+        logica = SistemaLogico(gestor, conteo)
+        servidor = None
+        try:
+            if args.metricas is not None:
+                try:
+                    servidor = MonitorMetricas(gestor, conteo, logica).servir(args.metricas)
+                except OSError as e:
+                    parser.error(f"no se pudo abrir el puerto de métricas: {e}")
+                print(f"📈 Métricas en {servidor.url}")
+            ejecutar_menu(gestor, conteo, logica)
+        finally:
+            if servidor is not None:
+                servidor.detener()
+            if args.db:
+                gestor.cerrar()
+        return 0
+    finally:
+        if perfilador is not None:
+            perfilador.desactivar()
+            perfilador.guardar(args.perfil)
+
+
+def ejecutar_menu(
+    gestor: GestorConjuntos, conteo: AnalizadorConteo, logica: SistemaLogico
+) -> None:
+    """Bucle del menú principal, hasta que se elige salir"""
     while True:
         limpiar_pantalla()
         mostrar_banner()
@@ -425,25 +609,27 @@ def main() -> None:
         elif opcion == "3":
             menu_consultas_conjuntos(gestor)
         elif opcion == "4":
-            if not gestor.universo:
+            if not gestor.total_artefactos():
                 print("\n⚠️  No hay artefactos registrados. Carga datos primero.")
                 pausa()
             else:
                 menu_analisis_estadistico(conteo)
         elif opcion == "5":
-            if not gestor.universo:
+            if not gestor.total_artefactos():
                 print("\n⚠️  No hay artefactos registrados. Carga datos primero.")
                 pausa()
             else:
                 menu_sistema_logico(logica)
         elif opcion == "6":
-            if not gestor.universo:
+            if not gestor.total_artefactos():
                 print("\n⚠️  No hay artefactos registrados. Carga datos primero.")
                 pausa()
             else:
                 generar_reporte_completo(gestor, conteo, logica)
         elif opcion == "7":
             cargar_datos_ejemplo(gestor)
+        elif opcion == "8":
+            menu_importar(gestor)
         elif opcion == "0":
             limpiar_pantalla()
             print("\n" + "=" * 60)
@@ -460,5 +646,230 @@ def main() -> None:
             pausa()
 
 
+# ==================== MODO POR LOTES ====================
+#
+# Cada comando procesa los inventarios indicados y termina: no limpia la
+# pantalla ni espera teclas, así puede usarse desde scripts y cron. Cada
+# ARCHIVO es un inventario independiente ("-" o ninguno: la entrada
+# estándar); con --json se escribe una línea JSON por inventario.
+
+COMANDOS = ("import", "report", "query", "top")
+REPORTES = ("stats", "logic", "full")
+
+
+def agregar_comandos(parser: argparse.ArgumentParser) -> None:
+    """Agrega al parser los comandos del modo por lotes"""
+    comunes = argparse.ArgumentParser(add_help=False)
+    comunes.add_argument(
+        "--formato",
+        choices=("csv", "jsonl"),
+        help="formato de los inventarios (por defecto, según la extensión o el contenido)",
+    )
+    comunes.add_argument(
+        "-o",
+        "--salida",
+        metavar="ARCHIVO",
+        default="-",
+        help="archivo donde escribir el resultado (por defecto, la salida estándar)",
+    )
+    comunes.add_argument("--json", action="store_true", help="una línea JSON por inventario")
+
+    comandos = parser.add_subparsers(dest="comando", metavar="COMANDO")
+    importar = comandos.add_parser(
+        "import",
+        parents=[comunes],
+        help="importa inventarios (a la base de --db) e informa el resultado",
+    )
+    importar.add_argument(
+        "--errores",
+        action="store_true",
+        help="escribe las filas rechazadas de cada ARCHIVO en ARCHIVO.errores.csv",
+    )
+    reporte = comandos.add_parser("report", parents=[comunes], help="genera un reporte")
+    reporte.add_argument("tipo", choices=REPORTES, help="estadístico, lógico o completo")
+    consulta = comandos.add_parser(
+        "query", parents=[comunes], help="artefactos que cumplen una consulta"
+    )
+    consulta.add_argument("expresion", metavar="EXPRESION", help='p. ej. "nivel:ALTO ∩ tipo:X"')
+    top = comandos.add_parser("top", parents=[comunes], help="los N artefactos de mayor consumo")
+    top.add_argument("cantidad", metavar="N", type=int)
+    for subparser in (importar, reporte, consulta, top):
+        # Después de los argumentos propios de cada comando
+        subparser.add_argument(
+            "archivos",
+            metavar="ARCHIVO",
+            nargs="*",
+            help="inventario CSV o JSONL (- o ninguno: entrada estándar; con --db, la base)",
+        )
+
+
+def _separar_opcionales(argv: List[str]) -> List[str]:
+    """
+    Evita que --perfil o --metricas sin valor tomen el nombre del comando
+
+    "--perfil report stats" se interpreta como "--perfil=- report stats".
+    """
+    resultado = list(argv)
+    for posicion, argumento in enumerate(resultado[:-1]):
+        if resultado[posicion + 1] in COMANDOS:
+            if argumento == "--perfil":
+                resultado[posicion] = "--perfil=-"
+            elif argumento == "--metricas":
+                resultado[posicion] = f"--metricas={PUERTO}"
+    return resultado
+
+
+def ejecutar_comando(args: argparse.Namespace, tarifa: Any = None) -> int:
+    """
+    Ejecuta un comando del modo por lotes
+
+    Los errores de un inventario se informan en la salida de errores y no
+    detienen el resto.
+
+    Args:
+        args: Argumentos de main (comando, archivos y opciones)
+        tarifa (Tarifa, opcional): Tarifa para los costos del reporte
+
+    Returns:
+        int: 0 si todo se procesó, 1 si algún inventario falló
+    """
+    archivos = args.archivos or (["-"] if args.comando == "import" or not args.db else [])
+    codigo = 0
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    try:
+        if args.db:
+            # Un único inventario: la base, con los archivos importados antes
+            gestor = GestorSQLite(args.db)
+            try:
+                for archivo in archivos:
+                    codigo |= _procesar(args, gestor, archivo, tarifa, salida, len(archivos))
+                if args.comando != "import":
+                    codigo |= _procesar(args, gestor, None, tarifa, salida, 1)
+            finally:
+                gestor.cerrar()
+        else:
+            for archivo in archivos:
+                gestor = GestorConjuntos()
+                codigo |= _procesar(args, gestor, archivo, tarifa, salida, len(archivos))
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    return codigo
+
+
+def _procesar(
+    args: argparse.Namespace,
+    gestor: GestorConjuntos,
+    archivo: Optional[str],
+    tarifa: Any,
+    salida: TextIO,
+    cantidad: int,
+) -> int:
+    """Carga archivo en el gestor (si hay) y escribe el resultado del comando"""
+    nombre = args.db if archivo is None else "<entrada estándar>" if archivo == "-" else archivo
+    try:
+        if archivo is not None:
+            errores = None
+            if args.comando == "import" and args.errores and archivo != "-":
+                errores = archivo + ".errores.csv"
+            origen = sys.stdin if archivo == "-" else archivo
+            resultado = importador.importar(gestor, origen, args.formato, reporte=errores)
+        if args.comando == "import":
+            datos: Dict[str, Any] = resultado
+            texto = _texto_importacion(resultado)
+        else:
+            conteo = AnalizadorConteo(gestor, tarifa)
+            logica = SistemaLogico(gestor, conteo)
+            if args.json:
+                datos = datos_comando(args, gestor, conteo, logica)
+            else:
+                texto = texto_comando(args, gestor, conteo, logica)
+    except (OSError, ValueError) as e:
+        print(f"❌ {nombre}: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        salida.write(json.dumps({"archivo": nombre, **datos}, ensure_ascii=False) + "\n")
+    else:
+        if cantidad > 1:
+            salida.write(f"==> {nombre} <==\n")
+        salida.write(texto.rstrip("\n") + "\n")
+    return 0
+
+
+def _texto_importacion(resultado: Dict[str, Any]) -> str:
+    lineas = [
+        f"Filas leídas: {resultado['leidos']}",
+        f"Insertados:   {resultado['insertados']}",
+        f"Reemplazados: {resultado['reemplazados']}",
+        f"Rechazados:   {resultado['rechazados']}",
+    ]
+    lineas.extend(f"Línea {linea}: {motivo}" for linea, motivo in resultado["errores"])
+    return "\n".join(lineas)
+
+
+def datos_comando(
+    args: argparse.Namespace,
+    gestor: GestorConjuntos,
+    conteo: AnalizadorConteo,
+    logica: SistemaLogico,
+) -> Dict[str, Any]:
+    """Resultado de report, query o top como diccionario serializable"""
+    if args.comando == "query":
+        nombres = consultas.consultar(gestor, args.expresion)
+        return {"consulta": args.expresion, "cantidad": len(nombres), "artefactos": sorted(nombres)}
+    if args.comando == "top":
+        return {
+            "top": [
+                {"nombre": nombre, "consumo_kwh": consumo}
+                for nombre, consumo in conteo.ranking(0, max(args.cantidad, 0))
+            ]
+        }
+
+    datos: Dict[str, Any] = {}
+    if args.tipo in ("stats", "full"):
+        datos["estadisticas"] = conteo.resumen_estadistico()
+    if args.tipo in ("logic", "full"):
+        datos["logica"] = logica.resumen_logico()
+    if args.tipo == "full":
+        motor = MotorPerfiles.de(gestor)
+        if motor.artefactos_con_perfil():
+            datos["demanda"] = {
+                "pico": motor.pico(),
+                "picos_por_ubicacion": motor.picos_por_ubicacion(),
+            }
+        agenda = MotorAgenda.de(gestor)
+        if agenda.artefactos_con_horarios():
+            datos["horarios"] = {
+                "maximo_concurrente": agenda.maximo_concurrente(),
+                "carga_maxima": agenda.carga_maxima(),
+            }
+    return datos
+
+
+def texto_comando(
+    args: argparse.Namespace,
+    gestor: GestorConjuntos,
+    conteo: AnalizadorConteo,
+    logica: SistemaLogico,
+) -> str:
+    """Resultado de report, query o top como texto"""
+    if args.comando == "query":
+        # Un nombre por línea, fácil de procesar con otras herramientas
+        return "\n".join(sorted(consultas.consultar(gestor, args.expresion)))
+    if args.comando == "top":
+        return "\n".join(
+            f"{posicion}. {nombre.title()}: {consumo:.2f} kWh"
+            for posicion, (nombre, consumo) in enumerate(
+                conteo.ranking(0, max(args.cantidad, 0)), 1
+            )
+        )
+    if args.tipo == "stats":
+        return conteo.generar_reporte_estadistico()
+    if args.tipo == "logic":
+        return logica.generar_reporte_logico()
+    return reporte_completo(gestor, conteo, logica)
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -3,6 +3,6 @@ Módulo models
 Contiene los modelos de dominio del sistema
 """
 
-from .artefacto import Artefacto
+from .artefacto import Artefacto, validar_datos
 
-__all__ = ["Artefacto"]
+__all__ = ["Artefacto", "validar_datos"]
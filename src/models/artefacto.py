@@ -3,7 +3,153 @@ Módulo: artefacto.py
 Representa un artefacto eléctrico del hogar con sus características
 """
 
-from typing import Literal
+import re
+from typing import Literal, Optional, Tuple
+
+import numpy as np
+
+# Límites de potencia (W) que definen los niveles de consumo
+UMBRAL_ALTO_W = 1000  # ALTO: más de 1000 W
+UMBRAL_MEDIO_W = 200  # MEDIO: desde 200 W hasta 1000 W
+
+# Resoluciones admitidas para el perfil de uso: por hora o por cuarto de hora
+RANURAS_PERFIL = (24, 96)
+
+MINUTOS_DIA = 24 * 60
+
+# Intervalo "HH:MM-HH:MM" (se aceptan también "a" y "–" como separador)
+_INTERVALO = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*(?:-|–|a)\s*(\d{1,2}):(\d{2})\s*$")
+
+
+def validar_datos(
+    nombre: str, watts: float, horas_dia: float, ubicacion: str, tipo: str
+) -> Optional[str]:
+    """
+    Verifica los datos de un artefacto con las mismas reglas del menú de carga
+
+    Returns:
+        str or None: Mensaje de error, o None si los datos son válidos
+    """
+    if not nombre or not nombre.strip():
+        return "El nombre no puede estar vacío"
+    if watts <= 0:
+        return "La potencia debe ser mayor a 0"
+    if horas_dia < 0 or horas_dia > 24:
+        return "Las horas deben estar entre 0 y 24"
+    if not ubicacion or not ubicacion.strip():
+        return "La ubicación no puede estar vacía"
+    if not tipo or not tipo.strip():
+        return "El tipo no puede estar vacío"
+    return None
+
+
+def normalizar_perfil(perfil) -> Optional[np.ndarray]:
+    """
+    Valida un perfil de uso diario y lo devuelve como arreglo de solo lectura
+
+    Args:
+        perfil: Secuencia de 24 (horas) o 96 (cuartos de hora) valores entre
+            0 y 1: la fracción de cada intervalo en que el artefacto está
+            encendido. None indica que no hay perfil.
+
+    Returns:
+        np.ndarray or None: Perfil como float64
+
+    Raises:
+        ValueError: Si la cantidad de valores o algún valor no es válido
+    """
+    if perfil is None:
+        return None
+    try:
+        arreglo = np.array(perfil, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError("El perfil de uso debe tener valores numéricos") from None
+    if arreglo.ndim != 1 or len(arreglo) not in RANURAS_PERFIL:
+        raise ValueError("El perfil de uso debe tener 24 o 96 valores")
+    if not np.all((arreglo >= 0) & (arreglo <= 1)):
+        raise ValueError("Los valores del perfil de uso deben estar entre 0 y 1")
+    arreglo.flags.writeable = False
+    return arreglo
+
+
+def _minuto(hora: str, minuto: str) -> int:
+    """Minuto del día de una hora "HH:MM" (se admite 24:00 como fin del día)"""
+    h, m = int(hora), int(minuto)
+    if m >= 60 or h > 24 or (h == 24 and m):
+        raise ValueError("Las horas del horario deben estar entre 00:00 y 24:00")
+    return h * 60 + m
+
+
+def normalizar_horarios(horarios) -> Optional[Tuple[Tuple[int, int], ...]]:
+    """
+    Valida los horarios de encendido y los devuelve como intervalos en minutos
+
+    Args:
+        horarios: Texto con intervalos "HH:MM-HH:MM" separados por coma, punto
+            y coma o "|", o una secuencia de esos textos o de pares (inicio,
+            fin) en minutos del día. Un intervalo que pasa la medianoche
+            ("23:00-01:00") se parte en dos. None o vacío indica que no hay
+            horarios.
+
+    Returns:
+        tuple or None: Intervalos (inicio, fin) semiabiertos, en minutos,
+        ordenados y sin superposiciones (los que se tocan se unen)
+
+    Raises:
+        ValueError: Si algún intervalo no es válido
+    """
+    if horarios is None:
+        return None
+    if isinstance(horarios, str):
+        horarios = re.split(r"[,;|]", horarios)
+    try:
+        horarios = iter(horarios)
+    except TypeError:
+        raise ValueError("Los horarios deben ser texto o una lista de intervalos") from None
+    intervalos = []
+    for intervalo in horarios:
+        if isinstance(intervalo, str):
+            if not intervalo.strip():
+                continue
+            coincidencia = _INTERVALO.match(intervalo)
+            if coincidencia is None:
+                raise ValueError(f"Horario inválido: '{intervalo.strip()}' (use HH:MM-HH:MM)")
+            inicio = _minuto(*coincidencia.group(1, 2))
+            fin = _minuto(*coincidencia.group(3, 4))
+        else:
+            try:
+                inicio, fin = (int(valor) for valor in intervalo)
+            except (TypeError, ValueError):
+                raise ValueError("Cada horario debe ser un par (inicio, fin)") from None
+            if not (0 <= inicio <= MINUTOS_DIA and 0 <= fin <= MINUTOS_DIA):
+                raise ValueError("Las horas del horario deben estar entre 00:00 y 24:00")
+        if inicio == fin:
+            raise ValueError("Un horario no puede empezar y terminar a la misma hora")
+        if inicio < fin:
+            intervalos.append((inicio, fin))
+        else:
+            # Pasa la medianoche: hasta el fin del día y desde el comienzo
+            intervalos.append((inicio, MINUTOS_DIA))
+            if fin:
+                intervalos.append((0, fin))
+
+    unidos = []
+    for inicio, fin in sorted(intervalos):
+        if unidos and inicio <= unidos[-1][1]:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return tuple(unidos) or None
+
+
+def formatear_horarios(horarios: Optional[Tuple[Tuple[int, int], ...]]) -> str:
+    """Horarios como texto "HH:MM-HH:MM, ..." (vacío si no hay)"""
+    if not horarios:
+        return ""
+    return ", ".join(
+        f"{inicio // 60:02d}:{inicio % 60:02d}-{fin // 60:02d}:{fin % 60:02d}"
+        for inicio, fin in horarios
+    )
 
 
 class Artefacto:
@@ -16,29 +162,102 @@ class Artefacto:
         horas_dia (float): Horas de uso diario
         ubicacion (str): Ubicación en el hogar
         tipo (str): Tipo de artefacto
+        perfil_uso (np.ndarray, opcional): Fracción de uso en cada hora (24
+            valores) o cuarto de hora (96) del día; indica cuándo se usa.
+            El consumo se sigue calculando con horas_dia.
+        horarios (tuple, opcional): Intervalos (inicio, fin) de encendido, en
+            minutos del día; por ejemplo, 19:00-20:30 es (1140, 1230)
+
+    El consumo mensual y el nivel se calculan una sola vez y se guardan;
+    asignar watts u horas_dia los invalida.
     """
 
+    __slots__ = (
+        "nombre",
+        "ubicacion",
+        "tipo",
+        "_watts",
+        "_horas_dia",
+        "_consumo_mensual",
+        "_nivel",
+        "_perfil_uso",
+        "_horarios",
+    )
+
     def __init__(
         self,
         nombre: str,
         watts: float,
         horas_dia: float,
         ubicacion: str,
-        tipo: str
+        tipo: str,
+        perfil_uso=None,
+        horarios=None,
     ) -> None:
         self.nombre = nombre
-        self.watts = watts
-        self.horas_dia = horas_dia
+        self._watts = watts
+        self._horas_dia = horas_dia
         self.ubicacion = ubicacion
         self.tipo = tipo
+        self._consumo_mensual: Optional[float] = None
+        self._nivel: Optional[str] = None
+        self._perfil_uso: Optional[np.ndarray] = (
+            None if perfil_uso is None else normalizar_perfil(perfil_uso)
+        )
+        self._horarios: Optional[Tuple[Tuple[int, int], ...]] = (
+            None if horarios is None else normalizar_horarios(horarios)
+        )
+
+    @property
+    def watts(self) -> float:
+        """Potencia en watts"""
+        return self._watts
+
+    @watts.setter
+    def watts(self, valor: float) -> None:
+        self._watts = valor
+        self._consumo_mensual = self._nivel = None
+
+    @property
+    def horas_dia(self) -> float:
+        """Horas de uso diario"""
+        return self._horas_dia
+
+    @horas_dia.setter
+    def horas_dia(self, valor: float) -> None:
+        self._horas_dia = valor
+        self._consumo_mensual = None
+
+    @property
+    def perfil_uso(self) -> Optional[np.ndarray]:
+        """Perfil de uso diario (24 o 96 valores entre 0 y 1), o None"""
+        return self._perfil_uso
+
+    @perfil_uso.setter
+    def perfil_uso(self, valor) -> None:
+        self._perfil_uso = normalizar_perfil(valor)
+
+    @property
+    def horarios(self) -> Optional[Tuple[Tuple[int, int], ...]]:
+        """Intervalos (inicio, fin) de encendido en minutos del día, o None"""
+        return self._horarios
+
+    @horarios.setter
+    def horarios(self, valor) -> None:
+        self._horarios = normalizar_horarios(valor)
 
     def consumo_diario(self) -> float:
         """Calcula el consumo diario en Wh (watt-hora)"""
-        return self.watts * self.horas_dia
+        return self._watts * self._horas_dia
 
     def consumo_mensual(self) -> float:
         """Calcula el consumo mensual en kWh (kilowatt-hora)"""
-        return (self.consumo_diario() * 30) / 1000
+        consumo = self._consumo_mensual
+        if consumo is None:
+            consumo = self._consumo_mensual = (
+                self._watts * self._horas_dia * 30
+            ) / 1000
+        return consumo
 
     def nivel_consumo(self) -> Literal['ALTO', 'MEDIO', 'BAJO']:
         """
@@ -47,12 +266,16 @@ class Artefacto:
         Returns:
             Literal['ALTO', 'MEDIO', 'BAJO']: Nivel de consumo del artefacto
         """
-        if self.watts > 1000:
-            return "ALTO"
-        elif self.watts >= 200:
-            return "MEDIO"
-        else:
-            return "BAJO"
+        nivel = self._nivel
+        if nivel is None:
+            if self._watts > UMBRAL_ALTO_W:
+                nivel = "ALTO"
+            elif self._watts >= UMBRAL_MEDIO_W:
+                nivel = "MEDIO"
+            else:
+                nivel = "BAJO"
+            self._nivel = nivel
+        return nivel
 
     def __str__(self) -> str:
         return f"{self.nombre} ({self.watts}W) - {self.ubicacion}"
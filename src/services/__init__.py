@@ -6,5 +6,14 @@ Contiene la lógica de negocio del sistema
 from .conjuntos import GestorConjuntos
 from .conteo import AnalizadorConteo
 from .logica import SistemaLogico
+from .columnar import AlmacenColumnar
+from .bitmaps import ConjuntoBits, IndiceBits
 
-__all__ = ["GestorConjuntos", "AnalizadorConteo", "SistemaLogico"]
+__all__ = [
+    "GestorConjuntos",
+    "AnalizadorConteo",
+    "SistemaLogico",
+    "AlmacenColumnar",
+    "ConjuntoBits",
+    "IndiceBits",
+]
@@ -0,0 +1,313 @@
+"""
+Módulo: agenda.py
+Superposición de horarios de encendido con un algoritmo de barrido
+
+Cada artefacto puede traer sus horarios (Artefacto.horarios): intervalos
+de encendido como 19:00-20:30. Para saber cuántos artefactos coinciden no
+hace falta comparar todos los pares: se ordenan los k inicios y fines de
+intervalo y se recorren una sola vez (barrido), llevando los encendidos en
+cada momento. El orden cuesta O(k log k) y el recorrido O(k), más O(1)
+por cada par superpuesto que se informe.
+
+Los intervalos son semiabiertos: un artefacto que se apaga a las 20:00 no
+coincide con otro que se enciende a las 20:00 (en el barrido, a igual
+minuto los fines van antes que los inicios).
+
+Para la simultaneidad, los datos de cada artefacto se usan en este orden:
+sus horarios, su perfil de uso (los cuartos de hora en que está encendido)
+o, si no tiene ninguno, el día completo.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.artefacto import MINUTOS_DIA, Artefacto
+from services.conjuntos import GestorConjuntos
+
+Intervalos = Tuple[Tuple[int, int], ...]  # (inicio, fin) en minutos del día
+# Un artefacto en el barrido: (nombre, watts, intervalos)
+Programado = Tuple[str, float, Intervalos]
+
+DIA_COMPLETO: Intervalos = ((0, MINUTOS_DIA),)
+
+
+def hora(minuto: int) -> str:
+    """Minuto del día como "HH:MM" """
+    return f"{minuto // 60:02d}:{minuto % 60:02d}"
+
+
+def intervalos_de_perfil(perfil: np.ndarray) -> Intervalos:
+    """
+    Intervalos en que un perfil de uso está encendido (valor mayor a 0)
+
+    Args:
+        perfil (np.ndarray): Perfil de 24 o 96 valores
+
+    Returns:
+        tuple: Intervalos (inicio, fin) en minutos, con las ranuras
+        consecutivas unidas
+    """
+    encendido = np.concatenate(([False], np.asarray(perfil) > 0, [False]))
+    cambios = np.flatnonzero(encendido[1:] != encendido[:-1])
+    minutos = MINUTOS_DIA // len(perfil)
+    return tuple(
+        (int(inicio) * minutos, int(fin) * minutos)
+        for inicio, fin in zip(cambios[::2], cambios[1::2])
+    )
+
+
+def intervalos_de(artefacto: Artefacto) -> Intervalos:
+    """Intervalos de encendido: horarios, perfil de uso o el día completo"""
+    if artefacto.horarios is not None:
+        return artefacto.horarios
+    if artefacto.perfil_uso is not None:
+        return intervalos_de_perfil(artefacto.perfil_uso)
+    return DIA_COMPLETO
+
+
+def ocupacion_en_ranuras(horarios: Intervalos, ranuras: int = 96) -> np.ndarray:
+    """
+    Fracción de cada ranura del día cubierta por los horarios
+
+    Args:
+        horarios (tuple): Intervalos (inicio, fin) en minutos
+        ranuras (int): Ranuras por día (96: cuartos de hora)
+
+    Returns:
+        np.ndarray: Un valor entre 0 y 1 por ranura (un perfil de uso)
+    """
+    minutos = np.zeros(MINUTOS_DIA)
+    for inicio, fin in horarios:
+        minutos[inicio:fin] = 1
+    return minutos.reshape(ranuras, -1).mean(axis=1)
+
+
+# ==================== BARRIDO ====================
+
+
+def maximo_concurrente(intervalos: Iterable[Intervalos]) -> int:
+    """
+    Máximo de artefactos encendidos a la vez
+
+    Args:
+        intervalos (iterable): Intervalos de cada artefacto (sin
+            superposiciones dentro de un mismo artefacto)
+
+    Returns:
+        int: Mayor cantidad de intervalos abiertos en un mismo momento
+    """
+    eventos = []
+    for intervalos_artefacto in intervalos:
+        for inicio, fin in intervalos_artefacto:
+            eventos.append((inicio, 1))
+            eventos.append((fin, -1))
+    # A igual minuto, -1 queda antes que 1: primero se apagan
+    eventos.sort()
+    encendidos = maximo = 0
+    for _, cambio in eventos:
+        encendidos += cambio
+        if encendidos > maximo:
+            maximo = encendidos
+    return maximo
+
+
+def barrer(programados: Sequence[Programado]) -> Dict[str, Any]:
+    """
+    Recorre los horarios una vez y calcula la concurrencia y los pares
+
+    Args:
+        programados (sequence): (nombre, watts, intervalos) de cada artefacto
+
+    Returns:
+        dict: maximo (artefactos a la vez) y su minuto de inicio,
+        carga_maxima (W a la vez) y su minuto de inicio, y pares: lista de
+        (nombre_a, nombre_b, inicio, fin) con cada tramo en que dos
+        artefactos están encendidos a la vez
+    """
+    # (minuto, 0 = fin / 1 = inicio, artefacto, fin del intervalo)
+    eventos = [
+        (inicio, 1, indice, fin)
+        for indice, (_, _, intervalos) in enumerate(programados)
+        for inicio, fin in intervalos
+    ]
+    eventos += [(fin, 0, indice, fin) for _, _, indice, fin in eventos]
+    eventos.sort()
+
+    activos: Dict[int, int] = {}  # artefacto -> fin de su intervalo abierto
+    watts = 0.0
+    resultado: Dict[str, Any] = {
+        "maximo": 0,
+        "minuto_maximo": None,
+        "carga_maxima": 0.0,
+        "minuto_carga_maxima": None,
+        "pares": [],
+    }
+    pares: List[Tuple[str, str, int, int]] = resultado["pares"]
+    for minuto, es_inicio, indice, fin in eventos:
+        nombre, potencia, _ = programados[indice]
+        if not es_inicio:
+            del activos[indice]
+            watts -= potencia
+            continue
+
+        for otro, fin_otro in activos.items():
+            pares.append((programados[otro][0], nombre, minuto, min(fin, fin_otro)))
+        activos[indice] = fin
+        watts += potencia
+        if len(activos) > resultado["maximo"]:
+            resultado["maximo"] = len(activos)
+            resultado["minuto_maximo"] = minuto
+        if watts > resultado["carga_maxima"]:
+            resultado["carga_maxima"] = watts
+            resultado["minuto_carga_maxima"] = minuto
+    return resultado
+
+
+# ==================== MOTOR ====================
+
+
+class MotorAgenda:
+    """
+    Concurrencia de los artefactos con horarios de un gestor, por ubicación
+
+    El barrido de cada ubicación se calcula una vez por versión del
+    inventario (igual que MotorPerfiles); solo intervienen los artefactos
+    que tienen horarios.
+    """
+
+    def __init__(self, gestor: GestorConjuntos) -> None:
+        self.gestor = gestor
+        self._version: int = -1
+        # {ubicacion: resultado de barrer()} de todos los programados
+        self._barridos: Dict[str, Dict[str, Any]] = {}
+        # {ubicacion: pares superpuestos de alto consumo}
+        self._pares_criticos: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        self._con_horarios: int = 0
+
+    @classmethod
+    def de(cls, gestor: GestorConjuntos) -> "MotorAgenda":
+        """Devuelve el motor compartido de un gestor (lo crea si falta)"""
+        motor = gestor._motor_agenda
+        if motor is None:
+            motor = cls(gestor)
+            gestor._motor_agenda = motor
+        return motor
+
+    def _actualizar(self) -> None:
+        """Vuelve a barrer los horarios si el inventario cambió"""
+        if self._version == self.gestor.version:
+            return
+
+        programados: Dict[str, List[Programado]] = {}
+        criticos: Dict[str, List[Programado]] = {}
+        for artefacto in self.gestor.iterar_artefactos():
+            if artefacto.horarios is None:
+                continue
+            ubicacion = self.gestor.etiqueta_ubicacion(artefacto.ubicacion)
+            programado = (artefacto.nombre, artefacto.watts, artefacto.horarios)
+            programados.setdefault(ubicacion, []).append(programado)
+            if artefacto.nivel_consumo() == "ALTO":
+                criticos.setdefault(ubicacion, []).append(programado)
+
+        self._barridos = {
+            ubicacion: barrer(lista) for ubicacion, lista in programados.items()
+        }
+        self._pares_criticos = {
+            ubicacion: barrer(lista)["pares"] for ubicacion, lista in criticos.items()
+        }
+        self._con_horarios = sum(len(lista) for lista in programados.values())
+        self._version = self.gestor.version
+
+    def artefactos_con_horarios(self) -> int:
+        """Cantidad de artefactos que tienen horarios"""
+        self._actualizar()
+        return self._con_horarios
+
+    def maximo_concurrente(self) -> Dict[str, Tuple[int, Optional[str]]]:
+        """
+        Máximo de artefactos con horarios encendidos a la vez, por ubicación
+
+        Returns:
+            dict: {ubicacion: (cantidad, hora "HH:MM" en que se alcanza)}
+        """
+        self._actualizar()
+        return {
+            ubicacion: (barrido["maximo"], hora(barrido["minuto_maximo"]))
+            for ubicacion, barrido in self._barridos.items()
+        }
+
+    def carga_maxima(self) -> Dict[str, Tuple[float, str]]:
+        """
+        Mayor potencia encendida a la vez, por ubicación
+
+        Returns:
+            dict: {ubicacion: (watts, hora "HH:MM" en que empieza)}
+        """
+        self._actualizar()
+        return {
+            ubicacion: (barrido["carga_maxima"], hora(barrido["minuto_carga_maxima"]))
+            for ubicacion, barrido in self._barridos.items()
+        }
+
+    def pares_criticos(self, ubicacion: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+        """
+        Pares de artefactos de alto consumo con horarios superpuestos
+
+        Args:
+            ubicacion (str, opcional): Solo los de esta ubicación
+
+        Returns:
+            list: (artefacto_a, artefacto_b, "HH:MM" inicio, "HH:MM" fin) de
+            cada tramo superpuesto
+        """
+        self._actualizar()
+        if ubicacion is None:
+            listas = self._pares_criticos.values()
+        else:
+            listas = [self._pares_criticos.get(ubicacion, [])]
+        return [
+            (a, b, hora(inicio), hora(fin))
+            for pares in listas
+            for a, b, inicio, fin in pares
+        ]
+
+    def generar_reporte_horarios(self) -> str:
+        """
+        Genera el reporte de concurrencia de los horarios de encendido
+
+        Returns:
+            str: Reporte formateado
+        """
+        self._actualizar()
+        reporte = "\n" + "=" * 60 + "\n"
+        reporte += "   HORARIOS DE ENCENDIDO - CONCURRENCIA\n"
+        reporte += "=" * 60 + "\n\n"
+
+        total = self.gestor.total_artefactos()
+        reporte += f"🗓️  Artefactos con horarios: {self._con_horarios} de {total}\n\n"
+
+        reporte += "⚡ CARGA MÁXIMA A LA VEZ POR UBICACIÓN\n"
+        maximos = self.maximo_concurrente()
+        for ubicacion, (watts, inicio) in sorted(
+            self.carga_maxima().items(), key=lambda x: x[1][0], reverse=True
+        ):
+            cantidad = maximos[ubicacion][0]
+            reporte += (
+                f"   {ubicacion}: {watts:.0f} W desde las {inicio} "
+                f"(hasta {cantidad} artefacto(s) a la vez)\n"
+            )
+        reporte += "\n"
+
+        reporte += "🔥 ALTO CONSUMO SUPERPUESTO\n"
+        hay_pares = False
+        for ubicacion in sorted(self._pares_criticos):
+            for a, b, inicio, fin in self.pares_criticos(ubicacion):
+                reporte += f"   {ubicacion}: {a} y {b} de {inicio} a {fin}\n"
+                hay_pares = True
+        if not hay_pares:
+            reporte += "   Ninguno\n"
+
+        reporte += "\n" + "=" * 60 + "\n"
+        return reporte
+
@@ -0,0 +1,619 @@
+"""
+Módulo: almacen_sqlite.py
+Gestor de artefactos persistente sobre un archivo SQLite
+
+GestorSQLite ofrece la misma interfaz pública que GestorConjuntos, pero
+guarda los artefactos en una base SQLite local en lugar de en memoria:
+
+- El inventario sobrevive entre sesiones: abrir el archivo no recorre ni
+  carga los artefactos.
+- Los subconjuntos por ubicación, tipo y nivel se resuelven con índices de
+  SQLite (ubicación, tipo y watts), sin tener el inventario en memoria.
+- Los agregados (cantidades y consumo por grupo y total) se mantienen con
+  triggers en la tabla resumen, así que leerlos no recorre el inventario.
+- El ranking por consumo se lee en orden de un índice, con LIMIT/OFFSET.
+- Las expresiones de conjuntos (services.expresiones) se traducen a una
+  sola condición WHERE: resultados y cardinalidades salen de una consulta,
+  sin armar conjuntos intermedios en Python.
+
+Los agregados y el ranking leídos se guardan en memoria hasta la próxima
+modificación (igual que version en GestorConjuntos); los subconjuntos, que
+pueden ser grandes, se consultan cada vez. Se asume un único proceso
+escritor por archivo.
+"""
+
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from models.artefacto import (
+    UMBRAL_ALTO_W,
+    UMBRAL_MEDIO_W,
+    Artefacto,
+    formatear_horarios,
+)
+from services.conjuntos import (
+    NIVELES_CONSUMO,
+    TAMANO_LOTE,
+    filtrar_validos,
+    imprimir_conjunto,
+    normalizar_cambios,
+    normalizar_clave,
+    validar_cambios,
+)
+from services.expresiones import (
+    Diferencia,
+    Expresion,
+    Indice,
+    Interseccion,
+    Union as UnionExpresion,
+    Universo,
+    Vacio,
+    planificar,
+)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS artefactos (
+    nombre TEXT PRIMARY KEY,           -- nombre normalizado
+    nombre_original TEXT NOT NULL,
+    watts REAL NOT NULL,
+    horas_dia REAL NOT NULL,
+    ubicacion TEXT NOT NULL,
+    ubicacion_clave TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    tipo_clave TEXT NOT NULL,
+    nivel TEXT NOT NULL,
+    consumo_kwh REAL NOT NULL,
+    perfil_uso BLOB,                   -- float64 little-endian, o NULL
+    horarios TEXT                      -- "HH:MM-HH:MM, ...", o NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artefactos_ubicacion ON artefactos (ubicacion_clave);
+CREATE INDEX IF NOT EXISTS idx_artefactos_tipo ON artefactos (tipo_clave);
+CREATE INDEX IF NOT EXISTS idx_artefactos_watts ON artefactos (watts);
+CREATE INDEX IF NOT EXISTS idx_artefactos_consumo
+    ON artefactos (consumo_kwh DESC, nombre);
+
+-- Agregados acumulados: una fila por grupo con artefactos, más el total.
+-- La etiqueta es la primera forma en que se ingresó la ubicación o el tipo.
+CREATE TABLE IF NOT EXISTS resumen (
+    dimension TEXT NOT NULL,           -- 'total', 'ubicacion', 'tipo' o 'nivel'
+    clave TEXT NOT NULL,
+    etiqueta TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    consumo_kwh REAL NOT NULL,
+    PRIMARY KEY (dimension, clave)
+);
+
+CREATE TRIGGER IF NOT EXISTS resumen_alta AFTER INSERT ON artefactos BEGIN
+    INSERT INTO resumen VALUES
+        ('total', '', '', 1, NEW.consumo_kwh),
+        ('ubicacion', NEW.ubicacion_clave, NEW.ubicacion, 1, NEW.consumo_kwh),
+        ('tipo', NEW.tipo_clave, NEW.tipo, 1, NEW.consumo_kwh),
+        ('nivel', NEW.nivel, NEW.nivel, 1, NEW.consumo_kwh)
+    ON CONFLICT (dimension, clave) DO UPDATE SET
+        cantidad = cantidad + 1,
+        consumo_kwh = consumo_kwh + excluded.consumo_kwh;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_baja AFTER DELETE ON artefactos BEGIN
+    UPDATE resumen SET
+        cantidad = cantidad - 1,
+        consumo_kwh = consumo_kwh - OLD.consumo_kwh
+    WHERE (dimension = 'total' AND clave = '')
+        OR (dimension = 'ubicacion' AND clave = OLD.ubicacion_clave)
+        OR (dimension = 'tipo' AND clave = OLD.tipo_clave)
+        OR (dimension = 'nivel' AND clave = OLD.nivel);
+    DELETE FROM resumen WHERE cantidad = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS resumen_cambio AFTER UPDATE ON artefactos BEGIN
+    UPDATE resumen SET
+        cantidad = cantidad - 1,
+        consumo_kwh = consumo_kwh - OLD.consumo_kwh
+    WHERE (dimension = 'total' AND clave = '')
+        OR (dimension = 'ubicacion' AND clave = OLD.ubicacion_clave)
+        OR (dimension = 'tipo' AND clave = OLD.tipo_clave)
+        OR (dimension = 'nivel' AND clave = OLD.nivel);
+    DELETE FROM resumen WHERE cantidad = 0;
+    INSERT INTO resumen VALUES
+        ('total', '', '', 1, NEW.consumo_kwh),
+        ('ubicacion', NEW.ubicacion_clave, NEW.ubicacion, 1, NEW.consumo_kwh),
+        ('tipo', NEW.tipo_clave, NEW.tipo, 1, NEW.consumo_kwh),
+        ('nivel', NEW.nivel, NEW.nivel, 1, NEW.consumo_kwh)
+    ON CONFLICT (dimension, clave) DO UPDATE SET
+        cantidad = cantidad + 1,
+        consumo_kwh = consumo_kwh + excluded.consumo_kwh;
+END;
+"""
+
+_INSERTAR = """
+INSERT INTO artefactos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (nombre) DO UPDATE SET
+    nombre_original = excluded.nombre_original,
+    watts = excluded.watts,
+    horas_dia = excluded.horas_dia,
+    ubicacion = excluded.ubicacion,
+    ubicacion_clave = excluded.ubicacion_clave,
+    tipo = excluded.tipo,
+    tipo_clave = excluded.tipo_clave,
+    nivel = excluded.nivel,
+    consumo_kwh = excluded.consumo_kwh,
+    perfil_uso = excluded.perfil_uso,
+    horarios = excluded.horarios
+"""
+
+_COLUMNAS = "nombre_original, watts, horas_dia, ubicacion, tipo, perfil_uso, horarios"
+
+# Condición sobre watts de cada nivel (aprovecha el índice de watts)
+_CONDICION_NIVEL = {
+    "ALTO": ("watts > ?", (UMBRAL_ALTO_W,)),
+    "MEDIO": ("watts >= ? AND watts <= ?", (UMBRAL_MEDIO_W, UMBRAL_ALTO_W)),
+    "BAJO": ("watts < ?", (UMBRAL_MEDIO_W,)),
+}
+
+
+def _fila(artefacto: Artefacto) -> Tuple:
+    """Valores de la tabla artefactos para un artefacto"""
+    return (
+        artefacto.nombre.lower().strip(),
+        artefacto.nombre,
+        artefacto.watts,
+        artefacto.horas_dia,
+        artefacto.ubicacion,
+        normalizar_clave(artefacto.ubicacion),
+        artefacto.tipo,
+        normalizar_clave(artefacto.tipo),
+        artefacto.nivel_consumo(),
+        artefacto.consumo_mensual(),
+        None if artefacto.perfil_uso is None else artefacto.perfil_uso.astype("<f8").tobytes(),
+        formatear_horarios(artefacto.horarios) or None,
+    )
+
+
+def _condicion_indice(dimension: str, valor: str) -> Tuple[str, Tuple]:
+    """Condición WHERE de un subconjunto de índice"""
+    if dimension == "nivel":
+        return _CONDICION_NIVEL.get(valor.upper(), ("0", ()))
+    if dimension in ("ubicacion", "tipo"):
+        return f"{dimension}_clave = ?", (normalizar_clave(valor),)
+    raise ValueError(f"Dimensión desconocida: {dimension}")
+
+
+def _condicion(plan: Expresion) -> Tuple[str, Tuple]:
+    """
+    Traduce un plan de services.expresiones a una condición WHERE
+
+    Cada operación es una condición sobre la fila: ∪ es OR, ∩ es AND,
+    A - B es A AND NOT B y el complemento es NOT.
+
+    Returns:
+        tuple: (condición SQL, parámetros)
+    """
+    if isinstance(plan, Indice):
+        return _condicion_indice(plan.dimension, plan.valor)
+    if isinstance(plan, Universo):
+        return "1", ()
+    if isinstance(plan, Vacio):
+        return "0", ()
+    if isinstance(plan, (UnionExpresion, Interseccion)):
+        partes = [_condicion(hijo) for hijo in plan.hijos]
+        conector = " OR " if isinstance(plan, UnionExpresion) else " AND "
+        sql = conector.join(f"({condicion})" for condicion, _ in partes)
+        return sql, tuple(p for _, parametros in partes for p in parametros)
+    if isinstance(plan, Diferencia):
+        a, parametros_a = _condicion(plan.a)
+        b, parametros_b = _condicion(plan.b)
+        return f"({a}) AND NOT ({b})", parametros_a + parametros_b
+    a, parametros = _condicion(plan.a)  # Complemento
+    return f"NOT ({a})", parametros
+
+
+def _artefacto(fila: Tuple) -> Artefacto:
+    """Artefacto a partir de las columnas de _COLUMNAS"""
+    *datos, perfil, horarios = fila
+    if perfil is not None:
+        perfil = np.frombuffer(perfil, dtype="<f8")
+    return Artefacto(*datos, perfil_uso=perfil, horarios=horarios)
+
+
+class GestorSQLite:
+    """
+    Gestor de artefactos con almacenamiento en SQLite
+
+    Misma interfaz pública que GestorConjuntos, para usarlo con
+    AnalizadorConteo, SistemaLogico y el menú sin cambios.
+    """
+
+    def __init__(self, ruta: Union[str, Path] = ":memory:") -> None:
+        """
+        Abre (o crea) la base de datos
+
+        Args:
+            ruta (str): Archivo SQLite; ':memory:' para una base temporal
+        """
+        self.ruta = str(ruta)
+        self._conexion = sqlite3.connect(self.ruta)
+        self._conexion.execute("PRAGMA journal_mode = WAL")
+        self._conexion.execute("PRAGMA synchronous = NORMAL")
+        self._conexion.executescript(_ESQUEMA)
+        columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(artefactos)")}
+        if "perfil_uso" not in columnas:
+            # Bases creadas antes de que existieran los perfiles de uso
+            self._conexion.execute("ALTER TABLE artefactos ADD COLUMN perfil_uso BLOB")
+        if "horarios" not in columnas:
+            self._conexion.execute("ALTER TABLE artefactos ADD COLUMN horarios TEXT")
+        # Versión del inventario en esta sesión; invalida las lecturas guardadas
+        self.version: int = 0
+        self._cache: Dict[Tuple, Any] = {}
+        # Motor de curvas de carga compartido, creado por MotorPerfiles.de()
+        self._motor_perfiles = None
+        # Barrido de horarios compartido, creado por MotorAgenda.de()
+        self._motor_agenda = None
+
+    def cerrar(self) -> None:
+        """Cierra la conexión con la base de datos"""
+        self._conexion.close()
+
+    def __enter__(self) -> "GestorSQLite":
+        return self
+
+    def __exit__(self, *excepcion) -> None:
+        self.cerrar()
+
+    def _consultar(self, sql: str, parametros: Tuple = ()) -> List[Tuple]:
+        """Ejecuta una lectura, guardando el resultado hasta el próximo cambio"""
+        clave = (sql, parametros)
+        if clave not in self._cache:
+            self._cache[clave] = self._conexion.execute(sql, parametros).fetchall()
+        return self._cache[clave]
+
+    def _modificado(self) -> None:
+        self.version += 1
+        self._cache.clear()
+
+    # ==================== ALTAS, BAJAS Y CAMBIOS ====================
+
+    def agregar_artefacto(self, artefacto: Artefacto) -> None:
+        """
+        Agrega un artefacto; si ya existe uno con el mismo nombre, lo reemplaza
+
+        Args:
+            artefacto (Artefacto): Objeto artefacto a agregar
+        """
+        with self._conexion:
+            self._conexion.execute(_INSERTAR, _fila(artefacto))
+        self._modificado()
+        print(f"✓ Artefacto '{artefacto.nombre}' agregado al sistema")
+
+    def agregar_artefactos(
+        self, artefactos: Iterable[Artefacto], *, verbose: bool = False
+    ) -> Dict[str, int]:
+        """
+        Carga masiva de artefactos, un bloque por transacción
+
+        Args:
+            artefactos (Iterable[Artefacto]): Artefactos a agregar
+            verbose (bool): Si es True, informa cada artefacto procesado
+
+        Returns:
+            dict: {'insertados': n, 'reemplazados': n, 'rechazados': n}
+        """
+        resumen = {"insertados": 0, "reemplazados": 0, "rechazados": 0}
+        iterador = iter(artefactos)
+        while True:
+            bloque = list(islice(iterador, TAMANO_LOTE))
+            if not bloque:
+                break
+            validos = filtrar_validos(bloque, resumen, verbose)
+
+            antes = self.total_artefactos()
+            with self._conexion:
+                self._conexion.executemany(_INSERTAR, map(_fila, validos))
+            self._modificado()
+            insertados = self.total_artefactos() - antes
+            resumen["insertados"] += insertados
+            resumen["reemplazados"] += len(validos) - insertados
+            if verbose:
+                for artefacto in validos:
+                    print(f"✓ Artefacto '{artefacto.nombre}' agregado al sistema")
+        return resumen
+
+    def eliminar_artefacto(self, nombre: str) -> bool:
+        """
+        Quita un artefacto de la base
+
+        Returns:
+            bool: True si existía y se eliminó
+        """
+        with self._conexion:
+            cursor = self._conexion.execute(
+                "DELETE FROM artefactos WHERE nombre = ?", (nombre.lower().strip(),)
+            )
+        if cursor.rowcount == 0:
+            return False
+        self._modificado()
+        return True
+
+    def modificar_artefacto(self, nombre: str, **cambios) -> bool:
+        """
+        Modifica watts, horas_dia, ubicacion, tipo, perfil_uso u horarios de un artefacto
+
+        Returns:
+            bool: True si el artefacto existía y se modificó
+
+        Raises:
+            ValueError: Si el campo no se puede modificar o el dato no es válido
+        """
+        cambios = normalizar_cambios(cambios)
+        artefacto = self.obtener_artefacto(nombre)
+        if artefacto is None:
+            return False
+        validar_cambios(artefacto, cambios)
+
+        for campo, valor in cambios.items():
+            setattr(artefacto, campo, valor)
+        with self._conexion:
+            self._conexion.execute(_INSERTAR, _fila(artefacto))
+        self._modificado()
+        return True
+
+    # ==================== LECTURAS ====================
+
+    def obtener_artefacto(self, nombre: str) -> Optional[Artefacto]:
+        """
+        Obtiene el artefacto por nombre
+
+        Cada llamada crea un objeto nuevo: para cambiarlo en la base se usa
+        modificar_artefacto.
+        """
+        fila = self._conexion.execute(
+            f"SELECT {_COLUMNAS} FROM artefactos WHERE nombre = ?",
+            (nombre.lower().strip(),),
+        ).fetchone()
+        return _artefacto(fila) if fila else None
+
+    def iterar_artefactos(self) -> Iterator[Artefacto]:
+        """Recorre todos los artefactos leyéndolos de a bloques"""
+        cursor = self._conexion.execute(f"SELECT {_COLUMNAS} FROM artefactos")
+        while True:
+            filas = cursor.fetchmany(1000)
+            if not filas:
+                return
+            for fila in filas:
+                yield _artefacto(fila)
+
+    @property
+    def universo(self) -> Set[str]:
+        """
+        Conjunto universo U (se arma con todos los nombres de la base)
+
+        Solo para mostrarlo: las consultas, los conteos y el complemento se
+        resuelven en SQL sin leerlo.
+        """
+        return {nombre for (nombre,) in self._conexion.execute("SELECT nombre FROM artefactos")}
+
+    def vista_indice(self, dimension: str, valor: str) -> Set[str]:
+        """
+        Subconjunto de una dimensión, resuelto con el índice de SQLite
+
+        Args:
+            dimension (str): 'ubicacion', 'tipo' o 'nivel'
+            valor (str): Ubicación, tipo o nivel buscado
+
+        Returns:
+            set: Nombres de los artefactos
+        """
+        where, parametros = _condicion_indice(dimension, valor)
+        filas = self._conexion.execute(
+            f"SELECT nombre FROM artefactos WHERE {where}", parametros
+        )
+        return {nombre for (nombre,) in filas}
+
+    def obtener_por_ubicacion(self, ubicacion: str) -> Set[str]:
+        """Subconjunto de artefactos por ubicación"""
+        return self.vista_indice("ubicacion", ubicacion)
+
+    def obtener_por_tipo(self, tipo: str) -> Set[str]:
+        """Subconjunto de artefactos por tipo"""
+        return self.vista_indice("tipo", tipo)
+
+    def obtener_por_nivel_consumo(self, nivel: str) -> Set[str]:
+        """Subconjunto de artefactos por nivel de consumo ('ALTO', 'MEDIO' o 'BAJO')"""
+        return self.vista_indice("nivel", nivel)
+
+    def tamano_indice(self, dimension: str, valor: str) -> int:
+        """Cantidad de artefactos con ese valor, leída de la tabla resumen"""
+        if dimension not in ("ubicacion", "tipo", "nivel"):
+            raise ValueError(f"Dimensión desconocida: {dimension}")
+        clave = valor.upper() if dimension == "nivel" else normalizar_clave(valor)
+        return self._resumen(dimension).get(clave, ("", 0, 0.0))[1]
+
+    def consultar(self, expresion: Expresion) -> Set[str]:
+        """Evalúa una expresión de conjuntos perezosa (ver services.expresiones)"""
+        return self.evaluar_plan(planificar(expresion))
+
+    def evaluar_plan(self, plan: Expresion) -> Set[str]:
+        """Resultado de un plan ya planificado, con una sola consulta SQL"""
+        if isinstance(plan, Vacio):
+            return set()
+        where, parametros = _condicion(plan)
+        filas = self._conexion.execute(
+            f"SELECT nombre FROM artefactos WHERE {where}", parametros
+        )
+        return {nombre for (nombre,) in filas}
+
+    def contar_plan(self, plan: Expresion) -> int:
+        """
+        Cardinalidad de un plan: las hojas y U salen de la tabla resumen; el
+        resto, de un COUNT(*) guardado hasta el próximo cambio
+        """
+        if isinstance(plan, Indice):
+            return self.tamano_indice(plan.dimension, plan.valor)
+        if isinstance(plan, Universo):
+            return self.total_artefactos()
+        if isinstance(plan, Vacio):
+            return 0
+        where, parametros = _condicion(plan)
+        return self._consultar(f"SELECT COUNT(*) FROM artefactos WHERE {where}", parametros)[0][0]
+
+    # ==================== AGREGADOS ====================
+
+    def _resumen(self, dimension: str) -> Dict[str, Tuple[str, int, float]]:
+        """Filas de resumen de una dimensión: {clave: (etiqueta, cantidad, kWh)}"""
+        filas = self._consultar(
+            "SELECT clave, etiqueta, cantidad, consumo_kwh FROM resumen "
+            "WHERE dimension = ?",
+            (dimension,),
+        )
+        return {clave: (etiqueta, cantidad, kwh) for clave, etiqueta, cantidad, kwh in filas}
+
+    def total_artefactos(self) -> int:
+        """Cardinalidad del universo |U|"""
+        return self._resumen("total").get("", ("", 0, 0.0))[1]
+
+    def consumo_total_kwh(self) -> float:
+        """Consumo mensual total en kWh"""
+        return self._resumen("total").get("", ("", 0, 0.0))[2]
+
+    def consumo_por_ubicacion_kwh(self) -> Dict[str, float]:
+        """Consumo mensual por ubicación: {ubicacion: kWh}"""
+        return {e: consumo for e, _, consumo in self._resumen("ubicacion").values()}
+
+    def consumo_por_tipo_kwh(self) -> Dict[str, float]:
+        """Consumo mensual por tipo: {tipo: kWh}"""
+        return {e: consumo for e, _, consumo in self._resumen("tipo").values()}
+
+    def contar_por_ubicacion(self) -> Dict[str, int]:
+        """Cantidad de artefactos por ubicación: {ubicacion: cantidad}"""
+        return {e: cantidad for e, cantidad, _ in self._resumen("ubicacion").values()}
+
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Cantidad de artefactos por tipo: {tipo: cantidad}"""
+        return {e: cantidad for e, cantidad, _ in self._resumen("tipo").values()}
+
+    def contar_por_nivel(self) -> Dict[str, int]:
+        """Cantidad de artefactos por nivel: {nivel: cantidad}"""
+        resumen = self._resumen("nivel")
+        return {nivel: resumen.get(nivel, ("", 0, 0.0))[1] for nivel in NIVELES_CONSUMO}
+
+    def rango_ranking(self, inicio: int, fin: int) -> List[Tuple[str, float]]:
+        """
+        Posiciones [inicio, fin) del ranking de mayor a menor consumo
+
+        Se lee en orden del índice de consumo; a igual consumo, por nombre.
+
+        Returns:
+            list: Lista de tuplas (nombre, consumo_kWh)
+        """
+        inicio, fin = max(inicio, 0), max(fin, 0)
+        if fin <= inicio:
+            return []
+        return list(
+            self._consultar(
+                "SELECT nombre, consumo_kwh FROM artefactos "
+                "ORDER BY consumo_kwh DESC, nombre LIMIT ? OFFSET ?",
+                (fin - inicio, inicio),
+            )
+        )
+
+    def verificar_agregados(self) -> List[str]:
+        """
+        Compara la tabla resumen con un recálculo completo en SQL
+
+        Returns:
+            list: Diferencias encontradas (vacía si todo coincide)
+        """
+        diferencias = []
+        for dimension, columna in (
+            ("ubicacion", "ubicacion_clave"),
+            ("tipo", "tipo_clave"),
+            ("nivel", "nivel"),
+        ):
+            recalculado = {
+                clave: (cantidad, consumo)
+                for clave, cantidad, consumo in self._conexion.execute(
+                    f"SELECT {columna}, COUNT(*), SUM(consumo_kwh) "
+                    f"FROM artefactos GROUP BY {columna}"
+                )
+            }
+            guardado = {
+                clave: (cantidad, consumo)
+                for clave, (_, cantidad, consumo) in self._resumen(dimension).items()
+            }
+            if recalculado.keys() != guardado.keys():
+                diferencias.append(f"Grupos de {dimension} no coinciden")
+                continue
+            for clave, (cantidad, consumo) in recalculado.items():
+                cantidad_guardada, consumo_guardado = guardado[clave]
+                if cantidad_guardada != cantidad or abs(consumo_guardado - consumo) > 1e-6:
+                    diferencias.append(f"Resumen de {dimension} '{clave}' desactualizado")
+        return diferencias
+
+    # ==================== ETIQUETAS ====================
+
+    def obtener_todas_ubicaciones(self) -> Set[str]:
+        """Retorna conjunto de todas las ubicaciones únicas"""
+        return {etiqueta for etiqueta, _, _ in self._resumen("ubicacion").values()}
+
+    def obtener_todos_tipos(self) -> Set[str]:
+        """Retorna conjunto de todos los tipos únicos"""
+        return {etiqueta for etiqueta, _, _ in self._resumen("tipo").values()}
+
+    def etiqueta_ubicacion(self, ubicacion: str) -> str:
+        """Etiqueta con la que se registró una ubicación (sin distinguir mayúsculas)"""
+        fila = self._resumen("ubicacion").get(normalizar_clave(ubicacion))
+        return fila[0] if fila else ubicacion
+
+    def etiqueta_tipo(self, tipo: str) -> str:
+        """Etiqueta con la que se registró un tipo (sin distinguir mayúsculas)"""
+        fila = self._resumen("tipo").get(normalizar_clave(tipo))
+        return fila[0] if fila else tipo
+
+    # ==================== OPERACIONES DE CONJUNTOS ====================
+
+    def union(self, conjunto_a: Set[str], conjunto_b: Set[str]) -> Set[str]:
+        """Operación de Unión: A ∪ B"""
+        return conjunto_a | conjunto_b
+
+    def interseccion(self, conjunto_a: Set[str], conjunto_b: Set[str]) -> Set[str]:
+        """Operación de Intersección: A ∩ B"""
+        return conjunto_a & conjunto_b
+
+    def diferencia(self, conjunto_a: Set[str], conjunto_b: Set[str]) -> Set[str]:
+        """Operación de Diferencia: A - B"""
+        return conjunto_a - conjunto_b
+
+    def complemento(self, conjunto_a: Set[str]) -> Set[str]:
+        """
+        Complemento: U - A, resuelto en SQL sin leer el universo
+
+        Una expresión perezosa se traduce a WHERE NOT (condición); los
+        nombres de un conjunto común se cargan en una tabla temporal.
+        """
+        if isinstance(conjunto_a, Expresion):
+            return self.consultar(~conjunto_a)
+        with self._conexion:
+            self._conexion.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS excluidos (nombre TEXT PRIMARY KEY)"
+            )
+            self._conexion.execute("DELETE FROM excluidos")
+            self._conexion.executemany(
+                "INSERT OR IGNORE INTO excluidos VALUES (?)", ((n,) for n in conjunto_a)
+            )
+        filas = self._conexion.execute(
+            "SELECT nombre FROM artefactos WHERE NOT (nombre IN (SELECT nombre FROM excluidos))"
+        )
+        return {nombre for (nombre,) in filas}
+
+    def cardinalidad(self, conjunto: Set[str]) -> int:
+        """Cardinalidad: |A| (una expresión perezosa se cuenta sin materializarla)"""
+        if hasattr(conjunto, "cardinalidad"):
+            return conjunto.cardinalidad(self)
+        return len(conjunto)
+
+    def mostrar_conjunto(self, conjunto: Set[str], titulo: str = "Conjunto") -> None:
+        """Muestra un conjunto de forma legible"""
+        imprimir_conjunto(conjunto, titulo)
@@ -0,0 +1,248 @@
+"""
+Módulo: bitmaps.py
+Representación de subconjuntos de artefactos como mapas de bits
+
+Cada artefacto del gestor tiene un id entero denso (GestorConjuntos.ids).
+Un subconjunto se guarda como un entero de Python en el que el bit i vale 1
+si el artefacto con id i pertenece al subconjunto. Así, la unión, la
+intersección, la diferencia y el complemento son operaciones de bits sobre
+palabras de máquina, y la cardinalidad es un conteo de bits en 1. Los
+nombres solo se reconstruyen al mostrar el resultado.
+
+El gestor reusa los ids de los artefactos eliminados. Por eso cada mapa
+guarda la generación de ids (GestorConjuntos.generacion_ids) en que se
+armó, y usarlo después de una eliminación lanza ValueError en lugar de
+responder con los artefactos que heredaron esos ids.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+import numpy as np
+
+from services.conjuntos import GestorConjuntos, normalizar_clave
+
+
+def _contar_bits(bits: int) -> int:
+    """Cantidad de bits en 1 (int.bit_count existe desde Python 3.10)"""
+    try:
+        return bits.bit_count()
+    except AttributeError:
+        return bin(bits).count("1")
+
+
+def bits_desde_ids(ids: Iterable[int], tamano: int) -> int:
+    """
+    Construye un mapa de bits a partir de ids de artefactos
+
+    Args:
+        ids (iterable): Ids a marcar
+        tamano (int): Cantidad de ids posibles (longitud de nombres_por_id)
+
+    Returns:
+        int: Entero con el bit de cada id en 1
+    """
+    marcas = np.zeros(tamano, dtype=bool)
+    marcas[np.fromiter(ids, dtype=np.intp)] = True
+    return int.from_bytes(np.packbits(marcas, bitorder="little").tobytes(), "little")
+
+
+class ConjuntoBits:
+    """
+    Subconjunto de artefactos de un gestor guardado como mapa de bits
+
+    Admite los operadores | & - ~ (unión, intersección, diferencia y
+    complemento respecto del universo), len() e "in" con nombres. Con otro
+    ConjuntoBits, | & - devuelven un ConjuntoBits; con un set (a cualquier
+    lado del operador), devuelven el set de nombres del resultado.
+
+    Un mapa vale para la generación de ids en que se armó: si después se
+    elimina algún artefacto, su id puede pasar a otro y usar el mapa lanza
+    ValueError (hay que pedirlo de nuevo a IndiceBits).
+    """
+
+    __slots__ = ("gestor", "bits", "generacion")
+
+    def __init__(self, gestor: GestorConjuntos, bits: int = 0) -> None:
+        self.gestor = gestor
+        self.bits = bits
+        self.generacion = gestor.generacion_ids
+
+    def _vigente(self) -> int:
+        """Bits del mapa; ValueError si el gestor liberó ids desde que se armó"""
+        if self.generacion != self.gestor.generacion_ids:
+            raise ValueError(
+                "El mapa de bits es anterior a una eliminación en el gestor; "
+                "pídalo de nuevo a IndiceBits"
+            )
+        return self.bits
+
+    def _operando(self, otro: "ConjuntoBits") -> int:
+        if not isinstance(otro, ConjuntoBits):
+            return NotImplemented
+        if otro.gestor is not self.gestor:
+            raise ValueError("Los conjuntos pertenecen a gestores distintos")
+        return otro._vigente()
+
+    def __or__(self, otro: "ConjuntoBits") -> "ConjuntoBits":
+        if isinstance(otro, (set, frozenset)):
+            return self.a_nombres() | otro
+        bits = self._operando(otro)
+        if bits is NotImplemented:
+            return NotImplemented
+        return ConjuntoBits(self.gestor, self._vigente() | bits)
+
+    def __and__(self, otro: "ConjuntoBits") -> "ConjuntoBits":
+        if isinstance(otro, (set, frozenset)):
+            return self.a_nombres() & otro
+        bits = self._operando(otro)
+        if bits is NotImplemented:
+            return NotImplemented
+        return ConjuntoBits(self.gestor, self._vigente() & bits)
+
+    def __sub__(self, otro: "ConjuntoBits") -> "ConjuntoBits":
+        if isinstance(otro, (set, frozenset)):
+            return self.a_nombres() - otro
+        bits = self._operando(otro)
+        if bits is NotImplemented:
+            return NotImplemented
+        return ConjuntoBits(self.gestor, self._vigente() & ~bits)
+
+    def __ror__(self, otro: Set[str]) -> Set[str]:
+        if isinstance(otro, (set, frozenset)):
+            return otro | self.a_nombres()
+        return NotImplemented
+
+    def __rand__(self, otro: Set[str]) -> Set[str]:
+        if isinstance(otro, (set, frozenset)):
+            return otro & self.a_nombres()
+        return NotImplemented
+
+    def __rsub__(self, otro: Set[str]) -> Set[str]:
+        if isinstance(otro, (set, frozenset)):
+            return otro - self.a_nombres()
+        return NotImplemented
+
+    def __invert__(self) -> "ConjuntoBits":
+        universo = IndiceBits.de(self.gestor).universo()
+        return ConjuntoBits(self.gestor, universo.bits & ~self._vigente())
+
+    def __eq__(self, otro: object) -> bool:
+        if isinstance(otro, ConjuntoBits):
+            return self.gestor is otro.gestor and self._vigente() == otro._vigente()
+        if isinstance(otro, (set, frozenset)):
+            return self.a_nombres() == otro
+        return NotImplemented
+
+    __hash__ = None
+
+    def __len__(self) -> int:
+        return _contar_bits(self._vigente())
+
+    def __bool__(self) -> bool:
+        return self._vigente() != 0
+
+    def __contains__(self, nombre: object) -> bool:
+        if not isinstance(nombre, str):
+            return False
+        id_ = self.gestor.ids.get(nombre.lower().strip())
+        return id_ is not None and bool(self._vigente() >> id_ & 1)
+
+    def ids(self) -> Iterator[int]:
+        """Itera los ids marcados, en orden creciente"""
+        bits = self._vigente()
+        if not bits:
+            return iter(())
+        datos = np.frombuffer(
+            bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8
+        )
+        return iter(np.flatnonzero(np.unpackbits(datos, bitorder="little")).tolist())
+
+    def __iter__(self) -> Iterator[str]:
+        nombres_por_id = self.gestor.nombres_por_id
+        return (nombres_por_id[id_] for id_ in self.ids())
+
+    def a_nombres(self) -> Set[str]:
+        """Convierte el mapa de bits al conjunto de nombres equivalente"""
+        return set(self)
+
+    def __repr__(self) -> str:
+        return f"ConjuntoBits({len(self)} artefactos)"
+
+
+class IndiceBits:
+    """
+    Índices del gestor en forma de mapas de bits
+
+    Los mapas se construyen a demanda y se guardan hasta que cambia
+    gestor.version, de modo que consultas repetidas sobre un inventario sin
+    cambios no vuelven a recorrer los índices.
+    """
+
+    def __init__(self, gestor: GestorConjuntos) -> None:
+        self.gestor = gestor
+        self._cache: Dict[Tuple[str, str], ConjuntoBits] = {}
+        self._version = gestor.version
+
+    @classmethod
+    def de(cls, gestor: GestorConjuntos) -> "IndiceBits":
+        """Devuelve el índice de bits compartido de un gestor (lo crea si falta)"""
+        indice = gestor._indice_bits
+        if indice is None:
+            indice = cls(gestor)
+            gestor._indice_bits = indice
+        return indice
+
+    def _obtener(self, dimension: str, clave: str, nombres: Iterable[str]) -> ConjuntoBits:
+        if self._version != self.gestor.version:
+            self._cache.clear()
+            self._version = self.gestor.version
+        conjunto = self._cache.get((dimension, clave))
+        if conjunto is None:
+            conjunto = self.desde_nombres(nombres)
+            self._cache[(dimension, clave)] = conjunto
+        return conjunto
+
+    def desde_nombres(self, nombres: Iterable[str]) -> ConjuntoBits:
+        """
+        Convierte nombres de artefactos a mapa de bits
+
+        Los nombres que no están en el gestor se ignoran.
+
+        Args:
+            nombres (iterable): Nombres (se normalizan con lower().strip())
+
+        Returns:
+            ConjuntoBits: Subconjunto equivalente
+        """
+        ids = self.gestor.ids
+        marcados: List[int] = []
+        for nombre in nombres:
+            id_ = ids.get(nombre.lower().strip())
+            if id_ is not None:
+                marcados.append(id_)
+        tamano = len(self.gestor.nombres_por_id)
+        return ConjuntoBits(self.gestor, bits_desde_ids(marcados, tamano))
+
+    def universo(self) -> ConjuntoBits:
+        """Mapa de bits de todos los artefactos registrados"""
+        return self._obtener("universo", "", self.gestor.universo)
+
+    def por_ubicacion(self, ubicacion: str) -> ConjuntoBits:
+        """Equivalente en bits de gestor.obtener_por_ubicacion"""
+        return self._obtener(
+            "ubicacion",
+            normalizar_clave(ubicacion),
+            self.gestor.vista_indice("ubicacion", ubicacion),
+        )
+
+    def por_tipo(self, tipo: str) -> ConjuntoBits:
+        """Equivalente en bits de gestor.obtener_por_tipo"""
+        return self._obtener(
+            "tipo", normalizar_clave(tipo), self.gestor.vista_indice("tipo", tipo)
+        )
+
+    def por_nivel(self, nivel: str) -> ConjuntoBits:
+        """Equivalente en bits de gestor.obtener_por_nivel_consumo"""
+        return self._obtener(
+            "nivel", nivel.upper(), self.gestor.vista_indice("nivel", nivel)
+        )
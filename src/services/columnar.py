@@ -0,0 +1,313 @@
+"""
+Módulo: columnar.py
+Almacén columnar de artefactos con cálculos vectorizados
+
+Guarda los artefactos por columnas en lugar de un objeto por artefacto:
+- watts y horas_dia en arreglos NumPy de punto flotante
+- ubicacion y tipo codificados con diccionario (código entero por etiqueta)
+
+Así, los totales, las sumas por grupo y la clasificación por nivel se
+calculan con operaciones vectorizadas sobre todo el arreglo a la vez.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.artefacto import Artefacto, UMBRAL_ALTO_W, UMBRAL_MEDIO_W
+from services.conjuntos import GestorConjuntos, NIVELES_CONSUMO
+
+# Código de cada nivel en el arreglo devuelto por niveles_consumo()
+CODIGO_NIVEL: Dict[str, int] = {
+    nivel: codigo for codigo, nivel in enumerate(NIVELES_CONSUMO)
+}
+
+
+class AlmacenColumnar:
+    """
+    Almacena artefactos en columnas NumPy
+
+    Cada artefacto ocupa una fila. Agregar un artefacto con un nombre ya
+    registrado reemplaza su fila, igual que en GestorConjuntos.
+    """
+
+    def __init__(self, capacidad: int = 1024) -> None:
+        capacidad = max(capacidad, 1)
+        self._watts = np.empty(capacidad, dtype=np.float64)
+        self._horas = np.empty(capacidad, dtype=np.float64)
+        # Los códigos usan np.intp, el tipo que np.bincount recibe sin convertir
+        self._ubicacion = np.empty(capacidad, dtype=np.intp)
+        self._tipo = np.empty(capacidad, dtype=np.intp)
+        self._n = 0
+
+        # Nombre normalizado de cada fila y fila de cada nombre (None hasta
+        # la primera búsqueda en almacenes creados con normalizados=True)
+        self.nombres: Sequence[str] = []
+        self._filas: Optional[Dict[str, int]] = {}
+
+        # Diccionarios de codificación: clave normalizada → código
+        self._codigos_ubicacion: Dict[str, int] = {}
+        self._codigos_tipo: Dict[str, int] = {}
+        # Etiqueta original de cada código
+        self.etiquetas_ubicacion: List[str] = []
+        self.etiquetas_tipo: List[str] = []
+
+    @classmethod
+    def desde_gestor(cls, gestor: GestorConjuntos) -> "AlmacenColumnar":
+        """Construye el almacén con todos los artefactos de un gestor"""
+        almacen = cls(capacidad=gestor.total_artefactos())
+        almacen.agregar_artefactos(gestor.iterar_artefactos())
+        return almacen
+
+    @classmethod
+    def desde_columnas(
+        cls,
+        nombres: List[str],
+        watts: np.ndarray,
+        horas_dia: np.ndarray,
+        ubicaciones: np.ndarray,
+        tipos: np.ndarray,
+        etiquetas_ubicacion: List[str],
+        etiquetas_tipo: List[str],
+        normalizados: bool = False,
+    ) -> "AlmacenColumnar":
+        """
+        Construye el almacén directamente a partir de columnas ya codificadas
+
+        Args:
+            nombres (list): Nombres únicos de los artefactos
+            watts (np.ndarray): Potencia de cada artefacto
+            horas_dia (np.ndarray): Horas de uso diario de cada artefacto
+            ubicaciones (np.ndarray): Código de ubicación de cada artefacto
+            tipos (np.ndarray): Código de tipo de cada artefacto
+            etiquetas_ubicacion (list): Etiqueta de cada código de ubicación
+            etiquetas_tipo (list): Etiqueta de cada código de tipo
+            normalizados (bool): Si los nombres ya están normalizados y son
+                únicos (por ejemplo, una secuencia perezosa de un snapshot).
+                En ese caso no se recorren: la fila de cada nombre se
+                calcula recién en la primera búsqueda.
+
+        Returns:
+            AlmacenColumnar: Almacén con las columnas dadas
+        """
+        almacen = cls(capacidad=0)
+        almacen._watts = np.asarray(watts, dtype=np.float64)
+        almacen._horas = np.asarray(horas_dia, dtype=np.float64)
+        almacen._ubicacion = np.asarray(ubicaciones, dtype=np.intp)
+        almacen._tipo = np.asarray(tipos, dtype=np.intp)
+        almacen._n = len(almacen._watts)
+
+        if normalizados:
+            almacen.nombres = nombres
+            almacen._filas = None
+            if len(nombres) != almacen._n:
+                raise ValueError("Los nombres deben ser únicos y uno por fila")
+        else:
+            almacen.nombres = [nombre.lower().strip() for nombre in nombres]
+            almacen._filas_por_nombre()
+
+        almacen.etiquetas_ubicacion = list(etiquetas_ubicacion)
+        almacen.etiquetas_tipo = list(etiquetas_tipo)
+        almacen._codigos_ubicacion = {
+            etiqueta.lower(): codigo
+            for codigo, etiqueta in enumerate(almacen.etiquetas_ubicacion)
+        }
+        almacen._codigos_tipo = {
+            etiqueta.lower(): codigo
+            for codigo, etiqueta in enumerate(almacen.etiquetas_tipo)
+        }
+        return almacen
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _filas_por_nombre(self) -> Dict[str, int]:
+        """Fila de cada nombre normalizado, armada la primera vez si hace falta"""
+        if self._filas is None or len(self._filas) != self._n:
+            self._filas = {nombre: fila for fila, nombre in enumerate(self.nombres)}
+            if len(self._filas) != self._n:
+                raise ValueError("Los nombres deben ser únicos y uno por fila")
+        return self._filas
+
+    # ==================== CARGA ====================
+
+    def agregar_artefacto(self, artefacto: Artefacto) -> None:
+        """
+        Agrega un artefacto como una fila nueva, o reemplaza su fila
+
+        Args:
+            artefacto (Artefacto): Objeto artefacto a agregar
+        """
+        nombre = artefacto.nombre.lower().strip()
+        filas = self._filas_por_nombre()
+        fila = filas.get(nombre)
+        if fila is None:
+            fila = self._n
+            self._reservar(fila + 1)
+            if not isinstance(self.nombres, list):
+                self.nombres = list(self.nombres)
+            self._n += 1
+            self.nombres.append(nombre)
+            filas[nombre] = fila
+
+        self._watts[fila] = artefacto.watts
+        self._horas[fila] = artefacto.horas_dia
+        self._ubicacion[fila] = _codificar(
+            artefacto.ubicacion, self._codigos_ubicacion, self.etiquetas_ubicacion
+        )
+        self._tipo[fila] = _codificar(
+            artefacto.tipo, self._codigos_tipo, self.etiquetas_tipo
+        )
+
+    def agregar_artefactos(self, artefactos: Iterable[Artefacto]) -> None:
+        """Agrega varios artefactos, en el orden en que se reciben"""
+        for artefacto in artefactos:
+            self.agregar_artefacto(artefacto)
+
+    def _reservar(self, capacidad: int) -> None:
+        """Agranda las columnas (al doble) si no alcanzan para capacidad filas"""
+        actual = len(self._watts)
+        if capacidad <= actual:
+            return
+        nueva = max(capacidad, actual * 2)
+        for atributo in ("_watts", "_horas", "_ubicacion", "_tipo"):
+            columna = getattr(self, atributo)
+            ampliada = np.empty(nueva, dtype=columna.dtype)
+            ampliada[: self._n] = columna[: self._n]
+            setattr(self, atributo, ampliada)
+
+    # ==================== COLUMNAS ====================
+
+    @property
+    def watts(self) -> np.ndarray:
+        """Potencia de cada fila (vista, sin copiar)"""
+        return self._watts[: self._n]
+
+    @property
+    def horas_dia(self) -> np.ndarray:
+        """Horas de uso diario de cada fila (vista, sin copiar)"""
+        return self._horas[: self._n]
+
+    @property
+    def ubicaciones(self) -> np.ndarray:
+        """Código de ubicación de cada fila (vista, sin copiar)"""
+        return self._ubicacion[: self._n]
+
+    @property
+    def tipos(self) -> np.ndarray:
+        """Código de tipo de cada fila (vista, sin copiar)"""
+        return self._tipo[: self._n]
+
+    # ==================== CÁLCULOS VECTORIZADOS ====================
+
+    def consumo_mensual(self) -> np.ndarray:
+        """
+        Calcula el consumo mensual de cada fila
+
+        Returns:
+            np.ndarray: Consumo en kWh, misma fórmula que Artefacto.consumo_mensual
+        """
+        return (self.watts * self.horas_dia * 30) / 1000
+
+    def consumo_total_mensual(self) -> float:
+        """Calcula el consumo mensual total en kWh"""
+        # Producto escalar: suma watts × horas sin crear arreglos intermedios
+        return float(np.dot(self.watts, self.horas_dia)) * 30 / 1000
+
+    def niveles_consumo(self) -> np.ndarray:
+        """
+        Clasifica cada fila según su potencia
+
+        Returns:
+            np.ndarray: Código de nivel de cada fila (ver CODIGO_NIVEL)
+        """
+        watts = self.watts
+        niveles = np.full(self._n, CODIGO_NIVEL["BAJO"], dtype=np.int8)
+        niveles[watts >= UMBRAL_MEDIO_W] = CODIGO_NIVEL["MEDIO"]
+        niveles[watts > UMBRAL_ALTO_W] = CODIGO_NIVEL["ALTO"]
+        return niveles
+
+    def contar_por_nivel_consumo(self) -> Dict[str, int]:
+        """
+        Cuenta filas por nivel de consumo
+
+        Returns:
+            dict: {nivel: cantidad}
+        """
+        conteo = np.bincount(self.niveles_consumo(), minlength=len(NIVELES_CONSUMO))
+        return {nivel: int(conteo[codigo]) for nivel, codigo in CODIGO_NIVEL.items()}
+
+    def contar_por_ubicacion(self) -> Dict[str, int]:
+        """Cuenta filas por ubicación: {ubicacion: cantidad}"""
+        return _agrupar(self.ubicaciones, self.etiquetas_ubicacion, None)
+
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Cuenta filas por tipo: {tipo: cantidad}"""
+        return _agrupar(self.tipos, self.etiquetas_tipo, None)
+
+    def consumo_por_ubicacion(self) -> Dict[str, float]:
+        """
+        Calcula consumo mensual agrupado por ubicación
+
+        Returns:
+            dict: {ubicacion: consumo_kWh}
+        """
+        return _agrupar(
+            self.ubicaciones, self.etiquetas_ubicacion, self.watts * self.horas_dia
+        )
+
+    def consumo_por_tipo(self) -> Dict[str, float]:
+        """
+        Calcula consumo mensual agrupado por tipo
+
+        Returns:
+            dict: {tipo: consumo_kWh}
+        """
+        return _agrupar(self.tipos, self.etiquetas_tipo, self.watts * self.horas_dia)
+
+    def fila(self, nombre: str) -> Tuple[str, float, float, str, str]:
+        """
+        Obtiene los datos de un artefacto por nombre
+
+        Returns:
+            tuple: (nombre, watts, horas_dia, ubicacion, tipo)
+        """
+        fila = self._filas_por_nombre()[nombre.lower().strip()]
+        return (
+            self.nombres[fila],
+            float(self._watts[fila]),
+            float(self._horas[fila]),
+            self.etiquetas_ubicacion[self._ubicacion[fila]],
+            self.etiquetas_tipo[self._tipo[fila]],
+        )
+
+
+def _codificar(etiqueta: str, codigos: Dict[str, int], etiquetas: List[str]) -> int:
+    """Devuelve el código de una etiqueta, asignándole uno nuevo si no tenía"""
+    clave = etiqueta.lower()
+    codigo = codigos.get(clave)
+    if codigo is None:
+        codigo = len(etiquetas)
+        codigos[clave] = codigo
+        etiquetas.append(etiqueta)
+    return codigo
+
+
+def _agrupar(codigos: np.ndarray, etiquetas: List[str], consumo_diario) -> dict:
+    """
+    Cuenta filas (consumo_diario=None) o suma kWh mensuales por código
+
+    Args:
+        codigos (np.ndarray): Código de grupo de cada fila
+        etiquetas (list): Etiqueta de cada código
+        consumo_diario (np.ndarray or None): Wh diarios de cada fila
+
+    Returns:
+        dict: {etiqueta: valor}, solo para los códigos con alguna fila
+    """
+    conteo = np.bincount(codigos, minlength=len(etiquetas))
+    presentes = np.flatnonzero(conteo)
+    if consumo_diario is None:
+        return {etiquetas[codigo]: int(conteo[codigo]) for codigo in presentes}
+    sumas = np.bincount(codigos, weights=consumo_diario, minlength=len(etiquetas))
+    return {etiquetas[codigo]: float(sumas[codigo]) * 30 / 1000 for codigo in presentes}
@@ -9,8 +9,153 @@ CONCEPTOS MATEMÁTICOS APLICADOS:
 - Cardinalidad: |A| = número de elementos en conjunto A
 """
 
-from typing import Set, Dict, Optional
-from models.artefacto import Artefacto
+import gc
+import math
+from bisect import bisect_left
+from itertools import islice
+from operator import attrgetter
+from typing import AbstractSet, Any, Set, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from models.artefacto import (
+    UMBRAL_ALTO_W,
+    UMBRAL_MEDIO_W,
+    Artefacto,
+    normalizar_horarios,
+    normalizar_perfil,
+    validar_datos,
+)
+
+NIVELES_CONSUMO: Tuple[str, ...] = ("ALTO", "MEDIO", "BAJO")
+
+# Cantidad de artefactos que la carga masiva acumula antes de volcarlos
+TAMANO_LOTE = 50_000
+
+# Hasta cuántas bajas pendientes se quitan del ranking con búsqueda binaria
+# (cada una desplaza la lista); con más, se reconstruye en una pasada
+BAJAS_POR_BUSQUEDA = 32
+
+
+def normalizar_clave(valor: str) -> str:
+    """Normaliza una ubicación o tipo para usarla como clave de índice"""
+    return valor.lower()
+
+
+def _sin_bajas(
+    entradas: List[Tuple[float, str]], bajas: Dict[Tuple[float, str], int]
+) -> List[Tuple[float, str]]:
+    """Entradas del ranking sin las marcadas como bajas (consume las marcas)"""
+    vigentes = []
+    for entrada in entradas:
+        copias = bajas.get(entrada)
+        if copias:
+            bajas[entrada] = copias - 1
+        else:
+            vigentes.append(entrada)
+    return vigentes
+
+
+def _codigos_de_claves(
+    etiquetas: List[str],
+    indice: Dict[str, Set[str]],
+    nombres: Dict[str, str],
+    consumos: Dict[str, float],
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Agrupa una columna de etiquetas por su clave de índice
+
+    Cada etiqueta distinta se normaliza una sola vez, y las claves nuevas se
+    agregan al índice (y al acumulado de consumo) con la primera etiqueta
+    original que aparece.
+
+    Returns:
+        tuple: (claves, codigos): la clave de cada grupo y el grupo
+        (0..len(claves)-1) de cada etiqueta
+    """
+    codigo_de_clave: Dict[str, int] = {}
+    codigo_de_etiqueta: Dict[str, int] = {}
+    for etiqueta in dict.fromkeys(etiquetas):
+        clave = normalizar_clave(etiqueta)
+        if clave not in indice:
+            indice[clave] = set()
+            nombres[clave] = etiqueta
+            consumos[clave] = 0.0
+        codigo_de_etiqueta[etiqueta] = codigo_de_clave.setdefault(clave, len(codigo_de_clave))
+    codigos = np.fromiter(
+        map(codigo_de_etiqueta.__getitem__, etiquetas), dtype=np.intp, count=len(etiquetas)
+    )
+    return list(codigo_de_clave), codigos
+
+
+def _indexar_grupos(
+    indice: Dict[str, Set[str]],
+    claves: List[str],
+    codigos: np.ndarray,
+    nombres: np.ndarray,
+) -> None:
+    """
+    Agrega los nombres de cada grupo a su subconjunto, con un update por clave
+
+    Args:
+        indice (dict): Índice invertido {clave: nombres}
+        claves (list): Clave de cada grupo
+        codigos (np.ndarray): Grupo de cada nombre
+        nombres (np.ndarray): Nombres (dtype object), en el orden de codigos
+    """
+    orden = np.argsort(codigos, kind="stable")
+    fines = np.cumsum(np.bincount(codigos, minlength=len(claves))).tolist()
+    inicio = 0
+    for clave, fin in zip(claves, fines):
+        if fin > inicio:
+            indice[clave].update(nombres[orden[inicio:fin]].tolist())
+        inicio = fin
+
+
+def _casi_iguales(a: float, b: float) -> bool:
+    """Compara kWh tolerando el redondeo que acumulan las sumas y restas"""
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+
+
+# Campos que la carga masiva lee de cada artefacto, en una sola pasada
+_CAMPOS_LOTE = attrgetter("nombre", "watts", "horas_dia", "ubicacion", "tipo")
+
+Columnas = Tuple[tuple, tuple, tuple, tuple, tuple]
+
+
+def _columnas(bloque: List[Artefacto]) -> Columnas:
+    """Columnas nombre, watts, horas_dia, ubicacion y tipo de un bloque"""
+    return tuple(zip(*map(_CAMPOS_LOTE, bloque))) or ((),) * 5
+
+
+def _columnas_validas(bloque: List[Artefacto]) -> Optional[Columnas]:
+    """
+    Columnas de un bloque, si todo el bloque cumple las reglas de validar_datos
+
+    Compara columnas enteras con min/max, que es mucho más rápido que validar
+    artefacto por artefacto.
+
+    Returns:
+        tuple or None: Las columnas (ver _columnas), o None si algo no cumple
+        y el bloque debe revisarse uno por uno para saber qué rechazar
+    """
+    if set(map(type, bloque)) != {Artefacto}:
+        return None
+    columnas = _columnas(bloque)
+    nombres, watts, horas, ubicaciones, tipos = columnas
+    try:
+        if (
+            min(watts) > 0
+            and min(horas) >= 0
+            and max(horas) <= 24
+            and all(map(str.strip, nombres))
+            and all(map(str.strip, ubicaciones))
+            and all(map(str.strip, tipos))
+        ):
+            return columnas
+    except (TypeError, AttributeError):
+        pass
+    return None
 
 
 class GestorConjuntos:
@@ -26,18 +171,500 @@ class GestorConjuntos:
             str, Artefacto
         ] = {}  # Para mantener objetos completos
 
+        # Índices invertidos: clave normalizada → subconjunto de nombres
+        self._indice_ubicacion: Dict[str, Set[str]] = {}
+        self._indice_tipo: Dict[str, Set[str]] = {}
+        self._indice_nivel: Dict[str, Set[str]] = {
+            nivel: set() for nivel in NIVELES_CONSUMO
+        }
+        # Etiqueta original (tal como se ingresó) de cada clave normalizada
+        self._etiquetas_ubicacion: Dict[str, str] = {}
+        self._etiquetas_tipo: Dict[str, str] = {}
+
+        # Agregados acumulados: se ajustan en cada alta, baja o modificación
+        self._consumo_total: float = 0.0
+        self._consumo_ubicacion: Dict[str, float] = {}  # clave → kWh
+        self._consumo_tipo: Dict[str, float] = {}  # clave → kWh
+        # (nivel, kWh) con que cada artefacto quedó indexado y entró en los
+        # acumulados: es lo que hay que restar al quitarlo
+        self._indexado: Dict[str, Tuple[str, float]] = {}
+        # Versión del inventario: aumenta con cada alta, baja o modificación,
+        # así quien guarde resultados calculados sabe cuándo quedan viejos
+        self.version: int = 0
+
+        # Ranking ordenado por consumo descendente: (-kWh, nombre). Las altas
+        # esperan en _ranking_pendientes y las bajas en _ranking_bajas (marcas
+        # con la cantidad de copias a quitar) hasta la próxima lectura
+        self._ranking: List[Tuple[float, str]] = []
+        self._ranking_pendientes: List[Tuple[float, str]] = []
+        self._ranking_bajas: Dict[Tuple[float, str], int] = {}
+
+        # Identificador entero denso de cada artefacto, para representar
+        # subconjuntos como bitmaps (ver services.bitmaps). Un artefacto
+        # conserva su id al reemplazarlo o modificarlo; al eliminarlo, su
+        # posición queda libre (None) y el próximo artefacto nuevo la reusa,
+        # así los ids no pasan de la mayor cantidad de artefactos registrada.
+        # Se asignan recién cuando alguien los pide (ver ids): un gestor que
+        # nunca usa mapas de bits no paga su mantenimiento en cada alta.
+        self._ids: Optional[Dict[str, int]] = None
+        self._nombres_por_id: List[Optional[str]] = []
+        self._ids_libres: List[int] = []
+        # Cambia cada vez que se libera un id: los mapas de bits armados
+        # antes dejan de ser válidos
+        self.generacion_ids: int = 0
+        # Índice de bits compartido, creado a demanda por IndiceBits.de()
+        self._indice_bits = None
+        # Motor de curvas de carga compartido, creado por MotorPerfiles.de()
+        self._motor_perfiles = None
+        # Barrido de horarios compartido, creado por MotorAgenda.de()
+        self._motor_agenda = None
+
+    def _activar_ids(self) -> Dict[str, int]:
+        """Asigna ids a todos los artefactos la primera vez que se piden"""
+        if self._ids is None:
+            self._nombres_por_id = list(self.artefactos_dict)
+            self._ids = {nombre: id_ for id_, nombre in enumerate(self._nombres_por_id)}
+        return self._ids
+
+    @property
+    def ids(self) -> Dict[str, int]:
+        """Id denso de cada artefacto"""
+        return self._activar_ids()
+
+    @property
+    def nombres_por_id(self) -> List[Optional[str]]:
+        """Nombre de cada id, o None si el id está libre"""
+        self._activar_ids()
+        return self._nombres_por_id
+
     def agregar_artefacto(self, artefacto: Artefacto) -> None:
         """
         Agrega un artefacto al conjunto universo
 
+        Si ya existe un artefacto con el mismo nombre, lo reemplaza.
+
         Args:
             artefacto (Artefacto): Objeto artefacto a agregar
         """
         nombre_normalizado = artefacto.nombre.lower().strip()
+        if nombre_normalizado in self.artefactos_dict:
+            self._desindexar(nombre_normalizado)
+        else:
+            self._asignar_ids([nombre_normalizado])
         self.universo.add(nombre_normalizado)
         self.artefactos_dict[nombre_normalizado] = artefacto
+        self._indexar(nombre_normalizado, artefacto)
+        self.version += 1
         print(f"✓ Artefacto '{artefacto.nombre}' agregado al sistema")
 
+    def agregar_artefactos(
+        self, artefactos: Iterable[Artefacto], *, verbose: bool = False
+    ) -> Dict[str, int]:
+        """
+        Carga masiva de artefactos
+
+        Acepta cualquier iterable o generador y vuelca los artefactos por
+        lotes al universo, al diccionario y a los índices. Los artefactos que
+        no superan la validación del menú de carga se rechazan.
+
+        Args:
+            artefactos (Iterable[Artefacto]): Artefactos a agregar
+            verbose (bool): Si es True, informa cada artefacto procesado
+
+        Returns:
+            dict: {'insertados': n, 'reemplazados': n, 'rechazados': n}
+        """
+        resumen = {"insertados": 0, "reemplazados": 0, "rechazados": 0}
+        iterador = iter(artefactos)
+
+        # La carga solo crea contenedores sin ciclos (cadenas, tuplas, sets),
+        # así que el recolector de ciclos no tiene nada que liberar: se pausa
+        # para que no recorra una y otra vez el inventario que va creciendo
+        recolector = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                bloque = list(islice(iterador, TAMANO_LOTE))
+                if not bloque:
+                    break
+                self._agregar_bloque(bloque, resumen, verbose)
+        finally:
+            if recolector:
+                gc.enable()
+
+        return resumen
+
+    def _agregar_bloque(
+        self, bloque: List[Artefacto], resumen: Dict[str, int], verbose: bool
+    ) -> None:
+        """Valida un bloque de la carga masiva y lo vuelca al gestor"""
+        columnas = _columnas_validas(bloque)
+        if columnas is None:
+            bloque = filtrar_validos(bloque, resumen, verbose)
+            columnas = _columnas(bloque)
+
+        nombres = list(map(str.strip, map(str.lower, columnas[0])))
+        antes = len(self.universo)
+        self.universo.update(nombres)
+        existentes: List[str] = []
+        if len(self.universo) - antes != len(nombres):
+            # Hay nombres ya registrados o repetidos en el bloque: gana el último
+            lote = dict(zip(nombres, bloque))
+            resumen["reemplazados"] += len(bloque) - len(lote)
+            # En el orden del lote (no el de un set): recorre los índices con
+            # mejor localidad al reemplazar muchos artefactos
+            existentes = [nombre for nombre in lote if nombre in self.artefactos_dict]
+            for nombre in existentes:
+                self._desindexar(nombre)
+            if len(lote) < len(bloque):
+                bloque = list(lote.values())
+                columnas = _columnas(bloque)
+            nombres = list(lote)
+
+        if self._ids is not None:
+            self._asignar_ids(
+                [nombre for nombre in nombres if nombre not in self._ids]
+                if existentes
+                else nombres
+            )
+        resumen["reemplazados"] += len(existentes)
+        resumen["insertados"] += len(nombres) - len(existentes)
+
+        self.artefactos_dict.update(zip(nombres, bloque))
+        if nombres:
+            self._indexar_lote(nombres, columnas)
+            self.version += 1
+        if verbose:
+            for artefacto in bloque:
+                print(f"✓ Artefacto '{artefacto.nombre}' agregado al sistema")
+
+    def eliminar_artefacto(self, nombre: str) -> bool:
+        """
+        Quita un artefacto del universo, de los índices y de los acumulados
+
+        Args:
+            nombre (str): Nombre del artefacto
+
+        Returns:
+            bool: True si existía y se eliminó
+        """
+        nombre_normalizado = nombre.lower().strip()
+        if nombre_normalizado not in self.artefactos_dict:
+            return False
+        self._desindexar(nombre_normalizado)
+        self.universo.discard(nombre_normalizado)
+        del self.artefactos_dict[nombre_normalizado]
+        if self._ids is not None:
+            id_ = self._ids.pop(nombre_normalizado)
+            self._nombres_por_id[id_] = None
+            self._ids_libres.append(id_)
+        self.generacion_ids += 1
+        self.version += 1
+        return True
+
+    def modificar_artefacto(self, nombre: str, **cambios) -> bool:
+        """
+        Modifica atributos de un artefacto manteniendo índices y acumulados
+
+        Los artefactos registrados deben modificarse con este método: asignar
+        sus atributos directamente deja desactualizados los índices.
+
+        Args:
+            nombre (str): Nombre del artefacto
+            **cambios: Nuevos valores de watts, horas_dia, ubicacion, tipo,
+                perfil_uso u horarios
+
+        Returns:
+            bool: True si el artefacto existía y se modificó
+        """
+        cambios = normalizar_cambios(cambios)
+        nombre_normalizado = nombre.lower().strip()
+        artefacto = self.artefactos_dict.get(nombre_normalizado)
+        if artefacto is None:
+            return False
+        validar_cambios(artefacto, cambios)
+
+        self._desindexar(nombre_normalizado)
+        for campo, valor in cambios.items():
+            setattr(artefacto, campo, valor)
+        self._indexar(nombre_normalizado, artefacto)
+        self.version += 1
+        return True
+
+    def _asignar_ids(self, nombres: List[str]) -> None:
+        """Asigna ids a nombres nuevos: primero los liberados, luego consecutivos"""
+        if self._ids is None:
+            return
+        reusados = min(len(self._ids_libres), len(nombres))
+        for nombre in nombres[:reusados]:
+            id_ = self._ids_libres.pop()
+            self._ids[nombre] = id_
+            self._nombres_por_id[id_] = nombre
+        nuevos = nombres[reusados:]
+        primero = len(self._nombres_por_id)
+        self._ids.update(zip(nuevos, range(primero, primero + len(nuevos))))
+        self._nombres_por_id.extend(nuevos)
+
+    # ==================== ÍNDICES INVERTIDOS ====================
+
+    def _indexar(self, nombre: str, artefacto: Artefacto) -> None:
+        """Registra el artefacto en los índices y lo suma a los acumulados"""
+        clave_ubicacion = normalizar_clave(artefacto.ubicacion)
+        clave_tipo = normalizar_clave(artefacto.tipo)
+        nivel = artefacto.nivel_consumo()
+        consumo = artefacto.consumo_mensual()
+
+        if clave_ubicacion not in self._indice_ubicacion:
+            self._indice_ubicacion[clave_ubicacion] = set()
+            self._etiquetas_ubicacion[clave_ubicacion] = artefacto.ubicacion
+            self._consumo_ubicacion[clave_ubicacion] = 0.0
+        self._indice_ubicacion[clave_ubicacion].add(nombre)
+        self._consumo_ubicacion[clave_ubicacion] += consumo
+
+        if clave_tipo not in self._indice_tipo:
+            self._indice_tipo[clave_tipo] = set()
+            self._etiquetas_tipo[clave_tipo] = artefacto.tipo
+            self._consumo_tipo[clave_tipo] = 0.0
+        self._indice_tipo[clave_tipo].add(nombre)
+        self._consumo_tipo[clave_tipo] += consumo
+
+        self._indice_nivel[nivel].add(nombre)
+        self._indexado[nombre] = (nivel, consumo)
+        self._consumo_total += consumo
+        self._ranking_pendientes.append((-consumo, nombre))
+
+    def _indexar_lote(self, lote: List[str], columnas: Columnas) -> None:
+        """
+        Equivalente a _indexar para muchos artefactos a la vez
+
+        Args:
+            lote (list): Nombres normalizados, distintos entre sí
+            columnas (tuple): Columnas de los artefactos (ver _columnas)
+
+        Cada índice se actualiza con un update por clave (los nombres del
+        lote agrupados por ubicación, tipo o nivel), y el consumo y el nivel
+        se calculan sobre las columnas con NumPy, con las mismas fórmulas que
+        Artefacto.consumo_mensual y Artefacto.nivel_consumo.
+        """
+        _, watts, horas, ubicaciones, tipos = columnas
+        nombres = np.array(lote, dtype=object)
+        potencia = np.array(watts, dtype=np.float64)
+        kwh = potencia * np.array(horas, dtype=np.float64) * 30 / 1000
+        consumos = kwh.tolist()
+        codigos_nivel = np.select(
+            [potencia > UMBRAL_ALTO_W, potencia >= UMBRAL_MEDIO_W],
+            [NIVELES_CONSUMO.index("ALTO"), NIVELES_CONSUMO.index("MEDIO")],
+            NIVELES_CONSUMO.index("BAJO"),
+        )
+        niveles = np.array(NIVELES_CONSUMO, dtype=object)[codigos_nivel].tolist()
+
+        for etiquetas, indice, nombres_clave, consumo_clave in (
+            (
+                ubicaciones,
+                self._indice_ubicacion,
+                self._etiquetas_ubicacion,
+                self._consumo_ubicacion,
+            ),
+            (
+                tipos,
+                self._indice_tipo,
+                self._etiquetas_tipo,
+                self._consumo_tipo,
+            ),
+        ):
+            claves, codigos = _codigos_de_claves(etiquetas, indice, nombres_clave, consumo_clave)
+            _indexar_grupos(indice, claves, codigos, nombres)
+            sumas = np.bincount(codigos, weights=kwh, minlength=len(claves)).tolist()
+            for clave, suma in zip(claves, sumas):
+                consumo_clave[clave] += suma
+
+        _indexar_grupos(self._indice_nivel, list(NIVELES_CONSUMO), codigos_nivel, nombres)
+
+        self._indexado.update(zip(lote, zip(niveles, consumos)))
+        self._consumo_total += sum(consumos)
+        self._ranking_pendientes.extend(zip((-kwh).tolist(), lote))
+
+    def _desindexar(self, nombre: str) -> None:
+        """
+        Quita el artefacto de los índices y resta su aporte a los acumulados
+
+        Las claves que quedan vacías se eliminan. Debe llamarse antes de
+        reemplazar, modificar o borrar el artefacto en artefactos_dict.
+        """
+        artefacto = self.artefactos_dict[nombre]
+        clave_ubicacion = normalizar_clave(artefacto.ubicacion)
+        clave_tipo = normalizar_clave(artefacto.tipo)
+        nivel, consumo = self._indexado.pop(nombre)
+
+        subconjunto = self._indice_ubicacion[clave_ubicacion]
+        subconjunto.discard(nombre)
+        if subconjunto:
+            self._consumo_ubicacion[clave_ubicacion] -= consumo
+        else:
+            del self._indice_ubicacion[clave_ubicacion]
+            del self._etiquetas_ubicacion[clave_ubicacion]
+            del self._consumo_ubicacion[clave_ubicacion]
+
+        subconjunto = self._indice_tipo[clave_tipo]
+        subconjunto.discard(nombre)
+        if subconjunto:
+            self._consumo_tipo[clave_tipo] -= consumo
+        else:
+            del self._indice_tipo[clave_tipo]
+            del self._etiquetas_tipo[clave_tipo]
+            del self._consumo_tipo[clave_tipo]
+
+        self._indice_nivel[nivel].discard(nombre)
+        entrada = (-consumo, nombre)
+        self._ranking_bajas[entrada] = self._ranking_bajas.get(entrada, 0) + 1
+        # Sin artefactos, el total vuelve a 0 exacto (sin error de redondeo)
+        self._consumo_total = self._consumo_total - consumo if self._indexado else 0.0
+
+    # ==================== AGREGADOS ACUMULADOS ====================
+
+    def total_artefactos(self) -> int:
+        """Cardinalidad del universo |U|"""
+        return len(self.universo)
+
+    def consumo_total_kwh(self) -> float:
+        """Consumo mensual total en kWh, sin recorrer el inventario"""
+        return self._consumo_total
+
+    def consumo_por_ubicacion_kwh(self) -> Dict[str, float]:
+        """Consumo mensual por ubicación: {ubicacion: kWh}"""
+        return {
+            self._etiquetas_ubicacion[clave]: consumo
+            for clave, consumo in self._consumo_ubicacion.items()
+        }
+
+    def consumo_por_tipo_kwh(self) -> Dict[str, float]:
+        """Consumo mensual por tipo: {tipo: kWh}"""
+        return {
+            self._etiquetas_tipo[clave]: consumo
+            for clave, consumo in self._consumo_tipo.items()
+        }
+
+    def contar_por_ubicacion(self) -> Dict[str, int]:
+        """Cantidad de artefactos por ubicación: {ubicacion: cantidad}"""
+        return {
+            self._etiquetas_ubicacion[clave]: len(subconjunto)
+            for clave, subconjunto in self._indice_ubicacion.items()
+        }
+
+    def contar_por_tipo(self) -> Dict[str, int]:
+        """Cantidad de artefactos por tipo: {tipo: cantidad}"""
+        return {
+            self._etiquetas_tipo[clave]: len(subconjunto)
+            for clave, subconjunto in self._indice_tipo.items()
+        }
+
+    def contar_por_nivel(self) -> Dict[str, int]:
+        """Cantidad de artefactos por nivel: {nivel: cantidad}"""
+        return {nivel: len(self._indice_nivel[nivel]) for nivel in NIVELES_CONSUMO}
+
+    def _ranking_ordenado(self) -> List[Tuple[float, str]]:
+        """
+        Incorpora las altas y bajas pendientes al ranking y lo devuelve ordenado
+
+        La parte ya ordenada se conserva como una corrida, así que sumar k
+        artefactos nuevos cuesta O(n + k log k) una sola vez. Las bajas se
+        aplican juntas: unas pocas con búsqueda binaria y, si son muchas, en
+        una única pasada O(n), así reemplazar n artefactos no cuesta O(n²).
+        """
+        bajas = self._ranking_bajas
+        if sum(bajas.values()) > BAJAS_POR_BUSQUEDA:
+            # Antes de ordenar: así no se ordenan entradas que van a salir
+            self._ranking = _sin_bajas(self._ranking, bajas)
+            self._ranking_pendientes = _sin_bajas(self._ranking_pendientes, bajas)
+            bajas.clear()
+        if self._ranking_pendientes:
+            self._ranking.extend(self._ranking_pendientes)
+            self._ranking_pendientes.clear()
+            self._ranking.sort()
+        if bajas:
+            ranking = self._ranking
+            for entrada, copias in bajas.items():
+                posicion = bisect_left(ranking, entrada)
+                del ranking[posicion : posicion + copias]
+            bajas.clear()
+        return self._ranking
+
+    def rango_ranking(self, inicio: int, fin: int) -> List[Tuple[str, float]]:
+        """
+        Posiciones [inicio, fin) del ranking de mayor a menor consumo
+
+        Con el ranking al día, obtener k posiciones cuesta O(k). A igual
+        consumo, ordena por nombre.
+
+        Returns:
+            list: Lista de tuplas (nombre, consumo_kWh)
+        """
+        ranking = self._ranking_ordenado()
+        return [
+            (nombre, -consumo_negativo)
+            for consumo_negativo, nombre in ranking[max(inicio, 0) : max(fin, 0)]
+        ]
+
+    def verificar_agregados(self) -> List[str]:
+        """
+        Compara índices y acumulados contra un recálculo completo
+
+        Detecta, por ejemplo, artefactos modificados sin pasar por
+        modificar_artefacto.
+
+        Returns:
+            list: Descripción de cada diferencia (vacía si todo coincide)
+        """
+        diferencias = []
+        consumo_total = 0.0
+        consumo_ubicacion: Dict[str, float] = {}
+        consumo_tipo: Dict[str, float] = {}
+        niveles = dict.fromkeys(NIVELES_CONSUMO, 0)
+        for artefacto in self.artefactos_dict.values():
+            consumo = artefacto.consumo_mensual()
+            clave_ubicacion = normalizar_clave(artefacto.ubicacion)
+            clave_tipo = normalizar_clave(artefacto.tipo)
+            consumo_total += consumo
+            consumo_ubicacion[clave_ubicacion] = (
+                consumo_ubicacion.get(clave_ubicacion, 0.0) + consumo
+            )
+            consumo_tipo[clave_tipo] = consumo_tipo.get(clave_tipo, 0.0) + consumo
+            niveles[artefacto.nivel_consumo()] += 1
+
+        if not _casi_iguales(consumo_total, self._consumo_total):
+            diferencias.append(
+                f"Consumo total: acumulado {self._consumo_total:.6f} kWh, "
+                f"recalculado {consumo_total:.6f} kWh"
+            )
+        for nombre, recalculado, acumulado in (
+            ("ubicación", consumo_ubicacion, self._consumo_ubicacion),
+            ("tipo", consumo_tipo, self._consumo_tipo),
+        ):
+            for clave in recalculado.keys() | acumulado.keys():
+                esperado = recalculado.get(clave)
+                obtenido = acumulado.get(clave)
+                if (
+                    esperado is None
+                    or obtenido is None
+                    or not _casi_iguales(esperado, obtenido)
+                ):
+                    diferencias.append(
+                        f"Consumo por {nombre} '{clave}': acumulado {obtenido}, "
+                        f"recalculado {esperado}"
+                    )
+        esperado = sorted(
+            (-artefacto.consumo_mensual(), nombre)
+            for nombre, artefacto in self.artefactos_dict.items()
+        )
+        if esperado != self._ranking_ordenado():
+            diferencias.append("El ranking de consumo no coincide con el inventario")
+        cantidades = self.contar_por_nivel()
+        if cantidades != niveles:
+            diferencias.append(
+                f"Cantidad por nivel: índice {cantidades}, recalculado {niveles}"
+            )
+        return diferencias
+
     def obtener_por_ubicacion(self, ubicacion: str) -> Set[str]:
         """
         Obtiene el subconjunto de artefactos por ubicación
@@ -48,11 +675,7 @@ class GestorConjuntos:
         Returns:
             set: Conjunto de nombres de artefactos
         """
-        return {
-            nombre
-            for nombre in self.universo
-            if self.artefactos_dict[nombre].ubicacion.lower() == ubicacion.lower()
-        }
+        return set(self._indice_ubicacion.get(normalizar_clave(ubicacion), ()))
 
     def obtener_por_tipo(self, tipo: str) -> Set[str]:
         """
@@ -64,11 +687,7 @@ class GestorConjuntos:
         Returns:
             set: Conjunto de nombres de artefactos
         """
-        return {
-            nombre
-            for nombre in self.universo
-            if self.artefactos_dict[nombre].tipo.lower() == tipo.lower()
-        }
+        return set(self._indice_tipo.get(normalizar_clave(tipo), ()))
 
     def obtener_por_nivel_consumo(self, nivel: str) -> Set[str]:
         """
@@ -80,11 +699,41 @@ class GestorConjuntos:
         Returns:
             set: Conjunto de nombres de artefactos
         """
-        return {
-            nombre
-            for nombre in self.universo
-            if self.artefactos_dict[nombre].nivel_consumo() == nivel.upper()
-        }
+        return set(self._indice_nivel.get(nivel.upper(), ()))
+
+    def vista_indice(self, dimension: str, valor: str) -> AbstractSet[str]:
+        """
+        Subconjunto indexado sin copiar, para consultas de solo lectura
+
+        A diferencia de obtener_por_*, devuelve el conjunto interno del
+        índice: quien lo recibe no debe modificarlo.
+
+        Args:
+            dimension (str): 'ubicacion', 'tipo' o 'nivel'
+            valor (str): Ubicación, tipo o nivel buscado
+
+        Returns:
+            set: Conjunto de nombres de artefactos (vacío si no hay)
+        """
+        if dimension == "nivel":
+            return self._indice_nivel.get(valor.upper(), frozenset())
+        indices = {"ubicacion": self._indice_ubicacion, "tipo": self._indice_tipo}
+        if dimension not in indices:
+            raise ValueError(f"Dimensión desconocida: {dimension}")
+        return indices[dimension].get(normalizar_clave(valor), frozenset())
+
+    def tamano_indice(self, dimension: str, valor: str) -> int:
+        """Cantidad de artefactos con ese valor, sin copiar el subconjunto"""
+        return len(self.vista_indice(dimension, valor))
+
+    def consultar(self, expresion) -> Set[str]:
+        """
+        Evalúa una expresión de conjuntos perezosa (ver services.expresiones)
+
+        Returns:
+            set: Nombres de los artefactos del resultado
+        """
+        return expresion.evaluar(self)
 
     def union(self, conjunto_a: Set[str], conjunto_b: Set[str]) -> Set[str]:
         """
@@ -121,10 +770,15 @@ class GestorConjuntos:
         Complemento: U - A
         Todos los elementos del universo que no están en A
 
+        Acepta también un ConjuntoBits (services.bitmaps), igual que union,
+        interseccion, diferencia y cardinalidad.
+
         Returns:
             set: Complemento de A
         """
-        return self.universo - conjunto_a
+        if isinstance(conjunto_a, (set, frozenset)):
+            return self.universo - conjunto_a
+        return ~conjunto_a
 
     def cardinalidad(self, conjunto: Set[str]) -> int:
         """
@@ -134,15 +788,30 @@ class GestorConjuntos:
         Returns:
             int: |A|
         """
+        # Una expresión perezosa se cuenta sin materializar el resultado
+        if hasattr(conjunto, "cardinalidad"):
+            return conjunto.cardinalidad(self)
         return len(conjunto)
 
     def obtener_todas_ubicaciones(self) -> Set[str]:
         """Retorna conjunto de todas las ubicaciones únicas"""
-        return {art.ubicacion for art in self.artefactos_dict.values()}
+        return set(self._etiquetas_ubicacion.values())
 
     def obtener_todos_tipos(self) -> Set[str]:
         """Retorna conjunto de todos los tipos únicos"""
-        return {art.tipo for art in self.artefactos_dict.values()}
+        return set(self._etiquetas_tipo.values())
+
+    def etiqueta_ubicacion(self, ubicacion: str) -> str:
+        """Etiqueta con la que se registró una ubicación (sin distinguir mayúsculas)"""
+        return self._etiquetas_ubicacion.get(normalizar_clave(ubicacion), ubicacion)
+
+    def etiqueta_tipo(self, tipo: str) -> str:
+        """Etiqueta con la que se registró un tipo (sin distinguir mayúsculas)"""
+        return self._etiquetas_tipo.get(normalizar_clave(tipo), tipo)
+
+    def iterar_artefactos(self) -> Iterator[Artefacto]:
+        """Recorre todos los artefactos registrados, sin copiarlos"""
+        return iter(self.artefactos_dict.values())
 
     def mostrar_conjunto(self, conjunto: Set[str], titulo: str = "Conjunto") -> None:
         """
@@ -152,14 +821,89 @@ class GestorConjuntos:
             conjunto (set): Conjunto a mostrar
             titulo (str): Título descriptivo
         """
-        print(f"\n{titulo}:")
-        print(f"Cardinalidad |A| = {len(conjunto)}")
-        if conjunto:
-            print(f"Elementos: {{{', '.join(sorted(conjunto))}}}")
-        else:
-            print("Conjunto vacío: ∅")
+        imprimir_conjunto(conjunto, titulo)
 
     def obtener_artefacto(self, nombre: str) -> Optional[Artefacto]:
         """Obtiene el objeto artefacto completo por nombre"""
         nombre_norm = nombre.lower().strip()
         return self.artefactos_dict.get(nombre_norm)
+
+
+# ==================== VALIDACIÓN Y PRESENTACIÓN COMPARTIDAS ====================
+#
+# Las usan GestorConjuntos y GestorSQLite, así las dos implementaciones
+# aceptan y rechazan exactamente los mismos datos.
+
+# Campos que modificar_artefacto acepta; los cuatro primeros pasan por validar_datos
+CAMPOS_VALIDADOS = ("watts", "horas_dia", "ubicacion", "tipo")
+CAMPOS_MODIFICABLES = CAMPOS_VALIDADOS + ("perfil_uso", "horarios")
+
+
+def filtrar_validos(
+    bloque: List[Artefacto], resumen: Dict[str, int], verbose: bool
+) -> List[Artefacto]:
+    """Valida un bloque artefacto por artefacto y descarta los inválidos"""
+    validos = []
+    for artefacto in bloque:
+        if not isinstance(artefacto, Artefacto):
+            error = "No es un Artefacto"
+        else:
+            try:
+                error = validar_datos(
+                    artefacto.nombre,
+                    artefacto.watts,
+                    artefacto.horas_dia,
+                    artefacto.ubicacion,
+                    artefacto.tipo,
+                )
+            except (TypeError, AttributeError):
+                error = "Datos con tipos inválidos"
+        if error is None:
+            validos.append(artefacto)
+        else:
+            resumen["rechazados"] += 1
+            if verbose:
+                print(f"✗ Artefacto rechazado: {error}")
+    return validos
+
+
+def normalizar_cambios(cambios: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Revisa los campos de modificar_artefacto y normaliza perfil y horarios
+
+    Raises:
+        ValueError: Si algún campo no se puede modificar o no es válido
+    """
+    desconocidos = [campo for campo in cambios if campo not in CAMPOS_MODIFICABLES]
+    if desconocidos:
+        raise ValueError(f"No se puede modificar: {', '.join(desconocidos)}")
+    cambios = dict(cambios)
+    if "perfil_uso" in cambios:
+        cambios["perfil_uso"] = normalizar_perfil(cambios["perfil_uso"])
+    if "horarios" in cambios:
+        cambios["horarios"] = normalizar_horarios(cambios["horarios"])
+    return cambios
+
+
+def validar_cambios(artefacto: Artefacto, cambios: Dict[str, Any]) -> None:
+    """
+    Valida el artefacto como quedaría con los cambios aplicados
+
+    Raises:
+        ValueError: Con el mensaje de validar_datos
+    """
+    valores = {campo: getattr(artefacto, campo) for campo in CAMPOS_VALIDADOS}
+    valores.update((campo, cambios[campo]) for campo in CAMPOS_VALIDADOS if campo in cambios)
+    error = validar_datos(artefacto.nombre, **valores)
+    if error is not None:
+        raise ValueError(error)
+
+
+def imprimir_conjunto(conjunto: AbstractSet[str], titulo: str) -> None:
+    """Imprime la cardinalidad y los elementos de un conjunto"""
+    print(f"\n{titulo}:")
+    print(f"Cardinalidad |A| = {len(conjunto)}")
+    if conjunto:
+        print(f"Elementos: {{{', '.join(sorted(conjunto))}}}")
+    else:
+        print("Conjunto vacío: ∅")
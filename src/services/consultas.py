@@ -0,0 +1,250 @@
+"""
+Módulo: consultas.py
+Lenguaje de consultas de conjuntos en texto
+
+Permite escribir consultas como:
+
+    (ubicacion:Cocina ∪ nivel:ALTO) ∩ ¬tipo:Iluminación
+
+y las compila a una expresión perezosa (services.expresiones) ya pasada por
+el planificador. Los planes compilados se guardan en una caché LRU cuya
+clave es el texto normalizado, así que repetir una consulta no vuelve a
+analizarla ni a planificarla.
+
+SINTAXIS:
+- Términos: ubicacion:VALOR, tipo:VALOR, nivel:ALTO|MEDIO|BAJO, U (universo).
+  Un valor con espacios u operadores va entre comillas: tipo:"Aire acond."
+- Operadores, de mayor a menor precedencia (la misma que en Python):
+    ¬A   ~A   !A   not A     Complemento
+    A - B                    Diferencia
+    A ∩ B   A & B   A and B  Intersección
+    A ∪ B   A | B   A or B   Unión
+- Paréntesis para agrupar.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Set, Tuple
+
+from services.conjuntos import GestorConjuntos
+from services.expresiones import (
+    Expresion,
+    Nivel,
+    Tipo,
+    Ubicacion,
+    Universo,
+    contar_plan,
+    evaluar_plan,
+    planificar,
+)
+
+# Cantidad de planes compilados que conserva la caché
+TAMANO_CACHE = 256
+
+DIMENSIONES = {
+    "ubicacion": Ubicacion,
+    "ubicación": Ubicacion,
+    "tipo": Tipo,
+    "nivel": Nivel,
+}
+
+# Operador canónico de cada símbolo o alias ASCII
+OPERADORES = {
+    "∪": "∪", "|": "∪", "or": "∪",
+    "∩": "∩", "&": "∩", "and": "∩",
+    "-": "-",
+    "¬": "¬", "~": "¬", "!": "¬", "not": "¬",
+}
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<termino>(?P<dimension>\w+)\s*:\s*
+            (?:"(?P<cita>[^"]*)"|(?P<valor>[^\s()∪∩¬|&~!"-]+)))
+      | (?P<operador>[∪∩¬|&~!-])
+      | (?P<parentesis>[()])
+      | (?P<palabra>\w+)
+    )
+    """,
+    re.VERBOSE,
+)
+
+Token = Tuple[str, object, int]  # (clase, valor, posición)
+
+# Valor entre comillas, con las comillas (grupo para que re.split lo conserve)
+_CITA = re.compile(r'("[^"]*")')
+
+
+def normalizar_consulta(texto: str) -> str:
+    """
+    Forma canónica del texto de una consulta (clave de la caché)
+
+    Las claves de los índices no distinguen mayúsculas, así que dos
+    consultas que solo difieren en mayúsculas o espacios dan el mismo plan.
+    Los valores entre comillas se conservan tal cual: solo se normaliza el
+    texto fuera de ellas.
+    """
+    partes = _CITA.split(texto.strip())
+    # Las partes impares son las citas que separó _CITA
+    for indice in range(0, len(partes), 2):
+        partes[indice] = re.sub(r"\s+", " ", partes[indice].lower())
+    return "".join(partes)
+
+
+def _tokenizar(texto: str) -> List[Token]:
+    """Divide el texto en tokens; ValueError si hay caracteres no válidos"""
+    tokens: List[Token] = []
+    posicion = 0
+    texto = texto.rstrip()
+    while posicion < len(texto):
+        coincidencia = _TOKEN.match(texto, posicion)
+        if coincidencia is None:
+            resto = texto[posicion:].lstrip()
+            raise ValueError(f"Carácter inesperado en la consulta: {resto[0]!r}")
+        inicio = coincidencia.start(coincidencia.lastgroup)
+        if coincidencia.group("termino"):
+            dimension = coincidencia.group("dimension")
+            if dimension not in DIMENSIONES:
+                raise ValueError(
+                    f"Dimensión desconocida: {dimension!r} "
+                    f"(usar ubicacion, tipo o nivel)"
+                )
+            valor = coincidencia.group("cita")
+            if valor is None:
+                valor = coincidencia.group("valor")
+            tokens.append(("hoja", DIMENSIONES[dimension](valor), inicio))
+        elif coincidencia.group("operador"):
+            tokens.append(("op", OPERADORES[coincidencia.group("operador")], inicio))
+        elif coincidencia.group("parentesis"):
+            tokens.append((coincidencia.group("parentesis"), None, inicio))
+        else:
+            palabra = coincidencia.group("palabra")
+            if palabra in OPERADORES:
+                tokens.append(("op", OPERADORES[palabra], inicio))
+            elif palabra in ("u", "universo"):
+                tokens.append(("hoja", Universo(), inicio))
+            else:
+                raise ValueError(f"Término no válido: {palabra!r} (falta 'dimension:')")
+        posicion = coincidencia.end()
+    return tokens
+
+
+class _Analizador:
+    """Analizador descendente recursivo, un método por nivel de precedencia"""
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self.tokens = tokens
+        self.posicion = 0
+
+    def _siguiente(self) -> Token:
+        if self.posicion < len(self.tokens):
+            return self.tokens[self.posicion]
+        return ("fin", None, -1)
+
+    def _es_operador(self, operador: str) -> bool:
+        clase, valor, _ = self._siguiente()
+        if clase == "op" and valor == operador:
+            self.posicion += 1
+            return True
+        return False
+
+    def analizar(self) -> Expresion:
+        expresion = self._union()
+        clase, _, inicio = self._siguiente()
+        if clase != "fin":
+            raise ValueError(f"Token inesperado en la posición {inicio}")
+        return expresion
+
+    def _union(self) -> Expresion:
+        expresion = self._interseccion()
+        while self._es_operador("∪"):
+            expresion = expresion | self._interseccion()
+        return expresion
+
+    def _interseccion(self) -> Expresion:
+        expresion = self._diferencia()
+        while self._es_operador("∩"):
+            expresion = expresion & self._diferencia()
+        return expresion
+
+    def _diferencia(self) -> Expresion:
+        expresion = self._complemento()
+        while self._es_operador("-"):
+            expresion = expresion - self._complemento()
+        return expresion
+
+    def _complemento(self) -> Expresion:
+        if self._es_operador("¬"):
+            return ~self._complemento()
+        clase, valor, inicio = self._siguiente()
+        if clase == "hoja":
+            self.posicion += 1
+            return valor
+        if clase == "(":
+            self.posicion += 1
+            expresion = self._union()
+            if self._siguiente()[0] != ")":
+                raise ValueError("Falta cerrar un paréntesis")
+            self.posicion += 1
+            return expresion
+        if clase == "fin":
+            raise ValueError("La consulta termina antes de lo esperado")
+        raise ValueError(f"Se esperaba un término en la posición {inicio}")
+
+
+def analizar(texto: str) -> Expresion:
+    """
+    Convierte el texto de una consulta en una expresión (sin planificar)
+
+    Raises:
+        ValueError: Si la consulta está vacía o mal formada
+    """
+    if not texto.strip():
+        raise ValueError("La consulta está vacía")
+    return _Analizador(_tokenizar(texto)).analizar()
+
+
+@lru_cache(maxsize=TAMANO_CACHE)
+def _compilar_normalizada(texto_normalizado: str) -> Expresion:
+    return planificar(analizar(texto_normalizado))
+
+
+def compilar(texto: str) -> Expresion:
+    """
+    Compila una consulta a un plan ejecutable, usando la caché LRU
+
+    Args:
+        texto (str): Consulta (ver la sintaxis al inicio del módulo)
+
+    Returns:
+        Expresion: Plan listo para evaluar contra cualquier gestor
+
+    Raises:
+        ValueError: Si la consulta está mal formada
+    """
+    return _compilar_normalizada(normalizar_consulta(texto))
+
+
+def consultar(gestor: GestorConjuntos, texto: str) -> Set[str]:
+    """
+    Ejecuta una consulta en texto sobre los índices de un gestor
+
+    Returns:
+        set: Nombres de los artefactos del resultado
+    """
+    return evaluar_plan(compilar(texto), gestor)
+
+
+def contar(gestor: GestorConjuntos, texto: str) -> int:
+    """Cardinalidad del resultado de una consulta, sin materializarlo si se puede"""
+    return contar_plan(compilar(texto), gestor)
+
+
+def info_cache():
+    """Aciertos, fallos y tamaño de la caché de planes compilados"""
+    return _compilar_normalizada.cache_info()
+
+
+def limpiar_cache() -> None:
+    """Vacía la caché de planes compilados"""
+    _compilar_normalizada.cache_clear()
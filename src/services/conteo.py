@@ -9,17 +9,109 @@ CONCEPTOS MATEMÁTICOS APLICADOS:
 - Estadísticas descriptivas
 """
 
-from typing import Dict, List, Tuple
+import heapq
+from operator import attrgetter, methodcaller
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from models.artefacto import Artefacto
 from services.conjuntos import GestorConjuntos
+from services.tarifas import Tarifa, calcular_costos
+
+# Dimensiones por las que se puede agrupar y cómo se obtienen de un artefacto
+DIMENSIONES: Dict[str, Callable[[Artefacto], str]] = {
+    "ubicacion": attrgetter("ubicacion"),
+    "tipo": attrgetter("tipo"),
+    "nivel": methodcaller("nivel_consumo"),
+}
+
+# Resultado de una agrupación: {claves del grupo: (cantidad, consumo_kWh)}
+Agrupacion = Dict[Tuple[str, ...], Tuple[int, float]]
 
 
 class AnalizadorConteo:
     """
     Realiza análisis de conteo y estadísticas sobre los artefactos
+
+    Con una tarifa, los reportes incluyen además el costo mensual.
     """
 
-    def __init__(self, gestor_conjuntos: GestorConjuntos) -> None:
+    def __init__(
+        self, gestor_conjuntos: GestorConjuntos, tarifa: Optional[Tarifa] = None
+    ) -> None:
         self.gestor: GestorConjuntos = gestor_conjuntos
+        self.tarifa: Optional[Tarifa] = tarifa
+
+    # ==================== MOTOR DE AGRUPACIÓN ====================
+
+    def agrupar(self, *dimensiones: str) -> Agrupacion:
+        """
+        Cuenta artefactos y suma su consumo mensual por grupos, en una sola pasada
+
+        Ejemplo: agrupar("ubicacion", "nivel") devuelve un grupo por cada par
+        (ubicación, nivel) presente, como ("Cocina", "ALTO").
+
+        Args:
+            *dimensiones (str): Una o más de 'ubicacion', 'tipo' y 'nivel'
+
+        Returns:
+            dict: {(valor_1, ..., valor_k): (cantidad, consumo_kWh)}
+        """
+        if not dimensiones:
+            raise ValueError("Se necesita al menos una dimensión")
+        desconocidas = [d for d in dimensiones if d not in DIMENSIONES]
+        if desconocidas:
+            raise ValueError(
+                f"Dimensión no válida: {', '.join(desconocidas)} "
+                f"(opciones: {', '.join(DIMENSIONES)})"
+            )
+
+        clave_de = _funcion_clave(dimensiones)
+        cantidades: Dict[Tuple[str, ...], int] = {}
+        consumos: Dict[Tuple[str, ...], float] = {}
+        for artefacto in self.gestor.iterar_artefactos():
+            clave = clave_de(artefacto)
+            if clave in cantidades:
+                cantidades[clave] += 1
+                consumos[clave] += artefacto.consumo_mensual()
+            else:
+                cantidades[clave] = 1
+                consumos[clave] = artefacto.consumo_mensual()
+
+        return self._unificar_etiquetas(dimensiones, cantidades, consumos)
+
+    def _unificar_etiquetas(
+        self,
+        dimensiones: Tuple[str, ...],
+        cantidades: Dict[Tuple[str, ...], int],
+        consumos: Dict[Tuple[str, ...], float],
+    ) -> Agrupacion:
+        """
+        Reemplaza ubicaciones y tipos por la etiqueta registrada en el gestor
+
+        Así 'cocina' y 'Cocina' caen en el mismo grupo, igual que en los
+        índices. Recorre los grupos, no los artefactos.
+        """
+        etiquetar = [
+            self.gestor.etiqueta_ubicacion
+            if dimension == "ubicacion"
+            else self.gestor.etiqueta_tipo
+            if dimension == "tipo"
+            else None
+            for dimension in dimensiones
+        ]
+        resultado: Agrupacion = {}
+        for clave, cantidad in cantidades.items():
+            grupo = tuple(
+                valor if funcion is None else funcion(valor)
+                for funcion, valor in zip(etiquetar, clave)
+            )
+            cantidad_previa, consumo_previo = resultado.get(grupo, (0, 0.0))
+            resultado[grupo] = (
+                cantidad_previa + cantidad,
+                consumo_previo + consumos[clave],
+            )
+        return resultado
+
+    # ==================== CONTEOS ====================
 
     def contar_por_ubicacion(self) -> Dict[str, int]:
         """
@@ -28,11 +120,7 @@ class AnalizadorConteo:
         Returns:
             dict: {ubicacion: cantidad}
         """
-        conteo = {}
-        for ubicacion in self.gestor.obtener_todas_ubicaciones():
-            conjunto = self.gestor.obtener_por_ubicacion(ubicacion)
-            conteo[ubicacion] = len(conjunto)
-        return conteo
+        return self.gestor.contar_por_ubicacion()
 
     def contar_por_tipo(self) -> Dict[str, int]:
         """
@@ -41,11 +129,7 @@ class AnalizadorConteo:
         Returns:
             dict: {tipo: cantidad}
         """
-        conteo = {}
-        for tipo in self.gestor.obtener_todos_tipos():
-            conjunto = self.gestor.obtener_por_tipo(tipo)
-            conteo[tipo] = len(conjunto)
-        return conteo
+        return self.gestor.contar_por_tipo()
 
     def contar_por_nivel_consumo(self) -> Dict[str, int]:
         """
@@ -54,11 +138,7 @@ class AnalizadorConteo:
         Returns:
             dict: {nivel: cantidad}
         """
-        conteo = {}
-        for nivel in ["ALTO", "MEDIO", "BAJO"]:
-            conjunto = self.gestor.obtener_por_nivel_consumo(nivel)
-            conteo[nivel] = len(conjunto)
-        return conteo
+        return self.gestor.contar_por_nivel()
 
     def calcular_porcentajes_consumo(self) -> Dict[str, float]:
         """
@@ -68,7 +148,7 @@ class AnalizadorConteo:
             dict: {nivel: porcentaje}
         """
         conteo = self.contar_por_nivel_consumo()
-        total = len(self.gestor.universo)
+        total = self.gestor.total_artefactos()
 
         if total == 0:
             return {"ALTO": 0, "MEDIO": 0, "BAJO": 0}
@@ -79,13 +159,12 @@ class AnalizadorConteo:
         """
         Calcula el consumo mensual total de todos los artefactos
 
+        Lee el total que el gestor mantiene actualizado: no recorre el inventario.
+
         Returns:
             float: Consumo total en kWh
         """
-        total = 0
-        for artefacto in self.gestor.artefactos_dict.values():
-            total += artefacto.consumo_mensual()
-        return total
+        return self.gestor.consumo_total_kwh()
 
     def consumo_por_ubicacion(self) -> Dict[str, float]:
         """
@@ -94,14 +173,7 @@ class AnalizadorConteo:
         Returns:
             dict: {ubicacion: consumo_kWh}
         """
-        consumo = {}
-        for ubicacion in self.gestor.obtener_todas_ubicaciones():
-            conjunto = self.gestor.obtener_por_ubicacion(ubicacion)
-            consumo[ubicacion] = sum(
-                self.gestor.obtener_artefacto(nombre).consumo_mensual()
-                for nombre in conjunto
-            )
-        return consumo
+        return self.gestor.consumo_por_ubicacion_kwh()
 
     def consumo_por_tipo(self) -> Dict[str, float]:
         """
@@ -110,14 +182,7 @@ class AnalizadorConteo:
         Returns:
             dict: {tipo: consumo_kWh}
         """
-        consumo = {}
-        for tipo in self.gestor.obtener_todos_tipos():
-            conjunto = self.gestor.obtener_por_tipo(tipo)
-            consumo[tipo] = sum(
-                self.gestor.obtener_artefacto(nombre).consumo_mensual()
-                for nombre in conjunto
-            )
-        return consumo
+        return self.gestor.consumo_por_tipo_kwh()
 
     def mayores_consumidores(self, n: int = 5) -> List[Tuple[str, float]]:
         """
@@ -129,12 +194,68 @@ class AnalizadorConteo:
         Returns:
             list: Lista de tuplas (nombre, consumo_kWh)
         """
-        consumos = [
-            (nombre, art.consumo_mensual())
-            for nombre, art in self.gestor.artefactos_dict.items()
-        ]
-        consumos_ordenados = sorted(consumos, key=lambda x: x[1], reverse=True)
-        return consumos_ordenados[:n]
+        return self.gestor.rango_ranking(0, n)
+
+    def menores_consumidores(self, n: int = 5) -> List[Tuple[str, float]]:
+        """
+        Identifica los N artefactos con menor consumo, del menor al mayor
+
+        Args:
+            n (int): Cantidad de artefactos a retornar
+
+        Returns:
+            list: Lista de tuplas (nombre, consumo_kWh)
+        """
+        total = self.gestor.total_artefactos()
+        return self.gestor.rango_ranking(total - n, total)[::-1]
+
+    def ranking(self, offset: int = 0, limit: int = 10) -> List[Tuple[str, float]]:
+        """
+        Página del ranking de artefactos por consumo, de mayor a menor
+
+        Args:
+            offset (int): Posición inicial (0 es el mayor consumidor)
+            limit (int): Cantidad máxima de artefactos de la página
+
+        Returns:
+            list: Lista de tuplas (nombre, consumo_kWh)
+        """
+        return self.gestor.rango_ranking(offset, offset + limit)
+
+    # ==================== COSTOS ====================
+
+    def costos(self) -> Dict[str, Any]:
+        """
+        Calcula el costo mensual con la tarifa del analizador
+
+        Returns:
+            dict: Resultado de tarifas.calcular_costos (total, por artefacto,
+            por ubicación, ...)
+
+        Raises:
+            ValueError: Si el analizador no tiene tarifa
+        """
+        if self.tarifa is None:
+            raise ValueError("No hay una tarifa configurada")
+        return calcular_costos(self.gestor, self.tarifa)
+
+    def costo_total_mensual(self) -> float:
+        """
+        Calcula el costo mensual total: cargo fijo, escalones y franjas
+
+        Returns:
+            float: Costo total del mes
+        """
+        return self.costos()["total"]
+
+    def costo_por_ubicacion(self) -> Dict[str, float]:
+        """
+        Calcula el costo mensual de la energía agrupado por ubicación
+
+        Returns:
+            dict: {ubicacion: costo}
+        """
+        return self.costos()["por_ubicacion"]
 
     def generar_reporte_estadistico(self) -> str:
         """
@@ -148,7 +269,7 @@ class AnalizadorConteo:
         reporte += "=" * 60 + "\n\n"
 
         # Cardinalidad del universo
-        total = len(self.gestor.universo)
+        total = self.gestor.total_artefactos()
         reporte += "📊 CARDINALIDAD DEL UNIVERSO\n"
         reporte += f"   Total de artefactos: |U| = {total}\n\n"
 
@@ -193,6 +314,79 @@ class AnalizadorConteo:
                 f"   {i}. {nombre.title()}: {consumo:.2f} kWh ({porcentaje:.1f}%)\n"
             )
 
+        if self.tarifa is not None:
+            reporte += "\n" + self._seccion_costos()
+
         reporte += "\n" + "=" * 60 + "\n"
 
         return reporte
+
+    def resumen_estadistico(self) -> Dict[str, Any]:
+        """
+        Datos del reporte estadístico, listos para serializar como JSON
+
+        Returns:
+            dict: Cardinalidad, conteos por ubicación, tipo y nivel, consumo
+            y los 5 mayores consumidores; con tarifa, también los costos
+            (sin el detalle por artefacto)
+        """
+        consumo_total = self.consumo_total_mensual()
+        resumen: Dict[str, Any] = {
+            "artefactos": self.gestor.total_artefactos(),
+            "por_ubicacion": self.contar_por_ubicacion(),
+            "por_tipo": self.contar_por_tipo(),
+            "por_nivel": self.contar_por_nivel_consumo(),
+            "porcentajes_nivel": self.calcular_porcentajes_consumo(),
+            "consumo_mensual_kwh": consumo_total,
+            "consumo_diario_kwh": consumo_total / 30,
+            "consumo_por_ubicacion": self.consumo_por_ubicacion(),
+            "consumo_por_tipo": self.consumo_por_tipo(),
+            "mayores_consumidores": [
+                {"nombre": nombre, "consumo_kwh": consumo}
+                for nombre, consumo in self.mayores_consumidores(5)
+            ],
+        }
+        if self.tarifa is not None:
+            costos = self.costos()
+            resumen["costos"] = {
+                "tarifa": self.tarifa.nombre,
+                **{clave: valor for clave, valor in costos.items() if clave != "por_artefacto"},
+            }
+        return resumen
+
+    def _seccion_costos(self) -> str:
+        """Sección del reporte con el costo mensual según la tarifa"""
+        costos = self.costos()
+        seccion = f"💲 COSTO MENSUAL (tarifa: {self.tarifa.nombre})\n"
+        seccion += f"   Cargo fijo:              $ {costos['cargo_fijo']:,.2f}\n"
+        seccion += f"   Energía (escalones):     $ {costos['energia']:,.2f}\n"
+        if self.tarifa.franjas:
+            seccion += f"   Recargos por franja:     $ {costos['franjas']:,.2f}\n"
+        seccion += f"   Total:                   $ {costos['total']:,.2f}\n"
+        seccion += f"   Precio medio:            $ {costos['precio_medio']:,.2f} por kWh\n\n"
+
+        seccion += "   Por ubicación:\n"
+        for ubicacion, costo in sorted(
+            costos["por_ubicacion"].items(), key=lambda x: x[1], reverse=True
+        ):
+            seccion += f"   {ubicacion}: $ {costo:,.2f}\n"
+
+        seccion += "\n   Artefactos más caros:\n"
+        mayores = heapq.nsmallest(5, costos["por_artefacto"].items(), key=lambda x: (-x[1], x[0]))
+        for i, (nombre, costo) in enumerate(mayores, 1):
+            seccion += f"   {i}. {nombre.title()}: $ {costo:,.2f}\n"
+        return seccion
+
+
+def _funcion_clave(
+    dimensiones: Tuple[str, ...]
+) -> Callable[[Artefacto], Tuple[str, ...]]:
+    """Arma la función que obtiene la clave de grupo de un artefacto"""
+    extractores = [DIMENSIONES[dimension] for dimension in dimensiones]
+    if len(extractores) == 1:
+        (primero,) = extractores
+        return lambda artefacto: (primero(artefacto),)
+    if len(extractores) == 2:
+        primero, segundo = extractores
+        return lambda artefacto: (primero(artefacto), segundo(artefacto))
+    return lambda artefacto: tuple(extraer(artefacto) for extraer in extractores)
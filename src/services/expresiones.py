@@ -0,0 +1,522 @@
+"""
+Módulo: expresiones.py
+Expresiones de conjuntos perezosas con planificador de consultas
+
+Una expresión describe una consulta sin calcularla todavía:
+
+    Ubicacion("Cocina") | Nivel("ALTO") - Tipo("Iluminación")
+
+construye un árbol con las operaciones ∪ (|), ∩ (&), - y complemento (~).
+Al evaluarla contra un GestorConjuntos:
+
+1. El planificador reescribe el árbol sin mirar los datos: aplana uniones e
+   intersecciones anidadas, baja las intersecciones por debajo de las
+   diferencias (A ∩ (B - C) = (A ∩ B) - C), convierte A ∩ ¬B en A - B y
+   descarta operandos que se sabe vacíos (dos ubicaciones distintas nunca
+   se intersecan).
+2. El evaluador ordena los operandos por cardinalidad estimada con los
+   tamaños de los índices, empieza por el más chico, corta en cuanto un
+   resultado parcial queda vacío y, cuando el parcial es más chico que el
+   operando siguiente, lo filtra por pertenencia en lugar de calcularlo.
+
+Solo se materializa el resultado final. cardinalidad() responde a partir de
+los tamaños de los índices, o contando sin armar conjuntos, cuando la forma
+de la expresión lo permite.
+
+Un gestor que sepa resolver el plan completo por su cuenta (GestorSQLite lo
+traduce a una sola consulta SQL) define evaluar_plan y contar_plan; en ese
+caso se usan esos métodos en lugar del evaluador de este módulo.
+"""
+
+from typing import AbstractSet, Dict, List, Set, Tuple
+
+from services.conjuntos import GestorConjuntos, normalizar_clave
+
+
+class Expresion:
+    """Nodo de una expresión de conjuntos (base de hojas y operaciones)"""
+
+    __slots__ = ()
+
+    # ==================== CONSTRUCCIÓN ====================
+
+    def __or__(self, otra: "Expresion") -> "Expresion":
+        return Union(self, otra)
+
+    def __and__(self, otra: "Expresion") -> "Expresion":
+        return Interseccion(self, otra)
+
+    def __sub__(self, otra: "Expresion") -> "Expresion":
+        return Diferencia(self, otra)
+
+    def __invert__(self) -> "Expresion":
+        return Complemento(self)
+
+    def _partes(self) -> tuple:
+        raise NotImplementedError
+
+    def __eq__(self, otra: object) -> bool:
+        return type(self) is type(otra) and self._partes() == otra._partes()
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self._partes()))
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    # ==================== EVALUACIÓN ====================
+
+    def planificar(self) -> "Expresion":
+        """Devuelve la expresión equivalente reescrita por el planificador"""
+        return planificar(self)
+
+    def evaluar(self, gestor: GestorConjuntos) -> Set[str]:
+        """
+        Calcula el resultado de la expresión
+
+        Args:
+            gestor (GestorConjuntos): Gestor con los índices a consultar
+
+        Returns:
+            set: Nombres de los artefactos del resultado (copia propia)
+        """
+        return evaluar_plan(planificar(self), gestor)
+
+    def cardinalidad(self, gestor: GestorConjuntos) -> int:
+        """Cantidad de artefactos del resultado, sin materializarlo si se puede"""
+        return contar_plan(planificar(self), gestor)
+
+
+# ==================== HOJAS ====================
+
+
+class Indice(Expresion):
+    """Subconjunto de un índice del gestor: dimensión = valor"""
+
+    __slots__ = ("valor",)
+
+    dimension = ""
+
+    def __init__(self, valor: str) -> None:
+        self.valor = self._normalizar(valor)
+
+    @staticmethod
+    def _normalizar(valor: str) -> str:
+        return normalizar_clave(valor.strip())
+
+    def _partes(self) -> tuple:
+        return (self.dimension, self.valor)
+
+    def __str__(self) -> str:
+        return f"{self.dimension}:{self.valor}"
+
+
+class Ubicacion(Indice):
+    """Artefactos de una ubicación"""
+
+    __slots__ = ()
+    dimension = "ubicacion"
+
+
+class Tipo(Indice):
+    """Artefactos de un tipo"""
+
+    __slots__ = ()
+    dimension = "tipo"
+
+
+class Nivel(Indice):
+    """Artefactos de un nivel de consumo (ALTO, MEDIO o BAJO)"""
+
+    __slots__ = ()
+    dimension = "nivel"
+
+    @staticmethod
+    def _normalizar(valor: str) -> str:
+        return valor.strip().upper()
+
+
+class Universo(Expresion):
+    """Todos los artefactos registrados (U)"""
+
+    __slots__ = ()
+
+    def _partes(self) -> tuple:
+        return ()
+
+    def __str__(self) -> str:
+        return "U"
+
+
+class Vacio(Expresion):
+    """Conjunto vacío (∅); lo produce el planificador"""
+
+    __slots__ = ()
+
+    def _partes(self) -> tuple:
+        return ()
+
+    def __str__(self) -> str:
+        return "∅"
+
+
+# ==================== OPERACIONES ====================
+
+
+class Union(Expresion):
+    """A ∪ B ∪ ..."""
+
+    __slots__ = ("hijos",)
+
+    def __init__(self, *hijos: Expresion) -> None:
+        self.hijos: Tuple[Expresion, ...] = hijos
+
+    def _partes(self) -> tuple:
+        return self.hijos
+
+    def __str__(self) -> str:
+        return "(" + " ∪ ".join(map(str, self.hijos)) + ")"
+
+
+class Interseccion(Expresion):
+    """A ∩ B ∩ ..."""
+
+    __slots__ = ("hijos",)
+
+    def __init__(self, *hijos: Expresion) -> None:
+        self.hijos: Tuple[Expresion, ...] = hijos
+
+    def _partes(self) -> tuple:
+        return self.hijos
+
+    def __str__(self) -> str:
+        return "(" + " ∩ ".join(map(str, self.hijos)) + ")"
+
+
+class Diferencia(Expresion):
+    """A - B"""
+
+    __slots__ = ("a", "b")
+
+    def __init__(self, a: Expresion, b: Expresion) -> None:
+        self.a = a
+        self.b = b
+
+    def _partes(self) -> tuple:
+        return (self.a, self.b)
+
+    def __str__(self) -> str:
+        return f"({self.a} - {self.b})"
+
+
+class Complemento(Expresion):
+    """U - A"""
+
+    __slots__ = ("a",)
+
+    def __init__(self, a: Expresion) -> None:
+        self.a = a
+
+    def _partes(self) -> tuple:
+        return (self.a,)
+
+    def __str__(self) -> str:
+        return f"¬{self.a}"
+
+
+# ==================== PLANIFICADOR ====================
+
+
+def _sin_repetidos(hijos: List[Expresion]) -> List[Expresion]:
+    return list(dict.fromkeys(hijos))
+
+
+def _union_de(hijos: List[Expresion]) -> Expresion:
+    return hijos[0] if len(hijos) == 1 else Union(*hijos)
+
+
+def _interseccion_de(hijos: List[Expresion]) -> Expresion:
+    return hijos[0] if len(hijos) == 1 else Interseccion(*hijos)
+
+
+def planificar(expresion: Expresion) -> Expresion:
+    """
+    Reescribe una expresión en una forma equivalente más barata de evaluar
+
+    Las reglas solo usan la estructura de la expresión (no los datos), así
+    que el plan sirve para cualquier inventario.
+
+    Returns:
+        Expresion: Expresión equivalente
+    """
+    if isinstance(expresion, Union):
+        return _planificar_union([planificar(h) for h in expresion.hijos])
+    if isinstance(expresion, Interseccion):
+        return _planificar_interseccion([planificar(h) for h in expresion.hijos])
+    if isinstance(expresion, Diferencia):
+        return _planificar_diferencia(planificar(expresion.a), planificar(expresion.b))
+    if isinstance(expresion, Complemento):
+        return _planificar_diferencia(Universo(), planificar(expresion.a))
+    return expresion
+
+
+def _planificar_union(hijos: List[Expresion]) -> Expresion:
+    planos: List[Expresion] = []
+    for hijo in hijos:
+        if isinstance(hijo, Union):
+            planos.extend(hijo.hijos)
+        elif isinstance(hijo, Universo):
+            return hijo
+        elif not isinstance(hijo, Vacio):
+            planos.append(hijo)
+    planos = _sin_repetidos(planos)
+    return _union_de(planos) if planos else Vacio()
+
+
+def _planificar_interseccion(hijos: List[Expresion]) -> Expresion:
+    positivos: List[Expresion] = []
+    negativos: List[Expresion] = []
+    pendientes = list(hijos)
+    while pendientes:
+        hijo = pendientes.pop()
+        if isinstance(hijo, Vacio):
+            return hijo
+        if isinstance(hijo, Interseccion):
+            pendientes.extend(hijo.hijos)
+        elif isinstance(hijo, Diferencia):
+            # A ∩ (B - C) = (A ∩ B) - C: la intersección se calcula primero
+            pendientes.append(hijo.a)
+            negativos.append(hijo.b)
+        elif isinstance(hijo, Complemento):
+            negativos.append(hijo.a)
+        elif not isinstance(hijo, Universo):
+            positivos.append(hijo)
+    positivos = _sin_repetidos(positivos[::-1])
+
+    # Cada artefacto tiene un solo valor por dimensión
+    valores: Dict[str, str] = {}
+    for hijo in positivos:
+        if isinstance(hijo, Indice):
+            if valores.setdefault(hijo.dimension, hijo.valor) != hijo.valor:
+                return Vacio()
+
+    base = _interseccion_de(positivos) if positivos else Universo()
+    if not negativos:
+        return base
+    return _planificar_diferencia(base, _planificar_union(negativos))
+
+
+def _planificar_diferencia(a: Expresion, b: Expresion) -> Expresion:
+    if isinstance(a, Vacio) or isinstance(b, Universo) or a == b:
+        return Vacio()
+    if isinstance(b, Vacio):
+        return a
+    if isinstance(a, Diferencia):
+        # (A - B) - C = A - (B ∪ C)
+        return _planificar_diferencia(a.a, _planificar_union([a.b, b]))
+    if isinstance(b, Diferencia) and isinstance(b.a, Universo):
+        # A - ¬B = A ∩ B
+        return _planificar_interseccion([a, b.b])
+    if (
+        isinstance(a, Indice)
+        and isinstance(b, Indice)
+        and a.dimension == b.dimension
+    ):
+        # Valores distintos de una misma dimensión son disjuntos
+        return a
+    return Diferencia(a, b)
+
+
+# ==================== EVALUACIÓN ====================
+
+
+def evaluar_plan(plan: Expresion, gestor: GestorConjuntos) -> Set[str]:
+    """
+    Evalúa una expresión ya planificada (sin volver a planificarla)
+
+    Returns:
+        set: Nombres de los artefactos del resultado (copia propia)
+    """
+    propio = getattr(gestor, "evaluar_plan", None)
+    if propio is not None:
+        return propio(plan)
+    evaluador = _Evaluador(gestor)
+    resultado = evaluador.materializar(plan)
+    if evaluador.es_vista(resultado):
+        return set(resultado)
+    return resultado
+
+
+def contar_plan(plan: Expresion, gestor: GestorConjuntos) -> int:
+    """Cardinalidad de una expresión ya planificada"""
+    propio = getattr(gestor, "contar_plan", None)
+    if propio is not None:
+        return propio(plan)
+    return _Evaluador(gestor).contar(plan)
+
+
+class _Evaluador:
+    """Evalúa un plan contra los índices de un gestor"""
+
+    def __init__(self, gestor: GestorConjuntos) -> None:
+        self.gestor = gestor
+        self._estimaciones: Dict[Expresion, int] = {}
+        # Hojas ya pedidas al gestor en esta evaluación
+        self._hojas: Dict[Expresion, AbstractSet[str]] = {}
+        # Conjuntos internos del gestor entregados sin copiar
+        self._vistas: Set[int] = set()
+        self._total = gestor.total_artefactos()
+
+    def es_vista(self, conjunto: AbstractSet[str]) -> bool:
+        """Indica si el conjunto es interno del gestor (no modificable)"""
+        return id(conjunto) in self._vistas or not isinstance(conjunto, set)
+
+    def estimar(self, expresion: Expresion) -> int:
+        """Cota superior de la cardinalidad, calculada con tamaños de índice"""
+        estimacion = self._estimaciones.get(expresion)
+        if estimacion is not None:
+            return estimacion
+        total = self._total
+        if isinstance(expresion, Indice):
+            estimacion = self.gestor.tamano_indice(expresion.dimension, expresion.valor)
+        elif isinstance(expresion, Universo):
+            estimacion = total
+        elif isinstance(expresion, Vacio):
+            estimacion = 0
+        elif isinstance(expresion, Union):
+            estimacion = min(total, sum(map(self.estimar, expresion.hijos)))
+        elif isinstance(expresion, Interseccion):
+            estimacion = min(map(self.estimar, expresion.hijos))
+        elif isinstance(expresion, Diferencia):
+            estimacion = self.estimar(expresion.a)
+        else:
+            estimacion = total
+        self._estimaciones[expresion] = estimacion
+        return estimacion
+
+    def _hoja(self, expresion: Expresion) -> AbstractSet[str]:
+        """Conjunto de una hoja, sin copiar (o None si no es hoja)"""
+        hoja = self._hojas.get(expresion)
+        if hoja is not None:
+            return hoja
+        if isinstance(expresion, Indice):
+            hoja = self.gestor.vista_indice(expresion.dimension, expresion.valor)
+        elif isinstance(expresion, Universo):
+            hoja = self.gestor.universo
+        elif isinstance(expresion, Vacio):
+            return frozenset()
+        else:
+            return None
+        self._hojas[expresion] = hoja
+        self._vistas.add(id(hoja))
+        return hoja
+
+    def contiene(self, expresion: Expresion, nombre: str) -> bool:
+        """Prueba de pertenencia sin materializar la expresión"""
+        hoja = self._hoja(expresion)
+        if hoja is not None:
+            return nombre in hoja
+        if isinstance(expresion, Union):
+            return any(self.contiene(h, nombre) for h in expresion.hijos)
+        if isinstance(expresion, Interseccion):
+            return all(self.contiene(h, nombre) for h in expresion.hijos)
+        if isinstance(expresion, Diferencia):
+            return self.contiene(expresion.a, nombre) and not self.contiene(
+                expresion.b, nombre
+            )
+        return not self.contiene(expresion.a, nombre)
+
+    def materializar(self, expresion: Expresion) -> AbstractSet[str]:
+        """
+        Calcula el conjunto de una expresión planificada
+
+        Returns:
+            set: Resultado. Puede ser un conjunto interno del gestor, que
+            no debe modificarse.
+        """
+        hoja = self._hoja(expresion)
+        if hoja is not None:
+            return hoja
+        if isinstance(expresion, Interseccion):
+            return self._filtrar(expresion.hijos)
+        if isinstance(expresion, Union):
+            return self._unir(expresion.hijos)
+        if isinstance(expresion, Diferencia):
+            return self._restar(self.materializar(expresion.a), expresion.b)
+        return self.gestor.universo - self.materializar(expresion.a)
+
+    def _filtrar(self, hijos) -> AbstractSet[str]:
+        """Intersección: de menor a mayor estimación, cortando si queda vacía"""
+        ordenados = sorted(hijos, key=self.estimar)
+        if self.estimar(ordenados[0]) == 0:
+            return frozenset()
+        resultado = self.materializar(ordenados[0])
+        for hijo in ordenados[1:]:
+            if not resultado:
+                break
+            hoja = self._hoja(hijo)
+            if hoja is not None:
+                resultado = resultado & hoja
+            elif len(resultado) < self.estimar(hijo):
+                resultado = {n for n in resultado if self.contiene(hijo, n)}
+            else:
+                resultado = resultado & self.materializar(hijo)
+        return resultado
+
+    def _unir(self, hijos) -> AbstractSet[str]:
+        """Unión: parte del operando más grande y descarta los vacíos"""
+        ordenados = sorted(hijos, key=self.estimar, reverse=True)
+        resultado = set(self.materializar(ordenados[0]))
+        for hijo in ordenados[1:]:
+            if len(resultado) == self._total:
+                break
+            if self.estimar(hijo):
+                resultado |= self.materializar(hijo)
+        return resultado
+
+    def _restar(self, a: AbstractSet[str], b: Expresion) -> AbstractSet[str]:
+        """Diferencia: filtra A por pertenencia si A es más chico que B"""
+        if not a or self.estimar(b) == 0:
+            return a
+        if self._hoja(b) is None and len(a) < self.estimar(b):
+            return {n for n in a if not self.contiene(b, n)}
+        return a - self.materializar(b)
+
+    def contar(self, expresion: Expresion) -> int:
+        """Cardinalidad de una expresión planificada"""
+        if isinstance(expresion, Indice):
+            return self.estimar(expresion)
+        if isinstance(expresion, Universo):
+            return self._total
+        if isinstance(expresion, Vacio):
+            return 0
+        if isinstance(expresion, Complemento):
+            return self._total - self.contar(expresion.a)
+        if isinstance(expresion, Union):
+            hijos = expresion.hijos
+            dimensiones = {getattr(h, "dimension", None) for h in hijos}
+            if len(dimensiones) == 1 and None not in dimensiones:
+                # Valores de una misma dimensión: subconjuntos disjuntos
+                return sum(map(self.contar, hijos))
+            if len(hijos) == 2:
+                # Inclusión-exclusión: |A ∪ B| = |A| + |B| - |A ∩ B|
+                comun = _planificar_interseccion(list(hijos))
+                return self.contar(hijos[0]) + self.contar(hijos[1]) - self.contar(comun)
+        if isinstance(expresion, Interseccion):
+            hojas = [h for h in expresion.hijos if self._hoja(h) is not None]
+            if hojas:
+                # Recorre la hoja más chica y prueba pertenencia en el resto
+                menor = min(hojas, key=self.estimar)
+                resto = [h for h in expresion.hijos if h is not menor]
+                return sum(
+                    1
+                    for n in self._hoja(menor)
+                    if all(self.contiene(h, n) for h in resto)
+                )
+        if isinstance(expresion, Diferencia):
+            if isinstance(expresion.a, Universo):
+                return self._total - self.contar(expresion.b)
+            a = self._hoja(expresion.a)
+            if a is not None:
+                return sum(1 for n in a if not self.contiene(expresion.b, n))
+        return len(self.materializar(expresion))
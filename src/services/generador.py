@@ -0,0 +1,483 @@
+"""
+Módulo: generador.py
+Inventarios sintéticos reproducibles para pruebas de carga
+
+Genera millones de artefactos realistas a partir de una semilla, siempre
+los mismos para la misma semilla y la misma configuración:
+
+- Nivel de consumo: cada fila sortea ALTO, MEDIO o BAJO según
+  PROPORCIONES (configurables).
+- Potencia: se sortea con la distribución del nivel (ver DISTRIBUCIONES),
+  se redondea a watts enteros y se recorta a los límites del nivel, así que
+  cada fila queda en el nivel que le tocó.
+- Horas de uso diario: una distribución (o una por nivel), recortada a
+  [0, 24] y redondeada a cuartos de hora.
+- Ubicación y tipo: distribución de Zipf finita, P(k) ∝ 1 / k^s: pocas
+  ubicaciones concentran la mayoría de los artefactos, como en un hogar real.
+- Nombre: un artefacto típico del nivel más el número de fila ("Heladera 7"),
+  así que los nombres son únicos.
+
+GENERACIÓN POR BLOQUES:
+Las filas se generan por bloques de TAMANO_BLOQUE con NumPy. Cada bloque
+tiene su propio generador aleatorio (semilla, número de bloque) y siempre
+sortea el bloque completo, aunque se pidan menos filas: pedir 1.000 filas
+da exactamente las primeras 1.000 de pedir un millón.
+
+escribir() vuelca CSV, JSONL (los formatos del importador) o un snapshot
+binario (ver snapshot.py) sin crear la lista de artefactos: CSV y JSONL se
+escriben bloque a bloque; el snapshot guarda solo columnas NumPy.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple, Union
+
+import numpy as np
+
+from models.artefacto import Artefacto, UMBRAL_ALTO_W, UMBRAL_MEDIO_W
+from services.columnar import CODIGO_NIVEL
+from services.conjuntos import NIVELES_CONSUMO
+from services import importador
+from services.importador import CAMPOS
+from services.snapshot import guardar_columnas
+
+# Una distribución es (nombre, parámetro 1, parámetro 2):
+#   ("uniforme", mínimo, máximo)       ("loguniforme", mínimo, máximo)
+#   ("normal", media, desvío)          ("lognormal", mu, sigma)
+#   ("gamma", forma, escala)
+Distribucion = Tuple[str, float, float]
+DISTRIBUCIONES = ("uniforme", "loguniforme", "normal", "lognormal", "gamma")
+
+TAMANO_BLOQUE = 65_536
+
+UBICACIONES: Tuple[str, ...] = (
+    "Cocina",
+    "Sala",
+    "Dormitorio",
+    "Oficina",
+    "Baño",
+    "Lavadero",
+    "Garaje",
+    "Patio",
+)
+TIPOS: Tuple[str, ...] = (
+    "Electrodoméstico",
+    "Electrónica",
+    "Iluminación",
+    "Climatización",
+    "Herramienta",
+)
+EXPONENTE_ZIPF = 1.1
+
+PROPORCIONES: Dict[str, float] = {"ALTO": 0.15, "MEDIO": 0.35, "BAJO": 0.50}
+
+# Límites de potencia de cada nivel, como en Artefacto.nivel_consumo()
+LIMITES_WATTS: Dict[str, Tuple[float, float]] = {
+    "ALTO": (UMBRAL_ALTO_W + 1, 5000),
+    "MEDIO": (UMBRAL_MEDIO_W, UMBRAL_ALTO_W),
+    "BAJO": (1, UMBRAL_MEDIO_W - 1),
+}
+WATTS: Dict[str, Distribucion] = {
+    "ALTO": ("loguniforme", 1001, 3500),
+    "MEDIO": ("loguniforme", 200, 1000),
+    "BAJO": ("loguniforme", 5, 199),
+}
+# Los artefactos de mayor potencia se usan menos horas por día
+HORAS: Dict[str, Distribucion] = {
+    "ALTO": ("gamma", 2.0, 0.75),
+    "MEDIO": ("gamma", 2.0, 2.5),
+    "BAJO": ("gamma", 2.0, 3.0),
+}
+
+NOMBRES: Dict[str, Tuple[str, ...]] = {
+    "ALTO": (
+        "Aire Acondicionado",
+        "Horno Eléctrico",
+        "Microondas",
+        "Plancha",
+        "Pava Eléctrica",
+        "Termotanque",
+        "Estufa Eléctrica",
+        "Secarropas",
+    ),
+    "MEDIO": (
+        "Heladera",
+        "Freezer",
+        "Lavarropas",
+        "Computadora",
+        "Cafetera",
+        "Licuadora",
+        "Secador de Pelo",
+        "Consola",
+    ),
+    "BAJO": (
+        "Lámpara LED",
+        "Televisor LED",
+        "Notebook",
+        "Router WiFi",
+        "Ventilador",
+        "Cargador",
+        "Radio",
+        "Monitor",
+    ),
+}
+
+Destino = Union[str, Path, TextIO]
+
+
+def _validar_distribucion(distribucion: Distribucion) -> Distribucion:
+    try:
+        nombre, primero, segundo = distribucion
+        primero, segundo = float(primero), float(segundo)
+    except (TypeError, ValueError):
+        raise ValueError(
+            f"Distribución inválida: {distribucion!r} (use (nombre, parámetro, parámetro))"
+        ) from None
+    if nombre not in DISTRIBUCIONES:
+        raise ValueError(
+            f"Distribución desconocida: '{nombre}' (use {', '.join(DISTRIBUCIONES)})"
+        )
+    if nombre == "uniforme" and primero > segundo:
+        raise ValueError(f"Rango inválido en {distribucion!r}")
+    if nombre == "loguniforme" and not 0 < primero <= segundo:
+        raise ValueError(f"Rango inválido en {distribucion!r} (debe ser positivo)")
+    if nombre in ("normal", "lognormal") and segundo < 0:
+        raise ValueError(f"Desvío negativo en {distribucion!r}")
+    if nombre == "gamma" and (primero <= 0 or segundo <= 0):
+        raise ValueError(f"La forma y la escala de {distribucion!r} deben ser positivas")
+    return (nombre, primero, segundo)
+
+
+def muestrear(
+    rng: np.random.Generator, distribucion: Distribucion, cantidad: int
+) -> np.ndarray:
+    """
+    Sortea valores de una distribución
+
+    Args:
+        rng (np.random.Generator): Generador aleatorio
+        distribucion (tuple): (nombre, parámetro 1, parámetro 2)
+        cantidad (int): Cantidad de valores
+
+    Returns:
+        np.ndarray: Valores sorteados
+    """
+    nombre, primero, segundo = distribucion
+    if nombre == "uniforme":
+        return rng.uniform(primero, segundo, cantidad)
+    if nombre == "loguniforme":
+        return np.exp(rng.uniform(np.log(primero), np.log(segundo), cantidad))
+    if nombre == "normal":
+        return rng.normal(primero, segundo, cantidad)
+    if nombre == "lognormal":
+        return rng.lognormal(primero, segundo, cantidad)
+    return rng.gamma(primero, segundo, cantidad)
+
+
+def pesos_zipf(cantidad: int, exponente: float) -> np.ndarray:
+    """Probabilidad de cada posición en una distribución de Zipf finita"""
+    pesos = 1.0 / np.arange(1, cantidad + 1) ** exponente
+    return pesos / pesos.sum()
+
+
+def _etiquetas(valor: Union[int, Sequence[str]], base: Sequence[str], prefijo: str) -> List[str]:
+    """Etiquetas dadas, o las primeras de base (numeradas si no alcanzan)"""
+    if isinstance(valor, int):
+        if valor < 1:
+            raise ValueError(f"Se necesita al menos una etiqueta de {prefijo.lower()}")
+        extra = [f"{prefijo} {k}" for k in range(len(base) + 1, valor + 1)]
+        return list(base[:valor]) + extra
+    etiquetas = [str(etiqueta).strip() for etiqueta in valor]
+    claves = [etiqueta.lower() for etiqueta in etiquetas]
+    if not etiquetas or not all(claves) or len(set(claves)) != len(claves):
+        raise ValueError(f"Las etiquetas de {prefijo.lower()} deben ser únicas y no vacías")
+    return etiquetas
+
+
+def _por_nivel(valor: Any, omision: Mapping[str, Distribucion]) -> Dict[str, Distribucion]:
+    """
+    Una distribución por nivel, a partir de una sola o de un dict con
+    algunos niveles (los que faltan usan la de omision)
+    """
+    if isinstance(valor, Mapping):
+        desconocidos = set(valor) - set(NIVELES_CONSUMO)
+        if desconocidos:
+            raise ValueError(f"Niveles desconocidos: {', '.join(sorted(desconocidos))}")
+        elegidas = {**omision, **valor}
+        return {nivel: _validar_distribucion(elegidas[nivel]) for nivel in NIVELES_CONSUMO}
+    distribucion = _validar_distribucion(valor)
+    return {nivel: distribucion for nivel in NIVELES_CONSUMO}
+
+
+class GeneradorInventario:
+    """
+    Generador reproducible de artefactos sintéticos
+
+    Atributos:
+        semilla (int): Semilla de la que dependen todas las filas
+        ubicaciones (list): Etiquetas de ubicación, de la más a la menos frecuente
+        tipos (list): Etiquetas de tipo, del más al menos frecuente
+    """
+
+    def __init__(
+        self,
+        semilla: int = 0,
+        *,
+        ubicaciones: Union[int, Sequence[str]] = UBICACIONES,
+        tipos: Union[int, Sequence[str]] = TIPOS,
+        exponente_zipf: float = EXPONENTE_ZIPF,
+        proporciones: Optional[Mapping[str, float]] = None,
+        watts: Optional[Mapping[str, Distribucion]] = None,
+        horas: Union[Distribucion, Mapping[str, Distribucion], None] = None,
+    ) -> None:
+        """
+        Args:
+            semilla (int): Semilla (entero no negativo)
+            ubicaciones (int | sequence): Etiquetas, o cuántas usar (si son
+                más que UBICACIONES, se agregan "Ubicación 9", ...)
+            tipos (int | sequence): Etiquetas, o cuántos usar
+            exponente_zipf (float): s en P(k) ∝ 1 / k^s (0 = uniforme)
+            proporciones (dict): Fracción de filas de cada nivel (se normaliza)
+            watts (dict): Distribución de la potencia por nivel (los niveles
+                que faltan usan WATTS)
+            horas (tuple | dict): Distribución de las horas de uso, una
+                para todos los niveles o un dict por nivel (como watts)
+
+        Raises:
+            ValueError: Si algún parámetro no es válido
+        """
+        if not isinstance(semilla, int) or semilla < 0:
+            raise ValueError("La semilla debe ser un entero no negativo")
+        if exponente_zipf < 0:
+            raise ValueError("El exponente de Zipf no puede ser negativo")
+
+        proporciones = dict(PROPORCIONES if proporciones is None else proporciones)
+        desconocidos = set(proporciones) - set(NIVELES_CONSUMO)
+        if desconocidos:
+            raise ValueError(f"Niveles desconocidos: {', '.join(sorted(desconocidos))}")
+        fracciones = np.array([float(proporciones.get(n, 0.0)) for n in NIVELES_CONSUMO])
+        if (fracciones < 0).any() or fracciones.sum() <= 0:
+            raise ValueError("Las proporciones deben ser no negativas y sumar más de 0")
+
+        self.semilla = semilla
+        self.ubicaciones = _etiquetas(ubicaciones, UBICACIONES, "Ubicación")
+        self.tipos = _etiquetas(tipos, TIPOS, "Tipo")
+        self.proporciones = dict(zip(NIVELES_CONSUMO, (fracciones / fracciones.sum()).tolist()))
+        self.watts = _por_nivel(watts or {}, WATTS)
+        self.horas = _por_nivel(HORAS if horas is None else horas, HORAS)
+
+        # Acumuladas para sortear con searchsorted: una sola tirada por fila
+        self._acumulada_nivel = np.cumsum(fracciones / fracciones.sum())
+        self._acumulada_ubicacion = np.cumsum(pesos_zipf(len(self.ubicaciones), exponente_zipf))
+        self._acumulada_tipo = np.cumsum(pesos_zipf(len(self.tipos), exponente_zipf))
+        self._nombres = [np.array(NOMBRES[nivel], dtype=object) for nivel in NIVELES_CONSUMO]
+
+    # ==================== BLOQUES ====================
+
+    def _bloque(self, numero: int, cantidad: int) -> Dict[str, Any]:
+        """Primeras cantidad filas del bloque numero (que se sortea completo)"""
+        rng = np.random.default_rng([self.semilla, numero])
+        filas = TAMANO_BLOQUE
+        niveles = self._sortear(rng, self._acumulada_nivel, filas)
+        ubicaciones = self._sortear(rng, self._acumulada_ubicacion, filas)
+        tipos = self._sortear(rng, self._acumulada_tipo, filas)
+        sorteo_nombre = rng.random(filas)
+
+        watts = np.empty(filas)
+        horas = np.empty(filas)
+        for nivel in NIVELES_CONSUMO:
+            # Cada nivel sortea el bloque completo para que la cantidad de
+            # números usados no dependa de cuántas filas le tocaron
+            filas_nivel = niveles == CODIGO_NIVEL[nivel]
+            minimo, maximo = LIMITES_WATTS[nivel]
+            watts_nivel = np.rint(muestrear(rng, self.watts[nivel], filas))
+            horas_nivel = np.rint(muestrear(rng, self.horas[nivel], filas) * 4) / 4
+            watts[filas_nivel] = np.clip(watts_nivel[filas_nivel], minimo, maximo)
+            horas[filas_nivel] = np.clip(horas_nivel[filas_nivel], 0, 24)
+
+        niveles = niveles[:cantidad]
+        base = np.empty(cantidad, dtype=object)
+        for codigo, nombres in enumerate(self._nombres):
+            filas_nivel = niveles == codigo
+            eleccion = (sorteo_nombre[:cantidad][filas_nivel] * len(nombres)).astype(np.intp)
+            base[filas_nivel] = nombres[eleccion]
+        primera = numero * TAMANO_BLOQUE + 1
+        numeros = range(primera, primera + cantidad)
+        return {
+            "nombres": [f"{b} {n}" for b, n in zip(base.tolist(), numeros)],
+            "watts": watts[:cantidad],
+            "horas_dia": horas[:cantidad],
+            "ubicaciones": ubicaciones[:cantidad],
+            "tipos": tipos[:cantidad],
+            "niveles": niveles,
+        }
+
+    @staticmethod
+    def _sortear(rng: np.random.Generator, acumulada: np.ndarray, filas: int) -> np.ndarray:
+        codigos = np.searchsorted(acumulada, rng.random(filas), side="right")
+        # Por redondeo la última acumulada puede quedar apenas debajo de 1
+        return np.minimum(codigos, len(acumulada) - 1).astype(np.intp)
+
+    def bloques(self, cantidad: int) -> Iterator[Dict[str, Any]]:
+        """
+        Recorre las filas por bloques de columnas
+
+        Args:
+            cantidad (int): Cantidad total de filas
+
+        Returns:
+            iterator: Dicts con nombres (lista), watts, horas_dia,
+            ubicaciones y tipos (códigos sobre self.ubicaciones y
+            self.tipos) y niveles (ver CODIGO_NIVEL)
+        """
+        if cantidad < 0:
+            raise ValueError("La cantidad de filas no puede ser negativa")
+        for numero, inicio in enumerate(range(0, cantidad, TAMANO_BLOQUE)):
+            yield self._bloque(numero, min(TAMANO_BLOQUE, cantidad - inicio))
+
+    def columnas(self, cantidad: int) -> Dict[str, Any]:
+        """
+        Todas las filas como columnas (ver bloques), para armar un
+        AlmacenColumnar o evaluar reglas sin crear artefactos
+        """
+        partes = list(self.bloques(cantidad))
+        columnas: Dict[str, Any] = {
+            "nombres": [nombre for parte in partes for nombre in parte["nombres"]]
+        }
+        for columna in ("watts", "horas_dia", "ubicaciones", "tipos", "niveles"):
+            arreglos = [parte[columna] for parte in partes]
+            columnas[columna] = np.concatenate(arreglos) if arreglos else np.empty(0, np.intp)
+        return columnas
+
+    def _filas(self, bloque: Dict[str, Any]) -> Iterator[Tuple[str, float, float, str, str]]:
+        """Filas de un bloque como tuplas en el orden de CAMPOS"""
+        return zip(
+            bloque["nombres"],
+            bloque["watts"].tolist(),
+            bloque["horas_dia"].tolist(),
+            [self.ubicaciones[codigo] for codigo in bloque["ubicaciones"].tolist()],
+            [self.tipos[codigo] for codigo in bloque["tipos"].tolist()],
+        )
+
+    def registros(self, cantidad: int) -> Iterator[Dict[str, Any]]:
+        """Filas como dicts con los campos del importador (ver CAMPOS)"""
+        for bloque in self.bloques(cantidad):
+            for fila in self._filas(bloque):
+                yield dict(zip(CAMPOS, fila))
+
+    def artefactos(self, cantidad: int) -> Iterator[Artefacto]:
+        """Filas como artefactos, listos para agregar_artefactos"""
+        for registro in self.registros(cantidad):
+            yield Artefacto(**registro)
+
+    # ==================== ESCRITURA ====================
+
+    def escribir(self, destino: Destino, cantidad: int, formato: Optional[str] = None) -> int:
+        """
+        Escribe un inventario en CSV, JSONL o snapshot binario
+
+        Args:
+            destino (str | Path | archivo): Archivo de destino, "-" para la
+                salida estándar o un archivo de texto abierto
+            cantidad (int): Cantidad de artefactos
+            formato (str, opcional): "csv", "jsonl" o "snapshot"; si falta,
+                se deduce de la extensión (.csv, .jsonl, .ndjson, .snap)
+
+        Returns:
+            int: Cantidad de artefactos escritos
+
+        Raises:
+            ValueError: Si el formato no se reconoce
+        """
+        if formato is None:
+            if not isinstance(destino, (str, Path)) or str(destino) == "-":
+                raise ValueError("Indique el formato al escribir en un archivo abierto")
+            formato = detectar_formato(Path(destino))
+        if formato == "snapshot":
+            if not isinstance(destino, (str, Path)) or str(destino) == "-":
+                raise ValueError("El snapshot se escribe en un archivo, no en un flujo de texto")
+            return self._escribir_snapshot(Path(destino), cantidad)
+        if formato not in ("csv", "jsonl"):
+            raise ValueError(f"Formato desconocido: '{formato}' (use csv, jsonl o snapshot)")
+
+        if not isinstance(destino, (str, Path)):
+            return self._escribir_texto(destino, cantidad, formato)
+        if str(destino) == "-":
+            return self._escribir_texto(sys.stdout, cantidad, formato)
+        with open(destino, "w", encoding="utf-8", newline="") as archivo:
+            return self._escribir_texto(archivo, cantidad, formato)
+
+    def _escribir_texto(self, archivo: TextIO, cantidad: int, formato: str) -> int:
+        escritor = csv.writer(archivo, lineterminator="\n")
+        if formato == "csv":
+            escritor.writerow(CAMPOS)
+        else:
+            # Las etiquetas se pasan a JSON una sola vez, no en cada fila
+            plantilla = "{{" + ", ".join(f'"{campo}": {{}}' for campo in CAMPOS) + "}}\n"
+            a_json = json.JSONEncoder(ensure_ascii=False).encode
+            ubicaciones = [a_json(ubicacion) for ubicacion in self.ubicaciones]
+            tipos = [a_json(tipo) for tipo in self.tipos]
+        for bloque in self.bloques(cantidad):
+            if formato == "csv":
+                escritor.writerows(self._filas(bloque))
+                continue
+            archivo.writelines(
+                plantilla.format(a_json(nombre), w, h, ubicaciones[u], tipos[t])
+                for nombre, w, h, u, t in zip(
+                    bloque["nombres"],
+                    bloque["watts"].tolist(),
+                    bloque["horas_dia"].tolist(),
+                    bloque["ubicaciones"].tolist(),
+                    bloque["tipos"].tolist(),
+                )
+            )
+        return cantidad
+
+    def _escribir_snapshot(self, ruta: Path, cantidad: int) -> int:
+        """Junta las columnas de todos los bloques y las guarda como snapshot"""
+        numericas: Dict[str, List[np.ndarray]] = {
+            "watts": [],
+            "horas_dia": [],
+            "ubicaciones": [],
+            "tipos": [],
+        }
+        largos: List[np.ndarray] = []
+        datos: List[bytes] = []
+        claves: List[np.ndarray] = []
+        for bloque in self.bloques(cantidad):
+            for columna, partes in numericas.items():
+                partes.append(bloque[columna])
+            codificados = [nombre.encode("utf-8") for nombre in bloque["nombres"]]
+            largos.append(np.fromiter(map(len, codificados), np.int64, len(codificados)))
+            datos.append(b"".join(codificados))
+            # Orden de los nombres normalizados: comparar los bytes UTF-8
+            # da el mismo orden que comparar las cadenas
+            claves.append(np.array([n.lower().encode("utf-8") for n in bloque["nombres"]]))
+
+        columnas = {
+            columna: np.concatenate(partes) if partes else np.empty(0)
+            for columna, partes in numericas.items()
+        }
+        offsets = np.zeros(cantidad + 1, dtype=np.int64)
+        if largos:
+            np.cumsum(np.concatenate(largos), out=offsets[1:])
+        columnas["nombres_offsets"] = offsets
+        columnas["nombres_datos"] = np.frombuffer(b"".join(datos), dtype=np.uint8)
+        columnas["orden_nombres"] = (
+            np.argsort(np.concatenate(claves), kind="stable") if claves else np.empty(0)
+        )
+        return guardar_columnas(ruta, columnas, self.ubicaciones, self.tipos)
+
+
+def detectar_formato(ruta: Path) -> str:
+    """Formato de salida según la extensión: "csv", "jsonl" o "snapshot" """
+    if ruta.suffix.lower() == ".snap":
+        return "snapshot"
+    try:
+        return importador.detectar_formato(ruta)
+    except ValueError:
+        raise ValueError(
+            f"Formato no reconocido: '{ruta.name}' (usar .csv, .jsonl o .snap)"
+        ) from None
@@ -0,0 +1,286 @@
+"""
+Módulo: importador.py
+Importación de inventarios desde archivos CSV y JSONL
+
+Lee el archivo línea a línea y entrega los artefactos válidos a la carga
+masiva del gestor (agregar_artefactos), que los vuelca por bloques de
+TAMANO_LOTE. Así la memoria usada no depende del tamaño del archivo: un
+archivo de varios gigabytes se importa sin cargarlo completo.
+
+Cada fila pasa por las mismas reglas que el menú de carga (validar_datos):
+potencia mayor a 0, horas entre 0 y 24 y campos de texto no vacíos. Las
+filas rechazadas se escriben, a medida que aparecen, en un reporte CSV con
+el número de línea, el motivo y el contenido original.
+
+FORMATOS:
+- CSV con encabezado: nombre, watts, horas_dia, ubicacion, tipo (en
+  cualquier orden; también se aceptan "horas" y "ubicación"). El separador
+  puede ser coma o punto y coma.
+- JSONL: un objeto por línea con esos mismos campos.
+
+En ambos formatos, el campo opcional perfil_uso trae 24 o 96 fracciones de
+uso (en CSV, separadas por espacios o "|"; en JSONL, una lista), y el campo
+opcional horarios, los intervalos de encendido "HH:MM-HH:MM" (separados
+por coma, punto y coma o "|"; en JSONL también como lista).
+"""
+
+import csv
+import json
+import math
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+
+from models.artefacto import Artefacto, validar_datos
+from services.conjuntos import GestorConjuntos
+
+CAMPOS = ("nombre", "watts", "horas_dia", "ubicacion", "tipo")
+_CLAVES = frozenset(CAMPOS)
+
+# Otros nombres de columna aceptados para cada campo
+ALIAS_CAMPOS = {
+    "horas": "horas_dia",
+    "ubicación": "ubicacion",
+    "potencia": "watts",
+}
+
+# Errores que se conservan en el resumen (el reporte los tiene todos)
+MAXIMO_ERRORES_RESUMEN = 20
+
+Fila = Tuple[int, Any]  # (número de línea, registro leído)
+Origen = Union[str, Path, TextIO]
+
+
+# ==================== LECTURA ====================
+
+
+def _normalizar_campo(campo: str) -> str:
+    campo = campo.strip().lower()
+    return ALIAS_CAMPOS.get(campo, campo)
+
+
+def leer_csv(archivo: TextIO) -> Iterator[Fila]:
+    """
+    Recorre las filas de un CSV con encabezado
+
+    Returns:
+        iterator: Pares (línea, {campo: texto}); si la fila no tiene la
+        cantidad de columnas del encabezado, el registro es la lista cruda
+    """
+    primera = archivo.readline().lstrip("\ufeff")
+    if not primera.strip():
+        return
+    separador = ";" if primera.count(";") > primera.count(",") else ","
+    encabezado = [
+        _normalizar_campo(campo) for campo in next(csv.reader([primera], delimiter=separador))
+    ]
+    faltantes = [campo for campo in CAMPOS if campo not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en el encabezado: {', '.join(faltantes)}")
+
+    lector = csv.reader(archivo, delimiter=separador)
+    for valores in lector:
+        if not valores or not any(valor.strip() for valor in valores):
+            continue
+        # line_num cuenta desde la segunda línea del archivo
+        linea = lector.line_num + 1
+        if len(valores) != len(encabezado):
+            yield linea, valores
+        else:
+            yield linea, dict(zip(encabezado, valores))
+
+
+def leer_jsonl(archivo: TextIO) -> Iterator[Fila]:
+    """
+    Recorre las líneas de un archivo JSONL
+
+    Returns:
+        iterator: Pares (línea, objeto); una línea que no es JSON válido
+        se entrega como texto, para que la validación la rechace
+    """
+    for linea, texto in enumerate(archivo, 1):
+        if not texto.strip():
+            continue
+        try:
+            yield linea, json.loads(texto)
+        except json.JSONDecodeError:
+            yield linea, texto.rstrip("\n")
+
+
+def detectar_formato(ruta: Path) -> str:
+    """Formato de un archivo según su extensión: "csv" o "jsonl" """
+    sufijo = ruta.suffix.lower()
+    if sufijo == ".csv":
+        return "csv"
+    if sufijo in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Formato no reconocido: '{ruta.name}' (usar .csv o .jsonl)")
+
+
+# ==================== VALIDACIÓN ====================
+
+
+def convertir_fila(registro: Any) -> Tuple[Optional[Artefacto], Optional[str]]:
+    """
+    Convierte un registro leído en artefacto, con las reglas del menú
+
+    Returns:
+        tuple: (artefacto, None) si es válido, o (None, motivo del rechazo)
+    """
+    if not isinstance(registro, dict):
+        return None, "Fila mal formada"
+    if not _CLAVES <= registro.keys():
+        # Solo se normalizan los nombres de campo si no vienen ya canónicos
+        registro = {_normalizar_campo(str(campo)): valor for campo, valor in registro.items()}
+    valores = [registro.get(campo) for campo in CAMPOS]
+    if None in valores:
+        faltantes = [campo for campo, valor in zip(CAMPOS, valores) if valor is None]
+        return None, f"Faltan campos: {', '.join(faltantes)}"
+    nombre, watts, horas, ubicacion, tipo = valores
+
+    try:
+        watts = float(watts)
+        horas = float(horas)
+    except (TypeError, ValueError):
+        return None, "Debes ingresar valores numéricos válidos"
+    if not (math.isfinite(watts) and math.isfinite(horas)):
+        return None, "Debes ingresar valores numéricos válidos"
+    nombre, ubicacion, tipo = str(nombre).strip(), str(ubicacion).strip(), str(tipo).strip()
+
+    error = validar_datos(nombre, watts, horas, ubicacion, tipo)
+    if error:
+        return None, error
+
+    perfil = registro.get("perfil_uso")
+    if isinstance(perfil, str):
+        # En CSV, los valores del perfil van separados por espacios o "|"
+        perfil = perfil.replace("|", " ").split() or None
+    try:
+        artefacto = Artefacto(
+            nombre,
+            watts,
+            horas,
+            ubicacion,
+            tipo,
+            perfil_uso=perfil,
+            horarios=registro.get("horarios") or None,
+        )
+        return artefacto, None
+    except ValueError as e:
+        return None, str(e)
+
+
+# ==================== IMPORTACIÓN ====================
+
+
+def _abrir(origen: Origen, formato: Optional[str]) -> Tuple[TextIO, str, bool]:
+    """Devuelve (flujo de texto, formato, si hay que cerrarlo)"""
+    if isinstance(origen, (str, Path)):
+        ruta = Path(origen)
+        formato = formato or detectar_formato(ruta)
+        # utf-8-sig descarta la marca BOM que agregan algunas planillas
+        return open(ruta, encoding="utf-8-sig", newline=""), formato, True
+
+    if formato is None:
+        # Sin extensión, un flujo que empieza con "{" se toma como JSONL
+        primera = origen.readline()
+        formato = "jsonl" if primera.lstrip().startswith("{") else "csv"
+        return _Prefijado(primera, origen), formato, False
+    return origen, formato, False
+
+
+class _Prefijado:
+    """Flujo que devuelve una línea ya leída y luego el resto del original"""
+
+    def __init__(self, primera: str, resto: TextIO) -> None:
+        self._lineas = chain([primera], resto)
+
+    def __iter__(self) -> Iterator[str]:
+        return self._lineas
+
+    def readline(self) -> str:
+        return next(self._lineas, "")
+
+
+def importar(
+    gestor: GestorConjuntos,
+    origen: Origen,
+    formato: Optional[str] = None,
+    reporte: Optional[Origen] = None,
+) -> Dict[str, Any]:
+    """
+    Importa un inventario CSV o JSONL al gestor, en streaming
+
+    Args:
+        gestor (GestorConjuntos): Destino (también sirve GestorSQLite)
+        origen: Ruta del archivo o flujo de texto
+        formato (str, opcional): "csv" o "jsonl"; por defecto se deduce de
+            la extensión (o del contenido, si el origen es un flujo)
+        reporte (opcional): Ruta o flujo donde escribir las filas
+            rechazadas como CSV (linea, motivo, registro). Una ruta se crea
+            recién con el primer rechazo: sin rechazos no queda archivo, y
+            se borra el reporte que hubiera dejado una importación anterior.
+
+    Returns:
+        dict: {'leidos', 'insertados', 'reemplazados', 'rechazados',
+        'errores'}, donde errores son los primeros MAXIMO_ERRORES_RESUMEN
+        rechazos como (línea, motivo)
+
+    Raises:
+        ValueError: Si el formato no se reconoce o al CSV le faltan columnas
+    """
+    if formato not in (None, "csv", "jsonl"):
+        raise ValueError(f"Formato desconocido: {formato!r} (usar csv o jsonl)")
+    flujo, formato, cerrar_flujo = _abrir(origen, formato)
+    salida_reporte = None
+    cerrar_reporte = isinstance(reporte, (str, Path))
+    escritor = None
+
+    resumen: Dict[str, Any] = {
+        "leidos": 0, "insertados": 0, "reemplazados": 0, "rechazados": 0
+    }
+    errores: List[Tuple[int, str]] = []
+
+    def registrar_rechazo(linea: int, motivo: str, registro: Any) -> None:
+        nonlocal salida_reporte, escritor
+        if escritor is None:
+            salida_reporte = (
+                open(reporte, "w", encoding="utf-8", newline="") if cerrar_reporte else reporte
+            )
+            escritor = csv.writer(salida_reporte)
+            escritor.writerow(["linea", "motivo", "registro"])
+        texto = registro if isinstance(registro, str) else json.dumps(
+            registro, ensure_ascii=False
+        )
+        escritor.writerow([linea, motivo, texto])
+
+    def validos() -> Iterator[Artefacto]:
+        filas = leer_csv(flujo) if formato == "csv" else leer_jsonl(flujo)
+        for linea, registro in filas:
+            resumen["leidos"] += 1
+            artefacto, motivo = convertir_fila(registro)
+            if artefacto is not None:
+                yield artefacto
+                continue
+            resumen["rechazados"] += 1
+            if len(errores) < MAXIMO_ERRORES_RESUMEN:
+                errores.append((linea, motivo))
+            if reporte is not None:
+                registrar_rechazo(linea, motivo, registro)
+
+    try:
+        carga = gestor.agregar_artefactos(validos())
+    finally:
+        if cerrar_flujo:
+            flujo.close()
+        if cerrar_reporte:
+            if salida_reporte is not None:
+                salida_reporte.close()
+            else:
+                Path(reporte).unlink(missing_ok=True)
+
+    resumen["insertados"] = carga["insertados"]
+    resumen["reemplazados"] = carga["reemplazados"]
+    resumen["rechazados"] += carga["rechazados"]
+    resumen["errores"] = errores
+    return resumen
@@ -9,11 +9,40 @@ CONCEPTOS MATEMÁTICOS APLICADOS:
 - Reglas de inferencia (Modus Ponens, Modus Tollens)
 """
 
-from typing import List, Optional, Tuple
+import copy
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.agenda import Intervalos, intervalos_de, maximo_concurrente
 from services.conjuntos import GestorConjuntos
 from services.conteo import AnalizadorConteo
 
 
+def memoizada(metodo: Callable) -> Callable:
+    """
+    Memoriza el resultado de un método según (método, argumentos, versión)
+
+    La versión es la del inventario del gestor: cualquier alta, baja o
+    modificación la cambia, y con ella quedan descartados los resultados
+    anteriores. Reevaluar sobre un inventario sin cambios no recorre nada.
+    Cada llamada recibe una copia del resultado, así que modificar un dict o
+    una lista devueltos no altera lo memorizado.
+    """
+
+    @wraps(metodo)
+    def evaluar(self: "SistemaLogico", *args: Any, **kwargs: Any) -> Any:
+        version = self.gestor.version
+        if version != self._version_memo:
+            self._memo.clear()
+            self._version_memo = version
+        clave = (metodo.__name__, args, tuple(sorted(kwargs.items())), version)
+        if clave not in self._memo:
+            self._memo[clave] = metodo(self, *args, **kwargs)
+        return copy.copy(self._memo[clave])
+
+    return evaluar
+
+
 class SistemaLogico:
     """
     Sistema de recomendaciones basado en lógica proposicional
@@ -24,9 +53,13 @@ class SistemaLogico:
     ) -> None:
         self.gestor: GestorConjuntos = gestor_conjuntos
         self.conteo: AnalizadorConteo = analizador_conteo
+        # Resultados memorizados, válidos para la versión _version_memo
+        self._memo: Dict[tuple, Any] = {}
+        self._version_memo: int = -1
 
     # ==================== PROPOSICIONES SIMPLES ====================
 
+    @memoizada
     def prop_consumo_alto(self, umbral: float = 300) -> bool:
         """
         Proposición p: "El consumo mensual es mayor a umbral kWh"
@@ -40,6 +73,7 @@ class SistemaLogico:
         consumo_total = self.conteo.consumo_total_mensual()
         return consumo_total > umbral
 
+    @memoizada
     def prop_muchos_artefactos_alto_consumo(self, umbral: int = 2) -> bool:
         """
         Proposición q: "Hay más de N artefactos de alto consumo"
@@ -50,9 +84,10 @@ class SistemaLogico:
         Returns:
             bool: True si se cumple la proposición
         """
-        alto_consumo = self.gestor.obtener_por_nivel_consumo("ALTO")
-        return len(alto_consumo) > umbral
+        # Tamaño del índice: no copia el subconjunto de nombres
+        return self.gestor.tamano_indice("nivel", "ALTO") > umbral
 
+    @memoizada
     def prop_ubicacion_critica(self, ubicacion: str, umbral_kwh: float = 50) -> bool:
         """
         Proposición r: "Una ubicación tiene consumo crítico"
@@ -67,21 +102,34 @@ class SistemaLogico:
         consumo_ubicacion = self.conteo.consumo_por_ubicacion()
         return consumo_ubicacion.get(ubicacion, 0) > umbral_kwh
 
+    @memoizada
     def prop_artefactos_simultaneos_criticos(self, ubicacion: str) -> bool:
         """
-        Proposición s: "En una ubicación hay múltiples artefactos de alto consumo"
+        Proposición s: "En una ubicación hay múltiples artefactos de alto
+        consumo encendidos a la vez"
+
+        s mira la superposición real con un barrido de los intervalos de
+        encendido: los horarios del artefacto si los tiene, si no los cuartos
+        de hora de su perfil de uso. Un artefacto sin ninguno de los dos
+        puede estar encendido en cualquier momento, así que sin datos de
+        horario s se reduce a contar los artefactos de alto consumo.
 
         Args:
             ubicacion (str): Ubicación a evaluar
 
         Returns:
-            bool: True si hay 2 o más artefactos de alto consumo
+            bool: True si 2 o más artefactos de alto consumo coinciden
         """
         artefactos_ubicacion = self.gestor.obtener_por_ubicacion(ubicacion)
         alto_consumo = self.gestor.obtener_por_nivel_consumo("ALTO")
         # Intersección: artefactos de alto consumo EN esta ubicación
         criticos_en_ubicacion = artefactos_ubicacion & alto_consumo
-        return len(criticos_en_ubicacion) >= 2
+        if len(criticos_en_ubicacion) < 2:
+            return False
+        return maximo_concurrente(
+            intervalos_de(self.gestor.obtener_artefacto(nombre))
+            for nombre in criticos_en_ubicacion
+        ) >= 2
 
     # ==================== CONECTIVOS LÓGICOS ====================
 
@@ -134,6 +182,7 @@ class SistemaLogico:
 
     # ==================== SISTEMA DE ALERTAS ====================
 
+    @memoizada
     def evaluar_nivel_alerta(self) -> str:
         """
         Evalúa el nivel de alerta usando lógica proposicional
@@ -157,6 +206,44 @@ class SistemaLogico:
         else:  # ¬(p ∨ q)
             return "NORMAL"
 
+    @memoizada
+    def evaluar_ubicaciones(
+        self, umbral_kwh: float = 50, minimo_alto: int = 2
+    ) -> Dict[str, Tuple[bool, bool]]:
+        """
+        Evalúa r y s para todas las ubicaciones a la vez
+
+        Equivale a llamar prop_ubicacion_critica y
+        prop_artefactos_simultaneos_criticos por cada ubicación, pero lee el
+        consumo por ubicación una sola vez y recorre solo los artefactos de
+        alto consumo: O(L + |ALTO|) en lugar de O(L²·N). Como en s, los
+        horarios o perfiles de uso de esos artefactos deciden si coinciden
+        en el tiempo.
+
+        Args:
+            umbral_kwh (float): Umbral de consumo de r, en kWh
+            minimo_alto (int): Artefactos de alto consumo que hacen verdadera s
+
+        Returns:
+            dict: {ubicacion: (r, s)}
+        """
+        consumo_ubicacion = self.conteo.consumo_por_ubicacion()
+
+        intervalos_por_ubicacion: Dict[str, List[Intervalos]] = {}
+        for nombre in self.gestor.obtener_por_nivel_consumo("ALTO"):
+            artefacto = self.gestor.obtener_artefacto(nombre)
+            ubicacion = self.gestor.etiqueta_ubicacion(artefacto.ubicacion)
+            intervalos_por_ubicacion.setdefault(ubicacion, []).append(intervalos_de(artefacto))
+
+        return {
+            ubicacion: (
+                consumo_ubicacion.get(ubicacion, 0) > umbral_kwh,
+                len(intervalos_por_ubicacion.get(ubicacion, ())) >= minimo_alto
+                and maximo_concurrente(intervalos_por_ubicacion[ubicacion]) >= minimo_alto,
+            )
+            for ubicacion in self.gestor.obtener_todas_ubicaciones()
+        }
+
     def identificar_ubicaciones_criticas(self) -> List[str]:
         """
         Identifica ubicaciones con consumo crítico
@@ -165,11 +252,8 @@ class SistemaLogico:
             list: Lista de ubicaciones críticas
         """
         criticas = []
-        for ubicacion in self.gestor.obtener_todas_ubicaciones():
+        for ubicacion, (r, s) in self.evaluar_ubicaciones(50).items():
             # Proposición compuesta: r ∨ s
-            r = self.prop_ubicacion_critica(ubicacion, 50)
-            s = self.prop_artefactos_simultaneos_criticos(ubicacion)
-
             if self.disyuncion(r, s):
                 criticas.append(ubicacion)
 
@@ -238,6 +322,25 @@ class SistemaLogico:
 
         return recomendaciones, nivel_alerta
 
+    def resumen_logico(self) -> Dict[str, Any]:
+        """
+        Datos del reporte lógico, listos para serializar como JSON
+
+        Returns:
+            dict: Proposiciones p y q, nivel de alerta, ubicaciones críticas
+            y recomendaciones
+        """
+        recomendaciones, nivel = self.generar_recomendaciones()
+        return {
+            "proposiciones": {
+                "p": self.prop_consumo_alto(300),
+                "q": self.prop_muchos_artefactos_alto_consumo(2),
+            },
+            "nivel_alerta": nivel,
+            "ubicaciones_criticas": self.identificar_ubicaciones_criticas(),
+            "recomendaciones": recomendaciones,
+        }
+
     def generar_reporte_logico(self) -> str:
         """
         Genera un reporte completo del análisis lógico
@@ -0,0 +1,274 @@
+"""
+Módulo: lotes.py
+Evaluación en lote de muchos hogares con un pool de procesos
+
+Cada hogar se analiza con su propio GestorConjuntos, AnalizadorConteo y
+SistemaLogico, igual que en el menú interactivo. Los hogares se reparten
+en bloques entre los procesos de un ProcessPoolExecutor y los resultados
+se entregan a medida que terminan, sin esperar al resto del lote.
+
+FORMATO DE LOS INVENTARIOS:
+- Un archivo .json por hogar: {"hogar": "id", "artefactos": [...]} o
+  directamente la lista de artefactos (el id es el nombre del archivo)
+- Un archivo .jsonl (o un flujo de texto) con un hogar por línea, en el
+  formato {"hogar": "id", "artefactos": [...]}
+- Un directorio con archivos de los dos tipos anteriores
+
+Cada artefacto es un objeto con nombre, watts, horas_dia, ubicacion y tipo
+(y, opcionalmente, perfil_uso y horarios).
+"""
+
+import json
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.logica import SistemaLogico
+
+# Hogares que cada proceso recibe por envío
+TAMANO_BLOQUE = 64
+
+Hogar = Tuple[str, List[Dict[str, Any]]]  # (id del hogar, artefactos)
+# Un hogar ya leído, un par (id por defecto, línea JSONL) o un archivo .json
+Entrada = Union[Hogar, Tuple[str, str], Path]
+
+
+# ==================== LECTURA ====================
+
+
+def _hogar_desde_json(dato: Any, hogar_por_defecto: str) -> Hogar:
+    """Interpreta un hogar en formato objeto o lista de artefactos"""
+    if isinstance(dato, list):
+        return hogar_por_defecto, dato
+    if isinstance(dato, dict) and isinstance(dato.get("artefactos"), list):
+        return str(dato.get("hogar", hogar_por_defecto)), dato["artefactos"]
+    raise ValueError(f"Hogar '{hogar_por_defecto}' sin lista de artefactos")
+
+
+def leer_entradas(origen: Union[str, Path, TextIO]) -> Iterator[Entrada]:
+    """
+    Recorre los inventarios de un origen sin interpretarlos
+
+    Cada entrada es la ruta de un archivo .json o el par (id por defecto,
+    línea JSONL). Así el proceso principal solo lee texto, y el análisis del
+    JSON ocurre en los procesos del pool.
+
+    Args:
+        origen: Directorio, archivo .json/.jsonl o flujo de texto JSONL
+
+    Returns:
+        iterator: Entradas para evaluar_hogares
+    """
+    if not isinstance(origen, (str, Path)):
+        archivos = [origen]
+    else:
+        ruta = Path(origen)
+        if ruta.is_dir():
+            archivos = sorted(
+                p
+                for p in ruta.iterdir()
+                if p.suffix in (".json", ".jsonl") and p.is_file()
+            )
+        else:
+            archivos = [ruta]
+
+    for archivo in archivos:
+        if isinstance(archivo, Path) and archivo.suffix == ".json":
+            yield archivo
+            continue
+        if isinstance(archivo, Path):
+            nombre, entrada = archivo.stem, open(archivo, encoding="utf-8")
+        else:
+            nombre, entrada = "entrada", archivo
+        try:
+            for numero, linea in enumerate(entrada, 1):
+                if linea.strip():
+                    yield f"{nombre}:{numero}", linea
+        finally:
+            if entrada is not archivo:
+                entrada.close()
+
+
+def _interpretar(entrada: Entrada) -> Hogar:
+    """Convierte una entrada de leer_entradas en (id del hogar, artefactos)"""
+    if isinstance(entrada, Path):
+        with open(entrada, encoding="utf-8") as archivo:
+            return _hogar_desde_json(json.load(archivo), entrada.stem)
+    hogar, datos = entrada
+    if isinstance(datos, str):
+        return _hogar_desde_json(json.loads(datos), hogar)
+    return hogar, datos
+
+
+def leer_hogares(origen: Union[str, Path, TextIO]) -> Iterator[Hogar]:
+    """
+    Lee inventarios de hogares a demanda, sin cargarlos todos en memoria
+
+    Args:
+        origen: Directorio, archivo .json/.jsonl o flujo de texto JSONL
+
+    Returns:
+        iterator: Pares (id del hogar, lista de artefactos)
+
+    Raises:
+        ValueError: Si un inventario no tiene el formato esperado
+    """
+    for entrada in leer_entradas(origen):
+        yield _interpretar(entrada)
+
+
+# ==================== EVALUACIÓN ====================
+
+
+def _artefactos(datos: Iterable[Dict[str, Any]]) -> Tuple[List[Artefacto], int]:
+    """Convierte los datos a artefactos; devuelve también los mal formados"""
+    artefactos: List[Artefacto] = []
+    mal_formados = 0
+    for dato in datos:
+        try:
+            # NaN e infinito (válidos en JSON de Python) no son consumos
+            numeros = (float(dato["watts"]), float(dato["horas_dia"]))
+            if not all(map(math.isfinite, numeros)):
+                mal_formados += 1
+                continue
+            artefactos.append(
+                Artefacto(
+                    dato["nombre"],
+                    dato["watts"],
+                    dato["horas_dia"],
+                    dato["ubicacion"],
+                    dato["tipo"],
+                    perfil_uso=dato.get("perfil_uso"),
+                    horarios=dato.get("horarios"),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            mal_formados += 1
+    return artefactos, mal_formados
+
+
+def evaluar_hogar(hogar: str, datos: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analiza un hogar: estadísticas, nivel de alerta y recomendaciones
+
+    Args:
+        hogar (str): Identificador del hogar
+        datos (iterable): Artefactos del hogar como diccionarios
+
+    Returns:
+        dict: Resultado serializable a JSON
+    """
+    artefactos, mal_formados = _artefactos(datos)
+    gestor = GestorConjuntos()
+    resultado_carga = gestor.agregar_artefactos(artefactos)
+    conteo = AnalizadorConteo(gestor)
+    logica = SistemaLogico(gestor, conteo)
+
+    recomendaciones, nivel = logica.generar_recomendaciones()
+    return {
+        "hogar": hogar,
+        "artefactos": gestor.total_artefactos(),
+        "rechazados": resultado_carga["rechazados"] + mal_formados,
+        "consumo_total_kwh": conteo.consumo_total_mensual(),
+        "consumo_por_ubicacion_kwh": conteo.consumo_por_ubicacion(),
+        "artefactos_por_nivel": conteo.contar_por_nivel_consumo(),
+        "nivel_alerta": nivel,
+        "ubicaciones_criticas": logica.identificar_ubicaciones_criticas(),
+        "recomendaciones": recomendaciones,
+    }
+
+
+def _evaluar_entrada(entrada: Entrada) -> Dict[str, Any]:
+    """
+    Interpreta y evalúa una entrada
+
+    Un inventario mal formado no detiene el lote: su resultado solo trae
+    el id y el motivo del error.
+    """
+    try:
+        hogar, datos = _interpretar(entrada)
+    except (OSError, ValueError) as e:
+        hogar = entrada.stem if isinstance(entrada, Path) else entrada[0]
+        return {"hogar": hogar, "error": str(e)}
+    return evaluar_hogar(hogar, datos)
+
+
+def _evaluar_bloque(bloque: List[Entrada]) -> List[Dict[str, Any]]:
+    """Tarea de cada proceso: evalúa un bloque de entradas"""
+    return [_evaluar_entrada(entrada) for entrada in bloque]
+
+
+def evaluar_hogares(
+    hogares: Iterable[Entrada],
+    trabajadores: Optional[int] = None,
+    tamano_bloque: int = TAMANO_BLOQUE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Evalúa muchos hogares en paralelo y entrega cada resultado al terminar
+
+    Los hogares se leen a medida que hay lugar en la cola del pool (a lo
+    sumo dos bloques pendientes por proceso), así que la entrada puede ser
+    un flujo más grande que la memoria. El orden de salida es el orden en
+    que terminan los bloques, no el de entrada. Un inventario mal formado
+    da un resultado {"hogar", "error"} en lugar de detener el lote.
+
+    Args:
+        hogares (iterable): Pares (id, artefactos) o, mejor, entradas sin
+            interpretar de leer_entradas, que se analizan en el pool
+        trabajadores (int, opcional): Procesos del pool; por defecto, uno
+            por núcleo. Con 1 se evalúa en el proceso actual, sin pool.
+        tamano_bloque (int): Hogares por envío a un proceso
+
+    Returns:
+        iterator: Un resultado de evaluar_hogar por hogar
+    """
+    if tamano_bloque < 1:
+        raise ValueError("tamano_bloque debe ser al menos 1")
+    trabajadores = trabajadores or os.cpu_count() or 1
+    hogares = iter(hogares)
+
+    if trabajadores == 1:
+        for entrada in hogares:
+            yield _evaluar_entrada(entrada)
+        return
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        pendientes = set()
+        agotado = False
+        while True:
+            while not agotado and len(pendientes) < 2 * trabajadores:
+                bloque = list(islice(hogares, tamano_bloque))
+                if not bloque:
+                    agotado = True
+                    break
+                pendientes.add(pool.submit(_evaluar_bloque, bloque))
+            if not pendientes:
+                return
+            terminados, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                yield from futuro.result()
+
+
+def evaluar_origen(
+    origen: Union[str, Path, TextIO],
+    trabajadores: Optional[int] = None,
+    tamano_bloque: int = TAMANO_BLOQUE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Punto de entrada del lote: evalúa todos los hogares de un origen
+
+    Args:
+        origen: Directorio, archivo .json/.jsonl o flujo de texto JSONL
+        trabajadores (int, opcional): Procesos del pool (ver evaluar_hogares)
+        tamano_bloque (int): Hogares por envío a un proceso
+
+    Returns:
+        iterator: Resultados a medida que terminan
+    """
+    return evaluar_hogares(leer_entradas(origen), trabajadores, tamano_bloque)
@@ -0,0 +1,527 @@
+"""
+Módulo: metricas.py
+Métricas del monitor en formato OpenMetrics, servidas por HTTP
+
+Un Registro guarda contadores, medidores, histogramas y conjuntos de
+estados, y los expone en el formato de texto OpenMetrics que leen
+Prometheus y compatibles. servir() los publica en http://host:puerto/metrics
+con http.server, en un hilo aparte que no bloquea el menú.
+
+MonitorMetricas conecta el registro con un inventario:
+
+- hogar_artefactos, hogar_consumo_mensual_kwh y
+  hogar_artefactos_por_nivel{nivel}: los agregados que el gestor mantiene
+- hogar_nivel_alerta{hogar_nivel_alerta}: el resultado de
+  SistemaLogico.evaluar_nivel_alerta (memorizado por versión)
+- hogar_artefactos_ingresados_total, hogar_ingesta_segundos_total y
+  hogar_ingesta_artefactos_por_segundo: la carga de artefactos
+- hogar_consulta_segundos{consulta}: latencia de cada consulta del gestor y
+  de los reportes
+
+LECTURA SIN RECORRIDOS:
+El monitor envuelve los métodos del gestor que lo modifican. Después de
+cada cambio, en el mismo hilo que lo hizo, lee los agregados (que no
+recorren el inventario) y guarda los valores en el registro. Leer las
+métricas solo arma el texto con esos valores: nunca toca el gestor, así
+que no recorre nada y sirve también con GestorSQLite, cuya conexión no
+puede usarse desde otro hilo.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.logica import SistemaLogico
+
+TIPO_CONTENIDO = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PUERTO = 9464
+
+# Límites de los histogramas de latencia, en segundos
+LIMITES_LATENCIA: Tuple[float, ...] = (
+    0.00001,
+    0.00005,
+    0.0001,
+    0.0005,
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+
+NIVELES_ALERTA = ("NORMAL", "MODERADA", "CRÍTICA")
+
+# Métodos cuya latencia se mide, por objeto del monitor
+CONSULTAS_GESTOR = (
+    "obtener_por_ubicacion",
+    "obtener_por_tipo",
+    "obtener_por_nivel_consumo",
+    "consultar",
+    "union",
+    "interseccion",
+    "diferencia",
+    "complemento",
+    "rango_ranking",
+)
+REPORTES_CONTEO = ("generar_reporte_estadistico",)
+REPORTES_LOGICA = ("generar_reporte_logico", "generar_recomendaciones")
+MODIFICACIONES = ("eliminar_artefacto", "modificar_artefacto")
+
+# Cada cuántos artefactos de una carga masiva se actualiza la ingesta
+LOTE_INGESTA = 10_000
+
+Etiquetas = Tuple[str, ...]
+
+
+def _escapar(valor: str) -> str:
+    """Escapa un valor de etiqueta (o una ayuda) para OpenMetrics"""
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _numero(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    if float(valor).is_integer() and abs(valor) < 2**53:
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class Metrica:
+    """
+    Familia de métricas con el mismo nombre y distintos valores de etiquetas
+
+    Atributos:
+        nombre (str): Nombre de la familia (sin sufijos _total, _bucket, ...)
+        ayuda (str): Descripción para la línea HELP
+        etiquetas (tuple): Nombres de las etiquetas, en orden
+    """
+
+    TIPO = "unknown"
+
+    def __init__(
+        self, nombre: str, ayuda: str, etiquetas: Sequence[str], candado: threading.Lock
+    ) -> None:
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.etiquetas: Etiquetas = tuple(etiquetas)
+        self._candado = candado
+        self._valores: Dict[Etiquetas, Any] = {}
+
+    def _clave(self, valores: Dict[str, str]) -> Etiquetas:
+        if set(valores) != set(self.etiquetas):
+            raise ValueError(
+                f"{self.nombre} usa las etiquetas ({', '.join(self.etiquetas)}), "
+                f"no ({', '.join(valores)})"
+            )
+        return tuple(str(valores[etiqueta]) for etiqueta in self.etiquetas)
+
+    def _etiquetas(self, clave: Etiquetas, extra: str = "") -> str:
+        pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(self.etiquetas, clave)]
+        if extra:
+            pares.append(extra)
+        return "{" + ",".join(pares) + "}" if pares else ""
+
+    def muestras(self) -> List[str]:
+        """Líneas de muestras de la familia (se llama con el candado tomado)"""
+        return [
+            f"{self.nombre}{self._etiquetas(clave)} {_numero(valor)}"
+            for clave, valor in sorted(self._valores.items())
+        ]
+
+    def exponer(self) -> List[str]:
+        return [
+            f"# TYPE {self.nombre} {self.TIPO}",
+            f"# HELP {self.nombre} {_escapar(self.ayuda)}",
+            *self.muestras(),
+        ]
+
+
+class Contador(Metrica):
+    """Valor que solo crece (cantidad de eventos, segundos acumulados)"""
+
+    TIPO = "counter"
+
+    def incrementar(self, cantidad: float = 1, **etiquetas: str) -> None:
+        if cantidad < 0:
+            raise ValueError("Un contador no puede decrecer")
+        clave = self._clave(etiquetas)
+        with self._candado:
+            self._valores[clave] = self._valores.get(clave, 0) + cantidad
+
+    def valor(self, **etiquetas: str) -> float:
+        return self._valores.get(self._clave(etiquetas), 0)
+
+    def muestras(self) -> List[str]:
+        return [
+            f"{self.nombre}_total{self._etiquetas(clave)} {_numero(valor)}"
+            for clave, valor in sorted(self._valores.items())
+        ]
+
+
+class Medidor(Metrica):
+    """Valor que sube y baja (tamaño del inventario, consumo)"""
+
+    TIPO = "gauge"
+
+    def fijar(self, valor: float, **etiquetas: str) -> None:
+        clave = self._clave(etiquetas)
+        with self._candado:
+            self._valores[clave] = valor
+
+    def valor(self, **etiquetas: str) -> float:
+        return self._valores.get(self._clave(etiquetas), 0)
+
+
+class ConjuntoEstados(Metrica):
+    """Uno de varios estados posibles (tipo stateset de OpenMetrics)"""
+
+    TIPO = "stateset"
+
+    def __init__(
+        self, nombre: str, ayuda: str, estados: Sequence[str], candado: threading.Lock
+    ) -> None:
+        super().__init__(nombre, ayuda, (), candado)
+        self.estados = tuple(estados)
+        self._actual: Optional[str] = None
+
+    def fijar(self, estado: str) -> None:
+        if estado not in self.estados:
+            raise ValueError(f"Estado desconocido para {self.nombre}: {estado}")
+        with self._candado:
+            self._actual = estado
+
+    @property
+    def actual(self) -> Optional[str]:
+        return self._actual
+
+    def muestras(self) -> List[str]:
+        return [
+            f'{self.nombre}{{{self.nombre}="{_escapar(estado)}"}} {int(estado == self._actual)}'
+            for estado in self.estados
+        ]
+
+
+class Histograma(Metrica):
+    """Distribución de observaciones en casilleros acumulados"""
+
+    TIPO = "histogram"
+
+    def __init__(
+        self,
+        nombre: str,
+        ayuda: str,
+        etiquetas: Sequence[str],
+        candado: threading.Lock,
+        limites: Sequence[float] = LIMITES_LATENCIA,
+    ) -> None:
+        super().__init__(nombre, ayuda, etiquetas, candado)
+        self.limites = tuple(sorted(float(limite) for limite in limites))
+
+    def observar(self, valor: float, **etiquetas: str) -> None:
+        clave = self._clave(etiquetas)
+        with self._candado:
+            conteos = self._valores.get(clave)
+            if conteos is None:
+                # Un casillero por límite, más +Inf, más la suma
+                conteos = self._valores[clave] = [0] * (len(self.limites) + 1) + [0.0]
+            for posicion, limite in enumerate(self.limites):
+                if valor <= limite:
+                    conteos[posicion] += 1
+                    break
+            else:
+                conteos[len(self.limites)] += 1
+            conteos[-1] += valor
+
+    def cantidad(self, **etiquetas: str) -> int:
+        conteos = self._valores.get(self._clave(etiquetas))
+        return sum(conteos[:-1]) if conteos else 0
+
+    def muestras(self) -> List[str]:
+        lineas = []
+        for clave, conteos in sorted(self._valores.items()):
+            acumulado = 0
+            for limite, cantidad in zip(self.limites + (float("inf"),), conteos):
+                acumulado += cantidad
+                le = f'le="{_numero(limite)}"'
+                lineas.append(f"{self.nombre}_bucket{self._etiquetas(clave, le)} {acumulado}")
+            lineas.append(f"{self.nombre}_count{self._etiquetas(clave)} {acumulado}")
+            lineas.append(f"{self.nombre}_sum{self._etiquetas(clave)} {_numero(conteos[-1])}")
+        return lineas
+
+
+class Registro:
+    """Conjunto de métricas que se exponen juntas"""
+
+    def __init__(self) -> None:
+        self._candado = threading.Lock()
+        self._metricas: Dict[str, Metrica] = {}
+
+    def _agregar(self, metrica: Metrica) -> Any:
+        if metrica.nombre in self._metricas:
+            raise ValueError(f"La métrica {metrica.nombre} ya está registrada")
+        self._metricas[metrica.nombre] = metrica
+        return metrica
+
+    def contador(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Contador:
+        return self._agregar(Contador(nombre, ayuda, etiquetas, self._candado))
+
+    def medidor(self, nombre: str, ayuda: str, etiquetas: Sequence[str] = ()) -> Medidor:
+        return self._agregar(Medidor(nombre, ayuda, etiquetas, self._candado))
+
+    def estados(self, nombre: str, ayuda: str, estados: Sequence[str]) -> ConjuntoEstados:
+        return self._agregar(ConjuntoEstados(nombre, ayuda, estados, self._candado))
+
+    def histograma(
+        self,
+        nombre: str,
+        ayuda: str,
+        etiquetas: Sequence[str] = (),
+        limites: Sequence[float] = LIMITES_LATENCIA,
+    ) -> Histograma:
+        return self._agregar(Histograma(nombre, ayuda, etiquetas, self._candado, limites))
+
+    def exponer(self) -> str:
+        """
+        Todas las métricas en formato de texto OpenMetrics
+
+        Returns:
+            str: Familias en orden de registro, terminadas en "# EOF"
+        """
+        with self._candado:
+            lineas = [linea for metrica in self._metricas.values() for linea in metrica.exponer()]
+        lineas.append("# EOF")
+        return "\n".join(lineas) + "\n"
+
+
+# ==================== SERVIDOR HTTP ====================
+
+
+class ServidorMetricas:
+    """
+    Servidor HTTP que expone un registro en /metrics desde un hilo daemon
+
+    Atributos:
+        direccion (tuple): (host, puerto) en que escucha
+    """
+
+    def __init__(self, registro: Registro, host: str = "127.0.0.1", puerto: int = PUERTO) -> None:
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404, "Use /metrics")
+                    return
+                cuerpo = registro.exponer().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TIPO_CONTENIDO)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato: str, *args: Any) -> None:
+                # Sin registro por pedido: ensuciaría el menú en la terminal
+                pass
+
+        self._servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        self._servidor.daemon_threads = True
+        self.direccion: Tuple[str, int] = self._servidor.server_address[:2]
+        self._hilo = threading.Thread(
+            target=self._servidor.serve_forever, name="metricas", daemon=True
+        )
+        self._hilo.start()
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.direccion
+        return f"http://{host}:{puerto}/metrics"
+
+    def detener(self) -> None:
+        """Deja de atender pedidos y libera el puerto"""
+        self._servidor.shutdown()
+        self._servidor.server_close()
+        self._hilo.join()
+
+
+def servir(registro: Registro, puerto: int = PUERTO, host: str = "127.0.0.1") -> ServidorMetricas:
+    """
+    Publica el registro en http://host:puerto/metrics
+
+    Args:
+        registro (Registro): Métricas a exponer
+        puerto (int): Puerto TCP (0 elige uno libre)
+        host (str): Interfaz; por defecto solo la local
+
+    Returns:
+        ServidorMetricas: Servidor ya iniciado
+
+    Raises:
+        OSError: Si el puerto no está disponible
+    """
+    return ServidorMetricas(registro, host, puerto)
+
+
+# ==================== MONITOR DEL INVENTARIO ====================
+
+
+class MonitorMetricas:
+    """
+    Métricas de un inventario, actualizadas con cada cambio del gestor
+
+    Reemplaza, en las instancias recibidas, los métodos que modifican el
+    gestor y los de consulta (ver CONSULTAS_GESTOR y REPORTES_*) por
+    versiones que actualizan las métricas. Los métodos de la clase se
+    buscan en cada llamada, así el monitor convive con el perfilador.
+    """
+
+    def __init__(
+        self,
+        gestor: GestorConjuntos,
+        conteo: Optional[AnalizadorConteo] = None,
+        logica: Optional[SistemaLogico] = None,
+        registro: Optional[Registro] = None,
+    ) -> None:
+        self.gestor = gestor
+        self.conteo = conteo or AnalizadorConteo(gestor)
+        self.logica = logica or SistemaLogico(gestor, self.conteo)
+        self.registro = registro or Registro()
+
+        registro = self.registro
+        self.artefactos = registro.medidor("hogar_artefactos", "Artefactos en el inventario")
+        self.consumo = registro.medidor(
+            "hogar_consumo_mensual_kwh", "Consumo mensual total del inventario en kWh"
+        )
+        self.por_nivel = registro.medidor(
+            "hogar_artefactos_por_nivel", "Artefactos por nivel de consumo", ("nivel",)
+        )
+        self.alerta = registro.estados(
+            "hogar_nivel_alerta", "Nivel de alerta del sistema lógico", NIVELES_ALERTA
+        )
+        self.modificaciones = registro.contador(
+            "hogar_modificaciones", "Altas, bajas y cambios del inventario"
+        )
+        self.ingresados = registro.contador(
+            "hogar_artefactos_ingresados", "Artefactos recibidos por las cargas"
+        )
+        self.segundos_ingesta = registro.contador(
+            "hogar_ingesta_segundos", "Tiempo total dedicado a cargar artefactos"
+        )
+        self.tasa_ingesta = registro.medidor(
+            "hogar_ingesta_artefactos_por_segundo", "Velocidad de la última carga"
+        )
+        self.latencia = registro.histograma(
+            "hogar_consulta_segundos", "Latencia de consultas y reportes", ("consulta",)
+        )
+
+        self._version: Optional[int] = None
+        self._instrumentar()
+        self.actualizar()
+
+    # ==================== ACTUALIZACIÓN ====================
+
+    def actualizar(self) -> None:
+        """
+        Copia al registro los agregados del gestor, si cambió desde la
+        última vez (tamaño, consumo y niveles no recorren el inventario; el
+        nivel de alerta queda memorizado por versión en SistemaLogico)
+        """
+        version = self.gestor.version
+        if version == self._version:
+            return
+        if self._version is not None:
+            self.modificaciones.incrementar(max(1, version - self._version))
+        self._version = version
+        self.artefactos.fijar(self.gestor.total_artefactos())
+        self.consumo.fijar(self.gestor.consumo_total_kwh())
+        for nivel, cantidad in self.gestor.contar_por_nivel().items():
+            self.por_nivel.fijar(cantidad, nivel=nivel)
+        self.alerta.fijar(self.logica.evaluar_nivel_alerta())
+
+    def registrar_ingesta(self, cantidad: int, segundos: float) -> None:
+        """Suma una carga de cantidad artefactos que tardó segundos"""
+        self.ingresados.incrementar(cantidad)
+        self.segundos_ingesta.incrementar(segundos)
+        if segundos > 0:
+            self.tasa_ingesta.fijar(cantidad / segundos)
+
+    def observar_consulta(self, consulta: str, segundos: float) -> None:
+        self.latencia.observar(segundos, consulta=consulta)
+
+    def servir(self, puerto: int = PUERTO, host: str = "127.0.0.1") -> ServidorMetricas:
+        """Publica las métricas por HTTP (ver servir)"""
+        return servir(self.registro, puerto, host)
+
+    # ==================== INSTRUMENTACIÓN ====================
+
+    def _instrumentar(self) -> None:
+        for objeto, nombres in (
+            (self.gestor, CONSULTAS_GESTOR),
+            (self.conteo, REPORTES_CONTEO),
+            (self.logica, REPORTES_LOGICA),
+        ):
+            for nombre in nombres:
+                if hasattr(type(objeto), nombre):
+                    setattr(objeto, nombre, self._medir_consulta(objeto, nombre))
+        for nombre in MODIFICACIONES:
+            setattr(self.gestor, nombre, self._tras_cambio(nombre))
+        self.gestor.agregar_artefacto = self._agregar_uno
+        self.gestor.agregar_artefactos = self._agregar_varios
+
+    def _metodo(self, objeto: Any, nombre: str) -> Callable:
+        """Método de la clase ligado al objeto, buscado en cada llamada"""
+        return getattr(type(objeto), nombre).__get__(objeto)
+
+    def _medir_consulta(self, objeto: Any, nombre: str) -> Callable:
+        def medida(*args: Any, **kwargs: Any) -> Any:
+            inicio = time.perf_counter()
+            try:
+                return self._metodo(objeto, nombre)(*args, **kwargs)
+            finally:
+                self.observar_consulta(nombre, time.perf_counter() - inicio)
+
+        return medida
+
+    def _tras_cambio(self, nombre: str) -> Callable:
+        def modificar(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return self._metodo(self.gestor, nombre)(*args, **kwargs)
+            finally:
+                self.actualizar()
+
+        return modificar
+
+    def _agregar_uno(self, artefacto: Any) -> None:
+        inicio = time.perf_counter()
+        try:
+            self._metodo(self.gestor, "agregar_artefacto")(artefacto)
+        finally:
+            self.registrar_ingesta(1, time.perf_counter() - inicio)
+            self.actualizar()
+
+    def _agregar_varios(self, artefactos: Iterable[Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            return self._metodo(self.gestor, "agregar_artefactos")(
+                self._contar_ingesta(artefactos), *args, **kwargs
+            )
+        finally:
+            self.actualizar()
+
+    def _contar_ingesta(self, artefactos: Iterable[Any]) -> Iterator[Any]:
+        """Entrega los artefactos y registra la ingesta cada LOTE_INGESTA"""
+        pendientes = 0
+        inicio = time.perf_counter()
+        try:
+            for artefacto in artefactos:
+                yield artefacto
+                pendientes += 1
+                if pendientes == LOTE_INGESTA:
+                    ahora = time.perf_counter()
+                    self.registrar_ingesta(pendientes, ahora - inicio)
+                    pendientes, inicio = 0, ahora
+        finally:
+            if pendientes:
+                self.registrar_ingesta(pendientes, time.perf_counter() - inicio)
@@ -0,0 +1,332 @@
+"""
+Módulo: perfilado.py
+Perfil de ejecución por método, activado a pedido
+
+Cuando un reporte es lento, el perfil muestra en qué métodos se va el
+tiempo: cada método público de GestorConjuntos, GestorSQLite,
+AnalizadorConteo, SistemaLogico y Artefacto registra
+
+- llamadas: cuántas veces se llamó
+- total: tiempo acumulado, incluidos los métodos que llama
+- propio: tiempo acumulado sin los métodos perfilados que llama
+- p50 y p99: latencia mediana y percentil 99 de una llamada
+- filas: artefactos recorridos durante la llamada (ver FUENTES_FILAS)
+
+SIN COSTO DESACTIVADO:
+Los métodos se envuelven recién al activar el perfilador y se restauran al
+desactivarlo: mientras está desactivado las clases son las originales, sin
+ningún chequeo por llamada. Con el perfil activo, cada llamada suma del
+orden de un microsegundo.
+
+Los percentiles salen de un histograma logarítmico (SUBDIVISIONES
+casilleros por cada potencia de 2, error menor al 3 %), así la memoria no
+crece con la cantidad de llamadas.
+
+Uso:
+    with Perfilador() as perfilador:
+        conteo.generar_reporte_estadistico()
+    print(perfilador.reporte())
+"""
+
+import functools
+import inspect
+import json
+import math
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from models.artefacto import Artefacto
+from services.almacen_sqlite import GestorSQLite
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.logica import SistemaLogico
+
+CLASES = (GestorConjuntos, GestorSQLite, AnalizadorConteo, SistemaLogico, Artefacto)
+
+# Casilleros del histograma por cada potencia de 2 de nanosegundos
+SUBDIVISIONES = 16
+
+# Solo un perfilador puede estar activo: los métodos se reemplazan en las clases
+_activo: Optional["Perfilador"] = None
+
+
+class Estadistica:
+    """Mediciones acumuladas de un método"""
+
+    __slots__ = ("llamadas", "total_ns", "propio_ns", "maximo_ns", "filas", "_histograma")
+
+    def __init__(self) -> None:
+        self.llamadas = 0
+        self.total_ns = 0
+        self.propio_ns = 0
+        self.maximo_ns = 0
+        self.filas = 0
+        self._histograma: Dict[int, int] = {}
+
+    def registrar(self, duracion_ns: int, propio_ns: int, filas: int) -> None:
+        self.llamadas += 1
+        self.total_ns += duracion_ns
+        self.propio_ns += propio_ns
+        self.filas += filas
+        if duracion_ns > self.maximo_ns:
+            self.maximo_ns = duracion_ns
+        casillero = int(math.log2(duracion_ns + 1) * SUBDIVISIONES)
+        self._histograma[casillero] = self._histograma.get(casillero, 0) + 1
+
+    def percentil(self, fraccion: float) -> float:
+        """
+        Latencia (en segundos) que no supera la fracción pedida de llamadas
+
+        Args:
+            fraccion (float): Entre 0 y 1 (0.5 = mediana, 0.99 = p99)
+
+        Returns:
+            float: Centro del casillero del histograma, o 0 sin llamadas
+        """
+        if not self.llamadas:
+            return 0.0
+        objetivo = max(1, math.ceil(fraccion * self.llamadas))
+        acumuladas = 0
+        for casillero in sorted(self._histograma):
+            acumuladas += self._histograma[casillero]
+            if acumuladas >= objetivo:
+                centro = 2 ** ((casillero + 0.5) / SUBDIVISIONES) - 1
+                return min(centro, self.maximo_ns) / 1e9
+        return self.maximo_ns / 1e9
+
+    def resumen(self) -> Dict[str, float]:
+        """Mediciones en segundos, como se guardan en JSON"""
+        return {
+            "llamadas": self.llamadas,
+            "total": self.total_ns / 1e9,
+            "propio": self.propio_ns / 1e9,
+            "p50": self.percentil(0.50),
+            "p99": self.percentil(0.99),
+            "maximo": self.maximo_ns / 1e9,
+            "filas": self.filas,
+        }
+
+
+# ==================== FILAS RECORRIDAS ====================
+#
+# Las filas se cuentan donde se leen: cada artefacto que entrega
+# iterar_artefactos u obtener_artefacto y cada elemento de los conjuntos y
+# rangos del ranking que arman las consultas. Un método suma las filas
+# leídas mientras corre, así un reporte incluye las de todas sus consultas.
+
+
+def _filas_iteracion(
+    perfilador: "Perfilador", estadistica: Estadistica, artefactos: Iterable[Any]
+) -> Iterator[Any]:
+    # El recorrido ocurre después de que iterar_artefactos volvió: las
+    # filas se suman a medida que se entregan
+    for artefacto in artefactos:
+        perfilador._filas += 1
+        estadistica.filas += 1
+        yield artefacto
+
+
+def _filas_artefacto(perfilador: "Perfilador", estadistica: Estadistica, artefacto: Any) -> Any:
+    if artefacto is not None:
+        perfilador._filas += 1
+    return artefacto
+
+
+def _filas_conjunto(perfilador: "Perfilador", estadistica: Estadistica, conjunto: Any) -> Any:
+    # También sirve para las listas de pares (nombre, consumo) del ranking
+    perfilador._filas += len(conjunto)
+    return conjunto
+
+
+FUENTES_FILAS: Dict[str, Callable[["Perfilador", Estadistica, Any], Any]] = {
+    "iterar_artefactos": _filas_iteracion,
+    "obtener_artefacto": _filas_artefacto,
+    "obtener_por_ubicacion": _filas_conjunto,
+    "obtener_por_tipo": _filas_conjunto,
+    "obtener_por_nivel_consumo": _filas_conjunto,
+    "union": _filas_conjunto,
+    "interseccion": _filas_conjunto,
+    "diferencia": _filas_conjunto,
+    "complemento": _filas_conjunto,
+    "consultar": _filas_conjunto,
+    "rango_ranking": _filas_conjunto,
+}
+
+
+def _metodos_publicos(clase: type) -> Dict[str, Callable]:
+    """Funciones públicas definidas en la clase (sin propiedades ni estáticos)"""
+    return {
+        nombre: valor
+        for nombre, valor in vars(clase).items()
+        if not nombre.startswith("_") and inspect.isfunction(valor)
+    }
+
+
+class Perfilador:
+    """
+    Perfil de ejecución de los métodos públicos de un conjunto de clases
+
+    Atributos:
+        clases (tuple): Clases cuyos métodos se miden mientras está activo
+    """
+
+    def __init__(self, clases: Iterable[type] = CLASES) -> None:
+        self.clases = tuple(clases)
+        self._estadisticas: Dict[str, Estadistica] = {}
+        self._originales: List[tuple] = []
+        self._local = threading.local()
+        # Filas leídas desde que se creó (ver FUENTES_FILAS)
+        self._filas = 0
+
+    # ==================== ACTIVACIÓN ====================
+
+    @property
+    def activo(self) -> bool:
+        return _activo is self
+
+    def activar(self) -> "Perfilador":
+        """
+        Reemplaza los métodos de las clases por versiones medidas
+
+        Raises:
+            RuntimeError: Si ya hay otro perfilador activo
+        """
+        global _activo
+        if _activo is self:
+            return self
+        if _activo is not None:
+            raise RuntimeError("Ya hay un perfilador activo")
+        for clase in self.clases:
+            for nombre, funcion in _metodos_publicos(clase).items():
+                self._originales.append((clase, nombre, funcion))
+                setattr(clase, nombre, self._medir(f"{clase.__name__}.{nombre}", funcion))
+        _activo = self
+        return self
+
+    def desactivar(self) -> None:
+        """Restaura los métodos originales; las mediciones se conservan"""
+        global _activo
+        if _activo is not self:
+            return
+        for clase, nombre, funcion in reversed(self._originales):
+            setattr(clase, nombre, funcion)
+        self._originales.clear()
+        _activo = None
+
+    def __enter__(self) -> "Perfilador":
+        return self.activar()
+
+    def __exit__(self, *excepcion: Any) -> None:
+        self.desactivar()
+
+    def reiniciar(self) -> None:
+        """Descarta las mediciones acumuladas"""
+        self._estadisticas.clear()
+        self._filas = 0
+
+    def _medir(self, clave: str, funcion: Callable) -> Callable:
+        """Envuelve funcion para registrar sus llamadas en la estadística clave"""
+        estadistica = self._estadisticas.setdefault(clave, Estadistica())
+        contar_filas = FUENTES_FILAS.get(funcion.__name__)
+        reloj = time.perf_counter_ns
+        perfilador = self
+
+        @functools.wraps(funcion)
+        def medida(*args: Any, **kwargs: Any) -> Any:
+            # Pila de tiempos de los métodos medidos llamados por cada
+            # llamada en curso, para separar el tiempo propio
+            pila = perfilador._pila()
+            pila.append(0)
+            filas_antes = perfilador._filas
+            inicio = reloj()
+            try:
+                resultado = funcion(*args, **kwargs)
+                if contar_filas is not None and perfilador._filas == filas_antes:
+                    # Solo la consulta más interna cuenta sus filas
+                    resultado = contar_filas(perfilador, estadistica, resultado)
+                return resultado
+            finally:
+                duracion = reloj() - inicio
+                llamados = pila.pop()
+                if pila:
+                    pila[-1] += duracion
+                filas = perfilador._filas - filas_antes
+                estadistica.registrar(duracion, duracion - llamados, filas)
+
+        return medida
+
+    def _pila(self) -> List[int]:
+        pila = getattr(self._local, "pila", None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    # ==================== RESULTADOS ====================
+
+    def estadisticas(self) -> Dict[str, Dict[str, float]]:
+        """
+        Mediciones de los métodos llamados al menos una vez
+
+        Returns:
+            dict: {"Clase.metodo": {llamadas, total, propio, p50, p99,
+            maximo, filas}}, con los tiempos en segundos, ordenado por
+            tiempo total descendente
+        """
+        medidos = [(c, e) for c, e in self._estadisticas.items() if e.llamadas]
+        medidos.sort(key=lambda par: (-par[1].total_ns, par[0]))
+        return {clave: estadistica.resumen() for clave, estadistica in medidos}
+
+    def reporte(self, limite: Optional[int] = None) -> str:
+        """
+        Tabla con las mediciones, del método más lento al más rápido
+
+        Args:
+            limite (int, opcional): Cantidad máxima de métodos a mostrar
+        """
+        estadisticas = list(self.estadisticas().items())
+        lineas = ["\n" + "=" * 60, "⏱️  PERFIL DE EJECUCIÓN", "=" * 60]
+        if not estadisticas:
+            lineas.append("\nNo se registraron llamadas.")
+            return "\n".join(lineas) + "\n"
+        ancho = max(len(clave) for clave, _ in estadisticas[:limite]) + 2
+        lineas.append(
+            f"\n{'Método':<{ancho}}{'llamadas':>10}{'total':>11}{'propio':>11}"
+            f"{'p50':>11}{'p99':>11}{'filas':>12}"
+        )
+        for clave, medida in estadisticas[:limite]:
+            lineas.append(
+                f"{clave:<{ancho}}{medida['llamadas']:>10,}{_formatear(medida['total'])}"
+                f"{_formatear(medida['propio'])}{_formatear(medida['p50'])}"
+                f"{_formatear(medida['p99'])}{medida['filas']:>12,}"
+            )
+        if limite is not None and len(estadisticas) > limite:
+            lineas.append(f"... y {len(estadisticas) - limite} métodos más")
+        return "\n".join(lineas) + "\n"
+
+    def guardar(self, destino: Union[str, Path, TextIO]) -> None:
+        """
+        Vuelca el perfil: "-" lo escribe como tabla en la salida de errores;
+        una ruta .json, como JSON; cualquier otra ruta, como tabla
+        """
+        if not isinstance(destino, (str, Path)):
+            destino.write(self.reporte())
+        elif str(destino) == "-":
+            sys.stderr.write(self.reporte())
+        elif Path(destino).suffix.lower() == ".json":
+            with open(destino, "w", encoding="utf-8") as archivo:
+                json.dump({"metodos": self.estadisticas()}, archivo, ensure_ascii=False, indent=2)
+        else:
+            with open(destino, "w", encoding="utf-8") as archivo:
+                archivo.write(self.reporte())
+
+
+def _formatear(segundos: float) -> str:
+    """Tiempo en 11 columnas, con la unidad más legible"""
+    if segundos >= 1:
+        return f"{segundos:>9.2f} s"
+    if segundos >= 1e-3:
+        return f"{segundos * 1e3:>8.2f} ms"
+    return f"{segundos * 1e6:>8.2f} µs"
@@ -0,0 +1,302 @@
+"""
+Módulo: perfiles.py
+Curva de carga diaria y picos de demanda a partir de los perfiles de uso
+
+Cada artefacto puede traer un perfil de uso (Artefacto.perfil_uso): la
+fracción de cada hora o cuarto de hora del día en que está encendido. Con
+los perfiles se arma una matriz de carga de artefactos × 96 cuartos de
+hora (en kW) y todas las curvas salen de sumas vectorizadas sobre ella:
+
+- Curva de carga del hogar: suma de las filas.
+- Curva de cada ubicación: suma de las filas de cada grupo, con un solo
+  np.bincount sobre todas las celdas.
+- Simultaneidad: cuántos artefactos de alto consumo están encendidos a la
+  vez en cada cuarto de hora de cada ubicación.
+
+Los artefactos con horarios de encendido (Artefacto.horarios) usan como
+perfil la parte de cada cuarto de hora que cubren esos horarios, antes que
+su perfil de uso. Los que no tienen ninguno de los dos reparten sus
+horas_dia en partes iguales a lo largo del día (carga media): aportan lo
+mismo a cada cuarto de hora, así que se suman por ubicación sin ocupar
+filas de la matriz, que tiene solo los artefactos con perfil. Para la
+simultaneidad, en cambio, se supone que pueden estar encendidos en
+cualquier momento, como hasta ahora.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.artefacto import UMBRAL_ALTO_W, Artefacto
+from services.agenda import ocupacion_en_ranuras
+from services.conjuntos import GestorConjuntos
+
+# Resolución de las curvas: cuartos de hora por día
+RANURAS = 96
+MINUTOS_RANURA = 24 * 60 // RANURAS
+
+
+def perfil_en_ranuras(perfil: np.ndarray) -> np.ndarray:
+    """Lleva un perfil de 24 horas a 96 cuartos de hora (cada hora se repite 4 veces)"""
+    if len(perfil) == RANURAS:
+        return perfil
+    return np.repeat(perfil, RANURAS // len(perfil))
+
+
+def perfil_de(artefacto: Artefacto) -> Optional[np.ndarray]:
+    """
+    Perfil de un artefacto en 96 cuartos de hora
+
+    Returns:
+        np.ndarray or None: Cobertura de sus horarios si los tiene, si no su
+        perfil de uso; None si no tiene ninguno de los dos
+    """
+    if artefacto.horarios is not None:
+        return ocupacion_en_ranuras(artefacto.horarios, RANURAS)
+    if artefacto.perfil_uso is not None:
+        return perfil_en_ranuras(artefacto.perfil_uso)
+    return None
+
+
+def hora_de_ranura(ranura: int) -> str:
+    """Hora de inicio de una ranura, como "HH:MM" """
+    minutos = int(ranura) * MINUTOS_RANURA
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+class MotorPerfiles:
+    """
+    Calcula curvas de carga y picos de demanda de un gestor
+
+    La matriz de carga se arma y se reduce a una curva por ubicación una vez
+    por versión del inventario (igual que la memoización de SistemaLogico);
+    las consultas posteriores solo leen esas curvas.
+    """
+
+    def __init__(self, gestor: GestorConjuntos) -> None:
+        self.gestor = gestor
+        self._version: int = -1
+
+        self.ubicaciones: List[str] = []
+        # Curva de carga (kW) de cada ubicación: una fila por ubicación
+        self._curvas: np.ndarray = np.zeros((0, RANURAS))
+        # Artefactos de alto consumo encendidos en cada ranura, por ubicación
+        self._simultaneos: np.ndarray = np.zeros((0, RANURAS))
+        self._con_perfil: int = 0
+
+    @classmethod
+    def de(cls, gestor: GestorConjuntos) -> "MotorPerfiles":
+        """Devuelve el motor compartido de un gestor (lo crea si falta)"""
+        motor = gestor._motor_perfiles
+        if motor is None:
+            motor = cls(gestor)
+            gestor._motor_perfiles = motor
+        return motor
+
+    def _actualizar(self) -> None:
+        """Rearma la matriz de carga si el inventario cambió"""
+        if self._version == self.gestor.version:
+            return
+
+        # Código de ubicación por texto tal como vino, y por etiqueta
+        codigo_de_texto: Dict[str, int] = {}
+        codigos: Dict[str, int] = {}
+        filas_ubicacion: List[int] = []
+        potencias: List[float] = []
+        horas: List[float] = []
+        filas_perfil: List[int] = []
+        perfiles: List[np.ndarray] = []
+
+        for fila, artefacto in enumerate(self.gestor.iterar_artefactos()):
+            codigo = codigo_de_texto.get(artefacto.ubicacion)
+            if codigo is None:
+                etiqueta = self.gestor.etiqueta_ubicacion(artefacto.ubicacion)
+                codigo = codigos.setdefault(etiqueta, len(codigos))
+                codigo_de_texto[artefacto.ubicacion] = codigo
+            filas_ubicacion.append(codigo)
+            potencias.append(artefacto.watts)
+            horas.append(artefacto.horas_dia)
+            perfil = perfil_de(artefacto)
+            if perfil is not None:
+                filas_perfil.append(fila)
+                perfiles.append(perfil)
+
+        self.ubicaciones = list(codigos)
+        cantidad = len(self.ubicaciones)
+        grupos = np.asarray(filas_ubicacion, dtype=np.intp)
+        kw = np.asarray(potencias, dtype=np.float64) / 1000
+        con_perfil = np.zeros(len(grupos), dtype=bool)
+        con_perfil[filas_perfil] = True
+        alto = kw * 1000 > UMBRAL_ALTO_W
+
+        # Sin perfil: horas_dia repartidas en partes iguales a lo largo del
+        # día, así que aportan lo mismo a cada ranura y basta un bincount.
+        # Solo los artefactos con perfil ocupan filas de la matriz de carga.
+        media = kw * np.asarray(horas, dtype=np.float64) / 24
+        media[con_perfil] = 0
+        self._curvas = np.repeat(
+            np.bincount(grupos, weights=media, minlength=cantidad)[:, None], RANURAS, axis=1
+        )
+        # Los de alto consumo sin perfil cuentan como encendidos en todas las ranuras
+        sin_perfil = np.bincount(grupos[alto & ~con_perfil], minlength=cantidad)
+        self._simultaneos = np.repeat(sin_perfil[:, None].astype(np.float64), RANURAS, axis=1)
+        if perfiles:
+            filas = np.asarray(filas_perfil, dtype=np.intp)
+            matriz = np.stack(perfiles)
+            self._curvas += _sumar_grupos(matriz * kw[filas, None], grupos[filas], cantidad)
+            # Los de alto consumo con perfil, solo en las ranuras en que están encendidos
+            altos = alto[filas]
+            self._simultaneos += _sumar_grupos(
+                (matriz[altos] > 0).astype(np.float64), grupos[filas[altos]], cantidad
+            )
+        self._con_perfil = len(filas_perfil)
+        self._version = self.gestor.version
+
+    def artefactos_con_perfil(self) -> int:
+        """Cantidad de artefactos que tienen perfil de uso u horarios"""
+        self._actualizar()
+        return self._con_perfil
+
+    # ==================== CURVAS ====================
+
+    def curva_carga(self) -> np.ndarray:
+        """
+        Curva de carga diaria del hogar
+
+        Returns:
+            np.ndarray: Demanda media en kW de cada cuarto de hora (96 valores)
+        """
+        self._actualizar()
+        return self._curvas.sum(axis=0)
+
+    def curvas_por_ubicacion(self) -> Dict[str, np.ndarray]:
+        """
+        Curva de carga de cada ubicación
+
+        Returns:
+            dict: {ubicacion: demanda en kW de cada cuarto de hora}
+        """
+        self._actualizar()
+        return dict(zip(self.ubicaciones, self._curvas))
+
+    def pico(self) -> Tuple[float, str]:
+        """
+        Pico de demanda del hogar
+
+        Returns:
+            tuple: (kW en el pico, hora "HH:MM" en que empieza)
+        """
+        curva = self.curva_carga()
+        ranura = int(np.argmax(curva))
+        return float(curva[ranura]), hora_de_ranura(ranura)
+
+    def picos_por_ubicacion(self) -> Dict[str, Tuple[float, str]]:
+        """
+        Pico de demanda de cada ubicación
+
+        Returns:
+            dict: {ubicacion: (kW en el pico, hora "HH:MM")}
+        """
+        self._actualizar()
+        ranuras = np.argmax(self._curvas, axis=1)
+        picos = self._curvas[np.arange(len(ranuras)), ranuras]
+        return {
+            ubicacion: (float(pico), hora_de_ranura(ranura))
+            for ubicacion, pico, ranura in zip(self.ubicaciones, picos, ranuras)
+        }
+
+    # ==================== SIMULTANEIDAD ====================
+
+    def maximo_simultaneo_alto(self) -> Dict[str, int]:
+        """
+        Máximo de artefactos de alto consumo encendidos a la vez, por ubicación
+
+        Los que tienen perfil cuentan solo en los cuartos de hora en que están
+        encendidos; los que no tienen, en todos. Sin ningún perfil, el
+        resultado es la cantidad de artefactos de alto consumo.
+
+        Returns:
+            dict: {ubicacion: máximo de artefactos simultáneos}
+        """
+        self._actualizar()
+        maximos = self._simultaneos.max(axis=1, initial=0)
+        return {
+            ubicacion: int(maximo) for ubicacion, maximo in zip(self.ubicaciones, maximos)
+        }
+
+    def ranuras_simultaneas(self, ubicacion: str, minimo: int = 2) -> List[str]:
+        """
+        Cuartos de hora en que una ubicación tiene al menos minimo artefactos
+        de alto consumo encendidos
+
+        Returns:
+            list: Horas "HH:MM" de inicio de esos cuartos de hora
+        """
+        self._actualizar()
+        if ubicacion not in self.ubicaciones:
+            return []
+        encendidos = self._simultaneos[self.ubicaciones.index(ubicacion)]
+        return [hora_de_ranura(ranura) for ranura in np.flatnonzero(encendidos >= minimo)]
+
+    # ==================== REPORTE ====================
+
+    def generar_reporte_demanda(self) -> str:
+        """
+        Genera el reporte de curva de carga y picos de demanda
+
+        Returns:
+            str: Reporte formateado
+        """
+        self._actualizar()
+        reporte = "\n" + "=" * 60 + "\n"
+        reporte += "   DEMANDA DIARIA - PERFILES DE USO\n"
+        reporte += "=" * 60 + "\n\n"
+
+        total = self.gestor.total_artefactos()
+        reporte += f"📈 Artefactos con perfil de uso u horarios: {self._con_perfil} de {total}\n"
+        reporte += "   (los demás se reparten en partes iguales a lo largo del día)\n\n"
+
+        pico, hora = self.pico()
+        reporte += f"⚡ PICO DEL HOGAR: {pico:.2f} kW a las {hora}\n\n"
+
+        reporte += "📍 PICO POR UBICACIÓN\n"
+        picos = sorted(self.picos_por_ubicacion().items(), key=lambda x: x[1][0], reverse=True)
+        for ubicacion, (pico, hora) in picos:
+            reporte += f"   {ubicacion}: {pico:.2f} kW a las {hora}\n"
+        reporte += "\n"
+
+        reporte += "🔥 ALTO CONSUMO ENCENDIDO A LA VEZ\n"
+        simultaneos = {
+            ubicacion: maximo
+            for ubicacion, maximo in self.maximo_simultaneo_alto().items()
+            if maximo >= 2
+        }
+        if simultaneos:
+            for ubicacion, maximo in sorted(simultaneos.items()):
+                horas = self.ranuras_simultaneas(ubicacion)
+                reporte += f"   {ubicacion}: hasta {maximo} desde las {horas[0]}\n"
+        else:
+            reporte += "   Ninguna ubicación\n"
+
+        reporte += "\n" + "=" * 60 + "\n"
+        return reporte
+
+
+def _sumar_grupos(matriz: np.ndarray, grupos: np.ndarray, cantidad: int) -> np.ndarray:
+    """
+    Suma las filas de cada grupo con un único np.bincount
+
+    Cada celda (fila, ranura) va al casillero grupo × RANURAS + ranura, así
+    que no hace falta ordenar las filas ni recorrer los grupos.
+
+    Args:
+        matriz (np.ndarray): Una fila de RANURAS valores por artefacto
+        grupos (np.ndarray): Grupo (0..cantidad-1) de cada fila
+        cantidad (int): Cantidad de grupos
+
+    Returns:
+        np.ndarray: Una fila por grupo (ceros para los grupos vacíos)
+    """
+    casilleros = (grupos[:, None] * RANURAS + np.arange(RANURAS)).ravel()
+    sumas = np.bincount(casilleros, weights=matriz.ravel(), minlength=cantidad * RANURAS)
+    return sumas.reshape(cantidad, RANURAS)
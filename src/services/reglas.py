@@ -0,0 +1,284 @@
+"""
+Módulo: reglas.py
+Evaluación vectorizada de las reglas lógicas para muchos hogares
+
+SistemaLogico evalúa las proposiciones p, q, r, s de un solo hogar con
+condicionales de Python. Este módulo compila las mismas reglas (fórmulas
+con ∧ ∨ ¬ →) a operaciones sobre columnas booleanas de NumPy, con una fila
+por hogar, de modo que el nivel de alerta y las recomendaciones de todos
+los hogares se calculan en una sola pasada.
+
+PROPOSICIONES POR HOGAR (mismos umbrales por defecto que SistemaLogico):
+- p: El consumo mensual es mayor a 300 kWh
+- q: Hay más de 2 artefactos de alto consumo
+- r: Alguna ubicación consume más de 50 kWh
+- s: Alguna ubicación tiene 2 o más artefactos de alto consumo
+- hay_artefactos: El hogar tiene al menos un artefacto
+
+Así, r ∨ s equivale a "hay ubicaciones críticas" en SistemaLogico.
+
+DIFERENCIA CON SistemaLogico: las columnas no traen horarios ni perfiles de
+uso, así que s solo cuenta los artefactos de alto consumo de cada ubicación.
+SistemaLogico, en cambio, exige que al menos dos estén encendidos a la vez
+según sus horarios o perfiles. Las dos coinciden cuando ningún artefacto de
+alto consumo tiene horarios ni perfil (SistemaLogico los supone encendidos
+en cualquier momento); si los tienen, aquí s puede ser verdadera y allá no.
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from models.artefacto import UMBRAL_ALTO_W
+
+Columnas = Mapping[str, np.ndarray]
+Regla = Callable[[Columnas], np.ndarray]
+
+# Niveles de alerta, en el orden de sus códigos
+NIVELES_ALERTA: Tuple[str, ...] = ("CRÍTICA", "MODERADA", "NORMAL")
+
+# Reglas de SistemaLogico.evaluar_nivel_alerta, de la más a la menos grave.
+# El primer nivel cuya fórmula se cumple gana; si ninguna, NORMAL.
+REGLAS_ALERTA: Tuple[Tuple[str, str], ...] = (
+    ("CRÍTICA", "p ∧ q"),
+    ("MODERADA", "p ∨ q"),
+)
+
+# Reglas de SistemaLogico.generar_recomendaciones, en el mismo orden
+REGLAS_RECOMENDACION: Dict[str, str] = {
+    "revisar_consumo": "p",
+    "reemplazar_alto_consumo": "q",
+    "critico": "p ∧ q",
+    "ubicaciones_criticas": "r ∨ s",
+    "mayor_consumidor": "hay_artefactos",
+    "felicitacion": "¬p ∧ ¬q",
+}
+
+_TOKEN = re.compile(r"\s*(?:(?P<variable>\w+)|(?P<simbolo>→|->|[∧∨¬&|~!()]))")
+
+# Conectivo canónico de cada símbolo o alias ASCII
+CONECTIVOS = {
+    "∧": "∧", "&": "∧", "and": "∧",
+    "∨": "∨", "|": "∨", "or": "∨",
+    "¬": "¬", "~": "¬", "!": "¬", "not": "¬",
+    "→": "→", "->": "→",
+}
+
+
+# ==================== COMPILADOR ====================
+
+
+def _tokenizar(formula: str) -> List[str]:
+    tokens: List[str] = []
+    posicion = 0
+    formula = formula.rstrip()
+    while posicion < len(formula):
+        coincidencia = _TOKEN.match(formula, posicion)
+        if coincidencia is None:
+            raise ValueError(f"Carácter inesperado en la fórmula: {formula[posicion:]!r}")
+        token = coincidencia.group("variable") or coincidencia.group("simbolo")
+        tokens.append(CONECTIVOS.get(token, token))
+        posicion = coincidencia.end()
+    return tokens
+
+
+class _Compilador:
+    """
+    Analizador descendente recursivo que devuelve funciones sobre columnas
+
+    Precedencia, de mayor a menor: ¬, ∧, ∨, → (asociativa a derecha).
+    """
+
+    def __init__(self, tokens: List[str]) -> None:
+        self.tokens = tokens
+        self.posicion = 0
+
+    def _siguiente(self) -> Optional[str]:
+        if self.posicion < len(self.tokens):
+            return self.tokens[self.posicion]
+        return None
+
+    def _consumir(self, token: str) -> bool:
+        if self._siguiente() == token:
+            self.posicion += 1
+            return True
+        return False
+
+    def compilar(self) -> Regla:
+        regla = self._implicacion()
+        if self._siguiente() is not None:
+            raise ValueError(f"Token inesperado en la fórmula: {self._siguiente()!r}")
+        return regla
+
+    def _implicacion(self) -> Regla:
+        antecedente = self._disyuncion()
+        if self._consumir("→"):
+            consecuente = self._implicacion()
+            # p → q  ≡  ¬p ∨ q
+            return lambda c: ~antecedente(c) | consecuente(c)
+        return antecedente
+
+    def _disyuncion(self) -> Regla:
+        regla = self._conjuncion()
+        while self._consumir("∨"):
+            izquierda, derecha = regla, self._conjuncion()
+            regla = lambda c, a=izquierda, b=derecha: a(c) | b(c)  # noqa: E731
+        return regla
+
+    def _conjuncion(self) -> Regla:
+        regla = self._negacion()
+        while self._consumir("∧"):
+            izquierda, derecha = regla, self._negacion()
+            regla = lambda c, a=izquierda, b=derecha: a(c) & b(c)  # noqa: E731
+        return regla
+
+    def _negacion(self) -> Regla:
+        if self._consumir("¬"):
+            operando = self._negacion()
+            return lambda c: ~operando(c)
+        if self._consumir("("):
+            regla = self._implicacion()
+            if not self._consumir(")"):
+                raise ValueError("Falta cerrar un paréntesis en la fórmula")
+            return regla
+        token = self._siguiente()
+        if token is None or token in CONECTIVOS.values() or token == ")":
+            raise ValueError(f"Se esperaba una proposición y llegó {token!r}")
+        self.posicion += 1
+
+        def variable(columnas: Columnas) -> np.ndarray:
+            try:
+                return columnas[token]
+            except KeyError:
+                raise ValueError(f"Proposición desconocida: {token!r}") from None
+
+        return variable
+
+
+@lru_cache(maxsize=128)
+def compilar_regla(formula: str) -> Regla:
+    """
+    Compila una fórmula proposicional a una función vectorizada
+
+    Args:
+        formula (str): Por ejemplo "p ∧ ¬q" o "(r ∨ s) -> p". Admite los
+            alias ASCII & | ~ ! -> and or not.
+
+    Returns:
+        callable: Recibe {proposición: arreglo bool} y devuelve el arreglo
+        bool con el valor de la fórmula en cada fila
+
+    Raises:
+        ValueError: Si la fórmula está mal formada
+    """
+    tokens = _tokenizar(formula)
+    if not tokens:
+        raise ValueError("La fórmula está vacía")
+    return _Compilador(tokens).compilar()
+
+
+# ==================== PROPOSICIONES ====================
+
+
+def proposiciones_por_hogar(
+    hogares: np.ndarray,
+    watts: np.ndarray,
+    horas_dia: np.ndarray,
+    ubicaciones: np.ndarray,
+    cantidad_hogares: Optional[int] = None,
+    umbral_kwh: float = 300,
+    umbral_alto: int = 2,
+    umbral_ubicacion_kwh: float = 50,
+    minimo_alto: int = 2,
+) -> Dict[str, np.ndarray]:
+    """
+    Calcula p, q, r, s para cada hogar a partir de columnas de artefactos
+
+    Las columnas tienen una fila por artefacto (como en AlmacenColumnar) y
+    hogares indica a qué hogar pertenece cada fila. s cuenta artefactos de
+    alto consumo sin mirar horarios (ver el docstring del módulo).
+
+    Args:
+        hogares (np.ndarray): Número de hogar (0..H-1) de cada artefacto
+        watts (np.ndarray): Potencia de cada artefacto
+        horas_dia (np.ndarray): Horas de uso diario de cada artefacto
+        ubicaciones (np.ndarray): Código de ubicación de cada artefacto
+        cantidad_hogares (int, opcional): H; por defecto, max(hogares) + 1
+        umbral_kwh (float): Umbral de consumo mensual de p
+        umbral_alto (int): Artefactos de alto consumo que superan q
+        umbral_ubicacion_kwh (float): Umbral de consumo por ubicación de r
+        minimo_alto (int): Artefactos de alto consumo por ubicación de s
+
+    Returns:
+        dict: {proposición: arreglo bool con una fila por hogar}
+    """
+    hogares = np.asarray(hogares, dtype=np.intp)
+    ubicaciones = np.asarray(ubicaciones, dtype=np.intp)
+    if cantidad_hogares is None:
+        cantidad_hogares = int(hogares.max()) + 1 if len(hogares) else 0
+    consumo = np.asarray(watts, dtype=np.float64) * horas_dia * 30 / 1000
+    alto = np.asarray(watts) > UMBRAL_ALTO_W
+
+    artefactos = np.bincount(hogares, minlength=cantidad_hogares)
+    consumo_hogar = np.bincount(hogares, weights=consumo, minlength=cantidad_hogares)
+    altos_hogar = np.bincount(hogares, weights=alto, minlength=cantidad_hogares)
+
+    # r y s se evalúan por par (hogar, ubicación) y luego se reducen con ∃.
+    # Solo se numeran los pares que aparecen en los datos: con muchos hogares
+    # y muchas ubicaciones, casi todos los pares posibles están vacíos.
+    cantidad_ubicaciones = int(ubicaciones.max()) + 1 if len(ubicaciones) else 1
+    par = hogares.astype(np.int64) * cantidad_ubicaciones + ubicaciones
+    observados, numero_par = np.unique(par, return_inverse=True)
+    hogar_par = observados // cantidad_ubicaciones
+    consumo_par = np.bincount(numero_par, weights=consumo, minlength=len(observados))
+    altos_par = np.bincount(numero_par, weights=alto, minlength=len(observados))
+    r = np.zeros(cantidad_hogares, dtype=bool)
+    r[hogar_par[consumo_par > umbral_ubicacion_kwh]] = True
+    s = np.zeros(cantidad_hogares, dtype=bool)
+    s[hogar_par[altos_par >= minimo_alto]] = True
+
+    return {
+        "p": consumo_hogar > umbral_kwh,
+        "q": altos_hogar > umbral_alto,
+        "r": r,
+        "s": s,
+        "hay_artefactos": artefactos > 0,
+    }
+
+
+# ==================== EVALUACIÓN ====================
+
+
+def niveles_alerta(proposiciones: Columnas) -> np.ndarray:
+    """
+    Nivel de alerta de cada hogar según REGLAS_ALERTA
+
+    Returns:
+        np.ndarray: Código de nivel por hogar (índice en NIVELES_ALERTA)
+    """
+    condiciones = [compilar_regla(formula)(proposiciones) for _, formula in REGLAS_ALERTA]
+    codigos = [NIVELES_ALERTA.index(nivel) for nivel, _ in REGLAS_ALERTA]
+    return np.select(
+        condiciones, codigos, default=NIVELES_ALERTA.index("NORMAL")
+    ).astype(np.int8)
+
+
+def recomendaciones(proposiciones: Columnas) -> Dict[str, np.ndarray]:
+    """
+    Indica qué recomendaciones corresponden a cada hogar
+
+    Returns:
+        dict: {recomendación: arreglo bool por hogar} (ver REGLAS_RECOMENDACION)
+    """
+    return {
+        nombre: compilar_regla(formula)(proposiciones)
+        for nombre, formula in REGLAS_RECOMENDACION.items()
+    }
+
+
+def contar_niveles(codigos: np.ndarray) -> Dict[str, int]:
+    """Cuenta hogares por nivel de alerta: {nivel: cantidad}"""
+    conteo = np.bincount(codigos, minlength=len(NIVELES_ALERTA))
+    return {nivel: int(conteo[codigo]) for codigo, nivel in enumerate(NIVELES_ALERTA)}
@@ -0,0 +1,581 @@
+"""
+Módulo: snapshot.py
+Snapshot binario del inventario, abierto con mmap
+
+Reconstruir un inventario grande desde texto en cada inicio es lento. Un
+snapshot guarda el inventario ya procesado en un solo archivo binario:
+
+- Columnas numéricas de ancho fijo (watts, horas_dia, códigos de ubicación
+  y tipo), en little-endian.
+- Una tabla de cadenas para los nombres (un bloque UTF-8 y sus offsets);
+  las etiquetas de ubicación y tipo van en el encabezado.
+- Los horarios y perfiles de uso, solo si algún artefacto los tiene, con el
+  mismo esquema de offsets: los valores de todas las filas concatenados y
+  una fila sin horarios o sin perfil ocupa cero valores.
+- Los índices persistidos: filas de cada ubicación, tipo y nivel (en formato
+  CSR: offsets por grupo y filas concatenadas), el consumo de cada grupo,
+  el orden del ranking y el orden alfabético de los nombres.
+
+Abrir un snapshot solo lee el encabezado: las secciones se exponen como
+arreglos NumPy sobre el mmap del archivo, sin copiarlas, así que las páginas
+se leen del disco (o del page cache) recién cuando se usan.
+
+FORMATO:
+    MAGIA (8 bytes) | largo del encabezado (uint64) | encabezado JSON |
+    secciones alineadas a ALINEACION bytes
+El encabezado indica la versión, la cantidad de filas, las etiquetas y, para
+cada sección, su offset, dtype y cantidad de elementos.
+"""
+
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from models.artefacto import Artefacto, UMBRAL_ALTO_W, UMBRAL_MEDIO_W
+from services.columnar import CODIGO_NIVEL, AlmacenColumnar, _codificar
+from services.conjuntos import NIVELES_CONSUMO, GestorConjuntos
+
+MAGIA = b"ABPSNAP\x00"
+VERSION = 2
+# La versión 1 no tiene horarios ni perfiles; se sigue pudiendo abrir
+VERSIONES_LEGIBLES = (1, 2)
+# Alineación de cada sección, para que los arreglos queden bien alineados
+ALINEACION = 64
+
+DIMENSIONES = ("ubicacion", "tipo", "nivel")
+
+# Los códigos se guardan como int64 (= np.intp en 64 bits) para que
+# AlmacenColumnar y np.bincount los usen sin convertir; las listas de filas
+# de los índices, como uint32, que alcanza para 4.000 millones de filas.
+_DTYPE_CODIGO = "<i8"
+_DTYPE_FILA = "<u4"
+# Los horarios se guardan como minutos del día (inicio, fin, inicio, fin, ...)
+_DTYPE_MINUTO = "<u2"
+
+_LARGO = struct.Struct("<Q")
+
+
+class TablaCadenas(Sequence[str]):
+    """
+    Secuencia de cadenas sobre un bloque UTF-8 y sus offsets
+
+    Cada cadena se decodifica recién al pedirla.
+    """
+
+    def __init__(self, offsets: np.ndarray, datos: np.ndarray, normalizar: bool = False) -> None:
+        self._offsets = offsets
+        self._datos = datos
+        self._normalizar = normalizar
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de la tabla de cadenas")
+        inicio, fin = self._offsets[indice], self._offsets[indice + 1]
+        cadena = self._datos[inicio:fin].tobytes().decode("utf-8")
+        return cadena.lower().strip() if self._normalizar else cadena
+
+    def __iter__(self) -> Iterator[str]:
+        for indice in range(len(self)):
+            yield self[indice]
+
+
+# ==================== ESCRITURA ====================
+
+
+def _tabla_cadenas(cadenas: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Codifica cadenas como (offsets int64, bloque UTF-8)"""
+    codificadas = [cadena.encode("utf-8") for cadena in cadenas]
+    offsets = np.zeros(len(codificadas) + 1, dtype=_DTYPE_CODIGO)
+    np.cumsum([len(c) for c in codificadas], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(codificadas), dtype=np.uint8)
+
+
+def _tabla_valores(
+    valores: List[Optional[np.ndarray]], dtype: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Codifica un arreglo opcional por fila como (offsets int64, valores concatenados)"""
+    offsets = np.zeros(len(valores) + 1, dtype=_DTYPE_CODIGO)
+    np.cumsum([0 if v is None else len(v) for v in valores], out=offsets[1:])
+    presentes = [v for v in valores if v is not None]
+    datos = np.concatenate(presentes) if presentes else np.empty(0)
+    return offsets, datos.astype(dtype)
+
+
+def _indice_csr(codigos: np.ndarray, grupos: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Índice invertido en formato CSR
+
+    Returns:
+        tuple: (offsets, filas): las filas del grupo g son
+        filas[offsets[g]:offsets[g + 1]], en orden creciente
+    """
+    offsets = np.zeros(grupos + 1, dtype=_DTYPE_CODIGO)
+    np.cumsum(np.bincount(codigos, minlength=grupos), out=offsets[1:])
+    filas = np.argsort(codigos, kind="stable").astype(_DTYPE_FILA)
+    return offsets, filas
+
+
+def _codigos_nivel(watts: np.ndarray) -> np.ndarray:
+    """Código de nivel (ver CODIGO_NIVEL) de cada fila, como en AlmacenColumnar"""
+    niveles = np.full(len(watts), CODIGO_NIVEL["BAJO"], dtype=_DTYPE_CODIGO)
+    niveles[watts >= UMBRAL_MEDIO_W] = CODIGO_NIVEL["MEDIO"]
+    niveles[watts > UMBRAL_ALTO_W] = CODIGO_NIVEL["ALTO"]
+    return niveles
+
+
+def guardar_snapshot(gestor: GestorConjuntos, ruta: Union[str, Path]) -> int:
+    """
+    Escribe un snapshot binario con todos los artefactos de un gestor
+
+    El archivo se escribe aparte y luego reemplaza al anterior, así que un
+    snapshot abierto o una escritura interrumpida no dejan un archivo a
+    medias. Sirve con cualquier gestor que tenga total_artefactos() e
+    iterar_artefactos() (GestorConjuntos o GestorSQLite).
+
+    Args:
+        gestor (GestorConjuntos): Gestor a guardar
+        ruta (str | Path): Archivo de destino
+
+    Returns:
+        int: Cantidad de artefactos guardados
+    """
+    filas = gestor.total_artefactos()
+    watts = np.empty(filas, dtype="<f8")
+    horas = np.empty(filas, dtype="<f8")
+    ubicaciones = np.empty(filas, dtype=_DTYPE_CODIGO)
+    tipos = np.empty(filas, dtype=_DTYPE_CODIGO)
+    nombres: List[str] = []
+    codigos_ubicacion: Dict[str, int] = {}
+    codigos_tipo: Dict[str, int] = {}
+    etiquetas_ubicacion: List[str] = []
+    etiquetas_tipo: List[str] = []
+    horarios: List[Optional[np.ndarray]] = []
+    perfiles: List[Optional[np.ndarray]] = []
+
+    for fila, artefacto in enumerate(gestor.iterar_artefactos()):
+        nombres.append(artefacto.nombre)
+        horarios.append(
+            None if artefacto.horarios is None else np.ravel(artefacto.horarios)
+        )
+        perfiles.append(artefacto.perfil_uso)
+        watts[fila] = artefacto.watts
+        horas[fila] = artefacto.horas_dia
+        ubicaciones[fila] = _codificar(
+            artefacto.ubicacion, codigos_ubicacion, etiquetas_ubicacion
+        )
+        tipos[fila] = _codificar(artefacto.tipo, codigos_tipo, etiquetas_tipo)
+    if len(nombres) != filas:
+        raise ValueError("El gestor cambió mientras se guardaba el snapshot")
+
+    normalizados = [nombre.lower().strip() for nombre in nombres]
+    columnas = {"watts": watts, "horas_dia": horas, "ubicaciones": ubicaciones, "tipos": tipos}
+    columnas["nombres_offsets"], columnas["nombres_datos"] = _tabla_cadenas(nombres)
+    if any(intervalos is not None for intervalos in horarios):
+        columnas["horarios_offsets"], columnas["horarios_datos"] = _tabla_valores(
+            horarios, _DTYPE_MINUTO
+        )
+    if any(perfil is not None for perfil in perfiles):
+        columnas["perfiles_offsets"], columnas["perfiles_datos"] = _tabla_valores(
+            perfiles, "<f8"
+        )
+    columnas["orden_nombres"] = np.array(
+        sorted(range(filas), key=normalizados.__getitem__), dtype=_DTYPE_FILA
+    )
+    return guardar_columnas(ruta, columnas, etiquetas_ubicacion, etiquetas_tipo)
+
+
+def guardar_columnas(
+    ruta: Union[str, Path],
+    columnas: Dict[str, np.ndarray],
+    etiquetas_ubicacion: List[str],
+    etiquetas_tipo: List[str],
+) -> int:
+    """
+    Escribe un snapshot a partir de columnas ya codificadas
+
+    Los índices, consumos por grupo y el ranking se calculan aquí. Permite
+    escribir un snapshot sin crear un objeto Artefacto por fila (por
+    ejemplo, desde el generador de inventarios).
+
+    Args:
+        ruta (str | Path): Archivo de destino
+        columnas (dict): watts, horas_dia, ubicaciones y tipos (un valor por
+            fila); nombres_offsets y nombres_datos (tabla de cadenas UTF-8);
+            orden_nombres (filas en orden de los nombres normalizados);
+            opcionalmente horarios_offsets y horarios_datos (minutos de
+            inicio y fin de cada intervalo) y perfiles_offsets y
+            perfiles_datos (valores del perfil de uso)
+        etiquetas_ubicacion (list): Etiqueta de cada código de ubicación
+        etiquetas_tipo (list): Etiqueta de cada código de tipo
+
+    Returns:
+        int: Cantidad de filas guardadas
+    """
+    watts = np.asarray(columnas["watts"], dtype="<f8")
+    horas = np.asarray(columnas["horas_dia"], dtype="<f8")
+    ubicaciones = np.asarray(columnas["ubicaciones"], dtype=_DTYPE_CODIGO)
+    tipos = np.asarray(columnas["tipos"], dtype=_DTYPE_CODIGO)
+    orden_nombres = np.asarray(columnas["orden_nombres"], dtype=_DTYPE_FILA)
+    filas = len(watts)
+
+    consumo = watts * horas * 30 / 1000
+    secciones: Dict[str, np.ndarray] = {
+        "watts": watts,
+        "horas_dia": horas,
+        "ubicaciones": ubicaciones,
+        "tipos": tipos,
+        "nombres_offsets": np.asarray(columnas["nombres_offsets"], dtype=_DTYPE_CODIGO),
+        "nombres_datos": np.asarray(columnas["nombres_datos"], dtype=np.uint8),
+    }
+    for seccion, dtype in (("horarios", _DTYPE_MINUTO), ("perfiles", "<f8")):
+        if f"{seccion}_offsets" in columnas:
+            secciones[f"{seccion}_offsets"] = np.asarray(
+                columnas[f"{seccion}_offsets"], dtype=_DTYPE_CODIGO
+            )
+            secciones[f"{seccion}_datos"] = np.asarray(columnas[f"{seccion}_datos"], dtype=dtype)
+
+    codigos = {"ubicacion": ubicaciones, "tipo": tipos, "nivel": _codigos_nivel(watts)}
+    grupos = {
+        "ubicacion": len(etiquetas_ubicacion),
+        "tipo": len(etiquetas_tipo),
+        "nivel": len(NIVELES_CONSUMO),
+    }
+    for dimension in DIMENSIONES:
+        offsets, filas_grupo = _indice_csr(codigos[dimension], grupos[dimension])
+        secciones[f"indice_{dimension}_offsets"] = offsets
+        secciones[f"indice_{dimension}_filas"] = filas_grupo
+        secciones[f"consumo_{dimension}"] = np.bincount(
+            codigos[dimension], weights=consumo, minlength=grupos[dimension]
+        ).astype("<f8")
+
+    # Ranking: consumo descendente y, a igual consumo, nombre (como GestorConjuntos)
+    posicion_nombre = np.empty(filas, dtype=np.int64)
+    posicion_nombre[orden_nombres] = np.arange(filas)
+    secciones["orden_nombres"] = orden_nombres
+    secciones["ranking"] = np.lexsort((posicion_nombre, -consumo)).astype(_DTYPE_FILA)
+
+    _escribir(
+        Path(ruta),
+        {
+            "version": VERSION,
+            "filas": filas,
+            "etiquetas_ubicacion": list(etiquetas_ubicacion),
+            "etiquetas_tipo": list(etiquetas_tipo),
+        },
+        secciones,
+    )
+    return filas
+
+
+def _escribir(ruta: Path, meta: dict, secciones: Dict[str, np.ndarray]) -> None:
+    """Escribe encabezado y secciones en un archivo temporal y lo renombra"""
+    # Los offsets dependen del largo del encabezado, que a su vez los incluye:
+    # se recalculan hasta que el largo (con relleno) deja de cambiar
+    descripcion: Dict[str, list] = {}
+    encabezado = b""
+    while True:
+        offset = len(MAGIA) + _LARGO.size + len(encabezado)
+        for nombre, arreglo in secciones.items():
+            offset = -(-offset // ALINEACION) * ALINEACION
+            descripcion[nombre] = [offset, arreglo.dtype.str, len(arreglo)]
+            offset += arreglo.nbytes
+        nuevo = json.dumps({**meta, "secciones": descripcion}, ensure_ascii=False)
+        nuevo = nuevo.encode("utf-8")
+        nuevo += b" " * (-(len(MAGIA) + _LARGO.size + len(nuevo)) % ALINEACION)
+        if len(nuevo) == len(encabezado):
+            encabezado = nuevo
+            break
+        encabezado = nuevo
+
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with open(temporal, "wb") as archivo:
+        archivo.write(MAGIA)
+        archivo.write(_LARGO.pack(len(encabezado)))
+        archivo.write(encabezado)
+        for nombre, arreglo in secciones.items():
+            archivo.write(b"\0" * (descripcion[nombre][0] - archivo.tell()))
+            archivo.write(memoryview(np.ascontiguousarray(arreglo)).cast("B"))
+    os.replace(temporal, ruta)
+
+
+# ==================== LECTURA ====================
+
+
+def cargar_snapshot(ruta: Union[str, Path]) -> "Snapshot":
+    """
+    Abre un snapshot con mmap, sin leer los datos
+
+    Args:
+        ruta (str | Path): Archivo escrito por guardar_snapshot
+
+    Returns:
+        Snapshot: Vistas sin copia sobre el archivo
+
+    Raises:
+        ValueError: Si el archivo no es un snapshot válido
+    """
+    with open(ruta, "rb") as archivo:
+        if os.fstat(archivo.fileno()).st_size < len(MAGIA) + _LARGO.size:
+            raise ValueError(f"'{ruta}' no es un snapshot de artefactos")
+        # ACCESS_COPY: las vistas son escribibles, pero los cambios quedan en
+        # memoria privada y nunca llegan al archivo
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY)
+    return Snapshot(mapa, str(ruta))
+
+
+class Snapshot:
+    """
+    Inventario de solo lectura sobre el mmap de un snapshot
+
+    Las columnas, índices y tablas son vistas NumPy sobre el archivo. Para
+    trabajar con la interfaz completa, almacen() da un AlmacenColumnar sin
+    copiar las columnas y gestor() reconstruye un GestorConjuntos.
+    """
+
+    def __init__(self, mapa: mmap.mmap, ruta: str = "") -> None:
+        if mapa[: len(MAGIA)] != MAGIA:
+            raise ValueError(f"'{ruta}' no es un snapshot de artefactos")
+        (largo,) = _LARGO.unpack_from(mapa, len(MAGIA))
+        inicio = len(MAGIA) + _LARGO.size
+        meta = json.loads(mapa[inicio : inicio + largo].decode("utf-8"))
+        if meta.get("version") not in VERSIONES_LEGIBLES:
+            raise ValueError(f"Versión de snapshot no soportada: {meta.get('version')}")
+
+        self.ruta = ruta
+        self.filas: int = meta["filas"]
+        self.etiquetas_ubicacion: List[str] = meta["etiquetas_ubicacion"]
+        self.etiquetas_tipo: List[str] = meta["etiquetas_tipo"]
+        self._etiquetas = {
+            "ubicacion": self.etiquetas_ubicacion,
+            "tipo": self.etiquetas_tipo,
+            "nivel": list(NIVELES_CONSUMO),
+        }
+        self._secciones: Dict[str, np.ndarray] = {}
+        for nombre, (offset, dtype, cantidad) in meta["secciones"].items():
+            self._secciones[nombre] = np.frombuffer(
+                mapa, dtype=np.dtype(dtype), count=cantidad, offset=offset
+            )
+        # Cada vista guarda una referencia al mmap; se libera con la última
+        self.nombres = TablaCadenas(
+            self._secciones["nombres_offsets"], self._secciones["nombres_datos"]
+        )
+        self._claves = TablaCadenas(
+            self._secciones["nombres_offsets"],
+            self._secciones["nombres_datos"],
+            normalizar=True,
+        )
+
+    def __len__(self) -> int:
+        return self.filas
+
+    # ==================== COLUMNAS ====================
+
+    @property
+    def watts(self) -> np.ndarray:
+        """Potencia de cada fila (vista, sin copiar)"""
+        return self._secciones["watts"]
+
+    @property
+    def horas_dia(self) -> np.ndarray:
+        """Horas de uso diario de cada fila (vista, sin copiar)"""
+        return self._secciones["horas_dia"]
+
+    @property
+    def ubicaciones(self) -> np.ndarray:
+        """Código de ubicación de cada fila (vista, sin copiar)"""
+        return self._secciones["ubicaciones"]
+
+    @property
+    def tipos(self) -> np.ndarray:
+        """Código de tipo de cada fila (vista, sin copiar)"""
+        return self._secciones["tipos"]
+
+    def _valores(self, seccion: str, fila: int) -> Optional[np.ndarray]:
+        """Valores de una fila en una sección opcional, o None si no tiene"""
+        if f"{seccion}_offsets" not in self._secciones:
+            return None
+        offsets = self._secciones[f"{seccion}_offsets"]
+        inicio, fin = offsets[fila], offsets[fila + 1]
+        return self._secciones[f"{seccion}_datos"][inicio:fin] if fin > inicio else None
+
+    def artefacto(self, fila: int) -> Artefacto:
+        """Reconstruye el artefacto de una fila, con sus horarios y perfil de uso"""
+        minutos = self._valores("horarios", fila)
+        return Artefacto(
+            self.nombres[fila],
+            float(self.watts[fila]),
+            float(self.horas_dia[fila]),
+            self.etiquetas_ubicacion[self.ubicaciones[fila]],
+            self.etiquetas_tipo[self.tipos[fila]],
+            perfil_uso=self._valores("perfiles", fila),
+            horarios=None if minutos is None else minutos.reshape(-1, 2).tolist(),
+        )
+
+    def iterar_artefactos(self) -> Iterator[Artefacto]:
+        """Recorre los artefactos en el orden de las filas"""
+        for fila in range(self.filas):
+            yield self.artefacto(fila)
+
+    def total_artefactos(self) -> int:
+        """Cantidad de artefactos del snapshot"""
+        return self.filas
+
+    # ==================== ÍNDICES ====================
+
+    def buscar(self, nombre: str) -> Optional[int]:
+        """
+        Fila de un artefacto por nombre, con búsqueda binaria
+
+        Decodifica O(log n) nombres del orden alfabético persistido, sin
+        armar un diccionario con todos.
+
+        Returns:
+            int or None: Fila del artefacto, o None si no está
+        """
+        clave = nombre.lower().strip()
+        orden = self._secciones["orden_nombres"]
+        inferior, superior = 0, len(orden)
+        while inferior < superior:
+            medio = (inferior + superior) // 2
+            if self._claves[orden[medio]] < clave:
+                inferior = medio + 1
+            else:
+                superior = medio
+        if inferior < len(orden) and self._claves[orden[inferior]] == clave:
+            return int(orden[inferior])
+        return None
+
+    def obtener_artefacto(self, nombre: str) -> Optional[Artefacto]:
+        """Obtiene un artefacto por nombre, o None si no está"""
+        fila = self.buscar(nombre)
+        return None if fila is None else self.artefacto(fila)
+
+    def _codigo(self, dimension: str, valor: str) -> Optional[int]:
+        if dimension not in self._etiquetas:
+            raise ValueError(f"Dimensión desconocida: {dimension!r}")
+        clave = valor.lower()
+        for codigo, etiqueta in enumerate(self._etiquetas[dimension]):
+            if etiqueta.lower() == clave:
+                return codigo
+        return None
+
+    def filas_de(self, dimension: str, valor: str) -> np.ndarray:
+        """
+        Filas de un grupo según el índice persistido
+
+        Args:
+            dimension (str): "ubicacion", "tipo" o "nivel"
+            valor (str): Etiqueta del grupo (sin distinguir mayúsculas)
+
+        Returns:
+            np.ndarray: Filas del grupo en orden creciente (vista, sin copiar)
+        """
+        codigo = self._codigo(dimension, valor)
+        filas = self._secciones[f"indice_{dimension}_filas"]
+        if codigo is None:
+            return filas[:0]
+        offsets = self._secciones[f"indice_{dimension}_offsets"]
+        return filas[offsets[codigo] : offsets[codigo + 1]]
+
+    def obtener_por_ubicacion(self, ubicacion: str) -> List[str]:
+        """Nombres de los artefactos de una ubicación"""
+        return [self.nombres[fila] for fila in self.filas_de("ubicacion", ubicacion)]
+
+    def obtener_por_tipo(self, tipo: str) -> List[str]:
+        """Nombres de los artefactos de un tipo"""
+        return [self.nombres[fila] for fila in self.filas_de("tipo", tipo)]
+
+    def obtener_por_nivel_consumo(self, nivel: str) -> List[str]:
+        """Nombres de los artefactos de un nivel de consumo"""
+        return [self.nombres[fila] for fila in self.filas_de("nivel", nivel)]
+
+    # ==================== AGREGADOS ====================
+
+    def contar_por(self, dimension: str) -> Dict[str, int]:
+        """
+        Cuenta artefactos por grupo, a partir de los offsets del índice
+
+        Returns:
+            dict: {etiqueta: cantidad}, solo para los grupos con artefactos
+            (los niveles aparecen siempre)
+        """
+        offsets = self._secciones[f"indice_{dimension}_offsets"]
+        cantidades = np.diff(offsets)
+        return {
+            etiqueta: int(cantidad)
+            for etiqueta, cantidad in zip(self._etiquetas[dimension], cantidades)
+            if cantidad or dimension == "nivel"
+        }
+
+    def consumo_por(self, dimension: str) -> Dict[str, float]:
+        """
+        Consumo mensual persistido de cada grupo
+
+        Returns:
+            dict: {etiqueta: consumo_kWh}, solo para los grupos con artefactos
+        """
+        cantidades = np.diff(self._secciones[f"indice_{dimension}_offsets"])
+        consumo = self._secciones[f"consumo_{dimension}"]
+        return {
+            etiqueta: float(valor)
+            for etiqueta, valor, cantidad in zip(self._etiquetas[dimension], consumo, cantidades)
+            if cantidad
+        }
+
+    def consumo_total_kwh(self) -> float:
+        """Consumo mensual total en kWh"""
+        return float(self._secciones["consumo_nivel"].sum())
+
+    def rango_ranking(self, inicio: int, fin: int) -> List[Tuple[str, float]]:
+        """
+        Posiciones [inicio, fin) del ranking de mayor a menor consumo
+
+        Returns:
+            list: Lista de tuplas (nombre, consumo_kWh)
+        """
+        filas = self._secciones["ranking"][max(inicio, 0) : max(fin, 0)]
+        return [
+            (
+                self._claves[fila],
+                float(self.watts[fila] * self.horas_dia[fila] * 30 / 1000),
+            )
+            for fila in filas
+        ]
+
+    # ==================== CONVERSIÓN ====================
+
+    def almacen(self) -> AlmacenColumnar:
+        """
+        AlmacenColumnar sobre las columnas del snapshot, sin copiarlas
+
+        Los nombres se decodifican a medida que se piden. Modificar el
+        almacén no cambia el archivo.
+        """
+        return AlmacenColumnar.desde_columnas(
+            self._claves,
+            self.watts,
+            self.horas_dia,
+            self.ubicaciones,
+            self.tipos,
+            self.etiquetas_ubicacion,
+            self.etiquetas_tipo,
+            normalizados=True,
+        )
+
+    def gestor(self) -> GestorConjuntos:
+        """Reconstruye un GestorConjuntos con todos los artefactos (O(n))"""
+        gestor = GestorConjuntos()
+        gestor.agregar_artefactos(self.iterar_artefactos())
+        return gestor
@@ -0,0 +1,315 @@
+"""
+Módulo: tarifas.py
+Costo mensual de la energía con tarifas escalonadas y franjas horarias
+
+Una tarifa residencial tiene tres partes:
+- Cargo fijo: un monto por mes, sin importar el consumo.
+- Escalones: el precio por kWh sube por tramos de consumo mensual. Cada
+  escalón se cobra solo por los kWh que caen en su tramo (con límites 150
+  y 300: los primeros 150 kWh a un precio, los siguientes 150 a otro y el
+  resto a un tercero).
+- Franjas horarias (opcional): un recargo (o descuento, si es negativo)
+  por cada kWh consumido dentro de ciertos horarios, como "18:00-23:00".
+
+El consumo de cada artefacto es su consumo_mensual. Para las franjas, ese
+consumo se reparte a lo largo del día según sus horarios o su perfil de
+uso, o en partes iguales si no tiene ninguno (igual que MotorPerfiles).
+
+CÁLCULO VECTORIZADO:
+Los planes se compilan a arreglos (inicio, ancho y precio de cada escalón;
+recargo de cada cuarto de hora) y los escalones se recortan con np.clip
+sobre una matriz planes × hogares: se evalúan miles de planes contra miles
+de hogares en una sola llamada, recorriendo en Python solo los escalones.
+
+El costo de cada artefacto es su parte del costo de energía del hogar
+(consumo × precio medio de los escalones) más sus recargos por franja. El
+cargo fijo es del hogar y no se reparte.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from models.artefacto import normalizar_horarios
+from services.agenda import ocupacion_en_ranuras
+from services.conjuntos import GestorConjuntos
+from services.perfiles import RANURAS, perfil_de
+
+
+class Tarifa:
+    """
+    Plan tarifario residencial
+
+    Atributos:
+        nombre (str): Nombre del plan
+        precios (tuple): Precio por kWh de cada escalón
+        limites (tuple): kWh mensuales en que termina cada escalón, salvo el
+            último (uno menos que precios, en orden creciente)
+        cargo_fijo (float): Monto fijo mensual
+        franjas (dict): {"HH:MM-HH:MM": recargo por kWh en ese horario}
+    """
+
+    def __init__(
+        self,
+        nombre: str,
+        precios: Sequence[float],
+        limites: Sequence[float] = (),
+        cargo_fijo: float = 0.0,
+        franjas: Optional[Mapping[str, float]] = None,
+    ) -> None:
+        try:
+            self.precios = tuple(float(precio) for precio in precios)
+            self.limites = tuple(float(limite) for limite in limites)
+            self.cargo_fijo = float(cargo_fijo)
+        except (TypeError, ValueError):
+            raise ValueError("La tarifa debe tener valores numéricos") from None
+        if not self.precios:
+            raise ValueError("La tarifa necesita al menos un precio por kWh")
+        if len(self.limites) != len(self.precios) - 1:
+            raise ValueError("Cada escalón, salvo el último, necesita su límite en kWh")
+        if any(b <= a for a, b in zip((0.0,) + self.limites, self.limites)):
+            raise ValueError("Los límites de los escalones deben ser positivos y crecientes")
+        if min(self.precios) < 0 or self.cargo_fijo < 0:
+            raise ValueError("Los precios y el cargo fijo no pueden ser negativos")
+
+        if franjas is not None and not isinstance(franjas, Mapping):
+            raise ValueError('Las franjas deben ser un objeto {"HH:MM-HH:MM": recargo}')
+        try:
+            self.franjas: Dict[str, float] = {
+                horario: float(recargo) for horario, recargo in (franjas or {}).items()
+            }
+        except (TypeError, ValueError):
+            raise ValueError("El recargo de cada franja debe ser numérico") from None
+
+        self.nombre = nombre
+        # Recargo por kWh de cada cuarto de hora del día
+        self._recargos = np.zeros(RANURAS)
+        for horario, recargo in self.franjas.items():
+            intervalos = normalizar_horarios(horario)
+            if intervalos is None:
+                raise ValueError("Las franjas horarias no pueden estar vacías")
+            self._recargos += ocupacion_en_ranuras(intervalos, RANURAS) * recargo
+
+    @classmethod
+    def desde_dict(cls, datos: Mapping[str, Any]) -> "Tarifa":
+        """
+        Crea una tarifa a partir de un objeto JSON
+
+        Formato: {"nombre": "...", "cargo_fijo": 1500,
+        "escalones": [{"hasta": 150, "precio": 50}, {"precio": 80}],
+        "franjas": {"18:00-23:00": 20}}
+
+        Raises:
+            ValueError: Si falta algún dato o no es válido
+        """
+        escalones = datos.get("escalones")
+        if not isinstance(escalones, list) or not escalones:
+            raise ValueError("La tarifa necesita una lista de escalones")
+        try:
+            precios = [escalon["precio"] for escalon in escalones]
+            limites = [escalon["hasta"] for escalon in escalones[:-1]]
+        except (KeyError, TypeError):
+            raise ValueError(
+                "Cada escalón necesita su precio y, salvo el último, su límite 'hasta'"
+            ) from None
+        return cls(
+            str(datos.get("nombre", "Tarifa")),
+            precios,
+            limites,
+            datos.get("cargo_fijo", 0.0),
+            datos.get("franjas"),
+        )
+
+    def recargos_por_ranura(self) -> np.ndarray:
+        """Recargo por kWh de cada cuarto de hora del día (96 valores)"""
+        return self._recargos
+
+    def costo(self, consumo_kwh: float) -> float:
+        """
+        Costo mensual de un consumo repartido en partes iguales en el día
+
+        Args:
+            consumo_kwh (float): Consumo mensual en kWh
+
+        Returns:
+            float: Cargo fijo + escalones + recargos por franja
+        """
+        return float(costos_por_plan([self], [consumo_kwh])[0, 0])
+
+    def __repr__(self) -> str:
+        return f"Tarifa({self.nombre!r})"
+
+
+def cargar_tarifa(ruta: Union[str, Path]) -> Tarifa:
+    """
+    Lee una tarifa de un archivo JSON (ver Tarifa.desde_dict)
+
+    Raises:
+        ValueError: Si el archivo no tiene una tarifa válida
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        try:
+            datos = json.load(archivo)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"El archivo de tarifa no es JSON válido: {e}") from None
+    if not isinstance(datos, dict):
+        raise ValueError("El archivo de tarifa debe contener un objeto JSON")
+    return Tarifa.desde_dict(datos)
+
+
+# ==================== CÁLCULO EN LOTE ====================
+
+
+def compilar_planes(planes: Sequence[Tarifa]) -> Dict[str, np.ndarray]:
+    """
+    Pasa los planes a arreglos, con los escalones completados hasta el
+    plan que más tiene (los escalones de relleno tienen ancho 0)
+
+    Returns:
+        dict: inicios, anchos y precios (planes × escalones), fijos
+        (planes) y recargos (planes × 96)
+    """
+    escalones = max((len(plan.precios) for plan in planes), default=1)
+    inicios = np.zeros((len(planes), escalones))
+    anchos = np.zeros((len(planes), escalones))
+    precios = np.zeros((len(planes), escalones))
+    for fila, plan in enumerate(planes):
+        limites = np.array((0.0,) + plan.limites + (np.inf,))
+        cantidad = len(plan.precios)
+        inicios[fila, :cantidad] = limites[:-1]
+        anchos[fila, :cantidad] = np.diff(limites)
+        precios[fila, :cantidad] = plan.precios
+    return {
+        "inicios": inicios,
+        "anchos": anchos,
+        "precios": precios,
+        "fijos": np.array([plan.cargo_fijo for plan in planes]),
+        "recargos": np.array([plan.recargos_por_ranura() for plan in planes]).reshape(
+            len(planes), RANURAS
+        ),
+    }
+
+
+def costos_energia(compilados: Mapping[str, np.ndarray], consumos: np.ndarray) -> np.ndarray:
+    """
+    Costo de los escalones de cada plan para cada consumo
+
+    Args:
+        compilados (dict): Resultado de compilar_planes
+        consumos (np.ndarray): Consumo mensual (kWh) de cada hogar
+
+    Returns:
+        np.ndarray: Matriz planes × hogares
+    """
+    consumos = np.asarray(consumos, dtype=np.float64)
+    costos = np.zeros((len(compilados["precios"]), len(consumos)))
+    tramo = np.empty_like(costos)
+    # kWh de cada hogar dentro del escalón: consumo - inicio, recortado a
+    # [0, ancho]; las operaciones escriben sobre tramo para no crear matrices
+    for inicio, ancho, precio in zip(
+        compilados["inicios"].T, compilados["anchos"].T, compilados["precios"].T
+    ):
+        np.subtract(consumos, inicio[:, None], out=tramo)
+        np.minimum(tramo, ancho[:, None], out=tramo)
+        np.maximum(tramo, 0, out=tramo)
+        tramo *= precio[:, None]
+        costos += tramo
+    return costos
+
+
+def costos_por_plan(
+    planes: Sequence[Tarifa],
+    consumos: Sequence[float],
+    repartos: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Costo mensual total de cada hogar con cada plan, en una sola llamada
+
+    Args:
+        planes (sequence): Tarifas a comparar
+        consumos (sequence): Consumo mensual (kWh) de cada hogar
+        repartos (np.ndarray, opcional): Matriz hogares × 96 con la fracción
+            del consumo de cada hogar en cada cuarto de hora (cada fila suma
+            1). Sin repartos, el consumo se reparte en partes iguales.
+
+    Returns:
+        np.ndarray: Matriz planes × hogares con cargo fijo + escalones +
+        recargos por franja
+    """
+    compilados = compilar_planes(planes)
+    consumos = np.asarray(consumos, dtype=np.float64)
+    costos = costos_energia(compilados, consumos)
+    costos += compilados["fijos"][:, None]
+    if repartos is None:
+        recargo_medio = compilados["recargos"].mean(axis=1)[:, None]
+    else:
+        recargo_medio = compilados["recargos"] @ np.asarray(repartos, dtype=np.float64).T
+    costos += recargo_medio * consumos
+    return costos
+
+
+# ==================== COSTOS DE UN GESTOR ====================
+
+
+def calcular_costos(gestor: GestorConjuntos, tarifa: Tarifa) -> Dict[str, Any]:
+    """
+    Costo mensual de un inventario: total, por artefacto y por ubicación
+
+    Args:
+        gestor (GestorConjuntos): Inventario del hogar
+        tarifa (Tarifa): Plan con el que se factura
+
+    Returns:
+        dict: cargo_fijo, energia (escalones), franjas (recargos), total,
+        precio_medio (de los escalones, por kWh), por_artefacto {nombre:
+        costo} y por_ubicacion {ubicacion: costo}
+    """
+    nombres: List[str] = []
+    ubicaciones: List[str] = []
+    consumos: List[float] = []
+    filas_perfil: List[int] = []
+    perfiles: List[np.ndarray] = []
+    for fila, artefacto in enumerate(gestor.iterar_artefactos()):
+        nombres.append(artefacto.nombre.lower().strip())
+        ubicaciones.append(artefacto.ubicacion)
+        consumos.append(artefacto.consumo_mensual())
+        if artefacto.horarios is None and artefacto.perfil_uso is None:
+            continue
+        perfil = perfil_de(artefacto)
+        if perfil.sum() > 0:
+            filas_perfil.append(fila)
+            perfiles.append(perfil)
+
+    kwh = np.asarray(consumos, dtype=np.float64)
+    total_kwh = float(kwh.sum())
+    energia = float(costos_energia(compilar_planes([tarifa]), [total_kwh])[0, 0])
+    precio_medio = energia / total_kwh if total_kwh > 0 else 0.0
+
+    # Recargo medio por kWh de cada artefacto según cómo reparte su consumo
+    recargos = tarifa.recargos_por_ranura()
+    recargo_artefacto = np.full(len(kwh), recargos.mean())
+    if perfiles:
+        matriz = np.stack(perfiles)
+        recargo_artefacto[filas_perfil] = (matriz @ recargos) / matriz.sum(axis=1)
+    costos = kwh * (precio_medio + recargo_artefacto)
+
+    etiquetas: Dict[str, str] = {}
+    por_ubicacion: Dict[str, float] = {}
+    for ubicacion, costo in zip(ubicaciones, costos.tolist()):
+        etiqueta = etiquetas.get(ubicacion)
+        if etiqueta is None:
+            etiqueta = etiquetas[ubicacion] = gestor.etiqueta_ubicacion(ubicacion)
+        por_ubicacion[etiqueta] = por_ubicacion.get(etiqueta, 0.0) + costo
+
+    franjas = float((kwh * recargo_artefacto).sum())
+    return {
+        "cargo_fijo": tarifa.cargo_fijo,
+        "energia": energia,
+        "franjas": franjas,
+        "total": tarifa.cargo_fijo + energia + franjas,
+        "precio_medio": precio_medio,
+        "por_artefacto": dict(zip(nombres, costos.tolist())),
+        "por_ubicacion": por_ubicacion,
+    }
@@ -0,0 +1,148 @@
+"""
+Pruebas de los horarios de encendido
+
+Verifica el barrido de intervalos contra la comparación de todos los
+pares, los pares superpuestos por ubicación y la prioridad de los horarios
+en la proposición s
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import io
+import random
+
+from models.artefacto import Artefacto, normalizar_horarios
+from services.agenda import MotorAgenda, barrer, maximo_concurrente
+from services.almacen_sqlite import GestorSQLite
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.importador import importar
+from services.logica import SistemaLogico
+
+
+def crear_gestor() -> GestorConjuntos:
+    """Lavarropas y horno coinciden; aire y estufa no"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            # Cocina: el lavarropas sigue encendido cuando arranca el horno
+            Artefacto("Lavarropas", 2000, 1.5, "Cocina", "Lavado", horarios="19:00-20:30"),
+            Artefacto("Horno", 2500, 1, "Cocina", "Electrodoméstico", horarios="20:00-21:00"),
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            # Dormitorio: la estufa se enciende justo cuando se apaga el aire
+            Artefacto("Aire", 2000, 2, "Dormitorio", "Climatización", horarios="22:00-00:00"),
+            Artefacto("Estufa", 1500, 2, "Dormitorio", "Climatización", horarios="00:00-01:00"),
+        ]
+    )
+    return gestor
+
+
+def test_horarios_y_barrido():
+    """Los horarios se normalizan y el barrido coincide con la fuerza bruta"""
+    print("\n" + "=" * 60)
+    print("TEST: Horarios de encendido")
+    print("=" * 60)
+
+    assert normalizar_horarios("23:00-01:00") == ((0, 60), (1380, 1440)), (
+        "Error: un horario que pasa la medianoche se parte en dos"
+    )
+    assert normalizar_horarios(["10:00-11:00", "10:30-12:00"]) == ((600, 720),), (
+        "Error: los intervalos superpuestos de un artefacto se unen"
+    )
+    assert normalizar_horarios("") is None, "Error: sin intervalos no hay horarios"
+    for invalido in ("25:00-26:00", "10:00-10:00", "de mañana", [(0, 2000)], 5, True):
+        try:
+            normalizar_horarios(invalido)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Error: horario inválido aceptado: {invalido}")
+    print("\n✓ Normalización de horarios")
+
+    # Fines e inicios en el mismo minuto no se superponen
+    assert maximo_concurrente([((0, 60),), ((60, 120),)]) == 1
+
+    aleatorio = random.Random(7)
+    for _ in range(50):
+        horarios = []
+        for _ in range(aleatorio.randint(1, 12)):
+            inicio = aleatorio.randrange(0, 1440, 15)
+            horarios.append(normalizar_horarios([(inicio, aleatorio.randint(inicio + 1, 1440))]))
+        # Fuerza bruta: minuto a minuto y todos los pares
+        por_minuto = [
+            sum(any(i <= m < f for i, f in h) for h in horarios) for m in range(1440)
+        ]
+        pares = {
+            (a, b)
+            for a in range(len(horarios))
+            for b in range(a + 1, len(horarios))
+            if any(i1 < f2 and i2 < f1 for i1, f1 in horarios[a] for i2, f2 in horarios[b])
+        }
+        resultado = barrer([(str(k), 1000, h) for k, h in enumerate(horarios)])
+        assert resultado["maximo"] == max(por_minuto) == maximo_concurrente(horarios)
+        assert resultado["carga_maxima"] == 1000 * max(por_minuto), "Error en la carga"
+        assert {tuple(sorted((int(a), int(b)))) for a, b, _, _ in resultado["pares"]} == pares
+    print("✓ Barrido igual a la comparación de todos los pares")
+
+    print("\n✅ TEST APROBADO: Horarios y barrido\n")
+
+
+def test_concurrencia_por_ubicacion():
+    """Carga máxima y pares críticos de cada ubicación"""
+    gestor = crear_gestor()
+    motor = MotorAgenda.de(gestor)
+
+    assert motor.artefactos_con_horarios() == 4, "Error en artefactos con horarios"
+    assert motor.carga_maxima()["Cocina"] == (4500, "20:00"), "Error en la carga de Cocina"
+    assert motor.maximo_concurrente()["Dormitorio"] == (1, "00:00"), "Error en Dormitorio"
+    assert motor.pares_criticos() == [("Lavarropas", "Horno", "20:00", "20:30")]
+    assert motor.pares_criticos("Dormitorio") == [], "Error: aire y estufa no coinciden"
+
+    gestor.modificar_artefacto("Estufa", horarios="23:30-00:30")
+    assert MotorAgenda.de(gestor) is motor, "Error: el motor es compartido"
+    assert motor.pares_criticos("Dormitorio") == [("Aire", "Estufa", "23:30", "24:00")]
+    assert "Lavarropas y Horno de 20:00 a 20:30" in motor.generar_reporte_horarios()
+
+
+def test_horarios_en_logica_y_persistencia():
+    """s prioriza los horarios; los horarios se importan y persisten"""
+    gestor = crear_gestor()
+    logica = SistemaLogico(gestor, AnalizadorConteo(gestor))
+    assert logica.prop_artefactos_simultaneos_criticos("Cocina") is True
+    assert logica.prop_artefactos_simultaneos_criticos("Dormitorio") is False
+    assert logica.evaluar_ubicaciones(50)["Dormitorio"][1] is False
+
+    # Los horarios tienen prioridad sobre el perfil de uso
+    gestor.modificar_artefacto("Estufa", perfil_uso=[1.0] * 24)
+    assert logica.prop_artefactos_simultaneos_criticos("Dormitorio") is False
+    gestor.modificar_artefacto("Estufa", horarios=None)
+    assert logica.prop_artefactos_simultaneos_criticos("Dormitorio") is True
+
+    jsonl = (
+        '{"nombre": "Horno", "watts": 2500, "horas_dia": 1, "ubicacion": "Cocina", '
+        '"tipo": "Electrodoméstico", "horarios": ["20:00-21:00"]}\n'
+        '{"nombre": "Pava", "watts": 2200, "horas_dia": 1, "ubicacion": "Cocina", '
+        '"tipo": "Electrodoméstico", "horarios": "20:45-21:15"}\n'
+        '{"nombre": "Tostadora", "watts": 800, "horas_dia": 1, "ubicacion": "Cocina", '
+        '"tipo": "Electrodoméstico", "horarios": "mañana"}\n'
+    )
+    with GestorSQLite() as sqlite:
+        resultado = importar(sqlite, io.StringIO(jsonl))
+        assert resultado["errores"] == [(3, "Horario inválido: 'mañana' (use HH:MM-HH:MM)")]
+        assert sqlite.obtener_artefacto("pava").horarios == ((1245, 1275),)
+        assert MotorAgenda.de(sqlite).pares_criticos() == [("Horno", "Pava", "20:45", "21:00")]
+
+
+if __name__ == "__main__":
+    test_horarios_y_barrido()
+    test_concurrencia_por_ubicacion()
+    test_horarios_en_logica_y_persistencia()
@@ -0,0 +1,105 @@
+"""
+Pruebas del almacén columnar
+
+Verifica que los cálculos vectorizados coincidan con los de AnalizadorConteo
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import math
+
+from models.artefacto import Artefacto
+from services.columnar import AlmacenColumnar
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+
+
+def crear_gestor() -> GestorConjuntos:
+    """Gestor con artefactos de los tres niveles de consumo"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            Artefacto("TV", 80, 6, "Sala", "Electrónica"),
+            Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"),
+            Artefacto("Cafetera", 1000, 0.3, "Cocina", "Electrodoméstico"),
+            Artefacto("Plancha", 200, 0, "Lavadero", "Electrodoméstico"),
+        ]
+    )
+    return gestor
+
+
+def comparar_dicts(obtenido: dict, esperado: dict) -> bool:
+    """Compara diccionarios de consumo con tolerancia de punto flotante"""
+    return obtenido.keys() == esperado.keys() and all(
+        math.isclose(obtenido[clave], esperado[clave]) for clave in esperado
+    )
+
+
+def test_calculos_vectorizados():
+    """Los resultados columnares coinciden con los del analizador"""
+    print("\n" + "=" * 60)
+    print("TEST: Almacén columnar")
+    print("=" * 60)
+
+    gestor = crear_gestor()
+    conteo = AnalizadorConteo(gestor)
+    almacen = AlmacenColumnar.desde_gestor(gestor)
+
+    print(f"\n✓ Filas: {len(almacen)}")
+    assert len(almacen) == len(gestor.universo), "Error en cantidad de filas"
+
+    total = almacen.consumo_total_mensual()
+    print(f"✓ Consumo total: {total:.2f} kWh")
+    assert math.isclose(total, conteo.consumo_total_mensual()), "Error en consumo total"
+
+    assert comparar_dicts(almacen.consumo_por_ubicacion(), conteo.consumo_por_ubicacion()), (
+        "Error en consumo por ubicación"
+    )
+    assert comparar_dicts(almacen.consumo_por_tipo(), conteo.consumo_por_tipo()), (
+        "Error en consumo por tipo"
+    )
+    assert almacen.contar_por_nivel_consumo() == conteo.contar_por_nivel_consumo(), (
+        "Error en conteo por nivel"
+    )
+    assert almacen.contar_por_ubicacion() == conteo.contar_por_ubicacion(), (
+        "Error en conteo por ubicación"
+    )
+    print("✓ Totales, grupos y niveles coinciden con AnalizadorConteo")
+
+    print("\n✅ TEST APROBADO: Almacén columnar funciona correctamente\n")
+
+
+def test_reemplazo_y_crecimiento():
+    """Reemplazar un nombre reutiliza su fila y las columnas crecen solas"""
+    almacen = AlmacenColumnar(capacidad=2)
+    for i in range(10):
+        almacen.agregar_artefacto(Artefacto(f"Foco {i}", 10, 1, "Sala", "Iluminación"))
+    almacen.agregar_artefacto(Artefacto("FOCO 3", 1500, 2, "Garage", "Herramienta"))
+
+    assert len(almacen) == 10, "Error: el reemplazo no debe agregar filas"
+    assert almacen.fila("foco 3") == ("foco 3", 1500.0, 2.0, "Garage", "Herramienta"), (
+        "Error en fila reemplazada"
+    )
+    assert almacen.contar_por_nivel_consumo() == {"ALTO": 1, "MEDIO": 0, "BAJO": 9}, (
+        "Error en niveles tras el reemplazo"
+    )
+    assert almacen.contar_por_ubicacion() == {"Sala": 9, "Garage": 1}, (
+        "Error en conteo por ubicación"
+    )
+
+
+if __name__ == "__main__":
+    test_calculos_vectorizados()
+    test_reemplazo_y_crecimiento()
@@ -0,0 +1,124 @@
+"""
+Pruebas del modo por lotes de main.py
+
+Verifica que los comandos import, report, query y top procesen inventarios
+desde archivos, la entrada estándar o una base SQLite, y escriban texto o
+JSON sin esperar teclas
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import contextlib
+import io
+import json
+
+from main import main
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.generador import GeneradorInventario
+
+
+def ejecutar(*argumentos: str, entrada: str = ""):
+    """Ejecuta main con los argumentos; devuelve (código, salida, errores)"""
+    salida, errores = io.StringIO(), io.StringIO()
+    stdin = sys.stdin
+    sys.stdin = io.StringIO(entrada)
+    try:
+        with contextlib.redirect_stdout(salida), contextlib.redirect_stderr(errores):
+            codigo = main(list(argumentos))
+    finally:
+        sys.stdin = stdin
+    return codigo, salida.getvalue(), errores.getvalue()
+
+
+def test_reportes_por_archivo():
+    """report, query y top sobre varios inventarios, en texto y JSON"""
+    print("\n" + "=" * 60)
+    print("TEST: Modo por lotes")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        rutas = []
+        for semilla in (1, 2):
+            ruta = Path(directorio) / f"hogar{semilla}.csv"
+            GeneradorInventario(semilla).escribir(ruta, 200)
+            rutas.append(str(ruta))
+        esperado = GestorConjuntos()
+        esperado.agregar_artefactos(GeneradorInventario(1).artefactos(200))
+
+        codigo, salida, _ = ejecutar("report", "stats", "--json", *rutas)
+        lineas = [json.loads(linea) for linea in salida.splitlines()]
+        assert codigo == 0 and [linea["archivo"] for linea in lineas] == rutas
+        estadisticas = lineas[0]["estadisticas"]
+        assert estadisticas == json.loads(
+            json.dumps(AnalizadorConteo(esperado).resumen_estadistico())
+        ), "Error: el JSON debe reflejar el inventario del archivo"
+        print("\n✓ report stats --json: una línea por inventario")
+
+        codigo, salida, _ = ejecutar("report", "full", rutas[0], "-o", f"{directorio}/r.txt")
+        texto = Path(directorio, "r.txt").read_text(encoding="utf-8")
+        assert codigo == 0 and not salida
+        assert "REPORTE COMPLETO" in texto and "NIVEL DE ALERTA" in texto
+
+        codigo, salida, _ = ejecutar("top", "3", rutas[0])
+        ranking = AnalizadorConteo(esperado).ranking(0, 3)
+        assert salida.splitlines() == [
+            f"{i}. {nombre.title()}: {consumo:.2f} kWh"
+            for i, (nombre, consumo) in enumerate(ranking, 1)
+        ]
+
+        consulta = "nivel:ALTO ∩ ubicacion:Cocina"
+        codigo, salida, _ = ejecutar("query", consulta, "--json", rutas[0])
+        resultado = json.loads(salida)
+        nombres = esperado.interseccion(
+            esperado.obtener_por_nivel_consumo("ALTO"), esperado.obtener_por_ubicacion("Cocina")
+        )
+        assert resultado["artefactos"] == sorted(nombres) and resultado["cantidad"] > 0
+        print("✓ report full, top y query")
+
+        codigo, salida, errores = ejecutar("report", "logic", rutas[0], f"{directorio}/no.csv")
+        assert codigo == 1 and "no.csv" in errores, "Error: se informa el archivo fallido"
+        assert "NIVEL DE ALERTA" in salida, "Error: un archivo fallido no detiene el resto"
+
+    print("\n✅ TEST APROBADO: Modo por lotes\n")
+
+
+def test_entrada_estandar_e_importacion():
+    """Inventario por la entrada estándar e importación a una base SQLite"""
+    jsonl = io.StringIO()
+    GeneradorInventario(4).escribir(jsonl, 100, "jsonl")
+
+    entrada = jsonl.getvalue()
+    codigo, salida, _ = ejecutar("--perfil", "report", "logic", "--json", entrada=entrada)
+    logica = json.loads(salida)["logica"]
+    assert codigo == 0 and logica["nivel_alerta"] in ("NORMAL", "MODERADA", "CRÍTICA")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        base = f"{directorio}/hogar.db"
+        codigo, salida, _ = ejecutar("--db", base, "import", "--json", entrada=entrada)
+        assert codigo == 0 and json.loads(salida)["insertados"] == 100
+        codigo, salida, _ = ejecutar("--db", base, "top", "2", "--json")
+        assert len(json.loads(salida)["top"]) == 2, "Error: con --db se usa la base"
+
+    for argumentos in (("query", "nivel:("), ("--metricas", "report", "stats")):
+        try:
+            ejecutar(*argumentos)
+        except SystemExit as e:
+            assert e.code == 2
+        else:
+            raise AssertionError(f"Error: argumentos inválidos aceptados: {argumentos}")
+
+
+if __name__ == "__main__":
+    test_reportes_por_archivo()
+    test_entrada_estandar_e_importacion()
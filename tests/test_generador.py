@@ -0,0 +1,137 @@
+"""
+Pruebas del generador de inventarios sintéticos
+
+Verifica que la generación sea reproducible, que respete las proporciones
+de niveles y la distribución de Zipf, y que los archivos CSV, JSONL y
+snapshot escritos se lean con el importador y cargar_snapshot
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import collections
+import io
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.generador import TAMANO_BLOQUE, GeneradorInventario
+from services.importador import importar
+from services.snapshot import cargar_snapshot
+
+
+def test_reproducible_y_distribuciones():
+    """La misma semilla da las mismas filas, con niveles y Zipf esperados"""
+    print("\n" + "=" * 60)
+    print("TEST: Generador de inventarios")
+    print("=" * 60)
+
+    generador = GeneradorInventario(5)
+    filas = list(generador.registros(TAMANO_BLOQUE + 100))
+    assert list(GeneradorInventario(5).registros(50)) == filas[:50], (
+        "Error: pedir menos filas debe dar el comienzo de la misma secuencia"
+    )
+    assert list(GeneradorInventario(6).registros(50)) != filas[:50], "Error: semilla ignorada"
+    assert len({fila["nombre"].lower() for fila in filas}) == len(filas), (
+        "Error: los nombres deben ser únicos"
+    )
+    print("\n✓ Reproducible y con prefijo estable entre bloques")
+
+    niveles = collections.Counter(Artefacto(**fila).nivel_consumo() for fila in filas)
+    for nivel, fraccion in generador.proporciones.items():
+        assert abs(niveles[nivel] / len(filas) - fraccion) < 0.01, f"Error en nivel {nivel}"
+    assert all(0 <= fila["horas_dia"] <= 24 for fila in filas), "Error: horas fuera de rango"
+    assert all(fila["horas_dia"] * 4 == int(fila["horas_dia"] * 4) for fila in filas)
+    print(f"✓ Niveles: {dict(niveles)}")
+
+    conteo = collections.Counter(fila["ubicacion"] for fila in filas)
+    frecuencias = [conteo[ubicacion] for ubicacion in generador.ubicaciones]
+    assert frecuencias == sorted(frecuencias, reverse=True), "Error: Zipf debe decrecer"
+    # P(1) / P(2) = 2^s
+    assert abs(frecuencias[0] / frecuencias[1] - 2**1.1) < 0.1, "Error en el exponente"
+
+    parejo = GeneradorInventario(1, ubicaciones=12, exponente_zipf=0, proporciones={"ALTO": 1})
+    columnas = parejo.columnas(12_000)
+    assert parejo.ubicaciones[-1] == "Ubicación 12", "Error en las etiquetas numeradas"
+    assert (columnas["watts"] > 1000).all(), "Error: solo se pidieron artefactos ALTO"
+    assert min(collections.Counter(columnas["ubicaciones"].tolist()).values()) > 800
+    print("✓ Ubicaciones con distribución de Zipf")
+
+    print("\n✅ TEST APROBADO: Generador de inventarios\n")
+
+
+def test_archivos_csv_jsonl_y_snapshot():
+    """Los tres formatos se leen y describen el mismo inventario"""
+    generador = GeneradorInventario(11)
+    esperado = GestorConjuntos()
+    esperado.agregar_artefactos(generador.artefactos(3000))
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre in ("inventario.csv", "inventario.jsonl"):
+            ruta = Path(directorio) / nombre
+            assert generador.escribir(ruta, 3000) == 3000
+            gestor = GestorConjuntos()
+            resultado = importar(gestor, ruta)
+            assert resultado["insertados"] == 3000 and not resultado["errores"], (
+                f"Error al importar {nombre}: {resultado['errores']}"
+            )
+            assert gestor.universo == esperado.universo, f"Error en los nombres de {nombre}"
+            assert gestor.rango_ranking(0, 3000) == esperado.rango_ranking(0, 3000), (
+                f"Error: {nombre} no reproduce el inventario"
+            )
+
+        ruta = Path(directorio) / "inventario.snap"
+        assert generador.escribir(ruta, 3000) == 3000
+        snapshot = cargar_snapshot(ruta)
+        assert snapshot.rango_ranking(0, 3000) == esperado.rango_ranking(0, 3000)
+        assert snapshot.contar_por("ubicacion") == esperado.contar_por_ubicacion()
+        for artefacto in esperado.iterar_artefactos():
+            fila = snapshot.buscar(artefacto.nombre)
+            assert fila is not None, f"Error: {artefacto.nombre} no se encuentra"
+            assert snapshot.artefacto(fila).watts == artefacto.watts
+
+    salida = io.StringIO()
+    generador.escribir(salida, 2, "csv")
+    assert salida.getvalue().splitlines()[0] == "nombre,watts,horas_dia,ubicacion,tipo"
+
+
+def test_parametros_invalidos():
+    """Las configuraciones inválidas se rechazan con ValueError"""
+    for parametros in (
+        {"semilla": -1},
+        {"proporciones": {"ALTO": -1, "BAJO": 2}},
+        {"proporciones": {"ENORME": 1}},
+        {"watts": {"ALTO": ("triangular", 1, 2)}},
+        {"horas": ("gamma", 0, 1)},
+        {"ubicaciones": ["Sala", "sala"]},
+        {"tipos": 0},
+    ):
+        try:
+            GeneradorInventario(**parametros)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Error: parámetros inválidos aceptados: {parametros}")
+
+    generador = GeneradorInventario()
+    for destino, formato in (("inventario.txt", None), (io.StringIO(), "snapshot")):
+        try:
+            generador.escribir(destino, 1, formato)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Error: destino inválido aceptado: {destino}")
+
+
+if __name__ == "__main__":
+    test_reproducible_y_distribuciones()
+    test_archivos_csv_jsonl_y_snapshot()
+    test_parametros_invalidos()
@@ -0,0 +1,143 @@
+"""
+Pruebas del importador de inventarios
+
+Verifica la lectura de CSV y JSONL, las reglas de validación del menú y el
+reporte de filas rechazadas
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import csv
+import io
+
+from services.conjuntos import GestorConjuntos
+from services.importador import convertir_fila, importar
+
+CSV_INVENTARIO = """﻿Nombre;Watts;Horas;Ubicación;Tipo
+Heladera;150;24;Cocina;Electrodoméstico
+"Aire; split";2000;8;Dormitorio;Climatización
+Estufa;0;4;Sala;Climatización
+Secador;1800;25;Baño;Electrodoméstico
+Lámpara;diez;5;Sala;Iluminación
+Corta;10;5
+
+   ;60;5;Sala;Iluminación
+Heladera;160;24;Cocina;Electrodoméstico
+"""
+
+JSONL_INVENTARIO = """\
+{"nombre": "TV", "watts": 80, "horas_dia": 6, "ubicacion": "Sala", "tipo": "Electrónica"}
+esto no es JSON
+{"nombre": "Router", "watts": 12, "horas_dia": 24, "ubicacion": "Oficina"}
+{"nombre": "Notebook", "watts": 65, "horas_dia": 8, "ubicacion": " ", "tipo": "Electrónica"}
+"""
+
+
+def test_importar_csv_con_reporte():
+    """Las filas válidas se cargan y las inválidas van al reporte"""
+    print("\n" + "=" * 60)
+    print("TEST: Importación CSV")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "inventario.csv"
+        ruta.write_text(CSV_INVENTARIO, encoding="utf-8")
+        reporte = Path(directorio) / "errores.csv"
+        resultado = importar(gestor, ruta, reporte=reporte)
+
+        print(f"\n✓ Resultado: {resultado}")
+        assert resultado["leidos"] == 8, "Error en filas leídas"
+        assert resultado["insertados"] == 2, "Error en insertados"
+        assert resultado["reemplazados"] == 1, "Error en reemplazados"
+        assert resultado["rechazados"] == 5, "Error en rechazados"
+        assert gestor.universo == {"heladera", "aire; split"}, "Error en el universo"
+        assert gestor.obtener_artefacto("heladera").watts == 160, "Error: gana la última fila"
+
+        with open(reporte, encoding="utf-8", newline="") as archivo:
+            rechazos = list(csv.DictReader(archivo))
+        assert [(int(r["linea"]), r["motivo"]) for r in rechazos] == [
+            (4, "La potencia debe ser mayor a 0"),
+            (5, "Las horas deben estar entre 0 y 24"),
+            (6, "Debes ingresar valores numéricos válidos"),
+            (7, "Fila mal formada"),
+            (9, "El nombre no puede estar vacío"),
+        ], "Error en el reporte de rechazos"
+        assert resultado["errores"][0] == (4, "La potencia debe ser mayor a 0")
+        print("✓ Reporte con línea y motivo de cada rechazo")
+
+        # Sin rechazos no se crea el archivo del reporte
+        validas = Path(directorio) / "validas.csv"
+        validas.write_text("\n".join(CSV_INVENTARIO.split("\n")[:3]), encoding="utf-8")
+        sin_errores = Path(directorio) / "validas.errores.csv"
+        resultado = importar(GestorConjuntos(), validas, reporte=sin_errores)
+        assert (resultado["insertados"], resultado["rechazados"]) == (2, 0)
+        assert not sin_errores.exists(), "Error: el reporte vacío no debe escribirse"
+
+        # Una importación limpia borra el reporte de una corrida anterior
+        importar(GestorConjuntos(), validas, reporte=reporte)
+        assert not reporte.exists(), "Error: quedó el reporte de la corrida anterior"
+
+    print("\n✅ TEST APROBADO: Importación CSV\n")
+
+
+def test_importar_jsonl_desde_flujo():
+    """Un flujo sin extensión se reconoce como JSONL por su contenido"""
+    gestor = GestorConjuntos()
+    reporte = io.StringIO()
+    resultado = importar(gestor, io.StringIO(JSONL_INVENTARIO), reporte=reporte)
+
+    assert gestor.universo == {"tv"}, "Error en el universo"
+    assert resultado["errores"] == [
+        (2, "Fila mal formada"),
+        (3, "Faltan campos: tipo"),
+        (4, "La ubicación no puede estar vacía"),
+    ], "Error en los rechazos"
+    assert "esto no es JSON" in reporte.getvalue(), "Error: el reporte guarda la fila"
+
+    # Un horario de tipo inválido rechaza solo esa fila
+    filas = (
+        '{"nombre": "A", "watts": 10, "horas_dia": 1, "ubicacion": "Sala", "tipo": "Otro",'
+        ' "horarios": 5}\n'
+        '{"nombre": "B", "watts": 10, "horas_dia": 1, "ubicacion": "Sala", "tipo": "Otro"}\n'
+    )
+    resultado = importar(gestor, io.StringIO(filas))
+    assert gestor.obtener_artefacto("a") is None and gestor.obtener_artefacto("b")
+    assert [linea for linea, _ in resultado["errores"]] == [1], "Error: la fila 1 se rechaza"
+
+
+def test_validacion_como_en_el_menu():
+    """Las reglas son las del menú de carga, incluidos los límites"""
+    base = {"nombre": "X", "ubicacion": "Sala", "tipo": "Otro"}
+    assert convertir_fila({**base, "watts": "0.1", "horas_dia": "0"})[0] is not None
+    assert convertir_fila({**base, "watts": 5, "horas_dia": 24})[0] is not None
+    assert convertir_fila({**base, "watts": -5, "horas_dia": 1})[1] == (
+        "La potencia debe ser mayor a 0"
+    )
+    assert convertir_fila({**base, "watts": 5, "horas_dia": -0.5})[1] == (
+        "Las horas deben estar entre 0 y 24"
+    )
+    assert convertir_fila({**base, "watts": "nan", "horas_dia": 1})[0] is None
+
+    try:
+        importar(GestorConjuntos(), io.StringIO("nombre,watts\nA,1\n"))
+    except ValueError as e:
+        assert "horas_dia" in str(e), "Error: el mensaje debe nombrar las columnas"
+    else:
+        raise AssertionError("Error: un encabezado incompleto debe rechazarse")
+
+
+if __name__ == "__main__":
+    test_importar_csv_con_reporte()
+    test_importar_jsonl_desde_flujo()
+    test_validacion_como_en_el_menu()
@@ -0,0 +1,113 @@
+"""
+Pruebas de la evaluación en lote de hogares
+
+Verifica la lectura de inventarios y que el pool de procesos dé los mismos
+resultados que la evaluación secuencial
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import io
+import json
+import tempfile
+
+from services import lotes
+
+CAMPOS = ("nombre", "watts", "horas_dia", "ubicacion", "tipo")
+
+HOGARES = {
+    "casa-1": [
+        dict(zip(CAMPOS, fila))
+        for fila in [
+            ("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            ("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            ("Estufa", 1500, 4, "Dormitorio", "Climatización"),
+            ("Horno", 2200, 1, "Cocina", "Electrodoméstico"),
+        ]
+    ],
+    "casa-2": [
+        dict(zip(CAMPOS, ("Lámpara", 10, 5, "Sala", "Iluminación"))),
+        {"nombre": "Sin datos", "watts": 100},
+        dict(zip(CAMPOS, ("Negativo", -5, 1, "Sala", "Otro"))),
+    ],
+}
+
+
+def test_lectura_y_evaluacion():
+    """Los inventarios se leen de directorios y flujos y se evalúan igual"""
+    print("\n" + "=" * 60)
+    print("TEST: Evaluación en lote de hogares")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        # casa-1 como lista de artefactos; casa-2 dentro de un .jsonl
+        ruta = Path(directorio)
+        (ruta / "casa-1.json").write_text(json.dumps(HOGARES["casa-1"]), encoding="utf-8")
+        linea = json.dumps({"hogar": "casa-2", "artefactos": HOGARES["casa-2"]})
+        (ruta / "otros.jsonl").write_text(linea + "\n\n", encoding="utf-8")
+        (ruta / "notas.txt").write_text("se ignora", encoding="utf-8")
+
+        leidos = list(lotes.leer_hogares(directorio))
+        assert [hogar for hogar, _ in leidos] == ["casa-1", "casa-2"], (
+            "Error al leer el directorio"
+        )
+
+        secuencial = list(lotes.evaluar_hogares(leidos, trabajadores=1))
+        # Las entradas sin interpretar se analizan dentro del pool
+        paralelo = lotes.evaluar_origen(directorio, trabajadores=2, tamano_bloque=1)
+        # El pool entrega en orden de finalización
+        paralelo = sorted(paralelo, key=lambda resultado: resultado["hogar"])
+
+    assert paralelo == secuencial, "Error: el pool debe dar el mismo resultado"
+
+    casa1, casa2 = secuencial
+    print(f"\n✓ {casa1['hogar']}: {casa1['nivel_alerta']}, {casa1['consumo_total_kwh']:.1f} kWh")
+    assert casa1["nivel_alerta"] == "CRÍTICA", "Error en nivel de alerta"
+    assert set(casa1["ubicaciones_criticas"]) == {"Dormitorio", "Cocina"}, (
+        "Error en ubicaciones críticas"
+    )
+    print(f"✓ {casa2['hogar']}: {casa2['artefactos']} válido, {casa2['rechazados']} rechazados")
+    assert (casa2["artefactos"], casa2["rechazados"]) == (1, 2), "Error con datos inválidos"
+    assert casa2["nivel_alerta"] == "NORMAL", "Error en nivel de alerta"
+
+    # Potencias u horas no finitas se rechazan como en el importador
+    no_finitos = [
+        {"nombre": "A", "watts": float("nan"), "horas_dia": 1, "ubicacion": "S", "tipo": "T"},
+        {"nombre": "B", "watts": 100, "horas_dia": float("inf"), "ubicacion": "S", "tipo": "T"},
+    ]
+    resultado = lotes.evaluar_hogar("raro", no_finitos)
+    assert (resultado["artefactos"], resultado["rechazados"]) == (0, 2), (
+        "Error: NaN o infinito deben rechazarse"
+    )
+
+    # Un flujo JSONL se procesa línea por línea
+    flujo = io.StringIO(json.dumps({"hogar": "x", "artefactos": HOGARES["casa-1"]}))
+    resultados = lotes.evaluar_hogares(lotes.leer_hogares(flujo), trabajadores=1)
+    assert [r["hogar"] for r in resultados] == ["x"], "Error al leer un flujo"
+
+    # Un inventario mal formado da un resultado con error y no corta el lote
+    flujo = io.StringIO('{"hogar": "roto"}\n[]\nno es json\n')
+    resultados = list(lotes.evaluar_origen(flujo, trabajadores=1))
+    print(f"✓ Errores: {[r.get('error') for r in resultados]}")
+    assert [r["hogar"] for r in resultados] == ["entrada:1", "entrada:2", "entrada:3"], (
+        "Error en los ids de las líneas"
+    )
+    assert "error" in resultados[0] and "error" in resultados[2], (
+        "Error: las líneas mal formadas deben informarse"
+    )
+    assert resultados[1]["artefactos"] == 0, "Error con un hogar vacío"
+
+    print("\n✅ TEST APROBADO: Evaluación en lote funciona correctamente\n")
+
+
+if __name__ == "__main__":
+    test_lectura_y_evaluacion()
@@ -0,0 +1,153 @@
+"""
+Pruebas de las métricas OpenMetrics
+
+Verifica que el monitor refleje los agregados del inventario tras cada
+cambio, que leer las métricas no recorra el inventario y que el servidor
+HTTP las publique en /metrics
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import urllib.error
+import urllib.request
+from typing import Dict
+
+from models.artefacto import Artefacto
+from services.almacen_sqlite import GestorSQLite
+from services.conjuntos import GestorConjuntos
+from services.generador import GeneradorInventario
+from services.importador import importar
+from services.metricas import TIPO_CONTENIDO, MonitorMetricas, Registro, servir
+
+
+def leer_muestras(texto: str) -> Dict[str, float]:
+    """Muestras de una exposición, por nombre con etiquetas"""
+    lineas = texto.splitlines()
+    assert lineas[-1] == "# EOF", "Error: la exposición termina en # EOF"
+    muestras = {}
+    for linea in lineas:
+        if not linea.startswith("#"):
+            nombre, valor = linea.rsplit(" ", 1)
+            muestras[nombre] = float(valor)
+    return muestras
+
+
+def test_monitor_refleja_agregados():
+    """Tamaño, consumo, niveles y alerta se actualizan con cada cambio"""
+    print("\n" + "=" * 60)
+    print("TEST: Métricas del monitor")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    monitor = MonitorMetricas(gestor)
+    muestras = leer_muestras(monitor.registro.exponer())
+    assert muestras["hogar_artefactos"] == 0
+    assert muestras['hogar_nivel_alerta{hogar_nivel_alerta="NORMAL"}'] == 1
+
+    gestor.agregar_artefactos(GeneradorInventario(2).artefactos(400))
+    gestor.agregar_artefacto(Artefacto("Horno", 3000, 2, "Cocina", "Electrodoméstico"))
+    gestor.eliminar_artefacto("Horno")
+
+    # Leer las métricas no debe tocar el inventario
+    gestor.iterar_artefactos = None
+    muestras = leer_muestras(monitor.registro.exponer())
+    del gestor.iterar_artefactos
+    assert muestras["hogar_artefactos"] == 400
+    assert abs(muestras["hogar_consumo_mensual_kwh"] - gestor.consumo_total_kwh()) < 1e-6
+    for nivel, cantidad in gestor.contar_por_nivel().items():
+        assert muestras[f'hogar_artefactos_por_nivel{{nivel="{nivel}"}}'] == cantidad
+    assert muestras['hogar_nivel_alerta{hogar_nivel_alerta="CRÍTICA"}'] == 1, (
+        "Error: 400 artefactos superan los umbrales de alerta"
+    )
+    assert muestras["hogar_artefactos_ingresados_total"] == 401
+    assert muestras["hogar_modificaciones_total"] == 3
+    assert muestras["hogar_ingesta_artefactos_por_segundo"] > 0
+    print(f"\n✓ {muestras['hogar_artefactos']:.0f} artefactos, alerta CRÍTICA")
+
+    gestor.obtener_por_ubicacion("Cocina")
+    gestor.obtener_por_ubicacion("Sala")
+    monitor.logica.generar_reporte_logico()
+    muestras = leer_muestras(monitor.registro.exponer())
+    cocina = 'consulta="obtener_por_ubicacion"'
+    assert muestras[f"hogar_consulta_segundos_count{{{cocina}}}"] == 2
+    assert muestras[f'hogar_consulta_segundos_bucket{{{cocina},le="+Inf"}}'] == 2
+    assert muestras['hogar_consulta_segundos_count{consulta="generar_reporte_logico"}'] == 1
+    print("✓ Latencia de consultas y reportes")
+
+    print("\n✅ TEST APROBADO: Métricas del monitor\n")
+
+
+def test_registro_y_servidor():
+    """Formato de la exposición y publicación por HTTP"""
+    registro = Registro()
+    errores = registro.contador("errores", "Errores\ncon salto", ("origen",))
+    errores.incrementar(origen='a"b')
+    latencia = registro.histograma("latencia_segundos", "Latencia", limites=(0.1, 1))
+    for valor in (0.05, 0.5, 5):
+        latencia.observar(valor)
+    texto = registro.exponer()
+    assert "# HELP errores Errores\\ncon salto" in texto, "Error: la ayuda se escapa"
+    muestras = leer_muestras(texto)
+    assert muestras['errores_total{origen="a\\"b"}'] == 1
+    assert muestras['latencia_segundos_bucket{le="0.1"}'] == 1
+    assert muestras['latencia_segundos_bucket{le="1"}'] == 2
+    assert muestras['latencia_segundos_bucket{le="+Inf"}'] == 3
+    assert muestras["latencia_segundos_sum"] == 5.55
+    for invalido in (lambda: errores.incrementar(-1), lambda: errores.incrementar(otro="x")):
+        try:
+            invalido()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Error: se aceptó una operación inválida")
+
+    servidor = servir(registro, puerto=0)
+    try:
+        with urllib.request.urlopen(servidor.url, timeout=5) as respuesta:
+            assert respuesta.headers["Content-Type"] == TIPO_CONTENIDO
+            assert respuesta.read().decode("utf-8") == registro.exponer()
+        try:
+            urllib.request.urlopen(servidor.url.replace("/metrics", "/otra"), timeout=5)
+        except urllib.error.HTTPError as e:
+            assert e.code == 404
+        else:
+            raise AssertionError("Error: solo se publica /metrics")
+    finally:
+        servidor.detener()
+
+
+def test_monitor_sqlite_desde_otro_hilo():
+    """Con SQLite las métricas se sirven sin usar la conexión desde el servidor"""
+    with tempfile.TemporaryDirectory() as directorio:
+        gestor = GestorSQLite(Path(directorio) / "hogar.db")
+        monitor = MonitorMetricas(gestor)
+        ruta = Path(directorio) / "inventario.csv"
+        GeneradorInventario(4).escribir(ruta, 300)
+        importar(gestor, ruta)
+
+        servidor = monitor.servir(puerto=0)
+        try:
+            with urllib.request.urlopen(servidor.url, timeout=5) as respuesta:
+                muestras = leer_muestras(respuesta.read().decode("utf-8"))
+        finally:
+            servidor.detener()
+            gestor.cerrar()
+    assert muestras["hogar_artefactos"] == 300
+    assert muestras["hogar_artefactos_ingresados_total"] == 300
+    assert sum(v for k, v in muestras.items() if k.startswith("hogar_artefactos_por_nivel")) == 300
+
+
+if __name__ == "__main__":
+    test_monitor_refleja_agregados()
+    test_registro_y_servidor()
+    test_monitor_sqlite_desde_otro_hilo()
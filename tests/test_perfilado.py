@@ -0,0 +1,113 @@
+"""
+Pruebas del perfil de ejecución
+
+Verifica que el perfilador mida llamadas, tiempos y filas recorridas solo
+mientras está activo, y que deje las clases como estaban al desactivarse
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import json
+import math
+
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.generador import GeneradorInventario
+from services.logica import SistemaLogico
+from services.perfilado import Estadistica, Perfilador
+
+
+def crear_gestor(cantidad: int = 500) -> GestorConjuntos:
+    """Gestor con artefactos sintéticos reproducibles"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(GeneradorInventario(3).artefactos(cantidad))
+    return gestor
+
+
+def test_mediciones_y_filas():
+    """Llamadas, tiempos y filas de cada método perfilado"""
+    print("\n" + "=" * 60)
+    print("TEST: Perfil de ejecución")
+    print("=" * 60)
+
+    gestor = crear_gestor()
+    originales = (GestorConjuntos.obtener_por_ubicacion, SistemaLogico.generar_reporte_logico)
+    with Perfilador() as perfilador:
+        conteo = AnalizadorConteo(gestor)
+        conteo.agrupar("ubicacion", "nivel")
+        cocina = gestor.obtener_por_ubicacion("Cocina")
+        SistemaLogico(gestor, conteo).generar_reporte_logico()
+    assert (
+        GestorConjuntos.obtener_por_ubicacion,
+        SistemaLogico.generar_reporte_logico,
+    ) == originales, "Error: al desactivar se restauran los métodos originales"
+    gestor.obtener_por_ubicacion("Sala")
+
+    medidas = perfilador.estadisticas()
+    assert medidas["AnalizadorConteo.agrupar"]["llamadas"] == 1
+    assert medidas["AnalizadorConteo.agrupar"]["filas"] == 500, "Error: agrupar recorre todo"
+    assert medidas["GestorConjuntos.iterar_artefactos"]["filas"] >= 500
+    assert medidas["GestorConjuntos.obtener_por_ubicacion"]["filas"] >= len(cocina)
+    assert medidas["GestorConjuntos.obtener_por_ubicacion"]["llamadas"] == 1, (
+        "Error: desactivado no se mide"
+    )
+    reporte = medidas["SistemaLogico.generar_reporte_logico"]
+    assert reporte["filas"] > 0, "Error: el reporte suma las filas de sus consultas"
+    for clave, medida in medidas.items():
+        assert 0 <= medida["propio"] <= medida["total"], f"Error en el tiempo propio de {clave}"
+        assert medida["p50"] <= medida["p99"] <= medida["maximo"], f"Error en {clave}"
+    assert list(medidas)[0] == max(medidas, key=lambda clave: medidas[clave]["total"])
+    print(f"\n✓ {len(medidas)} métodos medidos")
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "perfil.json"
+        perfilador.guardar(ruta)
+        assert json.loads(ruta.read_text(encoding="utf-8"))["metodos"] == medidas
+    assert "AnalizadorConteo.agrupar" in perfilador.reporte()
+    print("✓ Perfil en JSON y como tabla")
+
+    print("\n✅ TEST APROBADO: Perfil de ejecución\n")
+
+
+def test_percentiles_y_activacion():
+    """Percentiles del histograma y un solo perfilador activo a la vez"""
+    estadistica = Estadistica()
+    for microsegundos in range(1, 1001):
+        estadistica.registrar(microsegundos * 1000, microsegundos * 1000, 0)
+    assert math.isclose(estadistica.percentil(0.5), 500e-6, rel_tol=0.03)
+    assert math.isclose(estadistica.percentil(0.99), 990e-6, rel_tol=0.03)
+    assert estadistica.percentil(1.0) <= 1e-3 and Estadistica().percentil(0.5) == 0
+
+    gestor = crear_gestor(10)
+    with Perfilador([GestorConjuntos]) as perfilador:
+        try:
+            Perfilador().activar()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("Error: solo puede haber un perfilador activo")
+        gestor.total_artefactos()
+    gestor.total_artefactos()
+    AnalizadorConteo(gestor).contar_por_tipo()
+    medidas = perfilador.estadisticas()
+    assert medidas["GestorConjuntos.total_artefactos"]["llamadas"] == 1, (
+        "Error: desactivado no se mide"
+    )
+    assert not any(clave.startswith("AnalizadorConteo") for clave in medidas)
+    perfilador.reiniciar()
+    assert perfilador.estadisticas() == {}
+
+
+if __name__ == "__main__":
+    test_mediciones_y_filas()
+    test_percentiles_y_activacion()
@@ -0,0 +1,133 @@
+"""
+Pruebas de los perfiles de uso
+
+Verifica la curva de carga, los picos por ubicación y que la proposición s
+use la superposición real de los perfiles
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import math
+
+import numpy as np
+
+from models.artefacto import Artefacto
+from services.almacen_sqlite import GestorSQLite
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.logica import SistemaLogico
+from services.perfiles import MotorPerfiles
+
+
+def horas(*encendidas: int) -> list:
+    """Perfil de 24 valores encendido (1) en las horas indicadas"""
+    perfil = [0.0] * 24
+    for hora in encendidas:
+        perfil[hora] = 1.0
+    return perfil
+
+
+def crear_gestor() -> GestorConjuntos:
+    """Dos artefactos de alto consumo por ubicación: unos coinciden y otros no"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            # Cocina: horno y pava coinciden a las 20 h
+            Artefacto("Horno", 2000, 2, "Cocina", "Electrodoméstico", horas(19, 20)),
+            Artefacto("Pava", 2200, 1, "Cocina", "Electrodoméstico", horas(20)),
+            # Dormitorio: aire de noche y estufa de mañana, nunca a la vez
+            Artefacto("Aire", 2000, 2, "Dormitorio", "Climatización", horas(22, 23)),
+            Artefacto("Estufa", 1500, 2, "Dormitorio", "Climatización", horas(7, 8)),
+            # Sin perfil: 150 W repartidos en todo el día
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+        ]
+    )
+    return gestor
+
+
+def test_curva_y_picos():
+    """La curva suma los perfiles y conserva la energía diaria"""
+    print("\n" + "=" * 60)
+    print("TEST: Perfiles de uso")
+    print("=" * 60)
+
+    gestor = crear_gestor()
+    motor = MotorPerfiles.de(gestor)
+    curva = motor.curva_carga()
+
+    assert len(curva) == 96, "Error: la curva debe tener 96 cuartos de hora"
+    # Con perfiles coherentes con horas_dia, la energía diaria coincide
+    assert math.isclose(curva.sum() / 4, gestor.consumo_total_kwh() / 30), (
+        "Error en la energía de la curva"
+    )
+    pico, hora = motor.pico()
+    assert math.isclose(pico, 4.35) and hora == "20:00", f"Error en el pico: {motor.pico()}"
+    picos = motor.picos_por_ubicacion()
+    assert math.isclose(picos["Cocina"][0], 4.35), "Error en el pico de Cocina"
+    assert picos["Cocina"][1] == "20:00", "Error en la hora del pico de Cocina"
+    assert picos["Dormitorio"] == (2.0, "22:00"), "Error en el pico de Dormitorio"
+    print(f"\n✓ Pico del hogar: {motor.pico()}")
+
+    assert motor.maximo_simultaneo_alto() == {"Cocina": 2, "Dormitorio": 1}
+    assert motor.ranuras_simultaneas("Cocina") == ["20:00", "20:15", "20:30", "20:45"]
+    assert motor.artefactos_con_perfil() == 4, "Error en artefactos con perfil"
+
+    gestor.modificar_artefacto("Pava", perfil_uso=horas(6))
+    assert MotorPerfiles.de(gestor) is motor, "Error: el motor es compartido"
+    assert motor.maximo_simultaneo_alto()["Cocina"] == 1, (
+        "Error: el motor debe recalcular tras una modificación"
+    )
+    print("✓ Picos, simultaneidad y recálculo por versión")
+
+    print("\n✅ TEST APROBADO: Curva de carga y picos\n")
+
+
+def test_simultaneidad_en_logica():
+    """s es verdadera solo donde los artefactos de alto consumo coinciden"""
+    gestor = crear_gestor()
+    logica = SistemaLogico(gestor, AnalizadorConteo(gestor))
+
+    assert logica.prop_artefactos_simultaneos_criticos("Cocina") is True
+    assert logica.prop_artefactos_simultaneos_criticos("Dormitorio") is False
+    ubicaciones = logica.evaluar_ubicaciones(50)
+    assert ubicaciones["Cocina"][1] and not ubicaciones["Dormitorio"][1], (
+        "Error: evaluar_ubicaciones debe coincidir con s"
+    )
+
+    # Sin perfil, la estufa puede estar encendida junto con el aire
+    gestor.modificar_artefacto("Estufa", perfil_uso=None)
+    assert logica.prop_artefactos_simultaneos_criticos("Dormitorio") is True
+    assert logica.evaluar_ubicaciones(50)["Dormitorio"][1], "Error sin perfil"
+
+
+def test_perfil_valido_y_persistente():
+    """Los perfiles se validan y sobreviven a GestorSQLite"""
+    for invalido in ([0.5] * 10, [2.0] * 24, ["x"] * 24):
+        try:
+            Artefacto("X", 100, 1, "Sala", "Otro", invalido)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Error: perfil inválido aceptado: {invalido}")
+
+    with GestorSQLite() as gestor:
+        gestor.agregar_artefactos(crear_gestor().iterar_artefactos())
+        assert np.array_equal(gestor.obtener_artefacto("horno").perfil_uso, horas(19, 20))
+        assert gestor.obtener_artefacto("heladera").perfil_uso is None
+        pico, hora = MotorPerfiles.de(gestor).pico()
+        assert math.isclose(pico, 4.35) and hora == "20:00", "Error en SQLite"
+
+
+if __name__ == "__main__":
+    test_curva_y_picos()
+    test_simultaneidad_en_logica()
+    test_perfil_valido_y_persistente()
@@ -19,6 +19,9 @@ from models.artefacto import Artefacto
 from services.conjuntos import GestorConjuntos
 from services.conteo import AnalizadorConteo
 from services.logica import SistemaLogico
+from services.bitmaps import IndiceBits
+from services.expresiones import Nivel, Tipo, Ubicacion, Universo, Vacio
+from services import consultas
 
 
 def test_artefacto():
@@ -48,6 +51,28 @@ def test_artefacto():
     print("\n✅ TEST 1 APROBADO: Clase Artefacto funciona correctamente\n")
 
 
+def test_artefacto_valores_derivados():
+    """Prueba que los valores derivados se recalculan al cambiar potencia u horas"""
+    plancha = Artefacto("Plancha", 150, 2, "Lavadero", "Electrodoméstico")
+    assert plancha.nivel_consumo() == "BAJO", "Error en nivel inicial"
+    assert plancha.consumo_mensual() == 9.0, "Error en consumo inicial"
+
+    plancha.watts = 1500
+    assert plancha.nivel_consumo() == "ALTO", "Error: el nivel no se invalidó"
+    assert plancha.consumo_mensual() == 90.0, "Error: el consumo no se invalidó"
+
+    plancha.horas_dia = 1
+    assert plancha.consumo_diario() == 1500, "Error en consumo diario"
+    assert plancha.consumo_mensual() == 45.0, "Error: el consumo no se invalidó"
+
+    # Con __slots__ no se pueden crear atributos por error
+    try:
+        plancha.wats = 10
+        assert False, "Error: Artefacto no debe aceptar atributos nuevos"
+    except AttributeError:
+        pass
+
+
 def test_conjuntos():
     """Prueba operaciones de conjuntos"""
     print("\n" + "=" * 60)
@@ -117,6 +142,323 @@ def test_conjuntos():
     return gestor
 
 
+def test_indices():
+    """Prueba los índices invertidos del gestor"""
+    print("\n" + "=" * 60)
+    print("TEST 2b: Índices por ubicación, tipo y nivel")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefacto(Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"))
+    gestor.agregar_artefacto(Artefacto("Microondas", 1200, 0.5, "cocina", "Electrodoméstico"))
+    gestor.agregar_artefacto(Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"))
+
+    # Las claves se comparan sin distinguir mayúsculas
+    cocina = gestor.obtener_por_ubicacion("COCINA")
+    print(f"\n✓ Cocina = {cocina}")
+    assert cocina == {"heladera", "microondas"}, "Error en índice de ubicación"
+    assert gestor.obtener_todas_ubicaciones() == {"Cocina", "Dormitorio"}, (
+        "Error: cada ubicación debe aparecer una sola vez"
+    )
+
+    # El resultado es una copia: modificarlo no altera el índice
+    cocina.add("intruso")
+    assert "intruso" not in gestor.obtener_por_ubicacion("Cocina"), (
+        "Error: el índice no debe exponerse mutable"
+    )
+
+    # Reemplazar un artefacto actualiza todos los índices
+    gestor.agregar_artefacto(Artefacto("Lámpara", 1500, 1, "Lavadero", "Electrodoméstico"))
+    assert gestor.obtener_por_ubicacion("Dormitorio") == set(), "Error al reindexar"
+    assert "Dormitorio" not in gestor.obtener_todas_ubicaciones(), (
+        "Error: las ubicaciones vacías deben desaparecer"
+    )
+    assert "Iluminación" not in gestor.obtener_todos_tipos(), "Error en índice de tipo"
+    assert gestor.obtener_por_nivel_consumo("alto") == {"microondas", "lámpara"}, (
+        "Error en índice de nivel"
+    )
+    assert gestor.obtener_por_nivel_consumo("BAJO") == {"heladera"}, (
+        "Error en índice de nivel"
+    )
+    print("✓ Reemplazo reindexado correctamente")
+
+    print("\n✅ TEST 2b APROBADO: Índices funcionan correctamente\n")
+
+
+def test_carga_masiva():
+    """Prueba la carga masiva de artefactos"""
+    print("\n" + "=" * 60)
+    print("TEST 2c: Carga masiva")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefacto(Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"))
+
+    resumen = gestor.agregar_artefactos(
+        art
+        for art in [
+            Artefacto("Heladera", 1500, 2, "Cocina", "Electrodoméstico"),
+            Artefacto("TV", 80, 6, "Sala", "Electrónica"),
+            Artefacto("tv ", 90, 6, "Sala", "Electrónica"),
+            Artefacto("Sin potencia", 0, 6, "Sala", "Electrónica"),
+            Artefacto("Horas de más", 100, 25, "Sala", "Electrónica"),
+            Artefacto("Sin ubicación", 100, 2, " ", "Electrónica"),
+            "no es un artefacto",
+        ]
+    )
+    print(f"\n✓ Resumen: {resumen}")
+    assert resumen == {"insertados": 1, "reemplazados": 2, "rechazados": 4}, (
+        "Error en el resumen de la carga masiva"
+    )
+    assert gestor.universo == {"heladera", "tv"}, "Error en el universo"
+    assert gestor.obtener_artefacto("TV").watts == 90, "Error: debe ganar el último"
+    assert gestor.obtener_por_nivel_consumo("ALTO") == {"heladera"}, (
+        "Error: el reemplazo debe reindexar"
+    )
+    assert gestor.obtener_por_nivel_consumo("BAJO") == {"tv"}, "Error en índice de nivel"
+    assert gestor.obtener_todas_ubicaciones() == {"Cocina", "Sala"}, (
+        "Error en índice de ubicación"
+    )
+
+    print("\n✅ TEST 2c APROBADO: Carga masiva funciona correctamente\n")
+
+
+def test_agregados_acumulados():
+    """Prueba los acumulados del gestor en altas, bajas y modificaciones"""
+    print("\n" + "=" * 60)
+    print("TEST 2d: Agregados acumulados")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+        ]
+    )
+    gestor.agregar_artefacto(Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"))
+    print(f"\n✓ Total acumulado: {gestor.consumo_total_kwh():.2f} kWh")
+    assert abs(gestor.consumo_total_kwh() - 607.5) < 1e-9, "Error en total acumulado"
+    assert gestor.verificar_agregados() == [], "Error: acumulados inconsistentes"
+
+    # Modificación: cambia de nivel y de ubicación
+    assert gestor.modificar_artefacto("heladera", watts=1500, ubicacion="Garage")
+    assert gestor.contar_por_nivel() == {"ALTO": 3, "MEDIO": 0, "BAJO": 1}, (
+        "Error en cantidad por nivel tras modificar"
+    )
+    assert gestor.consumo_por_ubicacion_kwh()["Garage"] == 1080.0, (
+        "Error en consumo por ubicación tras modificar"
+    )
+    assert gestor.obtener_por_ubicacion("Garage") == {"heladera"}, "Error en índice"
+    assert gestor.verificar_agregados() == [], "Error: acumulados inconsistentes"
+
+    # Baja: la ubicación que queda vacía desaparece
+    assert gestor.eliminar_artefacto("Heladera")
+    assert not gestor.eliminar_artefacto("Heladera"), "Error: ya estaba eliminado"
+    assert "Garage" not in gestor.consumo_por_ubicacion_kwh(), "Error en baja"
+    assert gestor.total_artefactos() == 3, "Error en cardinalidad tras la baja"
+    assert gestor.verificar_agregados() == [], "Error: acumulados inconsistentes"
+
+    try:
+        gestor.modificar_artefacto("Aire", watts=-5)
+        assert False, "Error: la modificación inválida debe rechazarse"
+    except ValueError as e:
+        print(f"✓ Modificación inválida rechazada: {e}")
+
+    # Una asignación directa no actualiza los acumulados: la verificación lo detecta
+    gestor.obtener_artefacto("Aire").watts = 100
+    diferencias = gestor.verificar_agregados()
+    print(f"✓ Diferencias detectadas: {len(diferencias)}")
+    assert diferencias, "Error: la verificación debe detectar la inconsistencia"
+
+    for nombre in list(gestor.universo):
+        gestor.eliminar_artefacto(nombre)
+    assert gestor.consumo_total_kwh() == 0.0, "Error: el total debe volver a 0"
+
+    print("\n✅ TEST 2d APROBADO: Agregados acumulados funcionan correctamente\n")
+
+
+def test_mapas_de_bits():
+    """Prueba el álgebra de conjuntos sobre mapas de bits"""
+    print("\n" + "=" * 60)
+    print("TEST 2e: Conjuntos como mapas de bits")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),
+            Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"),
+        ]
+    )
+    gestor.agregar_artefacto(Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"))
+    print(f"\n✓ Ids = {gestor.ids}")
+    assert sorted(gestor.ids.values()) == [0, 1, 2, 3], "Error: ids no densos"
+
+    bits = IndiceBits.de(gestor)
+    cocina, alto = bits.por_ubicacion("COCINA"), bits.por_nivel("alto")
+    cocina_set = gestor.obtener_por_ubicacion("Cocina")
+    alto_set = gestor.obtener_por_nivel_consumo("ALTO")
+
+    assert (cocina | alto) == cocina_set | alto_set, "Error en unión"
+    assert (cocina & alto) == cocina_set & alto_set, "Error en intersección"
+    assert (cocina - alto) == cocina_set - alto_set, "Error en diferencia"
+    assert gestor.complemento(cocina) == gestor.complemento(cocina_set), (
+        "Error en complemento"
+    )
+    assert gestor.cardinalidad(cocina | alto) == 3, "Error en cardinalidad"
+    assert "microondas" in cocina and "aire" not in cocina, "Error en pertenencia"
+    print(f"✓ Cocina ∪ ALTO = {sorted(cocina | alto)}")
+    assert alto_set | cocina == cocina_set | alto_set, "Error en unión con un set"
+    assert cocina_set & alto == cocina_set & alto_set, "Error en intersección con un set"
+    assert gestor.union(cocina_set, alto) == (cocina | alto_set), "Error en union del gestor"
+
+    # Los mapas se reconstruyen cuando cambia el inventario
+    gestor.eliminar_artefacto("Heladera")
+    gestor.agregar_artefacto(Artefacto("Horno", 1500, 1, "Cocina", "Electrodoméstico"))
+    assert gestor.ids["horno"] == 0, "Error: el id eliminado debe reutilizarse"
+    for uso in (lambda: "horno" in cocina, lambda: len(cocina), lambda: cocina | alto):
+        try:
+            uso()
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Error: un mapa anterior a la eliminación debe rechazarse")
+    assert bits.por_ubicacion("Cocina").a_nombres() == {"microondas", "horno"}, (
+        "Error: mapa de bits desactualizado"
+    )
+    assert len(~bits.por_nivel("ALTO")) == 1, "Error en complemento tras eliminar"
+
+    # Con altas y bajas constantes, los ids no crecen más que el inventario
+    for ronda in range(20):
+        gestor.agregar_artefactos(
+            Artefacto(f"Foco {ronda}-{i}", 10, 5, "Sala", "Iluminación") for i in range(50)
+        )
+        for i in range(50):
+            gestor.eliminar_artefacto(f"Foco {ronda}-{i}")
+    assert len(gestor.nombres_por_id) == 54, "Error: los ids crecen sin límite"
+    assert sorted(gestor.ids.values()) == [0, 1, 2, 3], "Error: ids tras reutilizar"
+    assert bits.universo().a_nombres() == gestor.universo
+
+    print("\n✅ TEST 2e APROBADO: Mapas de bits funcionan correctamente\n")
+
+
+def test_expresiones():
+    """Prueba las expresiones de conjuntos perezosas y su planificador"""
+    print("\n" + "=" * 60)
+    print("TEST 2f: Expresiones de conjuntos perezosas")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),
+            Artefacto("Lámpara", 10, 5, "Cocina", "Iluminación"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            Artefacto("Estufa", 1500, 4, "Sala", "Climatización"),
+        ]
+    )
+    cocina = gestor.obtener_por_ubicacion("Cocina")
+    alto = gestor.obtener_por_nivel_consumo("ALTO")
+    iluminacion = gestor.obtener_por_tipo("Iluminación")
+
+    consulta = Ubicacion("Cocina") | Nivel("ALTO") - Tipo("Iluminación")
+    print(f"\n✓ Consulta: {consulta}")
+    assert gestor.consultar(consulta) == cocina | (alto - iluminacion), (
+        "Error al evaluar la expresión"
+    )
+    consulta = Ubicacion("cocina") & ~Nivel("alto") & ~Tipo("Iluminación")
+    print(f"✓ Plan de {consulta}: {consulta.planificar()}")
+    assert gestor.consultar(consulta) == {"heladera"}, "Error con complementos"
+
+    # El planificador descarta operandos que se sabe vacíos
+    assert (Ubicacion("Cocina") & Ubicacion("Sala")).planificar() == Vacio(), (
+        "Error: dos ubicaciones no se intersecan"
+    )
+    assert (~~Universo()).planificar() == Universo(), "Error en doble complemento"
+
+    # cardinalidad coincide con el tamaño del resultado materializado
+    for expresion in (
+        Ubicacion("Cocina") & Nivel("ALTO"),
+        Tipo("Climatización") | Ubicacion("Cocina"),
+        ~(Ubicacion("Cocina") | Ubicacion("Sala")),
+        Nivel("ALTO") - Ubicacion("Sala"),
+    ):
+        assert gestor.cardinalidad(expresion) == len(gestor.consultar(expresion)), (
+            f"Error en cardinalidad de {expresion}"
+        )
+
+    # El resultado es una copia: modificarlo no altera los índices
+    resultado = gestor.consultar(Ubicacion("Sala"))
+    resultado.add("intruso")
+    assert gestor.obtener_por_ubicacion("Sala") == {"estufa"}, (
+        "Error: el resultado no debe compartir el índice"
+    )
+
+    print("\n✅ TEST 2f APROBADO: Expresiones funcionan correctamente\n")
+
+
+def test_consultas_texto():
+    """Prueba el lenguaje de consultas y la caché de planes"""
+    print("\n" + "=" * 60)
+    print("TEST 2g: Consultas en texto")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),
+            Artefacto("Lámpara", 10, 5, "Cocina", "Iluminación"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            Artefacto("TV", 80, 6, "Sala de estar", "Electrónica"),
+        ]
+    )
+
+    texto = "(ubicacion:Cocina ∪ nivel:ALTO) ∩ ¬tipo:Iluminación"
+    esperado = (Ubicacion("Cocina") | Nivel("ALTO")) & ~Tipo("Iluminación")
+    print(f"\n✓ {texto} → {consultas.compilar(texto)}")
+    assert consultas.consultar(gestor, texto) == gestor.consultar(esperado), (
+        "Error al ejecutar la consulta"
+    )
+    # Alias ASCII, mayúsculas y espacios distintos dan el mismo plan
+    ascii_ = "( UBICACION:cocina | nivel:alto )   & ~tipo:iluminación"
+    assert consultas.compilar(ascii_) == consultas.compilar(texto), (
+        "Error: los alias ASCII deben compilar igual"
+    )
+    assert consultas.contar(gestor, 'not ubicacion:"Sala de estar" and U') == 4, (
+        "Error con valores entre comillas"
+    )
+    assert consultas.normalizar_consulta('NOT  ubicacion:"Sala  De Estar"') == (
+        'not ubicacion:"Sala  De Estar"'
+    ), "Error: los valores entre comillas no se normalizan"
+    # Precedencia como en Python: la diferencia liga más que la unión
+    assert consultas.compilar("tipo:x | nivel:alto - ubicacion:y") == (
+        Tipo("x") | Nivel("ALTO") - Ubicacion("y")
+    ).planificar(), "Error de precedencia"
+
+    # Repetir una consulta usa la caché en lugar de volver a compilar
+    consultas.limpiar_cache()
+    for _ in range(3):
+        consultas.consultar(gestor, texto)
+    info = consultas.info_cache()
+    print(f"✓ Caché: {info}")
+    assert (info.hits, info.misses) == (2, 1), "Error en la caché de planes"
+
+    for invalida in ("", "cocina", "ubicacion:Cocina ∪", "(tipo:x", "color:rojo"):
+        try:
+            consultas.compilar(invalida)
+        except ValueError as e:
+            print(f"✓ {invalida!r}: {e}")
+        else:
+            raise AssertionError(f"Error: {invalida!r} debería rechazarse")
+
+    print("\n✅ TEST 2g APROBADO: Consultas en texto funcionan correctamente\n")
+
+
 def test_conteo(gestor):
     """Prueba análisis de conteo"""
     print("\n" + "=" * 60)
@@ -163,6 +505,126 @@ def test_conteo(gestor):
     return conteo
 
 
+def test_agrupacion():
+    """Prueba el motor de agrupación de una sola pasada"""
+    print("\n" + "=" * 60)
+    print("TEST 3b: Agrupación por dimensiones")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "cocina", "Electrodoméstico"),
+            Artefacto("Horno", 2000, 1, "Cocina", "Electrodoméstico"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"),
+        ]
+    )
+    conteo = AnalizadorConteo(gestor)
+
+    grupos = conteo.agrupar("ubicacion", "nivel")
+    print(f"\n✓ (ubicación, nivel) = {grupos}")
+    assert grupos[("Cocina", "ALTO")] == (2, 78.0), "Error en grupo Cocina/ALTO"
+    assert grupos[("Cocina", "BAJO")] == (1, 108.0), "Error en grupo Cocina/BAJO"
+    assert ("cocina", "ALTO") not in grupos, "Error: las etiquetas deben unificarse"
+    assert sum(cantidad for cantidad, _ in grupos.values()) == 5, (
+        "Error: cada artefacto debe contarse una vez"
+    )
+
+    total = conteo.agrupar("ubicacion", "tipo", "nivel")
+    assert abs(
+        sum(consumo for _, consumo in total.values()) - conteo.consumo_total_mensual()
+    ) < 1e-9, "Error: la suma de los grupos debe dar el total"
+
+    assert conteo.contar_por_ubicacion() == {"Cocina": 3, "Dormitorio": 2}, (
+        "Error en conteo por ubicación"
+    )
+    assert conteo.contar_por_nivel_consumo() == {"ALTO": 3, "MEDIO": 0, "BAJO": 2}, (
+        "Error: los niveles sin artefactos deben aparecer con 0"
+    )
+
+    try:
+        conteo.agrupar("color")
+        assert False, "Error: una dimensión desconocida debe rechazarse"
+    except ValueError as e:
+        print(f"✓ Dimensión inválida rechazada: {e}")
+
+    print("\n✅ TEST 3b APROBADO: Agrupación funciona correctamente\n")
+
+
+def test_ranking():
+    """Prueba el ranking de consumidores y su paginación"""
+    print("\n" + "=" * 60)
+    print("TEST 3c: Ranking de consumo")
+    print("=" * 60)
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),  # 108
+            Artefacto("Microondas", 1200, 0.5, "Cocina", "Electrodoméstico"),  # 18
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),  # 480
+        ]
+    )
+    gestor.agregar_artefacto(Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"))
+    gestor.agregar_artefacto(Artefacto("TV", 80, 6, "Sala", "Electrónica"))  # 14.4
+    conteo = AnalizadorConteo(gestor)
+
+    mayores = conteo.mayores_consumidores(2)
+    print(f"\n✓ Top 2: {mayores}")
+    assert mayores == [("aire", 480.0), ("heladera", 108.0)], "Error en top 2"
+    assert [n for n, _ in conteo.menores_consumidores(2)] == ["lámpara", "tv"], (
+        "Error en menores consumidores"
+    )
+
+    paginas = [conteo.ranking(offset, 2) for offset in range(0, 6, 2)]
+    print(f"✓ Páginas: {paginas}")
+    assert [n for pagina in paginas for n, _ in pagina] == [
+        "aire", "heladera", "microondas", "tv", "lámpara"
+    ], "Error en la paginación"
+    assert conteo.ranking(10, 5) == [], "Error: página fuera de rango"
+
+    # El ranking sigue al día tras modificar y eliminar
+    gestor.modificar_artefacto("TV", horas_dia=24)  # 57.6
+    gestor.eliminar_artefacto("Aire")
+    assert [n for n, _ in conteo.ranking(0, 3)] == ["heladera", "tv", "microondas"], (
+        "Error: el ranking no se actualizó"
+    )
+    assert conteo.menores_consumidores(10)[0][0] == "lámpara", "Error en menores"
+    assert gestor.verificar_agregados() == [], "Error: ranking inconsistente"
+
+    print("\n✅ TEST 3c APROBADO: Ranking funciona correctamente\n")
+
+
+def test_ranking_reemplazo_masivo():
+    """Reemplazar muchos artefactos a la vez deja el ranking al día"""
+    gestor = GestorConjuntos()
+    originales = [
+        Artefacto(f"Equipo {i}", 10 + i, 1 + i % 20, "Sala", "Electrónica") for i in range(300)
+    ]
+    gestor.agregar_artefactos(originales)
+    gestor.rango_ranking(0, 1)
+
+    # La mitad cambia de consumo y la otra mitad se reemplaza igual
+    reemplazos = [
+        Artefacto(a.nombre, a.watts * 3 if i % 2 else a.watts, a.horas_dia, "Sala", "Electrónica")
+        for i, a in enumerate(originales)
+    ]
+    resultado = gestor.agregar_artefactos(reemplazos)
+    assert resultado["reemplazados"] == 300 and resultado["insertados"] == 0
+    gestor.eliminar_artefacto("Equipo 7")
+    gestor.modificar_artefacto("Equipo 8", watts=5000)
+
+    esperado = sorted(
+        ((a.nombre.lower(), a.consumo_mensual()) for a in gestor.iterar_artefactos()),
+        key=lambda par: (-par[1], par[0]),
+    )
+    assert gestor.rango_ranking(0, 300) == esperado, "Error: ranking tras el reemplazo"
+    assert gestor.rango_ranking(0, 1)[0][0] == "equipo 8"
+    assert gestor.verificar_agregados() == [], "Error: ranking inconsistente"
+
+
 def test_logica(gestor, conteo):
     """Prueba sistema de lógica proposicional"""
     print("\n" + "=" * 60)
@@ -228,6 +690,81 @@ def test_logica(gestor, conteo):
     print("\n✅ TEST 4 APROBADO: Lógica Proposicional funciona correctamente\n")
 
 
+def test_memoizacion():
+    """Prueba que las proposiciones se memorizan según la versión del inventario"""
+    print("\n" + "=" * 60)
+    print("TEST 4b: Memorización de proposiciones")
+    print("=" * 60)
+
+    class ConteoEspia(AnalizadorConteo):
+        """Cuenta cuántas veces se calcula el consumo total"""
+
+        llamadas = 0
+
+        def consumo_total_mensual(self):
+            ConteoEspia.llamadas += 1
+            return super().consumo_total_mensual()
+
+    gestor = GestorConjuntos()
+    gestor.agregar_artefacto(Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"))
+    logica = SistemaLogico(gestor, ConteoEspia(gestor))
+
+    version = gestor.version
+    logica.generar_reporte_logico()
+    logica.generar_reporte_logico()
+    print(f"\n✓ Cálculos del consumo total en dos reportes: {ConteoEspia.llamadas}")
+    assert ConteoEspia.llamadas == 1, "Error: p debe evaluarse una sola vez"
+    assert gestor.version == version, "Error: un reporte no modifica el inventario"
+
+    # Cualquier cambio invalida los resultados memorizados
+    assert logica.prop_consumo_alto(300)
+    gestor.modificar_artefacto("Aire", horas_dia=1)
+    assert gestor.version == version + 1, "Error: la modificación debe cambiar la versión"
+    assert not logica.prop_consumo_alto(300), "Error: resultado viejo tras modificar"
+    assert ConteoEspia.llamadas == 2, "Error: p debe recalcularse tras el cambio"
+
+    # Distintos argumentos son entradas distintas
+    assert logica.prop_consumo_alto(10) and not logica.prop_consumo_alto(100), (
+        "Error: el umbral debe formar parte de la clave"
+    )
+
+    # Modificar un resultado devuelto no altera lo memorizado
+    ubicaciones = logica.evaluar_ubicaciones(50)
+    ubicaciones.clear()
+    assert logica.evaluar_ubicaciones(50), "Error: el llamador corrompió la memoria"
+
+    print("\n✅ TEST 4b APROBADO: Memorización funciona correctamente\n")
+
+
+def test_ubicaciones_criticas_en_lote():
+    """El evaluador en lote coincide con evaluar r y s ubicación por ubicación"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        Artefacto(
+            f"Artefacto {i}",
+            (i * 53) % 2500 + 5,
+            (i % 12) + 0.5,
+            f"Depto {i % 40}",
+            "Electrodoméstico",
+        )
+        for i in range(400)
+    )
+    logica = SistemaLogico(gestor, AnalizadorConteo(gestor))
+
+    evaluadas = logica.evaluar_ubicaciones(50)
+    for ubicacion in gestor.obtener_todas_ubicaciones():
+        esperado = (
+            logica.prop_ubicacion_critica(ubicacion, 50),
+            logica.prop_artefactos_simultaneos_criticos(ubicacion),
+        )
+        assert evaluadas[ubicacion] == esperado, f"Error en {ubicacion}"
+
+    criticas = logica.identificar_ubicaciones_criticas()
+    assert criticas == [u for u, (r, s) in evaluadas.items() if r or s], (
+        "Error en ubicaciones críticas"
+    )
+
+
 def test_integracion():
     """Prueba integración completa del sistema"""
     print("\n" + "=" * 60)
@@ -290,15 +827,27 @@ def ejecutar_todas_las_pruebas():
     try:
         # Test 1: Artefacto
         test_artefacto()
+        test_artefacto_valores_derivados()
 
         # Test 2: Conjuntos
         gestor = test_conjuntos()
+        test_indices()
+        test_carga_masiva()
+        test_agregados_acumulados()
+        test_mapas_de_bits()
+        test_expresiones()
+        test_consultas_texto()
 
         # Test 3: Conteo
         conteo = test_conteo(gestor)
+        test_agrupacion()
+        test_ranking()
+        test_ranking_reemplazo_masivo()
 
         # Test 4: Lógica
         test_logica(gestor, conteo)
+        test_memoizacion()
+        test_ubicaciones_criticas_en_lote()
 
         # Test 5: Integración
         test_integracion()
@@ -0,0 +1,171 @@
+"""
+Pruebas del snapshot binario
+
+Verifica que guardar y abrir un snapshot conserve artefactos, índices,
+agregados y ranking del gestor original
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import math
+
+import numpy as np
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.logica import SistemaLogico
+from services.snapshot import cargar_snapshot, guardar_snapshot
+
+
+def crear_gestor() -> GestorConjuntos:
+    """Gestor con etiquetas repetidas en distinta grafía y empates de consumo"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+            Artefacto("Microondas", 1200, 0.5, "cocina", "Electrodoméstico"),
+            Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+            Artefacto("TV Ñandú", 80, 6, "Sala", "Electrónica"),
+            Artefacto("Lámpara B", 10, 5, "Sala", "Iluminación"),
+            Artefacto("Lámpara A", 10, 5, "Sala", "Iluminación"),
+            Artefacto("Plancha", 200, 0, "Lavadero", "Electrodoméstico"),
+        ]
+    )
+    return gestor
+
+
+def test_ida_y_vuelta():
+    """Un snapshot reproduce el inventario y los índices del gestor"""
+    print("\n" + "=" * 60)
+    print("TEST: Snapshot binario")
+    print("=" * 60)
+
+    gestor = crear_gestor()
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "inventario.snap"
+        assert guardar_snapshot(gestor, ruta) == 7, "Error en cantidad guardada"
+        snapshot = cargar_snapshot(ruta)
+
+        print(f"\n✓ Filas: {len(snapshot)}")
+        for artefacto in gestor.iterar_artefactos():
+            copia = snapshot.obtener_artefacto(artefacto.nombre.upper())
+            assert copia is not None, f"Error: falta {artefacto.nombre}"
+            # Las etiquetas se guardan con la primera grafía, como en el gestor
+            assert (copia.nombre, copia.watts, copia.horas_dia) == (
+                artefacto.nombre,
+                artefacto.watts,
+                artefacto.horas_dia,
+            ), f"Error en los datos de {artefacto.nombre}"
+            assert copia.ubicacion == gestor.etiqueta_ubicacion(artefacto.ubicacion)
+            assert copia.tipo == gestor.etiqueta_tipo(artefacto.tipo)
+        assert snapshot.buscar("inexistente") is None, "Error: nombre inexistente"
+        print("✓ Artefactos y búsqueda por nombre")
+
+        assert set(snapshot.obtener_por_ubicacion("COCINA")) == {
+            gestor.obtener_artefacto(n).nombre for n in gestor.obtener_por_ubicacion("Cocina")
+        }, "Error en índice de ubicación"
+        for nivel in ("ALTO", "MEDIO", "BAJO"):
+            assert len(snapshot.filas_de("nivel", nivel)) == len(
+                gestor.obtener_por_nivel_consumo(nivel)
+            ), f"Error en índice de nivel {nivel}"
+        assert snapshot.contar_por("ubicacion") == gestor.contar_por_ubicacion()
+        assert snapshot.contar_por("nivel") == gestor.contar_por_nivel()
+        consumo = snapshot.consumo_por("tipo")
+        esperado = gestor.consumo_por_tipo_kwh()
+        assert consumo.keys() == esperado.keys() and all(
+            math.isclose(consumo[tipo], esperado[tipo]) for tipo in esperado
+        ), "Error en consumo por tipo"
+        assert math.isclose(snapshot.consumo_total_kwh(), gestor.consumo_total_kwh())
+        assert snapshot.rango_ranking(0, 10) == gestor.rango_ranking(0, 10), (
+            "Error en ranking"
+        )
+        print("✓ Índices, agregados y ranking coinciden con el gestor")
+
+        almacen = snapshot.almacen()
+        assert np.shares_memory(almacen.watts, snapshot.watts), (
+            "Error: el almacén debe usar las columnas del snapshot sin copiar"
+        )
+        assert almacen.fila("aire") == ("aire", 2000.0, 8.0, "Dormitorio", "Climatización")
+        almacen.agregar_artefacto(Artefacto("Aire", 1, 1, "Sala", "Iluminación"))
+        assert cargar_snapshot(ruta).artefacto(snapshot.buscar("aire")).watts == 2000, (
+            "Error: modificar el almacén no debe cambiar el archivo"
+        )
+        print("✓ Almacén columnar sin copia y archivo inalterado")
+
+        reconstruido = snapshot.gestor()
+        assert reconstruido.universo == gestor.universo, "Error al reconstruir el gestor"
+        assert not reconstruido.verificar_agregados(), "Error en agregados reconstruidos"
+
+    print("\n✅ TEST APROBADO: El snapshot conserva el inventario\n")
+
+
+def test_snapshot_vacio_y_archivo_invalido():
+    """Un inventario vacío se guarda bien y un archivo ajeno se rechaza"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "vacio.snap"
+        guardar_snapshot(GestorConjuntos(), ruta)
+        snapshot = cargar_snapshot(ruta)
+        assert len(snapshot) == 0 and snapshot.rango_ranking(0, 5) == []
+        assert snapshot.contar_por("nivel") == {"ALTO": 0, "MEDIO": 0, "BAJO": 0}
+
+        ajeno = Path(directorio) / "ajeno.txt"
+        ajeno.write_text("no es un snapshot, pero tiene suficientes bytes")
+        try:
+            cargar_snapshot(ajeno)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Error: un archivo ajeno debe rechazarse")
+
+
+def test_horarios_y_perfiles():
+    """Horarios y perfiles de uso sobreviven al snapshot"""
+    perfil = [0.0] * 24
+    perfil[20] = 0.5
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Horno", 3000, 1, "Cocina", "Electrodoméstico", horarios="12:00-13:00"),
+            Artefacto(
+                "Pava", 2000, 1, "Cocina", "Electrodoméstico", horarios="07:00-07:30, 23:00-01:00"
+            ),
+            Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico", perfil_uso=perfil),
+            Artefacto("Lámpara", 10, 5, "Sala", "Iluminación"),
+        ]
+    )
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "horarios.snap"
+        guardar_snapshot(gestor, ruta)
+        reconstruido = cargar_snapshot(ruta).gestor()
+
+    for artefacto in gestor.iterar_artefactos():
+        copia = reconstruido.obtener_artefacto(artefacto.nombre)
+        assert copia.horarios == artefacto.horarios, f"Error en horarios de {copia.nombre}"
+        if artefacto.perfil_uso is None:
+            assert copia.perfil_uso is None, f"Error: {copia.nombre} no tiene perfil"
+        else:
+            assert np.array_equal(copia.perfil_uso, artefacto.perfil_uso)
+
+    # Con horarios que no se superponen, s sigue siendo falsa tras el snapshot
+    for inventario in (gestor, reconstruido):
+        logica = SistemaLogico(inventario, AnalizadorConteo(inventario))
+        assert not logica.prop_artefactos_simultaneos_criticos("Cocina"), (
+            "Error: s cambió al guardar y abrir el snapshot"
+        )
+
+
+if __name__ == "__main__":
+    test_ida_y_vuelta()
+    test_snapshot_vacio_y_archivo_invalido()
+    test_horarios_y_perfiles()
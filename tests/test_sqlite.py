@@ -0,0 +1,169 @@
+"""
+Pruebas del gestor persistente en SQLite
+
+Verifica que GestorSQLite responda igual que GestorConjuntos y que el
+inventario se conserve al reabrir la base
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import math
+import tempfile
+
+from models.artefacto import Artefacto
+from services.almacen_sqlite import GestorSQLite
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services import consultas
+from services.expresiones import Nivel, Ubicacion
+from services.generador import GeneradorInventario
+from services.logica import SistemaLogico
+
+
+def crear_artefactos():
+    """Artefactos de los tres niveles, con ubicaciones escritas de dos formas"""
+    return [
+        Artefacto("Heladera", 150, 24, "Cocina", "Electrodoméstico"),
+        Artefacto("Microondas", 1200, 0.5, "cocina", "Electrodoméstico"),
+        Artefacto("Aire", 2000, 8, "Dormitorio", "Climatización"),
+        Artefacto("TV", 80, 6, "Sala", "Electrónica"),
+        Artefacto("Lámpara", 10, 5, "Dormitorio", "Iluminación"),
+        Artefacto("Cafetera", 1000, 0.3, "Cocina", "Electrodoméstico"),
+        Artefacto("Plancha", 1500, 1, "Lavadero", "Electrodoméstico"),
+        Artefacto("Inválido", -5, 1, "Sala", "Otro"),
+    ]
+
+
+def comparar(sqlite: GestorSQLite, memoria: GestorConjuntos) -> None:
+    """Compara las lecturas de los dos gestores"""
+    assert sqlite.total_artefactos() == memoria.total_artefactos(), "Error en |U|"
+    assert math.isclose(sqlite.consumo_total_kwh(), memoria.consumo_total_kwh()), (
+        "Error en consumo total"
+    )
+    for metodo in ("consumo_por_ubicacion_kwh", "consumo_por_tipo_kwh"):
+        obtenido, esperado = getattr(sqlite, metodo)(), getattr(memoria, metodo)()
+        assert obtenido.keys() == esperado.keys() and all(
+            math.isclose(obtenido[k], esperado[k]) for k in esperado
+        ), f"Error en {metodo}"
+    for metodo in ("contar_por_ubicacion", "contar_por_tipo", "contar_por_nivel"):
+        assert getattr(sqlite, metodo)() == getattr(memoria, metodo)(), f"Error en {metodo}"
+    for nivel in ("ALTO", "medio", "BAJO"):
+        assert sqlite.obtener_por_nivel_consumo(nivel) == memoria.obtener_por_nivel_consumo(
+            nivel
+        ), f"Error en nivel {nivel}"
+    for ubicacion in memoria.obtener_todas_ubicaciones():
+        assert sqlite.obtener_por_ubicacion(ubicacion) == memoria.obtener_por_ubicacion(
+            ubicacion
+        ), f"Error en ubicación {ubicacion}"
+    assert sqlite.obtener_todas_ubicaciones() == memoria.obtener_todas_ubicaciones(), (
+        "Error en etiquetas de ubicación"
+    )
+    assert sqlite.rango_ranking(0, 10) == memoria.rango_ranking(0, 10), "Error en ranking"
+    assert sqlite.verificar_agregados() == [], "Error: resumen inconsistente"
+
+
+def test_misma_interfaz_que_memoria():
+    """GestorSQLite responde igual que GestorConjuntos"""
+    print("\n" + "=" * 60)
+    print("TEST: Gestor persistente en SQLite")
+    print("=" * 60)
+
+    sqlite, memoria = GestorSQLite(), GestorConjuntos()
+    resumen = sqlite.agregar_artefactos(crear_artefactos())
+    assert resumen == memoria.agregar_artefactos(crear_artefactos()), (
+        "Error en el resumen de la carga"
+    )
+    print(f"\n✓ Carga: {resumen}")
+    comparar(sqlite, memoria)
+
+    for gestor in (sqlite, memoria):
+        gestor.modificar_artefacto("TV", watts=1100, ubicacion="Living")
+        gestor.eliminar_artefacto("Aire")
+    comparar(sqlite, memoria)
+    assert sqlite.eliminar_artefacto("no existe") is False, "Error al eliminar"
+    print("✓ Altas, cambios y bajas coinciden con el gestor en memoria")
+
+    # Conteo, lógica y expresiones funcionan sobre el gestor SQLite
+    assert (
+        SistemaLogico(sqlite, AnalizadorConteo(sqlite)).generar_recomendaciones()
+        == SistemaLogico(memoria, AnalizadorConteo(memoria)).generar_recomendaciones()
+    ), "Error en recomendaciones"
+    consulta = Ubicacion("Cocina") | Nivel("ALTO")
+    assert sqlite.consultar(consulta) == memoria.consultar(consulta), "Error en consulta"
+    assert sqlite.cardinalidad(consulta) == memoria.cardinalidad(consulta), (
+        "Error en cardinalidad"
+    )
+    sqlite.cerrar()
+
+    print("\n✅ TEST APROBADO: Gestor SQLite funciona correctamente\n")
+
+
+def test_persistencia():
+    """El inventario se conserva al cerrar y reabrir la base"""
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = Path(directorio) / "hogar.db"
+        with GestorSQLite(ruta) as gestor:
+            gestor.agregar_artefactos(crear_artefactos())
+            total = gestor.consumo_total_kwh()
+
+        with GestorSQLite(ruta) as gestor:
+            assert gestor.total_artefactos() == 7, "Error: la base no se conservó"
+            assert math.isclose(gestor.consumo_total_kwh(), total), "Error en el total"
+            artefacto = gestor.obtener_artefacto("MICROONDAS")
+            assert (artefacto.nombre, artefacto.ubicacion) == ("Microondas", "cocina"), (
+                "Error al leer un artefacto"
+            )
+            assert gestor.etiqueta_ubicacion("COCINA") == "Cocina", "Error en etiqueta"
+
+
+class GestorSinUniverso(GestorSQLite):
+    """GestorSQLite que falla si alguien arma el universo completo"""
+
+    @property
+    def universo(self):
+        raise AssertionError("Error: se leyeron todos los nombres de la base")
+
+
+def test_expresiones_en_sql():
+    """Las expresiones se resuelven con una consulta SQL, sin leer el universo"""
+    artefactos = list(GeneradorInventario(8).artefactos(2000))
+    memoria = GestorConjuntos()
+    memoria.agregar_artefactos(artefactos)
+    with GestorSinUniverso() as sqlite:
+        sqlite.agregar_artefactos(artefactos)
+        for texto in (
+            "(ubicacion:Cocina ∪ nivel:ALTO) ∩ ¬tipo:Iluminación",
+            "U - nivel:BAJO",
+            "¬(ubicacion:Cocina ∪ ubicacion:Sala) - nivel:MEDIO",
+            "ubicacion:Cocina ∩ ubicacion:Sala",
+            "nivel:ENORME",
+        ):
+            esperado = consultas.consultar(memoria, texto)
+            assert consultas.consultar(sqlite, texto) == esperado, f"Error en {texto}"
+            assert consultas.contar(sqlite, texto) == len(esperado), f"Error al contar {texto}"
+        expresion = Ubicacion("Cocina") & Nivel("ALTO")
+        assert sqlite.cardinalidad(expresion) == memoria.cardinalidad(expresion)
+        assert sqlite.consultar(expresion) == memoria.consultar(expresion)
+
+        cocina = memoria.obtener_por_ubicacion("Cocina")
+        assert sqlite.complemento(cocina) == memoria.complemento(cocina), (
+            "Error en el complemento"
+        )
+        assert sqlite.complemento(expresion) == memoria.consultar(~expresion), (
+            "Error en el complemento de una expresión"
+        )
+
+
+if __name__ == "__main__":
+    test_misma_interfaz_que_memoria()
+    test_persistencia()
+    test_expresiones_en_sql()
@@ -0,0 +1,130 @@
+"""
+Pruebas del motor de tarifas
+
+Verifica los escalones, las franjas horarias, el cálculo en lote de
+planes × hogares y la sección de costos del reporte estadístico
+"""
+
+import sys
+from pathlib import Path
+
+# Configurar path del proyecto ANTES de importar los módulos
+src_path = Path(__file__).resolve().parent.parent / "src"
+if str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+# Ahora sí importar los módulos del proyecto
+# ruff: noqa: E402
+
+import math
+
+import numpy as np
+
+from models.artefacto import Artefacto
+from services.conjuntos import GestorConjuntos
+from services.conteo import AnalizadorConteo
+from services.tarifas import Tarifa, calcular_costos, costos_por_plan
+
+# 150 kWh a 50, los siguientes 150 a 65 y el resto a 80; 20 más de 18 a 23 h
+RESIDENCIAL = Tarifa(
+    "Residencial", [50, 65, 80], [150, 300], cargo_fijo=1500, franjas={"18:00-23:00": 20}
+)
+
+
+def costo_escalones(consumo: float, precios: list, limites: list) -> float:
+    """Costo de los escalones tramo por tramo, sin vectorizar"""
+    costo, inicio = 0.0, 0.0
+    for precio, fin in zip(precios, limites + [math.inf]):
+        costo += max(0.0, min(consumo, fin) - inicio) * precio
+        inicio = fin
+    return costo
+
+
+def test_escalones_y_lote():
+    """Los escalones cobran cada tramo a su precio, también en lote"""
+    print("\n" + "=" * 60)
+    print("TEST: Tarifas escalonadas")
+    print("=" * 60)
+
+    plana = Tarifa("Plana", [60])
+    assert plana.costo(100) == 6000, "Error en la tarifa de un solo escalón"
+    assert RESIDENCIAL.costo(0) == 1500, "Error: sin consumo solo queda el cargo fijo"
+    # 400 kWh: 150 × 50 + 150 × 65 + 100 × 80, más 5/24 del consumo × 20
+    assert math.isclose(RESIDENCIAL.costo(400), 1500 + 7500 + 9750 + 8000 + 400 * 20 * 5 / 24)
+    print("\n✓ Escalones y franja con consumo parejo")
+
+    aleatorio = np.random.default_rng(3)
+    planes = []
+    for i in range(40):
+        escalones = int(aleatorio.integers(1, 5))
+        limites = np.cumsum(aleatorio.uniform(50, 200, escalones - 1)).tolist()
+        precios = aleatorio.uniform(10, 100, escalones).tolist()
+        planes.append(Tarifa(f"Plan {i}", precios, limites, cargo_fijo=float(i)))
+    consumos = aleatorio.uniform(0, 900, 300)
+    costos = costos_por_plan(planes, consumos)
+    assert costos.shape == (40, 300), "Error: una fila por plan y una columna por hogar"
+    for plan, fila in zip(planes, costos):
+        esperado = [
+            plan.cargo_fijo + costo_escalones(c, list(plan.precios), list(plan.limites))
+            for c in consumos
+        ]
+        assert np.allclose(fila, esperado), f"Error en el lote para {plan.nombre}"
+    print("✓ Lote de 40 planes × 300 hogares igual al cálculo tramo por tramo")
+
+    print("\n✅ TEST APROBADO: Tarifas escalonadas\n")
+
+
+def test_franjas_segun_horarios():
+    """Los recargos siguen los horarios o el perfil de cada artefacto"""
+    gestor = GestorConjuntos()
+    gestor.agregar_artefactos(
+        [
+            Artefacto("Horno", 2000, 2, "Cocina", "Electrodoméstico", horarios="19:00-21:00"),
+            Artefacto("Heladera", 150, 24, "cocina", "Electrodoméstico"),
+            Artefacto("Lámpara", 100, 5, "Sala", "Iluminación", perfil_uso=[0.0] * 23 + [1.0]),
+        ]
+    )
+    costos = calcular_costos(gestor, RESIDENCIAL)
+
+    assert costos["energia"] == 150 * 50 + 93 * 65, "Error en los escalones del hogar"
+    # Horno: 120 kWh en franja; heladera: 5/24 de 108 kWh; lámpara: fuera de franja
+    assert math.isclose(costos["franjas"], 120 * 20 + 108 * 20 * 5 / 24)
+    assert math.isclose(costos["total"], 1500 + costos["energia"] + costos["franjas"])
+    assert math.isclose(
+        sum(costos["por_artefacto"].values()), costos["energia"] + costos["franjas"]
+    ), "Error: los artefactos reparten energía y franjas, no el cargo fijo"
+    assert math.isclose(costos["por_artefacto"]["lámpara"], 15 * costos["precio_medio"])
+    assert set(costos["por_ubicacion"]) == {"Cocina", "Sala"}, "Error en las etiquetas"
+
+    conteo = AnalizadorConteo(gestor, RESIDENCIAL)
+    assert conteo.costo_total_mensual() == costos["total"], "Error en el analizador"
+    assert "💲 COSTO MENSUAL (tarifa: Residencial)" in conteo.generar_reporte_estadistico()
+    assert "COSTO" not in AnalizadorConteo(gestor).generar_reporte_estadistico()
+
+
+def test_tarifa_desde_json_invalida():
+    """Las tarifas mal formadas se rechazan con un mensaje claro"""
+    tarifa = Tarifa.desde_dict(
+        {"nombre": "T", "escalones": [{"hasta": 100, "precio": 10}, {"precio": 20}]}
+    )
+    assert tarifa.limites == (100,) and tarifa.precios == (10, 20), "Error al leer JSON"
+    for datos in (
+        {"escalones": []},
+        {"escalones": [{"precio": 10}, {"precio": 20}]},
+        {"escalones": [{"hasta": 100, "precio": 10}, {"precio": -1}]},
+        {"escalones": [{"precio": 10}], "franjas": {"noche": 5}},
+        {"escalones": [{"precio": 10}], "franjas": [1, 2]},
+        {"escalones": [{"precio": 10}], "franjas": {"18:00-19:00": None}},
+    ):
+        try:
+            Tarifa.desde_dict(datos)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"Error: tarifa inválida aceptada: {datos}")
+
+
+if __name__ == "__main__":
+    test_escalones_y_lote()
+    test_franjas_segun_horarios()
+    test_tarifa_desde_json_invalida()